@@ -30,6 +30,7 @@ class QueuedLambdaProcessor(Construct):
         alarm_topic: ITopic,
         dlq_count_alarm_threshold: int = 10,
         dlq_retention_period: Duration | None = None,
+        max_concurrency: int | None = None,
     ):
         super().__init__(scope, construct_id)
 
@@ -61,6 +62,7 @@ class QueuedLambdaProcessor(Construct):
         #         batch_size=batch_size,
         #         max_batching_window=max_batching_window,
         #         report_batch_item_failures=True,
+        #         max_concurrency=max_concurrency,
         #     ),
         # )
         #
@@ -77,6 +79,7 @@ class QueuedLambdaProcessor(Construct):
             batch_size=batch_size,
             max_batching_window=max_batching_window,
             report_batch_item_failures=True,
+            max_concurrency=max_concurrency,
             event_source_arn=self.queue.queue_arn,
         )
         self.queue.add_to_resource_policy(
@@ -75,3 +75,34 @@ class TestQueuedLambdaProcessor(TestCase):
                 }
             },
         )
+
+    def test_limits_concurrency(self):
+        app = App()
+        stack = Stack(app, 'Stack')
+
+        function = Function(
+            stack,
+            'Function',
+            handler='handle',
+            runtime=Runtime.PYTHON_3_14,
+            code=Code.from_inline("""def handle(*args): return"""),
+        )
+        QueuedLambdaProcessor(
+            stack,
+            'Processor',
+            process_function=function,
+            visibility_timeout=Duration.minutes(5),
+            retention_period=Duration.hours(12),
+            max_batching_window=Duration.seconds(0),
+            max_receive_count=3,
+            batch_size=1,
+            encryption_key=Key(stack, 'Key'),
+            alarm_topic=Topic(stack, 'Topic'),
+            max_concurrency=4,
+        )
+
+        template = Template.from_stack(stack)
+        template.has_resource(
+            CfnEventSourceMapping.CFN_RESOURCE_TYPE_NAME,
+            props={'Properties': {'BatchSize': 1, 'ScalingConfig': {'MaximumConcurrency': 4}}},
+        )
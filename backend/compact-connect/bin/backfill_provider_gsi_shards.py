@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+This script backfills the sharded provider GSI partition key (providerGSIPK) onto existing provider records. Records
+written since the sharded provider GSIs were added already have it, so this only needs to be run once per environment,
+after the sharded GSIs have finished creating and before provider_gsi_sharded_reads is enabled. It is safe to re-run.
+
+Run from `backend/compact-connect`, with the PROVIDER_TABLE_NAME environment variable set to the name of the table to
+backfill and the CLI configured with AWS credentials that have access to it.
+
+Example:
+PROVIDER_TABLE_NAME=compact-connect-provider-table-dev ./bin/backfill_provider_gsi_shards.py
+"""
+
+import json
+import logging
+import os
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+
+with open('cdk.json') as context_file:
+    _context = json.load(context_file)['context']
+os.environ.setdefault('COMPACTS', json.dumps(_context['compacts']))
+os.environ.setdefault('JURISDICTIONS', json.dumps(_context['jurisdictions']))
+
+# We have to import this after we've mucked with our path and environment
+from cc_common.data_model.schema.provider.record import provider_gsi_pk, provider_gsi_shard  # noqa: E402
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_table_name() -> str:
+    """Get the table name from environment variable."""
+    table_name = os.environ.get('PROVIDER_TABLE_NAME')
+    if not table_name:
+        raise ValueError('Please set PROVIDER_TABLE_NAME environment variable')
+    return table_name
+
+
+def backfill_table(table_name: str) -> None:
+    """Set providerGSIPK on every provider record in the specified DynamoDB table that does not have it."""
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.Table(table_name)
+
+    # Initialize counters
+    updated_count = 0
+    error_count = 0
+
+    scan_pagination = {}
+    while True:
+        response = table.scan(
+            FilterExpression=Attr('type').eq('provider') & Attr('providerGSIPK').not_exists(),
+            ProjectionExpression='pk, sk, #compact, providerId',
+            ExpressionAttributeNames={'#compact': 'compact'},
+            **scan_pagination,
+        )
+        items = response.get('Items', [])
+        if items:
+            logger.info('Found %d provider records to backfill in current batch', len(items))
+
+        for item in items:
+            key = {'pk': item['pk'], 'sk': item['sk']}
+            try:
+                table.update_item(
+                    Key=key,
+                    UpdateExpression='SET providerGSIPK = :gsi_pk',
+                    # Don't resurrect a provider that was deleted since we scanned it
+                    ConditionExpression=Attr('pk').exists(),
+                    ExpressionAttributeValues={
+                        ':gsi_pk': provider_gsi_pk(item['compact'], provider_gsi_shard(item['providerId'])),
+                    },
+                )
+                updated_count += 1
+                if updated_count % 100 == 0:
+                    logger.info('Backfilled %d provider records so far', updated_count)
+            except ClientError as e:
+                logger.error('Error backfilling provider record %s: %s', key, str(e))
+                error_count += 1
+
+        # Check if we need to continue pagination
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            break
+        scan_pagination = {'ExclusiveStartKey': last_evaluated_key}
+
+    # Log final statistics
+    logger.info('Backfill completed. Successfully updated %d provider records', updated_count)
+    if error_count > 0:
+        logger.warning('Encountered %d errors during backfill. Re-run the script to retry them.', error_count)
+
+
+if __name__ == '__main__':
+    try:
+        table_name = get_table_name()
+        logger.info('Starting provider GSI shard backfill of table: %s', table_name)
+        backfill_table(table_name)
+    except Exception as e:  # noqa: BLE001
+        logger.error('Script failed: %s', e)
+        exit(1)
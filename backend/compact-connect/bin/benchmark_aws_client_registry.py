@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare the per-call overhead of getting a DynamoDB table handle from the shared client registry in
+# _Config against building a new boto3 resource for each access, as the transaction history, rate limiting and event
+# state tables used to. Calls are made against moto, so the cost of the call itself is local and small.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_aws_client_registry.py --calls 500
+import os
+import sys
+import time
+from collections.abc import Callable
+
+# We have to do some set-up before we can import everything we need
+# Add the common lambda runtime to our pythonpath
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+
+os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+os.environ['RATE_LIMITING_TABLE_NAME'] = 'rate-limiting-table'
+
+import boto3  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+
+def benchmark(label: str, get_table: Callable, calls: int) -> float:
+    """Time getting a table handle and making a get_item call with it, returning the mean time per call, in seconds"""
+    # Warm up, so that one-time setup, like loading service models, isn't counted
+    get_table().get_item(Key={'pk': 'warm-up', 'sk': 'warm-up'})
+    start = time.perf_counter()
+    for i in range(calls):
+        get_table().get_item(Key={'pk': f'pk-{i}', 'sk': 'sk'})
+    per_call = (time.perf_counter() - start) / calls
+    print(f'{label:>20}: {per_call * 1000:>8.2f} ms per call')
+    return per_call
+
+
+if __name__ == '__main__':
+    import logging
+    from argparse import ArgumentParser
+
+    logging.basicConfig()
+
+    parser = ArgumentParser(description='Compare the per-call overhead of getting DynamoDB table handles')
+    parser.add_argument('--calls', help='The count of calls to time for each, default: 500', default=500, type=int)
+    args = parser.parse_args()
+
+    with mock_aws():
+        table_name = os.environ['RATE_LIMITING_TABLE_NAME']
+        boto3.resource('dynamodb').create_table(
+            TableName=table_name,
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'},
+            ],
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+
+        from cc_common.config import _Config
+
+        config = _Config()
+
+        new_resource_time = benchmark(
+            'resource per access', lambda: boto3.resource('dynamodb').Table(table_name), args.calls
+        )
+        registry_time = benchmark('client registry', lambda: config.rate_limiting_table, args.calls)
+        print(f'{"overhead saved":>20}: {(new_resource_time - registry_time) * 1000:>8.2f} ms per call')
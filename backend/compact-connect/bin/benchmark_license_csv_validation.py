@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare the throughput of the compiled bulk upload license validator against validating
+# each row with a full LicensePostRequestSchema load and dump, as the bulk upload handler used to.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_license_csv_validation.py --count 20000 --compact aslp --jurisdiction oh
+import json
+import os
+import sys
+import time
+from csv import DictWriter
+from io import StringIO
+
+# We have to do some set-up before we can import everything we need
+# Add the common and provider data lambda runtimes to our pythonpath
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+sys.path.append(os.path.join('lambdas', 'python', 'provider-data-v1'))
+
+with open('cdk.json') as context_file:
+    _context = json.load(context_file)['context']
+os.environ['LICENSE_TYPES'] = json.dumps(_context['license_types'])
+
+# This sets up the rest of the environment the data model needs, and gives us realistic mock licenses
+import generate_mock_license_csv_upload_file as mock_data  # noqa: E402
+from cc_common.data_model.schema.license.api import LicensePostRequestSchema  # noqa: E402
+from license_csv_reader import LicenseCSVReader  # noqa: E402
+from license_csv_validator import LicenseCSVValidator  # noqa: E402
+from marshmallow import ValidationError  # noqa: E402
+
+
+def generate_csv(count: int, *, compact: str, jurisdiction: str, invalid_every: int) -> str:
+    """Generate a mock bulk upload file, with every `invalid_every`th row made invalid"""
+    mock_data._initialize_name_faker()  # noqa: SLF001 protected-access
+    stream = StringIO()
+    writer = DictWriter(stream, fieldnames=mock_data.FIELDS)
+    writer.writeheader()
+    for i, row in enumerate(
+        mock_data.generate_license_records(count, compact=compact, jurisdiction=jurisdiction, ssn_prefix='000')
+    ):
+        if invalid_every and i % invalid_every == 0:
+            row['dateOfBirth'] = 'not a date'
+        writer.writerow(row)
+    return stream.getvalue()
+
+
+def validate_with_schema(rows: list[dict], *, compact: str, jurisdiction: str) -> int:
+    """Validate the rows one at a time, with a full schema load and dump, returning the number of valid rows"""
+    schema = LicensePostRequestSchema()
+    ssns_in_file_upload = {}
+    valid_count = 0
+    for i, raw_license in enumerate(rows):
+        try:
+            validated_license = schema.load(dict(compact=compact, jurisdiction=jurisdiction, **raw_license))
+            ssn_key = (validated_license['ssn'], validated_license['licenseType'])
+            if ssn_key in ssns_in_file_upload:
+                raise ValidationError('Duplicate License SSN')
+            ssns_in_file_upload[ssn_key] = i + 1
+            schema.dump(validated_license)
+            valid_count += 1
+        except ValidationError:
+            continue
+    return valid_count
+
+
+def validate_with_compiled_validator(rows: list[dict], *, compact: str, jurisdiction: str) -> int:
+    """Validate the rows with the compiled, chunked validator, returning the number of valid rows"""
+    validator = LicenseCSVValidator(compact=compact, jurisdiction=jurisdiction)
+    return sum(1 for result in validator.validate(rows) if result.error is None)
+
+
+def benchmark(label: str, func, rows: list[dict], repeat: int, **kwargs) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        valid_count = func(rows, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rows_per_second = len(rows) / best
+    print(f'{label:>20}: {rows_per_second:>12,.0f} rows/sec ({valid_count} of {len(rows)} rows valid)')
+    return rows_per_second
+
+
+if __name__ == '__main__':
+    import logging
+    from argparse import ArgumentParser
+
+    logging.basicConfig()
+
+    parser = ArgumentParser(description='Compare bulk upload license validation throughput')
+    parser.add_argument('--count', help='The count of licenses to validate', default=20_000, type=int)
+    parser.add_argument('--compact', help='The compact these licenses will be for', default='aslp')
+    parser.add_argument('-j', '--jurisdiction', help='The jurisdiction these licenses will be for', default='oh')
+    parser.add_argument(
+        '--invalid-every',
+        help='Make every Nth row invalid, to include the cost of reporting errors (0 for none, default: 20)',
+        default=20,
+        type=int,
+    )
+    parser.add_argument('--repeat', help='Number of timed runs of each validator, default: 3', default=3, type=int)
+    args = parser.parse_args()
+
+    csv_data = generate_csv(
+        args.count, compact=args.compact, jurisdiction=args.jurisdiction, invalid_every=args.invalid_every
+    )
+    license_rows = list(LicenseCSVReader().licenses(StringIO(csv_data)))
+
+    schema_rate = benchmark(
+        'schema per row',
+        validate_with_schema,
+        license_rows,
+        args.repeat,
+        compact=args.compact,
+        jurisdiction=args.jurisdiction,
+    )
+    compiled_rate = benchmark(
+        'compiled validator',
+        validate_with_compiled_validator,
+        license_rows,
+        args.repeat,
+        compact=args.compact,
+        jurisdiction=args.jurisdiction,
+    )
+    print(f'{"speedup":>20}: {compiled_rate / schema_rate:.1f}x')
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to measure the throughput of the license ingest chain, entirely against moto, so that performance
+# changes to the chain can be measured and reviewed without deploying.
+#
+# A mock bulk upload file is run through each stage of the chain, with the SQS and EventBridge hops between them wired
+# up locally, as they are deployed:
+#   bulk-upload: parse_bulk_upload_file, from the S3 put event for the uploaded file
+#   preprocess:  preprocess_license_ingest_messages, fed from the license preprocessing queue
+#   ingest:      ingest_license_messages, fed from the ingest queue, which a rule on the event bus targets
+# For each stage, rows/sec, the process's peak memory by the end of the stage and the AWS API calls made by the stage
+# are reported. Note that moto holds everything written so far in memory, in the same process.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_license_ingest.py --count 2000 --compact aslp --jurisdiction oh
+#
+# To record a baseline, then fail later runs that regress past it:
+# bin/benchmark_license_ingest.py --count 2000 --write-baseline ingest-baseline.json
+# bin/benchmark_license_ingest.py --count 2000 --baseline ingest-baseline.json
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import warnings
+from collections import Counter
+from csv import DictWriter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from io import BytesIO, StringIO
+from uuid import uuid4
+
+# We have to do some set-up before we can import everything we need
+# Add the common and provider data lambda runtimes to our pythonpath
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+sys.path.append(os.path.join('lambdas', 'python', 'provider-data-v1'))
+
+with open('cdk.json') as context_file:
+    _context = json.load(context_file)['context']
+
+# Every AWS call made here is served by moto, so none of these names refer to real resources
+os.environ.update(
+    {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_SECURITY_TOKEN': 'testing',
+        'AWS_SESSION_TOKEN': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'BULK_BUCKET_NAME': 'benchmark-bulk-bucket',
+        'EVENT_BUS_NAME': 'benchmark-data-events',
+        'PROVIDER_TABLE_NAME': 'benchmark-provider-table',
+        'SSN_TABLE_NAME': 'benchmark-ssn-table',
+        'SSN_INDEX_NAME': 'ssnIndex',
+        'LICENSE_TYPES': json.dumps(_context['license_types']),
+        'POWERTOOLS_METRICS_DISABLED': 'true',
+    }
+)
+
+import boto3  # noqa: E402
+
+# This sets up the rest of the environment the data model needs, and gives us realistic mock licenses
+import generate_mock_license_csv_upload_file as mock_data  # noqa: E402
+from aws_lambda_powertools.utilities.typing import LambdaContext  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+# The deployed batch size of both queued lambda processors in the chain
+SQS_BATCH_SIZE = 50
+
+
+class ApiCallCounter:
+    """Count the AWS API calls made by every client created from the given boto3 session, by service and operation
+
+    The counter has to be registered before the lambda runtime creates its clients, since each client takes a copy of
+    the session's event handlers when it is created. Calls made by the benchmark itself use a separate session, so they
+    are not counted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+
+    def register(self, session: boto3.Session):
+        session.events.register('before-call', self._count)
+
+    def _count(self, model, **kwargs):  # noqa: ARG002 unused-argument
+        with self._lock:
+            self.calls[f'{model.service_model.service_name}.{model.name}'] += 1
+
+    def reset(self) -> dict[str, int]:
+        """Return the calls counted so far, starting a new count"""
+        with self._lock:
+            calls = dict(sorted(self.calls.items()))
+            self.calls = Counter()
+        return calls
+
+
+@dataclass
+class StageResult:
+    name: str
+    rows: int
+    seconds: float
+    peak_memory_bytes: int
+    failures: int
+    api_calls: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def total_api_calls(self) -> int:
+        return sum(self.api_calls.values())
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.rows,
+            'rowsPerSecond': round(self.rows_per_second, 1),
+            'peakMemoryBytes': self.peak_memory_bytes,
+            'failures': self.failures,
+            'totalApiCalls': self.total_api_calls,
+            'apiCalls': self.api_calls,
+        }
+
+
+class IngestBenchmark:
+    """Create the resources the ingest chain needs in moto, then run an uploaded file through each of its stages"""
+
+    def __init__(self, *, compact: str, jurisdiction: str, api_call_counter: ApiCallCounter):
+        self.compact = compact
+        self.jurisdiction = jurisdiction
+        self.api_call_counter = api_call_counter
+        # The benchmark's own calls, to set up resources and move messages between stages, are made from this session
+        self.harness = boto3.Session()
+        self.sqs = self.harness.client('sqs')
+        self.context = self._mock_context()
+
+    def build_resources(self):
+        dynamodb = self.harness.resource('dynamodb')
+        dynamodb.create_table(
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'},
+            ],
+            TableName=os.environ['PROVIDER_TABLE_NAME'],
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        dynamodb.create_table(
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'},
+                {'AttributeName': 'providerIdGSIpk', 'AttributeType': 'S'},
+            ],
+            TableName=os.environ['SSN_TABLE_NAME'],
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            BillingMode='PAY_PER_REQUEST',
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': os.environ['SSN_INDEX_NAME'],
+                    'KeySchema': [
+                        {'AttributeName': 'providerIdGSIpk', 'KeyType': 'HASH'},
+                        {'AttributeName': 'sk', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                },
+            ],
+        )
+        self.harness.client('s3').create_bucket(Bucket=os.environ['BULK_BUCKET_NAME'])
+
+        self.preprocessing_queue_url = self.sqs.create_queue(QueueName='benchmark-license-preprocessing')['QueueUrl']
+        os.environ['LICENSE_PREPROCESSING_QUEUE_URL'] = self.preprocessing_queue_url
+
+        # Deliver license.ingest events from the event bus to the ingest queue, as the ingest stack's rule does
+        self.ingest_queue_url = self.sqs.create_queue(QueueName='benchmark-ingest')['QueueUrl']
+        ingest_queue_arn = self.sqs.get_queue_attributes(QueueUrl=self.ingest_queue_url, AttributeNames=['QueueArn'])[
+            'Attributes'
+        ]['QueueArn']
+        events = self.harness.client('events')
+        events.create_event_bus(Name=os.environ['EVENT_BUS_NAME'])
+        events.put_rule(
+            Name='benchmark-ingest',
+            EventBusName=os.environ['EVENT_BUS_NAME'],
+            EventPattern=json.dumps({'detail-type': ['license.ingest']}),
+        )
+        events.put_targets(
+            Rule='benchmark-ingest',
+            EventBusName=os.environ['EVENT_BUS_NAME'],
+            Targets=[{'Id': 'ingest-queue', 'Arn': ingest_queue_arn}],
+        )
+
+    def run(self, csv_data: bytes, *, row_count: int) -> list[StageResult]:
+        from handlers.bulk_upload import parse_bulk_upload_file
+        from handlers.ingest import ingest_license_messages, preprocess_license_ingest_messages
+
+        key = f'{self.compact}/{self.jurisdiction}/{uuid4().hex}'
+        self.harness.client('s3').upload_fileobj(BytesIO(csv_data), os.environ['BULK_BUCKET_NAME'], key)
+        s3_event = {
+            'Records': [
+                {
+                    'eventTime': datetime.now(tz=UTC).isoformat(),
+                    's3': {
+                        'bucket': {'name': os.environ['BULK_BUCKET_NAME']},
+                        'object': {'key': key, 'size': len(csv_data)},
+                    },
+                }
+            ]
+        }
+        results = [self._run_stage('bulk-upload', row_count, lambda: parse_bulk_upload_file(s3_event, self.context))]
+
+        # Each hop is drained before the next stage is timed, so moving messages between stages is not measured
+        results.append(
+            self._run_sqs_stage('preprocess', preprocess_license_ingest_messages, self.preprocessing_queue_url)
+        )
+        results.append(self._run_sqs_stage('ingest', ingest_license_messages, self.ingest_queue_url))
+        return results
+
+    def _run_sqs_stage(self, name: str, handler, queue_url: str) -> StageResult:
+        batches = self._drain_queue(queue_url)
+        row_count = sum(len(batch['Records']) for batch in batches)
+
+        def process_batches() -> int:
+            return sum(len(handler(batch, self.context)['batchItemFailures']) for batch in batches)
+
+        return self._run_stage(name, row_count, process_batches)
+
+    def _run_stage(self, name: str, row_count: int, func) -> StageResult:
+        self.api_call_counter.reset()
+        start = time.perf_counter()
+        failures = func() or 0
+        elapsed = time.perf_counter() - start
+        return StageResult(
+            name=name,
+            rows=row_count,
+            seconds=elapsed,
+            peak_memory_bytes=_peak_memory_bytes(),
+            failures=failures,
+            api_calls=self.api_call_counter.reset(),
+        )
+
+    def _drain_queue(self, queue_url: str) -> list[dict]:
+        """Receive every message on the queue, as SQS lambda events of the deployed batch size"""
+        records = []
+        while True:
+            messages = self.sqs.receive_message(
+                QueueUrl=queue_url, MaxNumberOfMessages=10, MessageAttributeNames=['All']
+            ).get('Messages', [])
+            if not messages:
+                break
+            records.extend(
+                {
+                    'messageId': message['MessageId'],
+                    'receiptHandle': message['ReceiptHandle'],
+                    'body': message['Body'],
+                    'messageAttributes': message.get('MessageAttributes', {}),
+                    'eventSource': 'aws:sqs',
+                }
+                for message in messages
+            )
+            self.sqs.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {'Id': str(i), 'ReceiptHandle': message['ReceiptHandle']} for i, message in enumerate(messages)
+                ],
+            )
+        return [{'Records': records[i : i + SQS_BATCH_SIZE]} for i in range(0, len(records), SQS_BATCH_SIZE)]
+
+    @staticmethod
+    def _mock_context() -> LambdaContext:
+        from unittest.mock import MagicMock
+
+        context = MagicMock(name='MockLambdaContext', spec=LambdaContext)
+        context.function_name = 'benchmark-license-ingest'
+        return context
+
+
+def _peak_memory_bytes() -> int:
+    """The peak resident set size of this process so far"""
+    # ru_maxrss is reported in bytes on macOS, but in kilobytes on linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def generate_csv(count: int, *, compact: str, jurisdiction: str) -> bytes:
+    """Generate a mock bulk upload file"""
+    mock_data._initialize_name_faker()  # noqa: SLF001 protected-access
+    stream = StringIO()
+    writer = DictWriter(stream, fieldnames=mock_data.FIELDS)
+    writer.writeheader()
+    # generate_license_records reports its progress on stdout, which we don't want mixed into our report
+    stdout = sys.stdout
+    sys.stdout = StringIO()
+    try:
+        for row in mock_data.generate_license_records(
+            count, compact=compact, jurisdiction=jurisdiction, ssn_prefix='000'
+        ):
+            writer.writerow(row)
+    finally:
+        sys.stdout = stdout
+    return stream.getvalue().encode('utf-8')
+
+
+def print_report(results: list[StageResult]):
+    print(f'{"stage":>12} {"rows":>8} {"rows/sec":>10} {"peak MiB":>9} {"failures":>9} {"API calls":>10}')
+    for result in results:
+        print(
+            f'{result.name:>12} {result.rows:>8} {result.rows_per_second:>10,.0f} '
+            f'{result.peak_memory_bytes / 2**20:>9,.1f} {result.failures:>9} {result.total_api_calls:>10}'
+        )
+    for result in results:
+        print(f'\n{result.name} API calls:')
+        for operation, count in result.api_calls.items():
+            print(f'{operation:>40}: {count}')
+
+
+def compare_to_baseline(
+    results: list[StageResult], baseline: dict, *, tolerance: float, api_call_tolerance: float
+) -> list[str]:
+    """Return a description of each way the results regress past the baseline"""
+    regressions = []
+    for result in results:
+        expected = baseline['stages'].get(result.name)
+        if expected is None:
+            continue
+        if result.rows_per_second < expected['rowsPerSecond'] * (1 - tolerance):
+            regressions.append(
+                f'{result.name}: {result.rows_per_second:,.0f} rows/sec, '
+                f'down from {expected["rowsPerSecond"]:,.0f} in the baseline'
+            )
+        if result.peak_memory_bytes > expected['peakMemoryBytes'] * (1 + tolerance):
+            regressions.append(
+                f'{result.name}: peak memory of {result.peak_memory_bytes:,} bytes, '
+                f'up from {expected["peakMemoryBytes"]:,} in the baseline'
+            )
+        for operation, count in result.api_calls.items():
+            expected_count = expected['apiCalls'].get(operation, 0)
+            if count > expected_count * (1 + api_call_tolerance):
+                regressions.append(
+                    f'{result.name}: {count} {operation} calls, up from {expected_count} in the baseline'
+                )
+    return regressions
+
+
+if __name__ == '__main__':
+    import random
+    from argparse import ArgumentParser
+
+    from faker import Faker
+
+    logging.basicConfig()
+    # The handlers publish no metrics when metrics are disabled, which powertools warns about for every batch
+    warnings.filterwarnings('ignore', message='No application metrics to publish')
+
+    parser = ArgumentParser(description='Measure license ingest throughput, locally against moto')
+    parser.add_argument('--count', help='The count of licenses to upload, default: 2000', default=2_000, type=int)
+    parser.add_argument('--compact', help='The compact these licenses will be for', default='aslp')
+    parser.add_argument('-j', '--jurisdiction', help='The jurisdiction these licenses will be for', default='oh')
+    parser.add_argument('--seed', help='Seed for the mock license data, default: 0', default=0, type=int)
+    parser.add_argument(
+        '--log-level',
+        help='Log level for the lambda runtime, default: WARNING, since per-message logging obscures the report',
+        default='WARNING',
+    )
+    parser.add_argument('--output', help='Write the results, as JSON, to this file')
+    parser.add_argument('--write-baseline', help='Write the results, as a baseline for later runs, to this file')
+    parser.add_argument('--baseline', help='Fail if the results regress past the baseline in this file')
+    parser.add_argument(
+        '--tolerance',
+        help='Allowed fractional regression of rows/sec and peak memory from the baseline, default: 0.2',
+        default=0.2,
+        type=float,
+    )
+    parser.add_argument(
+        '--api-call-tolerance',
+        help='Allowed fractional increase of each API call count from the baseline, default: 0',
+        default=0.0,
+        type=float,
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline['count'], baseline['compact']) != (args.count, args.compact):
+            parser.error(
+                f'The baseline was recorded for {baseline["count"]} {baseline["compact"]} licenses, '
+                f'so can only be compared with a run of the same'
+            )
+
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+    upload = generate_csv(args.count, compact=args.compact, jurisdiction=args.jurisdiction)
+
+    with mock_aws():
+        counter = ApiCallCounter()
+        from cc_common.config import config, logger
+
+        counter.register(config.boto_session)
+
+        logger.setLevel(args.log_level)
+
+        benchmark = IngestBenchmark(compact=args.compact, jurisdiction=args.jurisdiction, api_call_counter=counter)
+        benchmark.build_resources()
+        stage_results = benchmark.run(upload, row_count=args.count)
+
+    print_report(stage_results)
+    report = {
+        'count': args.count,
+        'compact': args.compact,
+        'stages': {result.name: result.to_dict() for result in stage_results},
+    }
+    for path in (args.output, args.write_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+    failed = False
+    if any(result.failures for result in stage_results):
+        print('\nSome messages failed to process, so these results do not reflect a successful ingest!')
+        failed = True
+    if baseline is not None:
+        regressions = compare_to_baseline(
+            stage_results, baseline, tolerance=args.tolerance, api_call_tolerance=args.api_call_tolerance
+        )
+        if regressions:
+            print('\nRegressed past the baseline:')
+            for regression in regressions:
+                print(f'  {regression}')
+            failed = True
+        else:
+            print('\nNo regression past the baseline')
+    sys.exit(1 if failed else 0)
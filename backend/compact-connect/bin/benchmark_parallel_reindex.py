@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare a full reindex of the provider search indices, as the populate provider documents lambda runs
+# it, sequentially by compact against a parallel scan of the provider table, entirely against moto.
+#
+# OpenSearch is replaced with a local stand-in, which accepts every document after a simulated bulk request latency, so
+# the comparison reflects the time each mode spends waiting on OpenSearch, as well as DynamoDB.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_parallel_reindex.py --providers-per-compact 500 --segments 8 --bulk-latency 0.2
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# We have to do some set-up before we can import everything we need
+# Add the common and search lambda runtimes to our pythonpath
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+sys.path.append(os.path.join('lambdas', 'python', 'search'))
+
+with open('cdk.json') as context_file:
+    _context = json.load(context_file)['context']
+
+# Every AWS call made here is served by moto, so none of these names refer to real resources
+os.environ.update(
+    {
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'AWS_SECURITY_TOKEN': 'testing',
+        'AWS_SESSION_TOKEN': 'testing',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'AWS_REGION': 'us-east-1',
+        'ENVIRONMENT_NAME': 'test',
+        'PROVIDER_TABLE_NAME': 'benchmark-provider-table',
+        'PROV_DATE_OF_UPDATE_INDEX_NAME': 'providerDateOfUpdate',
+        'OPENSEARCH_HOST_ENDPOINT': 'benchmark-opensearch.example.com',
+        'COMPACTS': json.dumps(_context['compacts']),
+        'JURISDICTIONS': json.dumps(_context['jurisdictions']),
+        'LICENSE_TYPES': json.dumps(_context['license_types']),
+        'POWERTOOLS_METRICS_DISABLED': 'true',
+    }
+)
+
+import boto3  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+
+class LocalOpenSearchStandIn:
+    """Accepts every bulk request after a fixed latency, counting the documents indexed"""
+
+    latency_seconds = 0.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents_indexed = 0
+
+    def bulk_index(self, *, index_name: str, documents: list[dict]) -> dict:  # noqa: ARG002 unused-argument
+        time.sleep(self.latency_seconds)
+        with self._lock:
+            self.documents_indexed += len(documents)
+        return {'items': [], 'errors': False}
+
+
+def build_provider_table():
+    boto3.resource('dynamodb').create_table(
+        AttributeDefinitions=[
+            {'AttributeName': 'pk', 'AttributeType': 'S'},
+            {'AttributeName': 'sk', 'AttributeType': 'S'},
+            {'AttributeName': 'providerDateOfUpdate', 'AttributeType': 'S'},
+        ],
+        TableName=os.environ['PROVIDER_TABLE_NAME'],
+        KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+        BillingMode='PAY_PER_REQUEST',
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': os.environ['PROV_DATE_OF_UPDATE_INDEX_NAME'],
+                'KeySchema': [
+                    {'AttributeName': 'sk', 'KeyType': 'HASH'},
+                    {'AttributeName': 'providerDateOfUpdate', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            },
+        ],
+    )
+
+
+def put_providers(compacts: list[str], providers_per_compact: int):
+    """Put the given count of providers, each with one license, in each compact"""
+    from common_test.test_data_generator import TestDataGenerator
+
+    for compact_index, compact in enumerate(compacts):
+        license_type = _context['license_types'][compact][0]['name']
+        for i in range(providers_per_compact):
+            provider_id = f'00000000-0000-0000-{compact_index:04d}-{i:012d}'
+            TestDataGenerator.put_default_provider_record_in_provider_table(
+                value_overrides={'compact': compact, 'providerId': provider_id}
+            )
+            TestDataGenerator.put_default_license_record_in_provider_table(
+                value_overrides={'compact': compact, 'providerId': provider_id, 'licenseType': license_type}
+            )
+
+
+def run_reindex(event: dict) -> tuple[float, int, int]:
+    """Run the reindex to completion, over as many invocations as it takes
+
+    :return: The elapsed seconds, the count of documents indexed and the count of invocations
+    """
+    from handlers.populate_provider_documents import populate_provider_documents
+
+    stand_in = LocalOpenSearchStandIn()
+    context = MagicMock()
+    # Plenty of time, so each invocation runs to completion
+    context.get_remaining_time_in_millis.return_value = 15 * 60 * 1000
+    invocations = 0
+    with patch('handlers.populate_provider_documents.OpenSearchClient', return_value=stand_in):
+        start = time.perf_counter()
+        while True:
+            invocations += 1
+            result = populate_provider_documents(event, context)
+            if result['completed']:
+                break
+            event = result['resumeFrom']
+        elapsed = time.perf_counter() - start
+    return elapsed, stand_in.documents_indexed, invocations
+
+
+def report(label: str, elapsed: float, documents_indexed: int, invocations: int):
+    print(
+        f'{label:>12}: {elapsed:>8,.2f} s, {documents_indexed / elapsed:>10,.1f} providers/sec, '
+        f'{documents_indexed:,} providers indexed in {invocations} invocation(s)'
+    )
+
+
+if __name__ == '__main__':
+    from argparse import ArgumentParser
+
+    from cc_common.config import logger
+
+    logging.basicConfig()
+    # The lambda logs every bulk request, which would drown out the results
+    logger.setLevel(logging.WARNING)
+
+    parser = ArgumentParser(description='Compare sequential and parallel reindex time')
+    parser.add_argument(
+        '--providers-per-compact', help='The count of providers in each compact, default: 500', default=500, type=int
+    )
+    parser.add_argument('--segments', help='The count of parallel scan segments, default: 8', default=8, type=int)
+    parser.add_argument(
+        '--bulk-latency',
+        help='Simulated latency of each OpenSearch bulk request, in seconds, default: 0.2',
+        default=0.2,
+        type=float,
+    )
+    args = parser.parse_args()
+
+    LocalOpenSearchStandIn.latency_seconds = args.bulk_latency
+    compacts = _context['compacts']
+    with mock_aws():
+        build_provider_table()
+        put_providers(compacts, args.providers_per_compact)
+        print(f'{len(compacts) * args.providers_per_compact:,} providers across {len(compacts)} compacts')
+
+        sequential = run_reindex({})
+        report('sequential', *sequential)
+        parallel = run_reindex({'parallel': True, 'totalSegments': args.segments})
+        report('parallel', *parallel)
+    print(f'{"speedup":>12}: {sequential[0] / parallel[0]:.1f}x')
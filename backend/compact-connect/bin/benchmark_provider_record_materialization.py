@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare the latency and memory of ProviderUserRecords converting each type of record to data
+# classes only when it is first accessed, against converting every record up front, as it used to, for a provider
+# with a large update history.
+#
+# Each access pattern is measured from construction, for a caller that only reads the provider's main records (like
+# the state API or encumbrance listeners), and for one that builds the full API response.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_provider_record_materialization.py --privileges 40 --updates-per-privilege 100
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+# The provider partition generator, along with the set-up needed to import our runtime code, lives with the
+# ProviderUserRecords benchmark
+sys.path.append(os.path.dirname(__file__))
+
+from benchmark_provider_user_records import generate_provider_records  # noqa: E402
+from cc_common.data_model.provider_record_util import ProviderUserRecords  # noqa: E402
+
+
+class EagerProviderUserRecords(ProviderUserRecords):
+    """ProviderUserRecords, with every type of record converted to data classes on construction"""
+
+    def __init__(self, provider_records):
+        super().__init__(provider_records)
+        for records in (
+            self._privilege_records,
+            self._license_records,
+            self._adverse_action_records,
+            self._investigation_records,
+            self._provider_records,
+            self._provider_update_records,
+            self._military_affiliation_records,
+            self._license_update_records,
+            self._privilege_update_records,
+        ):
+            len(records)
+
+
+def read_main_records(provider_user_records: ProviderUserRecords) -> None:
+    provider_user_records.get_provider_record()
+    provider_user_records.get_license_records()
+    provider_user_records.get_privilege_records()
+
+
+def build_api_response(provider_user_records: ProviderUserRecords) -> None:
+    provider_user_records.generate_api_response_object()
+
+
+def benchmark(
+    label: str,
+    records_class: type[ProviderUserRecords],
+    access: Callable[[ProviderUserRecords], None],
+    records: list[dict],
+    repeat: int,
+) -> float:
+    """
+    Time constructing ProviderUserRecords and accessing it, returning the best of `repeat` runs, in seconds. Memory
+    is traced separately, since tracing slows everything down.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        access(records_class(records))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    provider_user_records = records_class(records)
+    access(provider_user_records)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:>24}: {best * 1000:>8,.1f} ms, {retained / 1024:>8,.0f} KiB retained, {peak / 1024:>8,.0f} KiB peak')
+    return best
+
+
+if __name__ == '__main__':
+    import logging
+    from argparse import ArgumentParser
+
+    logging.basicConfig()
+
+    parser = ArgumentParser(description='Compare lazy and eager provider record materialization')
+    parser.add_argument(
+        '--privileges', help='The count of privileges the provider holds, default: 40', default=40, type=int
+    )
+    parser.add_argument(
+        '--updates-per-privilege',
+        help='The count of update records for each privilege, default: 100',
+        default=100,
+        type=int,
+    )
+    parser.add_argument('--repeat', help='Number of timed runs of each access, default: 5', default=5, type=int)
+    args = parser.parse_args()
+
+    provider_records = generate_provider_records(
+        privilege_count=args.privileges, updates_per_privilege=args.updates_per_privilege
+    )
+    print(f'Synthetic provider with {len(provider_records):,} records')
+
+    for access_label, access_func in (('main records', read_main_records), ('API response', build_api_response)):
+        print(f'{access_label}:')
+        eager_time = benchmark('eager', EagerProviderUserRecords, access_func, provider_records, args.repeat)
+        lazy_time = benchmark('lazy', ProviderUserRecords, access_func, provider_records, args.repeat)
+        print(f'{"speedup":>24}: {eager_time / lazy_time:.1f}x')
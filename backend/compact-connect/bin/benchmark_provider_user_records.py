@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare the cost of building a provider details API response from ProviderUserRecords, using its
+# per-license and per-privilege indexes, against scanning every record of a type for each license and privilege, as
+# ProviderUserRecords used to.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_provider_user_records.py --privileges 40 --updates-per-privilege 100
+import json
+import os
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+# We have to do some set-up before we can import everything we need
+# Add the common lambda runtime to our pythonpath
+sys.path.append(os.path.join('lambdas', 'python', 'common'))
+
+with open('cdk.json') as context_file:
+    _context = json.load(context_file)['context']
+os.environ['COMPACTS'] = json.dumps(_context['compacts'])
+os.environ['JURISDICTIONS'] = json.dumps(_context['jurisdictions'])
+os.environ['LICENSE_TYPES'] = json.dumps(_context['license_types'])
+# The environment name has no bearing on this benchmark, but we need a value to be set for the data model to work.
+os.environ['ENVIRONMENT_NAME'] = 'test'
+
+from cc_common.data_model.provider_record_util import ProviderUserRecords  # noqa: E402
+from cc_common.data_model.schema.adverse_action import AdverseActionData  # noqa: E402
+from cc_common.data_model.schema.common import AdverseActionAgainstEnum  # noqa: E402
+from cc_common.data_model.schema.investigation import InvestigationData  # noqa: E402
+from cc_common.data_model.schema.privilege import PrivilegeUpdateData  # noqa: E402
+from common_test.test_constants import DEFAULT_LICENSE_JURISDICTION  # noqa: E402
+from common_test.test_data_generator import TestDataGenerator  # noqa: E402
+
+
+class LinearScanProviderUserRecords(ProviderUserRecords):
+    """ProviderUserRecords, with the per-license and per-privilege lookups scanning every record of a type"""
+
+    def get_adverse_action_records_for_license(
+        self,
+        license_jurisdiction: str,
+        license_type_abbreviation: str,
+        filter_condition: Callable[[AdverseActionData], bool] | None = None,
+    ) -> list[AdverseActionData]:
+        return [
+            record
+            for record in self._adverse_action_records
+            if record.actionAgainst == AdverseActionAgainstEnum.LICENSE
+            and record.jurisdiction == license_jurisdiction
+            and record.licenseTypeAbbreviation == license_type_abbreviation
+            and (filter_condition is None or filter_condition(record))
+        ]
+
+    def get_adverse_action_records_for_privilege(
+        self,
+        privilege_jurisdiction: str,
+        privilege_license_type_abbreviation: str,
+        filter_condition: Callable[[AdverseActionData], bool] | None = None,
+    ) -> list[AdverseActionData]:
+        return [
+            record
+            for record in self._adverse_action_records
+            if record.actionAgainst == AdverseActionAgainstEnum.PRIVILEGE
+            and record.jurisdiction == privilege_jurisdiction
+            and record.licenseTypeAbbreviation == privilege_license_type_abbreviation
+            and (filter_condition is None or filter_condition(record))
+        ]
+
+    def get_investigation_records_for_privilege(
+        self,
+        privilege_jurisdiction: str,
+        privilege_license_type_abbreviation: str,
+        filter_condition: Callable[[InvestigationData], bool] | None = None,
+        include_closed: bool = False,
+    ) -> list[InvestigationData]:
+        return [
+            record
+            for record in self._investigation_records
+            if record.investigationAgainst == 'privilege'
+            and record.jurisdiction == privilege_jurisdiction
+            and record.licenseTypeAbbreviation == privilege_license_type_abbreviation
+            and (include_closed or record.closeDate is None)
+            and (filter_condition is None or filter_condition(record))
+        ]
+
+    def get_investigation_records_for_license(
+        self,
+        license_jurisdiction: str,
+        license_type_abbreviation: str,
+        filter_condition: Callable[[InvestigationData], bool] | None = None,
+        include_closed: bool = False,
+    ) -> list[InvestigationData]:
+        return [
+            record
+            for record in self._investigation_records
+            if record.investigationAgainst == 'license'
+            and record.jurisdiction == license_jurisdiction
+            and record.licenseTypeAbbreviation == license_type_abbreviation
+            and (include_closed or record.closeDate is None)
+            and (filter_condition is None or filter_condition(record))
+        ]
+
+    def get_update_records_for_privilege(
+        self,
+        jurisdiction: str,
+        license_type: str,
+        filter_condition: Callable[[PrivilegeUpdateData], bool] | None = None,
+    ) -> list[PrivilegeUpdateData]:
+        return [
+            record
+            for record in self._privilege_update_records
+            if record.jurisdiction == jurisdiction
+            and record.licenseType == license_type
+            and (filter_condition is None or filter_condition(record))
+        ]
+
+
+def generate_provider_records(*, privilege_count: int, updates_per_privilege: int) -> list[dict]:
+    """
+    Generate the database records of a synthetic provider with one license, `privilege_count` privileges in different
+    jurisdictions and `updates_per_privilege` update records, an adverse action and an investigation for each
+    privilege.
+    """
+    privilege_jurisdictions = [
+        jurisdiction for jurisdiction in _context['jurisdictions'] if jurisdiction != DEFAULT_LICENSE_JURISDICTION
+    ]
+    if privilege_count > len(privilege_jurisdictions):
+        raise ValueError(f'There are only {len(privilege_jurisdictions)} jurisdictions to hold privileges in')
+    privilege_jurisdictions = privilege_jurisdictions[:privilege_count]
+
+    records = [
+        TestDataGenerator.generate_default_provider(
+            value_overrides={'privilegeJurisdictions': set(privilege_jurisdictions)}
+        ).serialize_to_database_record(),
+        TestDataGenerator.generate_default_license().serialize_to_database_record(),
+    ]
+    base_update_date = datetime.fromisoformat('2024-01-01T00:00:00+00:00')
+    for jurisdiction in privilege_jurisdictions:
+        privilege = TestDataGenerator.generate_default_privilege(value_overrides={'jurisdiction': jurisdiction})
+        records.append(privilege.serialize_to_database_record())
+        records.append(
+            TestDataGenerator.generate_default_adverse_action(
+                value_overrides={'jurisdiction': jurisdiction}
+            ).serialize_to_database_record()
+        )
+        records.append(
+            TestDataGenerator.generate_default_investigation(
+                value_overrides={'jurisdiction': jurisdiction}
+            ).serialize_to_database_record()
+        )
+        for i in range(updates_per_privilege):
+            update_date = base_update_date + timedelta(hours=i)
+            records.append(
+                TestDataGenerator.generate_default_privilege_update(
+                    value_overrides={
+                        'jurisdiction': jurisdiction,
+                        'updateType': 'renewal',
+                        'createDate': update_date,
+                        'effectiveDate': update_date,
+                    },
+                    previous_privilege=privilege,
+                ).serialize_to_database_record()
+            )
+    return records
+
+
+def benchmark(label: str, records_class: type[ProviderUserRecords], records: list[dict], repeat: int) -> float:
+    """Time building an API response from a provider's records, returning the best of `repeat` runs, in seconds"""
+    provider_user_records = records_class(records)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        provider_user_records.generate_api_response_object()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:>20}: {best * 1000:>10,.1f} ms per API response')
+    return best
+
+
+if __name__ == '__main__':
+    import logging
+    from argparse import ArgumentParser
+
+    logging.basicConfig()
+
+    parser = ArgumentParser(description='Compare provider details API response building time')
+    parser.add_argument(
+        '--privileges', help='The count of privileges the provider holds, default: 40', default=40, type=int
+    )
+    parser.add_argument(
+        '--updates-per-privilege',
+        help='The count of update records for each privilege, default: 100',
+        default=100,
+        type=int,
+    )
+    parser.add_argument('--repeat', help='Number of timed runs of each lookup, default: 5', default=5, type=int)
+    args = parser.parse_args()
+
+    provider_records = generate_provider_records(
+        privilege_count=args.privileges, updates_per_privilege=args.updates_per_privilege
+    )
+    print(f'Synthetic provider with {len(provider_records):,} records')
+
+    linear_time = benchmark('linear scan', LinearScanProviderUserRecords, provider_records, args.repeat)
+    indexed_time = benchmark('indexed', ProviderUserRecords, provider_records, args.repeat)
+    print(f'{"speedup":>20}: {linear_time / indexed_time:.1f}x')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# ruff: noqa: T201 we use print statements for local scripts
+# Quick script to compare the cost of loading a large provider partition's records into data classes with full schema
+# validation, against the trusted loading ProviderUserRecords uses for records read from the provider table.
+#
+# Run from 'backend/compact-connect' like:
+# bin/benchmark_trusted_load.py --privileges 40 --updates-per-privilege 100
+import os
+import sys
+import time
+
+# The provider partition generator, along with the set-up needed to import our runtime code, lives with the
+# ProviderUserRecords benchmark
+sys.path.append(os.path.dirname(__file__))
+
+from benchmark_provider_user_records import generate_provider_records  # noqa: E402
+from cc_common.data_model.provider_record_util import PROVIDER_RECORD_DATA_CLASSES  # noqa: E402
+
+
+def benchmark(label: str, records: list[dict], *, trusted: bool, repeat: int) -> float:
+    """Time loading every record into its data class, returning the best of `repeat` runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            PROVIDER_RECORD_DATA_CLASSES[record['type']].from_database_record(record, trusted=trusted)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:>20}: {best * 1000:>10,.1f} ms per provider, {best * 1_000_000 / len(records):>8,.1f} us per record')
+    return best
+
+
+if __name__ == '__main__':
+    import logging
+    from argparse import ArgumentParser
+
+    logging.basicConfig()
+
+    parser = ArgumentParser(description='Compare validated and trusted database record loading time')
+    parser.add_argument(
+        '--privileges', help='The count of privileges the provider holds, default: 40', default=40, type=int
+    )
+    parser.add_argument(
+        '--updates-per-privilege',
+        help='The count of update records for each privilege, default: 100',
+        default=100,
+        type=int,
+    )
+    parser.add_argument('--repeat', help='Number of timed runs of each load, default: 5', default=5, type=int)
+    args = parser.parse_args()
+
+    provider_records = generate_provider_records(
+        privilege_count=args.privileges, updates_per_privilege=args.updates_per_privilege
+    )
+    print(f'Synthetic provider with {len(provider_records):,} records')
+
+    validated_time = benchmark('validated', provider_records, trusted=False, repeat=args.repeat)
+    trusted_time = benchmark('trusted', provider_records, trusted=True, repeat=args.repeat)
+    print(f'{"speedup":>20}: {validated_time / trusted_time:.1f}x')
@@ -1,8 +1,11 @@
 import json
 import logging
 import os
+from collections.abc import Mapping
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta, timezone
 from functools import cached_property
+from types import MappingProxyType
 
 import boto3
 from aws_lambda_powertools import Metrics
@@ -18,6 +21,56 @@ logger.setLevel(logging.DEBUG if os.environ.get('DEBUG', 'false').lower() == 'tr
 metrics = Metrics(namespace='compact-connect', service='common')
 
 
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    The compacts, jurisdictions and license types we are deployed with, parsed from the environment once, along with
+    the lookups derived from them. Every collection is immutable, so the snapshot can be shared by all callers.
+    """
+
+    compacts: tuple[str, ...]
+    jurisdictions: tuple[str, ...]
+    compact_set: frozenset[str]
+    jurisdiction_set: frozenset[str]
+    # {compact: (license type name, ...)}
+    license_types: Mapping[str, tuple[str, ...]]
+    # {compact: {license type name: abbreviation}}
+    license_type_abbreviations: Mapping[str, Mapping[str, str]]
+    # {compact: {lower-cased abbreviation: license type name}}
+    license_type_names: Mapping[str, Mapping[str, str]]
+
+    @classmethod
+    def from_environment(cls) -> 'ConfigSnapshot':
+        compacts = tuple(json.loads(os.environ['COMPACTS']))
+        jurisdictions = tuple(json.loads(os.environ['JURISDICTIONS']))
+        # Some lambdas, like the staff user lambdas, are not deployed with license types, since they don't use them
+        raw_license_types = json.loads(os.environ.get('LICENSE_TYPES', '{}'))
+        return cls(
+            compacts=compacts,
+            jurisdictions=jurisdictions,
+            compact_set=frozenset(compacts),
+            jurisdiction_set=frozenset(jurisdictions),
+            license_types=MappingProxyType(
+                {
+                    compact: tuple(lt['name'] for lt in license_types)
+                    for compact, license_types in raw_license_types.items()
+                }
+            ),
+            license_type_abbreviations=MappingProxyType(
+                {
+                    compact: MappingProxyType({lt['name']: lt['abbreviation'] for lt in license_types})
+                    for compact, license_types in raw_license_types.items()
+                }
+            ),
+            license_type_names=MappingProxyType(
+                {
+                    compact: MappingProxyType({lt['abbreviation'].lower(): lt['name'] for lt in license_types})
+                    for compact, license_types in raw_license_types.items()
+                }
+            ),
+        )
+
+
 class _Config:
     presigned_post_ttl_seconds = 3600
     default_page_size = 100
@@ -36,21 +89,82 @@ class _Config:
         """
         return os.environ['OPENSEARCH_HOST_ENDPOINT']
 
+    @property
+    def boto_max_pool_connections(self):
+        """
+        Number of connections each AWS client keeps in its pool, which bounds how many calls it can make concurrently
+        """
+        return int(os.environ.get('BOTO_MAX_POOL_CONNECTIONS', '50'))
+
+    @cached_property
+    def boto_session(self):
+        """
+        The boto3 session that every AWS client and resource we use is created from, so that credentials and
+        endpoints are only resolved once per container
+        """
+        return boto3.Session()
+
+    @cached_property
+    def boto_config(self):
+        """
+        Client configuration shared by every AWS client we create. Connections are kept alive between invocations of
+        a warm container.
+        """
+        return BotoConfig(
+            max_pool_connections=self.boto_max_pool_connections,
+            tcp_keepalive=True,
+            # The standard retry mode only makes 3 attempts by default. DynamoDB clients had 10 attempts in the legacy
+            # mode they used before, which we keep, so that throttling under concurrent writes is retried through,
+            # rather than surfacing as failures.
+            retries={'mode': 'standard', 'total_max_attempts': 10},
+        )
+
+    def _client(self, service_name: str, client_config: BotoConfig | None = None):
+        """
+        Create a client from the shared session, with any of the shared client configuration overridden by
+        client_config
+        """
+        client_config = self.boto_config if client_config is None else self.boto_config.merge(client_config)
+        return self.boto_session.client(service_name, config=client_config)
+
+    @cached_property
+    def dynamodb_resource(self):
+        """
+        The DynamoDB resource every table handle is created from.
+        """
+        return self.boto_session.resource('dynamodb', config=self.boto_config)
+
+    @cached_property
+    def _tables(self) -> dict:
+        return {}
+
+    def _table(self, table_name: str):
+        """
+        Get a handle on a DynamoDB table, which is only created the first time it is requested
+        """
+        try:
+            return self._tables[table_name]
+        except KeyError:
+            table = self._tables[table_name] = self.dynamodb_resource.Table(table_name)
+            return table
+
     @cached_property
     def cognito_client(self):
-        return boto3.client('cognito-idp')
+        return self._client('cognito-idp')
 
     @cached_property
     def users_table(self):
-        return boto3.resource('dynamodb').Table(self.users_table_name)
+        return self.dynamodb_resource.Table(self.users_table_name)
 
     @cached_property
     def s3_client(self):
-        return boto3.client('s3', config=BotoConfig(signature_version='s3v4'))
+        return self._client('s3', BotoConfig(signature_version='s3v4'))
 
     @cached_property
     def dynamodb_client(self):
-        return boto3.client('dynamodb')
+        # The resource's client converts between Python and DynamoDB types for the table handles, so it can't be
+        # shared for low-level calls
+        return self._client('dynamodb')
 
     @cached_property
     def data_client(self):
@@ -72,15 +186,32 @@ class _Config:
 
     @cached_property
     def compact_configuration_table(self):
-        return boto3.resource('dynamodb').Table(self.compact_configuration_table_name)
+        return self.dynamodb_resource.Table(self.compact_configuration_table_name)
 
     @cached_property
     def secrets_manager_client(self):
-        return boto3.client('secretsmanager')
+        return self._client('secretsmanager')
 
     @cached_property
     def events_client(self):
-        return boto3.client('events', config=BotoConfig(retries={'mode': 'standard'}))
+        return self._client('events')
+
+    @cached_property
+    def sqs_resource(self):
+        """
+        The SQS resource every queue handle is created from. Its client is shared with sqs_client.
+        """
+        # Size the connection pool so that every concurrent sender can hold its own connection
+        return self.boto_session.resource(
+            'sqs',
+            config=self.boto_config.merge(
+                BotoConfig(
+                    max_pool_connections=max(
+                        self.boto_max_pool_connections, self.license_preprocessing_queue_send_concurrency
+                    )
+                )
+            ),
+        )
 
     @cached_property
     def license_preprocessing_queue(self):
@@ -88,23 +219,101 @@ class _Config:
         Returns the SQS Queue resource for the license preprocessing queue.
         This allows for using the Queue's methods directly like send_messages.
         """
-        return boto3.resource('sqs').Queue(self.license_preprocessing_queue_url)
+        return self.sqs_resource.Queue(self.license_preprocessing_queue_url)
 
     @cached_property
     def license_preprocessing_queue_url(self):
         return os.environ['LICENSE_PREPROCESSING_QUEUE_URL']
 
+    @property
+    def license_preprocessing_queue_send_concurrency(self):
+        """
+        Number of batches of license messages that may be sent to the preprocessing queue concurrently
+        """
+        return int(os.environ.get('LICENSE_PREPROCESSING_QUEUE_SEND_CONCURRENCY', '8'))
+
+    @cached_property
+    def sqs_client(self):
+        return self.sqs_resource.meta.client
+
+    @property
+    def batch_get_concurrency(self):
+        """
+        Number of DynamoDB BatchGetItem requests a batch get may make concurrently
+        """
+        return int(os.environ.get('BATCH_GET_CONCURRENCY', '4'))
+
+    @property
+    def transaction_write_concurrency(self):
+        """
+        Number of independent DynamoDB transactions a transaction write plan may commit concurrently
+        """
+        return int(os.environ.get('TRANSACTION_WRITE_CONCURRENCY', '4'))
+
+    @property
+    def search_document_concurrency(self):
+        """
+        Number of provider search documents the search ingest handler may build concurrently
+        """
+        return int(os.environ.get('SEARCH_DOCUMENT_CONCURRENCY', '8'))
+
+    @property
+    def privilege_number_block_size(self):
+        """
+        Count of privilege numbers a container reserves from a compact's privilege counter at a time, which it then
+        hands out itself. One reserves a number for each privilege, as they are issued.
+        """
+        return max(1, int(os.environ.get('PRIVILEGE_NUMBER_BLOCK_SIZE', '1')))
+
+    @property
+    def bulk_upload_shard_size_bytes(self):
+        """
+        Bulk upload files larger than this are split into shards of about this size, which are processed concurrently.
+        Zero disables sharding.
+        """
+        return int(os.environ.get('BULK_UPLOAD_SHARD_SIZE_BYTES', '0'))
+
+    @property
+    def bulk_upload_max_decompressed_bytes(self):
+        """
+        Compressed bulk upload files may not decompress to more than this. Uploads are limited to ~30MB, which is ~200k
+        licenses uncompressed, so this default allows for ~2M licenses.
+        """
+        return int(os.environ.get('BULK_UPLOAD_MAX_DECOMPRESSED_BYTES', '300000000'))
+
+    @cached_property
+    def bulk_upload_shard_queue(self):
+        """
+        Returns the SQS Queue resource for the queue of bulk upload shards waiting to be processed.
+        """
+        return self.sqs_resource.Queue(self.bulk_upload_shard_queue_url)
+
+    @cached_property
+    def bulk_upload_shard_queue_url(self):
+        return os.environ['BULK_UPLOAD_SHARD_QUEUE_URL']
+
+    @property
+    def bulk_upload_shard_table_name(self):
+        return os.environ['BULK_UPLOAD_SHARD_TABLE_NAME']
+
+    @property
+    def bulk_upload_shard_table(self):
+        """
+        Records which shards of each sharded bulk upload file have been processed
+        """
+        return self._table(self.bulk_upload_shard_table_name)
+
     @cached_property
     def event_bus_name(self):
         return os.environ['EVENT_BUS_NAME']
 
     @cached_property
     def provider_table(self):
-        return boto3.resource('dynamodb').Table(self.provider_table_name)
+        return self.dynamodb_resource.Table(self.provider_table_name)
 
     @cached_property
     def ssn_table(self):
-        return boto3.resource('dynamodb').Table(self.ssn_table_name)
+        return self.dynamodb_resource.Table(self.ssn_table_name)
 
     @property
     def compact_configuration_table_name(self):
@@ -114,13 +323,31 @@ class _Config:
     def environment_name(self):
         return os.environ['ENVIRONMENT_NAME']
 
+    @cached_property
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        The compacts, jurisdictions and license types we are deployed with, parsed once per container. Call
+        reload_snapshot after changing the environment to parse them again.
+        """
+        return ConfigSnapshot.from_environment()
+
+    def reload_snapshot(self) -> ConfigSnapshot:
+        self.__dict__.pop('snapshot', None)
+        return self.snapshot
+
     @property
     def compacts(self):
-        return json.loads(os.environ['COMPACTS'])
+        return list(self.snapshot.compacts)
 
     @property
     def jurisdictions(self):
-        return json.loads(os.environ['JURISDICTIONS'])
+        return list(self.snapshot.jurisdictions)
+
+    def is_valid_compact(self, compact: str) -> bool:
+        return compact in self.snapshot.compact_set
+
+    def is_valid_jurisdiction(self, jurisdiction: str) -> bool:
+        return jurisdiction in self.snapshot.jurisdiction_set
 
     @property
     def license_types(self):
@@ -138,8 +365,7 @@ class _Config:
             "aslp": ["audiologist", "speech-language pathologist"]
         }
         """
-        raw_license_types = json.loads(os.environ['LICENSE_TYPES'])
-        return {compact: [lt['name'] for lt in license_types] for compact, license_types in raw_license_types.items()}
+        return {compact: list(license_types) for compact, license_types in self.snapshot.license_types.items()}
 
     @property
     def license_type_abbreviations(self):
@@ -153,17 +379,31 @@ class _Config:
             }
         }
         """
-        raw_license_types = json.loads(os.environ['LICENSE_TYPES'])
         return {
-            compact: {lt['name']: lt['abbreviation'] for lt in license_types}
-            for compact, license_types in raw_license_types.items()
+            compact: dict(abbreviations) for compact, abbreviations in self.snapshot.license_type_abbreviations.items()
         }
 
     def license_types_for_compact(self, compact):
-        return self.license_types[compact]
+        return list(self.snapshot.license_types[compact])
 
     def license_type_abbreviations_for_compact(self, compact):
-        return self.license_type_abbreviations[compact]
+        return dict(self.snapshot.license_type_abbreviations[compact])
+
+    def license_type_abbreviation(self, compact: str, license_type: str) -> str | None:
+        """
+        Look up the abbreviation of a license type, by its full name.
+
+        :return: The abbreviation, or None if the compact has no such license type
+        """
+        return self.snapshot.license_type_abbreviations.get(compact, {}).get(license_type)
+
+    def license_type_name(self, compact: str, abbreviation: str) -> str | None:
+        """
+        Look up the full name of a license type, by its abbreviation, ignoring case.
+
+        :return: The license type name, or None if the compact has no such license type
+        """
+        return self.snapshot.license_type_names.get(compact, {}).get(abbreviation.lower())
 
     @property
     def provider_table_name(self):
@@ -181,6 +421,22 @@ class _Config:
     def date_of_update_index_name(self):
         return os.environ['PROV_DATE_OF_UPDATE_INDEX_NAME']
 
+    @property
+    def provider_gsi_sharded_reads(self):
+        """
+        Whether provider listings are read from the sharded provider GSIs, rather than the single-partition GSIs.
+        This is only enabled once existing provider records have been backfilled with their shard key.
+        """
+        return os.environ.get('PROVIDER_GSI_SHARDED_READS', 'false').lower() == 'true'
+
+    @property
+    def fam_giv_mid_sharded_index_name(self):
+        return os.environ['PROV_FAM_GIV_MID_SHARDED_INDEX_NAME']
+
+    @property
+    def date_of_update_sharded_index_name(self):
+        return os.environ['PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME']
+
     @property
     def license_gsi_name(self):
         return os.environ['LICENSE_GSI_NAME']
@@ -251,7 +507,7 @@ class _Config:
 
     @cached_property
     def data_events_table(self):
-        return boto3.resource('dynamodb').Table(self.data_events_table_name)
+        return self.dynamodb_resource.Table(self.data_events_table_name)
 
     @property
     def data_events_table_name(self):
@@ -292,13 +548,17 @@ class _Config:
     def export_results_bucket_name(self):
         return os.environ['EXPORT_RESULTS_BUCKET_NAME']
 
+    @property
+    def privilege_export_job_lambda_name(self):
+        return os.environ['PRIVILEGE_EXPORT_JOB_LAMBDA_NAME']
+
     @property
     def transaction_history_table_name(self):
         return os.environ['TRANSACTION_HISTORY_TABLE_NAME']
 
     @property
     def transaction_history_table(self):
-        return boto3.resource('dynamodb').Table(self.transaction_history_table_name)
+        return self._table(self.transaction_history_table_name)
 
     @property
     def rate_limiting_table_name(self):
@@ -306,7 +566,7 @@ class _Config:
 
     @property
     def rate_limiting_table(self):
-        return boto3.resource('dynamodb').Table(self.rate_limiting_table_name)
+        return self._table(self.rate_limiting_table_name)
 
     @property
     def event_state_table_name(self):
@@ -314,7 +574,7 @@ class _Config:
 
     @property
     def event_state_table(self):
-        return boto3.resource('dynamodb').Table(self.event_state_table_name)
+        return self._table(self.event_state_table_name)
 
     @cached_property
     def event_state_client(self):
@@ -328,7 +588,7 @@ class _Config:
 
     @cached_property
     def lambda_client(self):
-        return boto3.client('lambda')
+        return self._client('lambda')
 
     @property
     def email_notification_service_lambda_name(self):
@@ -0,0 +1,124 @@
+import random
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from cc_common.config import logger
+
+# DynamoDB's hard limit on the number of keys in a single BatchGetItem call
+MAX_BATCH_GET_KEYS = 100
+
+
+@dataclass
+class BatchGetResult:
+    """
+    The outcome of a batch get.
+
+    :param items: The items that were found
+    :param unprocessed_keys: The keys DynamoDB still had not processed once retries were exhausted, which may or may
+        not exist. Keys that were processed, but do not exist in the table, are in neither list.
+    """
+
+    items: list[dict] = field(default_factory=list)
+    unprocessed_keys: list[dict] = field(default_factory=list)
+
+
+def batch_get_items(
+    table,
+    keys: Iterable[dict],
+    *,
+    consistent_read: bool = False,
+    projection: Iterable[str] | None = None,
+    max_workers: int = 4,
+    max_attempts: int = 5,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> BatchGetResult:
+    """
+    Get many items from a table by their keys, with BatchGetItem.
+
+    Keys are split into batches of up to 100, the BatchGetItem limit, and batches are requested concurrently by a
+    bounded pool of threads. Any keys DynamoDB leaves unprocessed are requested again after a decorrelated jitter
+    backoff, so that throttled callers do not all retry in lockstep. Keys that are still unprocessed after
+    `max_attempts` requests are returned in the result for the caller to handle, rather than raised.
+
+    :param table: The boto3 DynamoDB Table resource to read from
+    :param keys: The primary keys of the items to get. Duplicate keys are only requested once.
+    :param consistent_read: Whether to use strongly consistent reads
+    :param projection: The attributes to read, or None to read every attribute
+    :param max_workers: Maximum number of batches to request concurrently
+    :param max_attempts: Maximum number of requests for any one key
+    :param base_delay: The shortest backoff before retrying unprocessed keys, in seconds
+    :param max_delay: The longest backoff before retrying unprocessed keys, in seconds
+    :param sleep: Function to back off with, for testing
+    :return: The items found, and any keys left unprocessed
+    """
+    # BatchGetItem rejects requests with duplicate keys
+    unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+    if not unique_keys:
+        return BatchGetResult()
+
+    request_options = {'ConsistentRead': consistent_read}
+    if projection is not None:
+        # Placeholders are used for every attribute, since several of our attribute names are reserved words
+        attributes = list(projection)
+        request_options['ProjectionExpression'] = ', '.join(f'#{attribute}' for attribute in attributes)
+        request_options['ExpressionAttributeNames'] = {f'#{attribute}': attribute for attribute in attributes}
+
+    batches = [unique_keys[i : i + MAX_BATCH_GET_KEYS] for i in range(0, len(unique_keys), MAX_BATCH_GET_KEYS)]
+
+    def get_batch(batch_keys: list[dict]) -> BatchGetResult:
+        return _get_batch(
+            table,
+            batch_keys,
+            request_options,
+            max_attempts=max_attempts,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            sleep=sleep,
+        )
+
+    result = BatchGetResult()
+    if len(batches) == 1:
+        batch_results = [get_batch(batches[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            batch_results = list(executor.map(get_batch, batches))
+    for batch_result in batch_results:
+        result.items.extend(batch_result.items)
+        result.unprocessed_keys.extend(batch_result.unprocessed_keys)
+
+    if result.unprocessed_keys:
+        logger.warning(
+            'Keys left unprocessed after retries', table=table.table_name, count=len(result.unprocessed_keys)
+        )
+    return result
+
+
+def _get_batch(
+    table,
+    keys: list[dict],
+    request_options: dict,
+    *,
+    max_attempts: int,
+    base_delay: float,
+    max_delay: float,
+    sleep: Callable[[float], None],
+) -> BatchGetResult:
+    result = BatchGetResult()
+    delay = base_delay
+    for attempt in range(1, max_attempts + 1):
+        response = table.meta.client.batch_get_item(RequestItems={table.table_name: {'Keys': keys, **request_options}})
+        result.items.extend(response.get('Responses', {}).get(table.table_name, []))
+
+        keys = response.get('UnprocessedKeys', {}).get(table.table_name, {}).get('Keys', [])
+        if not keys or attempt == max_attempts:
+            break
+        # Decorrelated jitter: each delay is random, between the base delay and three times the previous delay
+        delay = min(max_delay, random.uniform(base_delay, delay * 3))  # noqa: S311 not used for cryptography
+        sleep(delay)
+
+    result.unprocessed_keys = keys
+    return result
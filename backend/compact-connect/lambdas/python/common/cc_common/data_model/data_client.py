@@ -1,7 +1,9 @@
 import time
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from datetime import time as dtime
+from threading import Lock
 from urllib.parse import quote
 from uuid import UUID, uuid4
 
@@ -11,6 +13,8 @@ from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 
 from cc_common.config import _Config, config, logger, metrics
+from cc_common.data_model.batch_get import BatchGetResult, batch_get_items
+from cc_common.data_model.provider_read_profile import ProviderReadProfile, get_provider_query_projection
 from cc_common.data_model.provider_record_util import (
     ProviderRecordType,
     ProviderRecordUtility,
@@ -43,6 +47,8 @@ from cc_common.data_model.schema.military_affiliation.record import MilitaryAffi
 from cc_common.data_model.schema.privilege import PrivilegeData, PrivilegeUpdateData
 from cc_common.data_model.schema.privilege.record import PrivilegeUpdateRecordSchema
 from cc_common.data_model.schema.provider import ProviderData, ProviderUpdateData
+from cc_common.data_model.schema.provider.record import PROVIDER_GSI_SHARD_COUNT, provider_gsi_pk
+from cc_common.data_model.transaction_planner import TransactionWritePlanner
 from cc_common.data_model.update_tier_enum import UpdateTierEnum
 from cc_common.exceptions import (
     CCAwsServiceException,
@@ -57,6 +63,11 @@ from cc_common.utils import logger_inject_kwargs
 MAX_DYNAMODB_TRANSACTION_ITEMS = 100
 
 
+def _provider_gsi_shard_count() -> int:
+    """The number of shards to scatter provider listing queries across, or 0 while sharded reads are not enabled"""
+    return PROVIDER_GSI_SHARD_COUNT if config.provider_gsi_sharded_reads else 0
+
+
 @dataclass
 class SsnCorrectionMigrationResult:
     """
@@ -75,12 +86,32 @@ class SsnCorrectionMigrationResult:
     old_provider_registered_email: str | None = None
 
 
+@dataclass
+class ProviderPartitionScanPage:
+    """
+    The provider partitions completed by one page of a segmented scan of the provider table.
+
+    :param partitions: The main records (provider, licenses, privileges, etc.) of each provider partition completed by
+        this page, as raw records, keyed by the partition's pk
+    :param last_key: The key to resume the segment's scan after these partitions, or None once the segment is finished
+    :param read_at: When the earliest scan request that read any of these partitions' records was sent, in epoch
+        seconds. The scan is strongly consistent, so the partitions reflect every write made before then.
+    """
+
+    partitions: dict[str, list[dict]]
+    last_key: dict | None
+    read_at: float
+
+
 class DataClient:
     """Client interface for license data dynamodb queries"""
 
     def __init__(self, config: _Config):
         self.config = config
         self.ssn_index_record_schema = SSNIndexRecordSchema()
+        # Blocks of privilege numbers this container has reserved, by compact, as (next number, last number)
+        self._privilege_number_blocks: dict[str, tuple[int, int]] = {}
+        self._privilege_number_lock = Lock()
 
     @logger_inject_kwargs(logger, 'compact')
     def get_or_create_provider_id(self, *, compact: str, ssn: str) -> str:
@@ -180,6 +211,7 @@ class DataClient:
         dynamo_pagination: dict,
         detail: bool = True,
         consistent_read: bool = False,
+        read_profile: ProviderReadProfile | None = None,
     ) -> list[dict]:
         logger.info('Getting provider')
         if detail:
@@ -188,7 +220,7 @@ class DataClient:
             sk_condition = Key('sk').eq(f'{compact}#PROVIDER')
 
         resp = self.config.provider_table.query(
-            Select='ALL_ATTRIBUTES',
+            **get_provider_query_projection(read_profile),
             KeyConditionExpression=Key('pk').eq(f'{compact}#PROVIDER#{provider_id}') & sk_condition,
             ConsistentRead=consistent_read,
             **dynamo_pagination,
@@ -206,7 +238,22 @@ class DataClient:
         provider_id: UUID,
         consistent_read: bool = True,
         include_update_tier: UpdateTierEnum | None = None,
+        read_profile: ProviderReadProfile | None = None,
+        trusted: bool = True,
     ) -> ProviderUserRecords:
+        """
+        Get all the records of a provider's partition.
+
+        :param compact: The compact name
+        :param provider_id: The provider ID
+        :param consistent_read: Whether to use strongly consistent reads
+        :param include_update_tier: Also include update records up to this tier
+        :param read_profile: Only read the attributes this profile needs, rather than every attribute. The records
+            returned are partial, so must not be written back to the table.
+        :param trusted: Load the records without validating them against their schemas. Paths that need to detect
+            records that do not match their schema must pass False, in which case every record is validated up front.
+        :raises CCNotFoundException: If the provider is not found
+        """
         logger.info('Getting provider')
 
         # Determine SK condition based on include_update_tier parameter
@@ -228,7 +275,7 @@ class DataClient:
             pagination = {'ExclusiveStartKey': last_evaluated_key} if last_evaluated_key else {}
 
             query_resp = self.config.provider_table.query(
-                Select='ALL_ATTRIBUTES',
+                **get_provider_query_projection(read_profile),
                 KeyConditionExpression=Key('pk').eq(f'{compact}#PROVIDER#{provider_id}') & sk_condition,
                 ConsistentRead=consistent_read,
                 **pagination,
@@ -242,9 +289,11 @@ class DataClient:
         if not resp['Items']:
             raise CCNotFoundException('Provider not found')
 
-        return ProviderUserRecords(resp['Items'])
+        return ProviderUserRecords(resp['Items'], trusted=trusted)
 
-    @paginated_query(set_query_limit_to_match_page_size=False)
+    @paginated_query(
+        set_query_limit_to_match_page_size=False, shard_count=_provider_gsi_shard_count, sort_key='providerFamGivMid'
+    )
     @logger_inject_kwargs(logger, 'compact', 'jurisdiction')
     def get_providers_sorted_by_family_name(
         self,
@@ -255,6 +304,7 @@ class DataClient:
         jurisdiction: str | None = None,
         scan_forward: bool = True,
         exclude_providers_without_privileges: bool = False,
+        shard: int | None = None,
     ):
         logger.info('Getting providers by family name')
         # provider_name is PII, so it is only logged at DEBUG level
@@ -271,7 +321,12 @@ class DataClient:
                 name_value += f'{quote(provider_name[1].lower())}#'
 
         # Set key condition to query by
-        key_condition = Key('sk').eq(f'{compact}#PROVIDER')
+        if shard is None:
+            index_name = config.fam_giv_mid_index_name
+            key_condition = Key('sk').eq(f'{compact}#PROVIDER')
+        else:
+            index_name = config.fam_giv_mid_sharded_index_name
+            key_condition = Key('providerGSIPK').eq(provider_gsi_pk(compact, shard))
         if name_value is not None:
             key_condition = key_condition & Key('providerFamGivMid').begins_with(name_value)
 
@@ -292,7 +347,7 @@ class DataClient:
                 filter_expression = privilege_filter
 
         return config.provider_table.query(
-            IndexName=config.fam_giv_mid_index_name,
+            IndexName=index_name,
             Select='ALL_ATTRIBUTES',
             KeyConditionExpression=key_condition,
             ScanIndexForward=scan_forward,
@@ -300,7 +355,9 @@ class DataClient:
             **dynamo_pagination,
         )
 
-    @paginated_query(set_query_limit_to_match_page_size=False)
+    @paginated_query(
+        set_query_limit_to_match_page_size=False, shard_count=_provider_gsi_shard_count, sort_key='providerDateOfUpdate'
+    )
     @logger_inject_kwargs(logger, 'compact', 'jurisdiction')
     def get_providers_sorted_by_updated(
         self,
@@ -313,6 +370,7 @@ class DataClient:
         only_providers_with_privileges_in_jurisdiction: bool = False,
         start_date_time: str | None = None,
         end_date_time: str | None = None,
+        shard: int | None = None,
     ):
         logger.info('Getting providers by date updated')
 
@@ -338,7 +396,12 @@ class DataClient:
                     filter_expression = jurisdiction_condition
 
         # Build key condition expression with optional date range
-        key_condition = Key('sk').eq(f'{compact}#PROVIDER')
+        if shard is None:
+            index_name = config.date_of_update_index_name
+            key_condition = Key('sk').eq(f'{compact}#PROVIDER')
+        else:
+            index_name = config.date_of_update_sharded_index_name
+            key_condition = Key('providerGSIPK').eq(provider_gsi_pk(compact, shard))
 
         # Add date range conditions if provided
         if start_date_time is not None and end_date_time is not None:
@@ -349,7 +412,7 @@ class DataClient:
             key_condition = key_condition & Key('providerDateOfUpdate').lte(end_date_time)
 
         return config.provider_table.query(
-            IndexName=config.date_of_update_index_name,
+            IndexName=index_name,
             Select='ALL_ATTRIBUTES',
             KeyConditionExpression=key_condition,
             ScanIndexForward=scan_forward,
@@ -357,6 +420,42 @@ class DataClient:
             **dynamo_pagination,
         )
 
+    @logger_inject_kwargs(logger, 'compact')
+    def count_providers(self, *, compact: str) -> int:
+        """
+        Count the providers in a compact, from the top-level provider records in the provider date of update GSI, or
+        in every shard of its sharded equivalent, once sharded reads are enabled.
+
+        :param compact: The compact to count the providers of
+        :return: The number of providers
+        """
+        logger.info('Counting providers')
+        if config.provider_gsi_sharded_reads:
+            index_name = config.date_of_update_sharded_index_name
+            key_conditions = [
+                Key('providerGSIPK').eq(provider_gsi_pk(compact, shard)) for shard in range(PROVIDER_GSI_SHARD_COUNT)
+            ]
+        else:
+            index_name = config.date_of_update_index_name
+            key_conditions = [Key('sk').eq(f'{compact}#PROVIDER')]
+
+        provider_count = 0
+        for key_condition in key_conditions:
+            last_key = None
+            while True:
+                pagination = {'ExclusiveStartKey': last_key} if last_key else {}
+                response = config.provider_table.query(
+                    IndexName=index_name,
+                    Select='COUNT',
+                    KeyConditionExpression=key_condition,
+                    **pagination,
+                )
+                provider_count += response['Count']
+                last_key = response.get('LastEvaluatedKey')
+                if last_key is None:
+                    break
+        return provider_count
+
     def _generate_privilege_record(
         self,
         compact: str,
@@ -371,7 +470,7 @@ class DataClient:
     ) -> PrivilegeData:
         current_datetime = config.current_standard_datetime
         try:
-            license_type_abbreviation = self.config.license_type_abbreviations[compact][license_type]
+            license_type_abbreviation = self.config.snapshot.license_type_abbreviations[compact][license_type]
         except KeyError as e:
             # This shouldn't happen, since license type comes from a validated record, but we'll check
             # anyway, in case of miss-configuration.
@@ -1114,69 +1213,139 @@ class DataClient:
             military_status=military_status.value,
         )
 
-    @logger_inject_kwargs(logger, 'compact', 'provider_ids')
-    def batch_get_providers_by_id(self, compact: str, provider_ids: list[str]) -> list[dict]:
+    def scan_provider_partitions(
+        self,
+        *,
+        segment: int,
+        total_segments: int,
+        exclusive_start_key: dict | None = None,
+        page_size: int = 1000,
+        read_profile: ProviderReadProfile | None = None,
+    ) -> Iterator[ProviderPartitionScanPage]:
         """
-        Get provider records by their IDs in batches.
-
-        :param compact: The compact name
-        :param provider_ids: List of provider IDs to fetch
-        :return: List of provider records
+        Scan one segment of a parallel scan of the provider table, assembling the main records of each provider
+        partition as they are read.
+
+        A partition's records are always within one segment, and are read in order, so a partition is complete once
+        the scan reaches a different partition, without querying each partition again. Because a partition can span
+        scan pages, the last partition of a page is only yielded with the page that completes it. Each page's
+        last_key is the key of the last record of its last completed partition, so resuming from it never skips a
+        partition that was not yielded.
+
+        The scan is strongly consistent, so that each page reflects every write made before its read_at.
+
+        :param segment: The segment to scan
+        :param total_segments: The number of segments the table is split into
+        :param exclusive_start_key: The last_key of a previous page, to resume the segment after it
+        :param page_size: The number of records to read per scan page
+        :param read_profile: Only read the attributes this profile needs, rather than every attribute
+        :return: A page for each scan page, the last of which has no last_key
         """
-        providers = []
-        # DynamoDB batch_get_item has a limit of 100 items per request
-        batch_size = 100
-
-        # Process provider IDs in batches
-        for i in range(0, len(provider_ids), batch_size):
-            batch_ids = provider_ids[i : i + batch_size]
-            request_items = {
-                self.config.provider_table.table_name: {
-                    'Keys': [
-                        {'pk': f'{compact}#PROVIDER#{provider_id}', 'sk': f'{compact}#PROVIDER'}
-                        for provider_id in batch_ids
-                    ],
-                    'ConsistentRead': True,
-                }
-            }
-
-            response = self.config.provider_table.meta.client.batch_get_item(RequestItems=request_items)
-
-            # Add the returned items to our results
-            if response['Responses']:
-                providers.extend(response['Responses'][self.config.provider_table.table_name])
-
-            # Handle any unprocessed keys by retrying with exponential backoff
-            retry_attempts = 0
-            max_retries = 3
-            base_sleep_time = 0.5  # 50ms initial sleep
-
-            while response.get('UnprocessedKeys') and retry_attempts <= max_retries:
-                # Calculate exponential backoff sleep time
-                sleep_time = min(base_sleep_time * (2**retry_attempts), 5)  # Cap at 5 seconds
-                time.sleep(sleep_time)
+        projection = get_provider_query_projection(read_profile)
+        # Only the main records of provider partitions, whose sort keys are '{compact}#PROVIDER...', are needed.
+        # Update records and the privilege counters are filtered out.
+        scan_parameters = {
+            **projection,
+            'FilterExpression': 'contains(#sk, :providerSortKey)',
+            'ExpressionAttributeNames': {**projection.get('ExpressionAttributeNames', {}), '#sk': 'sk'},
+            'ExpressionAttributeValues': {':providerSortKey': '#PROVIDER'},
+            'Segment': segment,
+            'TotalSegments': total_segments,
+            'Limit': page_size,
+            'ConsistentRead': True,
+        }
 
-                response = self.config.provider_table.meta.client.batch_get_item(
-                    RequestItems=response['UnprocessedKeys']
-                )
-                if response['Responses']:
-                    providers.extend(response['Responses'][self.config.provider_table.table_name])
+        # Where the next scan page starts, and where a later scan could safely resume from
+        scan_key = exclusive_start_key
+        resume_key = exclusive_start_key
+        # The partition the scan is currently in, which may continue on the next page, and when it started to be read
+        pending_pk = None
+        pending_records = []
+        pending_read_at = None
+        while True:
+            pagination = {'ExclusiveStartKey': scan_key} if scan_key else {}
+            request_read_at = time.time()
+            response = self.config.provider_table.scan(**scan_parameters, **pagination)
+
+            partitions = {}
+            # A partition carried over from an earlier page started to be read by an earlier request
+            page_read_at = request_read_at if pending_read_at is None else pending_read_at
+            for record in response.get('Items', []):
+                if record['pk'] != pending_pk:
+                    if pending_pk is not None:
+                        partitions[pending_pk] = pending_records
+                        resume_key = {'pk': pending_records[-1]['pk'], 'sk': pending_records[-1]['sk']}
+                    pending_pk = record['pk']
+                    pending_records = []
+                    pending_read_at = request_read_at
+                pending_records.append(record)
+
+            scan_key = response.get('LastEvaluatedKey')
+            if scan_key is None:
+                if pending_pk is not None:
+                    partitions[pending_pk] = pending_records
+                yield ProviderPartitionScanPage(partitions=partitions, last_key=None, read_at=page_read_at)
+                return
+            if pending_pk is None:
+                # No provider records have been read yet, so there is nothing to re-read on resumption
+                resume_key = scan_key
+            yield ProviderPartitionScanPage(partitions=partitions, last_key=resume_key, read_at=page_read_at)
 
-                retry_attempts += 1
+    @logger_inject_kwargs(logger, 'compact', 'provider_ids')
+    def batch_get_providers_by_id(
+        self, compact: str, provider_ids: Iterable[str], *, projection: Iterable[str] | None = None
+    ) -> BatchGetResult:
+        """
+        Get provider records by their IDs in batches.
 
-            if response.get('UnprocessedKeys'):
-                # this is unlikely to happen, but if it does, we log it and continue
-                logger.error('Failed to fetch all provider records', unprocessed_keys=response['UnprocessedKeys'])
+        Note that providers that do not exist are silently omitted from the results, and providers that DynamoDB could
+        not read, even after retries, are returned as unprocessed keys.
 
-        return providers
+        :param compact: The compact name
+        :param provider_ids: The IDs of the providers to fetch
+        :param projection: The attributes of each provider record to read, or None to read every attribute
+        :return: The provider records found, and the keys of any providers left unprocessed
+        """
+        return batch_get_items(
+            self.config.provider_table,
+            ({'pk': f'{compact}#PROVIDER#{provider_id}', 'sk': f'{compact}#PROVIDER'} for provider_id in provider_ids),
+            consistent_read=True,
+            projection=projection,
+            max_workers=self.config.batch_get_concurrency,
+        )
 
     @logger_inject_kwargs(logger, 'compact')
     def claim_privilege_number(self, compact: str) -> int:
         """
-        Claim a unique privilege number for a compact by atomically incrementing the privilege counter.
-        If the counter doesn't exist yet, it will be created with an initial value of 1.
+        Claim a unique privilege number for a compact.
+
+        Privilege numbers are reserved from the compact's privilege counter in blocks of
+        config.privilege_number_block_size, so that concurrent purchases do not all contend for the counter. This
+        container hands out the numbers of its block until it runs out, then reserves another.
+
+        Numbers are unique, but, with a block size over one, are not issued in order across containers, and any numbers
+        left in a block when its container is shut down are never issued, leaving gaps. As with a purchase that fails
+        after claiming its number, gaps in the privilege numbers are acceptable.
+        """
+        with self._privilege_number_lock:
+            next_number, last_number = self._privilege_number_blocks.get(compact, (1, 0))
+            if next_number > last_number:
+                block_size = self.config.privilege_number_block_size
+                last_number = self._reserve_privilege_numbers(compact=compact, count=block_size)
+                next_number = last_number - block_size + 1
+            self._privilege_number_blocks[compact] = (next_number + 1, last_number)
+
+        logger.info('Claimed privilege number', privilege_count=next_number)
+        return next_number
+
+    def _reserve_privilege_numbers(self, *, compact: str, count: int) -> int:
+        """
+        Reserve a block of privilege numbers by atomically incrementing the compact's privilege counter.
+        If the counter doesn't exist yet, it will be created with an initial value of count.
+
+        :return: The last number of the reserved block
         """
-        logger.info('Claiming privilege number')
+        logger.info('Reserving privilege numbers', count=count)
         resp = self.config.provider_table.update_item(
             Key={
                 'pk': f'{compact}#PRIVILEGE_COUNT',
@@ -1187,13 +1356,11 @@ class DataClient:
                 '#count': 'privilegeCount',
             },
             ExpressionAttributeValues={
-                ':increment': 1,
+                ':increment': count,
             },
             ReturnValues='UPDATED_NEW',
         )
-        privilege_count = resp['Attributes']['privilegeCount']
-        logger.info('Claimed privilege number', privilege_count=privilege_count)
-        return privilege_count
+        return int(resp['Attributes']['privilegeCount'])
 
     @logger_inject_kwargs(logger, 'compact', 'provider_id')
     def get_provider_top_level_record(self, *, compact: str, provider_id: str) -> ProviderData:
@@ -1399,7 +1566,7 @@ class DataClient:
             if not last_evaluated_key:
                 break
 
-        return [PrivilegeUpdateData.from_database_record(item) for item in response_items]
+        return [PrivilegeUpdateData.from_database_record(item, trusted=True) for item in response_items]
 
     @logger_inject_kwargs(logger, 'compact', 'provider_id', 'detail', 'jurisdiction', 'license_type_abbr')
     def get_privilege_data(
@@ -2639,7 +2806,7 @@ class DataClient:
         top_level_provider_record: ProviderData,
         selected_jurisdiction: str,
         all_active_privileges: list[PrivilegeData],
-        all_transaction_items: list[dict],
+        planner: TransactionWritePlanner,
     ) -> None:
         # Get provider record update transaction items for jurisdiction with no valid license
         provider_transaction_items = self._get_provider_record_transaction_items_for_jurisdiction_with_no_known_license(
@@ -2648,13 +2815,14 @@ class DataClient:
             provider_record=top_level_provider_record,
             selected_jurisdiction=selected_jurisdiction,
         )
-        all_transaction_items.extend(provider_transaction_items)
+        provider_group_id = planner.add_group(provider_transaction_items)
 
-        # Get privilege deactivation transaction items
-        privilege_transaction_items = self._get_privilege_deactivation_transaction_items_for_jurisdiction_change(
+        # Get privilege deactivation transaction items, which are only committed once the provider record is updated
+        privilege_transaction_groups = self._get_privilege_deactivation_transaction_items_for_jurisdiction_change(
             compact=compact, provider_id=provider_id, privileges=all_active_privileges
         )
-        all_transaction_items.extend(privilege_transaction_items)
+        for privilege_transaction_items in privilege_transaction_groups:
+            planner.add_group(privilege_transaction_items, after=[provider_group_id])
 
     @logger_inject_kwargs(logger, 'compact', 'provider_id', 'selected_jurisdiction')
     def update_provider_home_state_jurisdiction(
@@ -2720,8 +2888,9 @@ class DataClient:
             logger.info('No active privileges found for user. Proceeding with provider update')
 
         try:
-            # Collect all transaction items
-            all_transaction_items = []
+            # Plan all transaction items, in groups that must each be committed together. The provider record is
+            # updated first, and no privilege is changed unless it succeeds.
+            planner = self._get_transaction_planner()
 
             # Check if provider has any licenses in the new jurisdiction
             if not new_home_state_licenses:
@@ -2733,7 +2902,7 @@ class DataClient:
                     top_level_provider_record=top_level_provider_record,
                     selected_jurisdiction=selected_jurisdiction,
                     all_active_privileges=all_active_privileges,
-                    all_transaction_items=all_transaction_items,
+                    planner=planner,
                 )
             else:
                 # Check if the selected jurisdiction is live in the compact configuration
@@ -2756,7 +2925,7 @@ class DataClient:
                         top_level_provider_record=top_level_provider_record,
                         selected_jurisdiction=selected_jurisdiction,
                         all_active_privileges=all_active_privileges,
-                        all_transaction_items=all_transaction_items,
+                        planner=planner,
                     )
                 else:
                     # Find the best license in the selected jurisdiction
@@ -2775,7 +2944,7 @@ class DataClient:
                             selected_jurisdiction=selected_jurisdiction,
                         )
                     )
-                    all_transaction_items.extend(provider_transaction_items)
+                    provider_group_id = planner.add_group(provider_transaction_items)
 
                     # Get licenses from the current home state
                     current_home_state_licenses = provider_user_records.get_license_records(
@@ -2834,7 +3003,7 @@ class DataClient:
                             continue
 
                         # Get transaction items for privileges that can be moved to a license in the new jurisdiction
-                        privilege_transaction_items = (
+                        privilege_transaction_groups = (
                             self._get_privilege_transaction_items_resulting_from_home_jurisdiction_move(
                                 compact=compact,
                                 provider_id=provider_id,
@@ -2843,10 +3012,11 @@ class DataClient:
                                 license_type=license_type,
                             )
                         )
-                        all_transaction_items.extend(privilege_transaction_items)
+                        for privilege_transaction_items in privilege_transaction_groups:
+                            planner.add_group(privilege_transaction_items, after=[provider_group_id])
 
             # Execute all transactions in batches
-            self._execute_batched_transactions(all_transaction_items)
+            self._execute_transaction_plan(planner)
 
             # Return the previous home jurisdiction
             return home_jurisdiction_before_update
@@ -3073,19 +3243,32 @@ class DataClient:
             # replay window to reason about. The fence's dateOfUpdate condition failing rolls the whole
             # transaction back and raises for SQS retry.
             self._log_ssn_migration_transaction_items('single-atomic-transaction', all_transaction_items)
-            self._execute_batched_transactions(all_transaction_items)
+            planner = self._get_transaction_planner()
+            planner.add_group(all_transaction_items)
+            self._execute_transaction_plan(planner)
         else:
             # Large migration: the operations cannot fit in a single atomic transaction, so run them as
-            # replay-safe phases. The final group is a single atomic transaction (<= 3 items) that can never
-            # split across a batch boundary, so the old provider record and target license are always torn
-            # down together. The fence's dateOfUpdate condition failing raises for SQS retry; the retry
-            # re-reads current state and takes the now-correct branch.
+            # replay-safe phases, each ordered after the one before. The final group is a single atomic group
+            # (<= 3 items) that can never split across transactions, so the old provider record and target
+            # license are always torn down together. The fence's dateOfUpdate condition failing raises for SQS
+            # retry; the retry re-reads current state and takes the now-correct branch.
+            planner = self._get_transaction_planner()
             self._log_ssn_migration_transaction_items('create', create_transaction_items)
-            self._execute_batched_transactions(create_transaction_items)
+            create_group_ids = planner.add_items(create_transaction_items)
             self._log_ssn_migration_transaction_items('delete', delete_transaction_items)
-            self._execute_batched_transactions(delete_transaction_items)
+            # Unlike the creates, the deletes are chained, so they commit in order and stop at the first failure.
+            # Committing them concurrently could delete a privilege while its history records survive a failed
+            # transaction, which a replay would not recognize as part of the migration and would refuse to move.
+            delete_group_ids = []
+            for delete_transaction_item in delete_transaction_items:
+                delete_group_ids.append(
+                    planner.add_group(
+                        [delete_transaction_item], after=delete_group_ids[-1:] if delete_group_ids else create_group_ids
+                    )
+                )
             self._log_ssn_migration_transaction_items('final', final_transaction_items)
-            self._execute_batched_transactions(final_transaction_items)
+            planner.add_group(final_transaction_items, after=[*create_group_ids, *delete_group_ids])
+            self._execute_transaction_plan(planner)
 
         return SsnCorrectionMigrationResult(
             migration_performed=True,
@@ -3358,44 +3541,23 @@ class DataClient:
                 privilege_records=[privilege_data.to_dict() for privilege_data in rekeyed_privileges],
             )
 
-    def _execute_batched_transactions(self, transaction_items: list[dict]) -> None:
-        """
-        Execute transaction items in batches of 100 (DynamoDB limit).
+    def _get_transaction_planner(self) -> TransactionWritePlanner:
+        return TransactionWritePlanner(
+            self.config.dynamodb_client,
+            max_workers=self.config.transaction_write_concurrency,
+            max_transaction_items=MAX_DYNAMODB_TRANSACTION_ITEMS,
+        )
 
-        :param transaction_items: List of transaction items to execute
-        :raises CCInternalException: If any transaction batch fails
+    def _execute_transaction_plan(self, planner: TransactionWritePlanner) -> None:
         """
-        if not transaction_items:
-            logger.info('No transaction items to execute')
-            return
-
-        logger.info('Executing batched transactions', total_items=len(transaction_items))
+        Execute every transaction of a plan.
 
-        batch_size = MAX_DYNAMODB_TRANSACTION_ITEMS
-        processed_batches = []
-
-        try:
-            # Process transactions in batches
-            for i in range(0, len(transaction_items), batch_size):
-                batch = transaction_items[i : i + batch_size]
-                logger.info(
-                    'Executing transaction batch',
-                    batch_number=len(processed_batches) + 1,
-                    batch_size=len(batch),
-                    total_batches=(len(transaction_items) + batch_size - 1) // batch_size,
-                )
-
-                self.config.dynamodb_client.transact_write_items(TransactItems=batch)
-                processed_batches.append(batch)
-
-        except Exception as e:
-            logger.error(
-                'Transaction batch failed',
-                failed_batch_number=len(processed_batches) + 1,
-                total_processed_batches=len(processed_batches),
-                error=str(e),
-            )
-            raise CCInternalException(f'Transaction batch failed: {str(e)}') from e
+        :param planner: The planner holding the transaction items
+        :raises CCInternalException: If any transaction fails
+        """
+        result = planner.execute()
+        if not result.succeeded:
+            raise CCInternalException(f'Transaction batch failed: {str(result.error)}') from result.error
 
     def _get_privilege_transaction_items_resulting_from_home_jurisdiction_move(
         self,
@@ -3405,7 +3567,7 @@ class DataClient:
         provider_user_records: ProviderUserRecords,
         selected_jurisdiction: str,
         license_type: str,
-    ) -> list[dict]:
+    ) -> list[list[dict]]:
         """
         Get transaction items for privileges that are affected by moving to a new jurisdiction.
 
@@ -3419,7 +3581,7 @@ class DataClient:
         :param provider_user_records: Collection of records for provider, including privileges and licenses
         :param selected_jurisdiction: The jurisdiction the provider has selected through the api.
         :param license_type: The license type to check
-        :return: List of transaction items
+        :return: The transaction items for each affected privilege, which must be committed together
         """
         # Get privileges for this license type that were not previously deactivated
         privileges_for_license_type = [
@@ -3557,20 +3719,16 @@ class DataClient:
         compact: str,
         provider_id: str,
         privileges: list[PrivilegeData],
-    ) -> list[dict]:
+    ) -> list[list[dict]]:
         """
         Get transaction items for deactivating privileges when changing to a jurisdiction where they can't be valid.
 
-        Note: This method is designed to handle up to 50 privileges in a single transaction.
-        We don't anticipate a system with more than 50 jurisdictions for the foreseeable future,
-        so this limit is sufficient.
-        If the system grows beyond 50 jurisdictions, this method will need to be enhanced to
-        process multiple transactions with proper rollback handling.
+        Each privilege's update record and deactivation are grouped, so that one is never committed without the other.
 
         :param compact: The compact name
         :param provider_id: The provider ID
         :param privileges: The list of privileges to deactivate
-        :return: List of transaction items
+        :return: The transaction items for each privilege, which must be committed together
         """
         if not privileges:
             logger.info(
@@ -3611,33 +3769,33 @@ class DataClient:
                 }
             )
 
-            # Add update record to transaction
+            serialized_update_record = privilege_update_record.serialize_to_database_record()
             transactions.append(
-                {
-                    'Put': {
-                        'TableName': self.config.provider_table_name,
-                        'Item': TypeSerializer().serialize(privilege_update_record.serialize_to_database_record())['M'],
-                    }
-                }
-            )
-
-            # Update privilege record
-            transactions.append(
-                {
-                    'Update': {
-                        'TableName': self.config.provider_table_name,
-                        'Key': {
-                            'pk': {'S': privilege.serialize_to_database_record()['pk']},
-                            'sk': {'S': privilege.serialize_to_database_record()['sk']},
-                        },
-                        'UpdateExpression': 'SET homeJurisdictionChangeStatus = :homeJurisdictionChangeStatus,'
-                        'dateOfUpdate = :dateOfUpdate',
-                        'ExpressionAttributeValues': {
-                            ':homeJurisdictionChangeStatus': {'S': HomeJurisdictionChangeStatusEnum.INACTIVE},
-                            ':dateOfUpdate': {'S': self.config.current_standard_datetime.isoformat()},
-                        },
-                    }
-                }
+                [
+                    # Add update record to transaction
+                    {
+                        'Put': {
+                            'TableName': self.config.provider_table_name,
+                            'Item': TypeSerializer().serialize(serialized_update_record)['M'],
+                        }
+                    },
+                    # Update privilege record
+                    {
+                        'Update': {
+                            'TableName': self.config.provider_table_name,
+                            'Key': {
+                                'pk': {'S': privilege.serialize_to_database_record()['pk']},
+                                'sk': {'S': privilege.serialize_to_database_record()['sk']},
+                            },
+                            'UpdateExpression': 'SET homeJurisdictionChangeStatus = :homeJurisdictionChangeStatus,'
+                            'dateOfUpdate = :dateOfUpdate',
+                            'ExpressionAttributeValues': {
+                                ':homeJurisdictionChangeStatus': {'S': HomeJurisdictionChangeStatusEnum.INACTIVE},
+                                ':dateOfUpdate': {'S': self.config.current_standard_datetime.isoformat()},
+                            },
+                        }
+                    },
+                ]
             )
 
         return transactions
@@ -3721,20 +3879,17 @@ class DataClient:
         provider_id: str,
         privileges: list[PrivilegeData],
         new_license: LicenseData,
-    ) -> list[dict]:
+    ) -> list[list[dict]]:
         """
         Get transaction items for updating privileges when changing to a jurisdiction with a valid license.
 
-        Note: This method is designed to handle up to 50 privileges in a single transaction.
-        The current system supports a maximum of 50 jurisdictions, so this limit is sufficient.
-        If the system grows beyond 50 jurisdictions, this method will need to be enhanced to
-        process multiple transactions with proper rollback handling.
+        Each privilege's update record and update are grouped, so that one is never committed without the other.
 
         :param compact: The compact name
         :param provider_id: The provider ID
         :param privileges: The list of privileges to update
         :param new_license: The license in the new jurisdiction
-        :return: List of transaction items
+        :return: The transaction items for each privilege, which must be committed together
         """
         if not privileges:
             logger.info(
@@ -3830,16 +3985,6 @@ class DataClient:
                 }
             )
 
-            # Add update record to transaction
-            transactions.append(
-                {
-                    'Put': {
-                        'TableName': self.config.provider_table_name,
-                        'Item': TypeSerializer().serialize(privilege_update_record.serialize_to_database_record())['M'],
-                    }
-                }
-            )
-
             # Update privilege record
             set_clauses = [
                 'licenseJurisdiction = :licenseJurisdiction',
@@ -3860,19 +4005,29 @@ class DataClient:
             update_expression = 'SET ' + ', '.join(set_clauses)
 
             serialized_privilege_record = privilege.serialize_to_database_record()
+            serialized_update_record = privilege_update_record.serialize_to_database_record()
 
             transactions.append(
-                {
-                    'Update': {
-                        'TableName': self.config.provider_table_name,
-                        'Key': {
-                            'pk': {'S': serialized_privilege_record['pk']},
-                            'sk': {'S': serialized_privilege_record['sk']},
-                        },
-                        'UpdateExpression': update_expression,
-                        'ExpressionAttributeValues': expression_values,
-                    }
-                }
+                [
+                    # Add update record to transaction
+                    {
+                        'Put': {
+                            'TableName': self.config.provider_table_name,
+                            'Item': TypeSerializer().serialize(serialized_update_record)['M'],
+                        }
+                    },
+                    {
+                        'Update': {
+                            'TableName': self.config.provider_table_name,
+                            'Key': {
+                                'pk': {'S': serialized_privilege_record['pk']},
+                                'sk': {'S': serialized_privilege_record['sk']},
+                            },
+                            'UpdateExpression': update_expression,
+                            'ExpressionAttributeValues': expression_values,
+                        }
+                    },
+                ]
             )
 
         return transactions
@@ -3951,8 +4106,9 @@ class DataClient:
             'adverseActionId': adverse_action_id,
         }
 
-        # Build transaction items for all privileges
-        transaction_items = []
+        # Plan a transaction group for each privilege, so that a privilege's update record is always committed with
+        # the change it records
+        planner = self._get_transaction_planner()
 
         # The time selected here is somewhat arbitrary; however, we want this selection to not alter the date
         # displayed for a user when it is transformed back to their timezone. We selected noon UTC-4:00 so that
@@ -4004,15 +4160,16 @@ class DataClient:
                 }
             ).serialize_to_database_record()
 
-            # Add PUT transaction for privilege update record
-            transaction_items.append(self._generate_put_transaction_item(privilege_update_record))
-
-            # Add UPDATE transaction for privilege encumbered status
-            transaction_items.append(
-                self._generate_set_privilege_encumbered_status_item(
-                    privilege_data=privilege_data,
-                    privilege_encumbered_status=PrivilegeEncumberedStatusEnum.LICENSE_ENCUMBERED,
-                )
+            planner.add_group(
+                [
+                    # PUT transaction for privilege update record
+                    self._generate_put_transaction_item(privilege_update_record),
+                    # UPDATE transaction for privilege encumbered status
+                    self._generate_set_privilege_encumbered_status_item(
+                        privilege_data=privilege_data,
+                        privilege_encumbered_status=PrivilegeEncumberedStatusEnum.LICENSE_ENCUMBERED,
+                    ),
+                ]
             )
 
         for encumbered_privilege in previously_encumbered_privileges_associated_with_license:
@@ -4056,21 +4213,13 @@ class DataClient:
                 }
             ).serialize_to_database_record()
 
-            # Add PUT transaction for privilege update record
-            transaction_items.append(self._generate_put_transaction_item(privilege_update_record))
+            # PUT transaction for privilege update record
+            planner.add_group([self._generate_put_transaction_item(privilege_update_record)])
 
-        # Execute transactions in batches of 100 (DynamoDB limit)
-        batch_size = 100
-        while transaction_items:
-            batch = transaction_items[:batch_size]
-            transaction_items = transaction_items[batch_size:]
-
-            try:
-                self.config.dynamodb_client.transact_write_items(TransactItems=batch)
-                logger.info('Successfully processed privilege encumbrance batch', batch_size=len(batch))
-            except ClientError as e:
-                logger.error('Failed to process privilege encumbrance batch', error=str(e))
-                raise CCAwsServiceException('Failed to encumber privileges for license') from e
+        result = planner.execute()
+        if not result.succeeded:
+            logger.error('Failed to process privilege encumbrance transactions', error=str(result.error))
+            raise CCAwsServiceException('Failed to encumber privileges for license') from result.error
 
         logger.info('Successfully encumbered associated privileges for license')
 
@@ -4148,8 +4297,9 @@ class DataClient:
             logger.error(message)
             raise CCInternalException(message)
 
-        # Build transaction items for all privileges
-        transaction_items = []
+        # Plan a transaction group for each privilege, so that a privilege's update record is always committed with
+        # the change it records
+        planner = self._get_transaction_planner()
 
         # The time selected here is somewhat arbitrary; however, we want this selection to not alter the date
         # displayed for a user when it is transformed back to their timezone. We selected noon UTC-4:00 so that
@@ -4179,29 +4329,22 @@ class DataClient:
                 }
             ).serialize_to_database_record()
 
-            # Add PUT transaction for privilege update record
-            transaction_items.append(self._generate_put_transaction_item(privilege_update_record))
-
-            # Add UPDATE transaction for privilege encumbered status
-            transaction_items.append(
-                self._generate_set_privilege_encumbered_status_item(
-                    privilege_data=privilege_data,
-                    privilege_encumbered_status=PrivilegeEncumberedStatusEnum.UNENCUMBERED,
-                )
+            planner.add_group(
+                [
+                    # PUT transaction for privilege update record
+                    self._generate_put_transaction_item(privilege_update_record),
+                    # UPDATE transaction for privilege encumbered status
+                    self._generate_set_privilege_encumbered_status_item(
+                        privilege_data=privilege_data,
+                        privilege_encumbered_status=PrivilegeEncumberedStatusEnum.UNENCUMBERED,
+                    ),
+                ]
             )
 
-        # Execute transactions in batches of 100 (DynamoDB limit)
-        batch_size = 100
-        while transaction_items:
-            batch = transaction_items[:batch_size]
-            transaction_items = transaction_items[batch_size:]
-
-            try:
-                self.config.dynamodb_client.transact_write_items(TransactItems=batch)
-                logger.info('Successfully processed privilege unencumbrance batch', batch_size=len(batch))
-            except ClientError as e:
-                logger.error('Failed to process privilege unencumbrance batch', error=str(e))
-                raise CCAwsServiceException('Failed to unencumber privileges for license') from e
+        result = planner.execute()
+        if not result.succeeded:
+            logger.error('Failed to process privilege unencumbrance transactions', error=str(result.error))
+            raise CCAwsServiceException('Failed to unencumber privileges for license') from result.error
 
         logger.info('Successfully unencumbered all license-encumbered privileges for license')
         return matching_privileges, latest_effective_lift_date
@@ -4246,8 +4389,9 @@ class DataClient:
 
         logger.info('Found privileges to deactivate', privilege_count=len(active_privileges_associated_with_license))
 
-        # Build transaction items for all privileges
-        transaction_items = []
+        # Plan a transaction group for each privilege, so that a privilege's update record is always committed with
+        # the change it records
+        planner = self._get_transaction_planner()
 
         for privilege_data in active_privileges_associated_with_license:
             now = config.current_standard_datetime
@@ -4270,29 +4414,22 @@ class DataClient:
                 }
             ).serialize_to_database_record()
 
-            # Add PUT transaction for privilege update record
-            transaction_items.append(self._generate_put_transaction_item(privilege_update_record))
-
-            # Add UPDATE transaction for privilege license deactivated status
-            transaction_items.append(
-                self._generate_set_privilege_license_deactivated_status_item(
-                    privilege_data=privilege_data,
-                    license_deactivated_status=LicenseDeactivatedStatusEnum.LICENSE_DEACTIVATED,
-                )
+            planner.add_group(
+                [
+                    # PUT transaction for privilege update record
+                    self._generate_put_transaction_item(privilege_update_record),
+                    # UPDATE transaction for privilege license deactivated status
+                    self._generate_set_privilege_license_deactivated_status_item(
+                        privilege_data=privilege_data,
+                        license_deactivated_status=LicenseDeactivatedStatusEnum.LICENSE_DEACTIVATED,
+                    ),
+                ]
             )
 
-        # Execute transactions in batches of 100 (DynamoDB limit)
-        batch_size = 100
-        while transaction_items:
-            batch = transaction_items[:batch_size]
-            transaction_items = transaction_items[batch_size:]
-
-            try:
-                self.config.dynamodb_client.transact_write_items(TransactItems=batch)
-                logger.info('Successfully processed privilege deactivation batch', batch_size=len(batch))
-            except ClientError as e:
-                logger.error('Failed to process privilege deactivation batch', error=str(e))
-                raise CCAwsServiceException('Failed to deactivate privileges for license') from e
+        result = planner.execute()
+        if not result.succeeded:
+            logger.error('Failed to process privilege deactivation transactions', error=str(result.error))
+            raise CCAwsServiceException('Failed to deactivate privileges for license') from result.error
 
         logger.info('Successfully deactivated associated privileges for license')
 
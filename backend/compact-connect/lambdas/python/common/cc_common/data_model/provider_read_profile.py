@@ -0,0 +1,108 @@
+from enum import StrEnum
+from functools import cache
+
+from cc_common.data_model.provider_record_util import ProviderRecordType
+from cc_common.data_model.schema.base_record import BaseRecordSchema
+
+
+class ProviderReadProfile(StrEnum):
+    """
+    Named use cases for reading a provider's partition, each of which only needs some of the attributes of the
+    provider's records.
+
+    By default, a provider's partition is read with every attribute of every record. That includes large attributes,
+    like the copies of the previous record held by update records, the attestations of privileges and the document
+    keys of military affiliations, which most readers never look at. Reading with a profile projects those attributes
+    away, saving read capacity and deserialization time on large partitions.
+
+    Records read with a profile are partial: they can be loaded into a ProviderUserRecords, but any attribute the
+    profile omits will be missing from them, so a record read with a profile must never be written back to the table,
+    unless that profile omits none of that record type's attributes. The only such case is INGEST, which rebuilds and
+    writes back provider and license records: it only omits the attributes of update, privilege and military
+    affiliation records, none of which ingest writes back.
+    """
+
+    # Building the provider's OpenSearch document, which only holds the fields of the general provider response
+    SEARCH_DOCUMENT = 'search-document'
+    # Ingesting a license, which rewrites license and provider records, so needs those in full
+    INGEST = 'ingest'
+    # Notifying a provider and jurisdictions of an event, which only needs names, the registered email and statuses
+    NOTIFICATION = 'notification'
+
+
+# The copies of a record's previous and changed values held by update records, which grow with every update
+_UPDATE_VALUE_ATTRIBUTES = frozenset({'previous', 'updatedValues', 'removedValues'})
+
+# Lists attached to privilege and military affiliation records
+_ATTACHMENT_ATTRIBUTES = frozenset({'attestations', 'documentKeys', 'fileNames'})
+
+# Personal identifiers and account secrets, none of which are included in the general provider response
+_SENSITIVE_ATTRIBUTES = frozenset(
+    {
+        'dateOfBirth',
+        'ssnLastFour',
+        'pendingEmailAddress',
+        'emailVerificationCode',
+        'emailVerificationExpiry',
+        'recoveryToken',
+        'recoveryExpiry',
+    }
+)
+
+# Contact details uploaded with a license. Notifications are only sent to the provider's registered email address.
+_LICENSE_CONTACT_ATTRIBUTES = frozenset(
+    {
+        'emailAddress',
+        'phoneNumber',
+        'homeAddressStreet1',
+        'homeAddressStreet2',
+        'homeAddressCity',
+        'homeAddressState',
+        'homeAddressPostalCode',
+    }
+)
+
+# The attributes each profile leaves out of the read
+_OMITTED_ATTRIBUTES: dict[ProviderReadProfile, frozenset[str]] = {
+    # Search documents include privilege attestations and military affiliation file names, but not document keys
+    ProviderReadProfile.SEARCH_DOCUMENT: _UPDATE_VALUE_ATTRIBUTES | _SENSITIVE_ATTRIBUTES | {'documentKeys'},
+    ProviderReadProfile.INGEST: _UPDATE_VALUE_ATTRIBUTES | _ATTACHMENT_ATTRIBUTES,
+    ProviderReadProfile.NOTIFICATION: (
+        _UPDATE_VALUE_ATTRIBUTES | _ATTACHMENT_ATTRIBUTES | _SENSITIVE_ATTRIBUTES | _LICENSE_CONTACT_ATTRIBUTES
+    ),
+}
+
+
+@cache
+def get_profile_attributes(read_profile: ProviderReadProfile) -> tuple[str, ...]:
+    """
+    Get the attributes of provider records that a profile reads.
+
+    A profile reads every attribute declared by any of the provider record schemas, other than the ones it omits, so
+    attributes added to a record schema are read by every profile unless a profile is changed to omit them.
+    """
+    attributes = set()
+    for record_type in ProviderRecordType:
+        schema = BaseRecordSchema.get_schema_by_type(record_type)
+        attributes.update(field.data_key or name for name, field in schema.fields.items())
+    return tuple(sorted(attributes - _OMITTED_ATTRIBUTES[read_profile]))
+
+
+def get_provider_query_projection(read_profile: ProviderReadProfile | None) -> dict:
+    """
+    Get the parameters that select which attributes a query of a provider's partition reads.
+
+    :param read_profile: The profile to read with, or None to read every attribute
+    :return: Parameters to pass to the query
+    """
+    if read_profile is None:
+        return {'Select': 'ALL_ATTRIBUTES'}
+
+    # Several of our attribute names (i.e. 'status' and 'type') are DynamoDB reserved words, so every attribute is
+    # referenced through a placeholder
+    attributes = get_profile_attributes(read_profile)
+    return {
+        'Select': 'SPECIFIC_ATTRIBUTES',
+        'ProjectionExpression': ', '.join(f'#{attribute}' for attribute in attributes),
+        'ExpressionAttributeNames': {f'#{attribute}': attribute for attribute in attributes},
+    }
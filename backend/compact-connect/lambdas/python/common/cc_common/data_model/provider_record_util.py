@@ -1,3 +1,4 @@
+from collections import defaultdict
 from collections.abc import Callable, Iterable
 from datetime import (
     UTC,
@@ -6,6 +7,7 @@ from datetime import (
     timedelta,
 )
 from enum import StrEnum
+from functools import cached_property
 from uuid import UUID
 
 from cc_common.config import config, logger
@@ -44,6 +46,19 @@ class ProviderRecordType(StrEnum):
     INVESTIGATION = 'investigation'
 
 
+# The data class each type of provider record is loaded into
+PROVIDER_RECORD_DATA_CLASSES: dict[str, type[CCDataClass]] = {
+    ProviderRecordType.PROVIDER: ProviderData,
+    ProviderRecordType.PROVIDER_UPDATE: ProviderUpdateData,
+    ProviderRecordType.LICENSE: LicenseData,
+    ProviderRecordType.LICENSE_UPDATE: LicenseUpdateData,
+    ProviderRecordType.PRIVILEGE: PrivilegeData,
+    ProviderRecordType.PRIVILEGE_UPDATE: PrivilegeUpdateData,
+    ProviderRecordType.MILITARY_AFFILIATION: MilitaryAffiliationData,
+    ProviderRecordType.ADVERSE_ACTION: AdverseActionData,
+    ProviderRecordType.INVESTIGATION: InvestigationData,
+}
+
 # The following update event types are used during events which caused
 # licenses/privileges to become inactive
 DEACTIVATION_EVENT_TYPES: list[UpdateCategory] = [
@@ -428,53 +443,187 @@ class ProviderUserRecords:
     records up to a given tier are required. Raises ``CCNotFoundException`` when the
     provider has no items.
 
-    On initialization, raw dict records are categorized by type and converted to
-    typed data classes for efficient access. The ``provider_records`` attribute
+    On initialization, raw dict records are categorized by type. Each type is converted to typed data classes the
+    first time it is accessed, so callers only pay for the types they use, which matters for providers with long
+    update histories. Records are expected to be read from the provider table, so are trusted, rather than
+    validated, as they are converted. The ``provider_records`` attribute
     retains the original dicts for code paths that have not migrated to the
     data-class pattern.
+
+    When the partition is read with a ``ProviderReadProfile``, records are partial, missing whichever attributes the
+    profile omits. Since trusted loading does not check for required fields, partial records load as any other, and
+    only the attributes a profile omits are unavailable from them.
+
+    Records are also indexed by the license or privilege they belong to, so that per-license and per-privilege
+    lookups do not scan every record of a type. Providers can accumulate thousands of update records, and building
+    an API response looks up the records of every license and privilege.
     """
 
-    def __init__(self, provider_records: Iterable[dict]):
-        # list of all records for this provider in dict format, which can be used for parts of the system that
-        # have not been updated to use the data class pattern
-        self.provider_records = provider_records
-
-        # Pre-convert and categorize records by type for efficiency
-        self._privilege_records: list[PrivilegeData] = []
-        self._license_records: list[LicenseData] = []
-        self._adverse_action_records: list[AdverseActionData] = []
-        self._investigation_records: list[InvestigationData] = []
-        self._provider_records: list[ProviderData] = []
-        self._provider_update_records: list[ProviderUpdateData] = []
-        self._military_affiliation_records: list[MilitaryAffiliationData] = []
-        self._license_update_records: list[LicenseUpdateData] = []
-        self._privilege_update_records: list[PrivilegeUpdateData] = []
-
-        # Convert records once during initialization
-        for record in provider_records:
+    def __init__(self, provider_records: Iterable[dict], *, trusted: bool = True):
+        """
+        :param provider_records: The provider's raw records
+        :param trusted: Load the records without validation. If False, every record is validated, and so converted,
+            during initialization, so that a record that does not match its schema raises a ValidationError here.
+        """
+        self._raw_records = list(provider_records)
+        self._trusted = trusted
+
+        # Raw records, grouped by type. Each type is only converted to data classes the first time it is accessed.
+        self._raw_records_by_type: dict[str, list[dict]] = defaultdict(list)
+        self._records_by_type: dict[str, list[CCDataClass]] = {}
+        for record in self._raw_records:
             record_type = record.get('type')
-            if record_type == ProviderRecordType.PRIVILEGE:
-                self._privilege_records.append(PrivilegeData.from_database_record(record))
-            elif record_type == ProviderRecordType.LICENSE:
-                self._license_records.append(LicenseData.from_database_record(record))
-            elif record_type == ProviderRecordType.ADVERSE_ACTION:
-                self._adverse_action_records.append(AdverseActionData.from_database_record(record))
-            elif record_type == ProviderRecordType.INVESTIGATION:
-                self._investigation_records.append(InvestigationData.from_database_record(record))
-            elif record_type == ProviderRecordType.PROVIDER:
-                self._provider_records.append(ProviderData.from_database_record(record))
-            elif record_type == ProviderRecordType.PROVIDER_UPDATE:
-                self._provider_update_records.append(ProviderUpdateData.from_database_record(record))
-            elif record_type == ProviderRecordType.MILITARY_AFFILIATION:
-                self._military_affiliation_records.append(MilitaryAffiliationData.from_database_record(record))
-            elif record_type == ProviderRecordType.LICENSE_UPDATE:
-                self._license_update_records.append(LicenseUpdateData.from_database_record(record))
-            elif record_type == ProviderRecordType.PRIVILEGE_UPDATE:
-                self._privilege_update_records.append(PrivilegeUpdateData.from_database_record(record))
+            if record_type in PROVIDER_RECORD_DATA_CLASSES:
+                self._raw_records_by_type[record_type].append(record)
             else:
                 # log the warning, but continue with initialization
                 logger.warning('Unrecognized record type found.', record_type=record_type)
 
+        if not trusted:
+            for record_type in self._raw_records_by_type:
+                self._records_of_type(record_type)
+
+    @property
+    def provider_records(self) -> list[dict]:
+        """
+        List of all records for this provider in dict format, which can be used for parts of the system that have not
+        been updated to use the data class pattern.
+
+        Loading a record calculates its status fields in the raw dict, which code using these dicts relies on, so
+        every type of record is converted first.
+        """
+        for record_type in self._raw_records_by_type:
+            self._records_of_type(record_type)
+        return self._raw_records
+
+    def _records_of_type(self, record_type: ProviderRecordType) -> list[CCDataClass]:
+        """
+        Get the records of a type as data classes, which are converted the first time they are requested. These
+        records are read straight from the provider table, so are loaded without validation unless the records were
+        not trusted.
+        """
+        try:
+            return self._records_by_type[record_type]
+        except KeyError:
+            data_class = PROVIDER_RECORD_DATA_CLASSES[record_type]
+            records = self._records_by_type[record_type] = [
+                data_class.from_database_record(record, trusted=self._trusted)
+                for record in self._raw_records_by_type.get(record_type, ())
+            ]
+            return records
+
+    @property
+    def _privilege_records(self) -> list[PrivilegeData]:
+        return self._records_of_type(ProviderRecordType.PRIVILEGE)
+
+    @property
+    def _license_records(self) -> list[LicenseData]:
+        return self._records_of_type(ProviderRecordType.LICENSE)
+
+    @property
+    def _adverse_action_records(self) -> list[AdverseActionData]:
+        return self._records_of_type(ProviderRecordType.ADVERSE_ACTION)
+
+    @property
+    def _investigation_records(self) -> list[InvestigationData]:
+        return self._records_of_type(ProviderRecordType.INVESTIGATION)
+
+    @property
+    def _provider_records(self) -> list[ProviderData]:
+        return self._records_of_type(ProviderRecordType.PROVIDER)
+
+    @property
+    def _provider_update_records(self) -> list[ProviderUpdateData]:
+        return self._records_of_type(ProviderRecordType.PROVIDER_UPDATE)
+
+    @property
+    def _military_affiliation_records(self) -> list[MilitaryAffiliationData]:
+        return self._records_of_type(ProviderRecordType.MILITARY_AFFILIATION)
+
+    @property
+    def _license_update_records(self) -> list[LicenseUpdateData]:
+        return self._records_of_type(ProviderRecordType.LICENSE_UPDATE)
+
+    @property
+    def _privilege_update_records(self) -> list[PrivilegeUpdateData]:
+        return self._records_of_type(ProviderRecordType.PRIVILEGE_UPDATE)
+
+    # Records are indexed by the (jurisdiction, license type) of the license or privilege they belong to. Like the
+    # records themselves, each index is only built the first time it is used, and preserves the order the records
+    # were loaded in.
+
+    @cached_property
+    def _licenses_by_abbreviation(self) -> dict[tuple[str, str], list[LicenseData]]:
+        """Licenses, by (jurisdiction, licenseTypeAbbreviation)"""
+        index = defaultdict(list)
+        for record in self._license_records:
+            index[(record.jurisdiction, record.licenseTypeAbbreviation)].append(record)
+        return index
+
+    @cached_property
+    def _licenses_by_type(self) -> dict[tuple[str, str], list[LicenseData]]:
+        """Licenses, by (jurisdiction, licenseType)"""
+        index = defaultdict(list)
+        for record in self._license_records:
+            index[(record.jurisdiction, record.licenseType)].append(record)
+        return index
+
+    @cached_property
+    def _privileges_by_abbreviation(self) -> dict[tuple[str, str], list[PrivilegeData]]:
+        """Privileges, by (jurisdiction, licenseTypeAbbreviation)"""
+        index = defaultdict(list)
+        for record in self._privilege_records:
+            index[(record.jurisdiction, record.licenseTypeAbbreviation)].append(record)
+        return index
+
+    @cached_property
+    def _privileges_by_license(self) -> dict[tuple[str, str], list[PrivilegeData]]:
+        """Privileges, by the (jurisdiction, licenseTypeAbbreviation) of their home license"""
+        index = defaultdict(list)
+        for record in self._privilege_records:
+            index[(record.licenseJurisdiction, record.licenseTypeAbbreviation)].append(record)
+        return index
+
+    @cached_property
+    def _adverse_actions_by_subject(self) -> dict[tuple[str, str, str], list[AdverseActionData]]:
+        """Adverse actions, by (actionAgainst, jurisdiction, licenseTypeAbbreviation)"""
+        index = defaultdict(list)
+        for record in self._adverse_action_records:
+            index[(record.actionAgainst, record.jurisdiction, record.licenseTypeAbbreviation)].append(record)
+        return index
+
+    @cached_property
+    def _adverse_actions_by_id(self) -> dict[UUID, AdverseActionData]:
+        index = {}
+        for record in self._adverse_action_records:
+            # The first record with a given id wins, as it would if we were searching for it
+            index.setdefault(record.adverseActionId, record)
+        return index
+
+    @cached_property
+    def _investigations_by_subject(self) -> dict[tuple[str, str, str], list[InvestigationData]]:
+        """Investigations, by (investigationAgainst, jurisdiction, licenseTypeAbbreviation)"""
+        index = defaultdict(list)
+        for record in self._investigation_records:
+            index[(record.investigationAgainst, record.jurisdiction, record.licenseTypeAbbreviation)].append(record)
+        return index
+
+    @cached_property
+    def _license_updates_by_type(self) -> dict[tuple[str, str], list[LicenseUpdateData]]:
+        """License update records, by (jurisdiction, licenseType)"""
+        index = defaultdict(list)
+        for record in self._license_update_records:
+            index[(record.jurisdiction, record.licenseType)].append(record)
+        return index
+
+    @cached_property
+    def _privilege_updates_by_type(self) -> dict[tuple[str, str], list[PrivilegeUpdateData]]:
+        """Privilege update records, by (jurisdiction, licenseType)"""
+        index = defaultdict(list)
+        for record in self._privilege_update_records:
+            index[(record.jurisdiction, record.licenseType)].append(record)
+        return index
+
     def get_specific_license_record(self, jurisdiction: str, license_abbreviation: str) -> LicenseData | None:
         """
         Get a specific license record from a list of provider records.
@@ -483,14 +632,8 @@ class ProviderUserRecords:
         :param license_abbreviation: The abbreviation of the license type.
         :return: The license record if found, else None.
         """
-        return next(
-            (
-                record
-                for record in self._license_records
-                if record.jurisdiction == jurisdiction and record.licenseTypeAbbreviation == license_abbreviation
-            ),
-            None,
-        )
+        records = self._licenses_by_abbreviation.get((jurisdiction, license_abbreviation))
+        return records[0] if records else None
 
     def get_specific_privilege_record(self, jurisdiction: str, license_abbreviation: str) -> PrivilegeData | None:
         """
@@ -500,14 +643,8 @@ class ProviderUserRecords:
         :param license_abbreviation: The abbreviation of the license type.
         :return: The license record if found, else None.
         """
-        return next(
-            (
-                record
-                for record in self._privilege_records
-                if record.jurisdiction == jurisdiction and record.licenseTypeAbbreviation == license_abbreviation
-            ),
-            None,
-        )
+        records = self._privileges_by_abbreviation.get((jurisdiction, license_abbreviation))
+        return records[0] if records else None
 
     def get_privilege_records(
         self,
@@ -534,10 +671,8 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._privilege_records
-            if record.licenseJurisdiction == license_jurisdiction
-            and record.licenseTypeAbbreviation == license_type_abbreviation
-            and (filter_condition is None or filter_condition(record))
+            for record in self._privileges_by_license.get((license_jurisdiction, license_type_abbreviation), ())
+            if filter_condition is None or filter_condition(record)
         ]
 
     def get_license_records(
@@ -567,11 +702,10 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._adverse_action_records
-            if record.actionAgainst == AdverseActionAgainstEnum.LICENSE
-            and record.jurisdiction == license_jurisdiction
-            and record.licenseTypeAbbreviation == license_type_abbreviation
-            and (filter_condition is None or filter_condition(record))
+            for record in self._adverse_actions_by_subject.get(
+                (AdverseActionAgainstEnum.LICENSE, license_jurisdiction, license_type_abbreviation), ()
+            )
+            if filter_condition is None or filter_condition(record)
         ]
 
     def get_adverse_action_by_id(self, adverse_action_id: UUID) -> AdverseActionData | None:
@@ -581,10 +715,7 @@ class ProviderUserRecords:
         :param UUID adverse_action_id: The ID of the adverse action to find
         :return: The found adverse action record if found, else None
         """
-        return next(
-            (record for record in self._adverse_action_records if record.adverseActionId == adverse_action_id),
-            None,
-        )
+        return self._adverse_actions_by_id.get(adverse_action_id)
 
     def _get_latest_effective_lift_date_for_adverse_actions(
         self, adverse_actions: list[AdverseActionData]
@@ -647,11 +778,10 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._adverse_action_records
-            if record.actionAgainst == AdverseActionAgainstEnum.PRIVILEGE
-            and record.jurisdiction == privilege_jurisdiction
-            and record.licenseTypeAbbreviation == privilege_license_type_abbreviation
-            and (filter_condition is None or filter_condition(record))
+            for record in self._adverse_actions_by_subject.get(
+                (AdverseActionAgainstEnum.PRIVILEGE, privilege_jurisdiction, privilege_license_type_abbreviation), ()
+            )
+            if filter_condition is None or filter_condition(record)
         ]
 
     def get_investigation_records_for_privilege(
@@ -672,11 +802,10 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._investigation_records
-            if record.investigationAgainst == 'privilege'
-            and record.jurisdiction == privilege_jurisdiction
-            and record.licenseTypeAbbreviation == privilege_license_type_abbreviation
-            and (
+            for record in self._investigations_by_subject.get(
+                ('privilege', privilege_jurisdiction, privilege_license_type_abbreviation), ()
+            )
+            if (
                 include_closed or record.closeDate is None
             )  # Only return active investigations unless include_closed is True
             and (filter_condition is None or filter_condition(record))
@@ -700,11 +829,10 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._investigation_records
-            if record.investigationAgainst == 'license'
-            and record.jurisdiction == license_jurisdiction
-            and record.licenseTypeAbbreviation == license_type_abbreviation
-            and (
+            for record in self._investigations_by_subject.get(
+                ('license', license_jurisdiction, license_type_abbreviation), ()
+            )
+            if (
                 include_closed or record.closeDate is None
             )  # Only return active investigations unless include_closed is True
             and (filter_condition is None or filter_condition(record))
@@ -878,10 +1006,8 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._license_update_records
-            if record.jurisdiction == jurisdiction
-            and record.licenseType == license_type
-            and (filter_condition is None or filter_condition(record))
+            for record in self._license_updates_by_type.get((jurisdiction, license_type), ())
+            if filter_condition is None or filter_condition(record)
         ]
 
     def get_update_records_for_privilege(
@@ -899,10 +1025,8 @@ class ProviderUserRecords:
         """
         return [
             record
-            for record in self._privilege_update_records
-            if record.jurisdiction == jurisdiction
-            and record.licenseType == license_type
-            and (filter_condition is None or filter_condition(record))
+            for record in self._privilege_updates_by_type.get((jurisdiction, license_type), ())
+            if filter_condition is None or filter_condition(record)
         ]
 
     def get_records_associated_with_license(self, jurisdiction: str, license_type: str) -> list[CCDataClass]:
@@ -917,16 +1041,10 @@ class ProviderUserRecords:
         :param license_type: The license type (full name, not abbreviation)
         :return: The license record and all of its dependent records
         """
-        license_record = next(
-            (
-                record
-                for record in self._license_records
-                if record.jurisdiction == jurisdiction and record.licenseType == license_type
-            ),
-            None,
-        )
-        if license_record is None:
+        license_records = self._licenses_by_type.get((jurisdiction, license_type))
+        if not license_records:
             return []
+        license_record = license_records[0]
 
         license_type_abbreviation = license_record.licenseTypeAbbreviation
 
@@ -1,6 +1,9 @@
+import heapq
 import json
 from base64 import b64decode, b64encode
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, repeat
 from types import MethodType
 
 from botocore.exceptions import ClientError
@@ -33,22 +36,56 @@ class paginated_query:  # noqa: N801 invalid-name
     parameter on the query, so DynamoDB will evaluate as many items as it can within a single query, returning all
     evaluated items that match the filter expression. The decorator will handle truncating the items to fit within the
     pageSize, and will also handle calculating the lastKey for the next page of results.
+
+    SCATTER-GATHER: For queries against an index whose partitions are split into shards, provide shard_count, a callable
+    returning the number of shards to query (or 0, to query as normal), and sort_key, the index's sort key attribute.
+    The decorated function will then be called with a `shard` keyword argument, and must query only that shard. Each
+    shard is queried concurrently, and their results are merge-sorted by sort_key, in the order given by the decorated
+    function's `scan_forward` keyword argument (ascending by default). The encoded lastKey is then a composite of each
+    shard's own cursor.
+
+    PROJECTED READS: If the decorated function is called with a `read_profile` keyword argument, it only reads some of
+    each record's attributes, so records are loaded into their schemas as partial records, without checking for required
+    fields.
     """
 
-    def __init__(self, set_query_limit_to_match_page_size: bool = True):
+    def __init__(
+        self,
+        set_query_limit_to_match_page_size: bool = True,
+        shard_count: Callable[[], int] | None = None,
+        sort_key: str | None = None,
+    ):
         super().__init__()
+        if shard_count is not None and sort_key is None:
+            raise ValueError('sort_key is required for scatter-gather queries')
         self.set_query_limit_to_match_page_size = set_query_limit_to_match_page_size
+        self.shard_count = shard_count
+        self.sort_key = sort_key
 
     def __call__(self, fn: Callable):
-        return _PaginatedQueryDecorator(fn, self.set_query_limit_to_match_page_size)
+        return _PaginatedQueryDecorator(
+            fn,
+            self.set_query_limit_to_match_page_size,
+            shard_count=self.shard_count,
+            sort_key=self.sort_key,
+        )
 
 
 class _PaginatedQueryDecorator:
     """Internal decorator class that handles the actual pagination logic."""
 
-    def __init__(self, fn: Callable, set_query_limit_to_match_page_size: bool):
+    def __init__(
+        self,
+        fn: Callable,
+        set_query_limit_to_match_page_size: bool,
+        *,
+        shard_count: Callable[[], int] | None = None,
+        sort_key: str | None = None,
+    ):
         self.fn = fn
         self.set_query_limit_to_match_page_size = set_query_limit_to_match_page_size
+        self.shard_count = shard_count
+        self.sort_key = sort_key
 
     def __get__(self, instance, owner):
         return MethodType(self, instance)
@@ -65,6 +102,47 @@ class _PaginatedQueryDecorator:
                 raise CCInvalidRequestException(message='Invalid lastKey') from e
         page_size = pagination.get('pageSize', config.default_page_size)
 
+        shard_count = self.shard_count() if self.shard_count is not None else 0
+        if shard_count:
+            items, last_key = self._scatter_gather(
+                shard_count=shard_count,
+                last_key=last_key,
+                page_size=page_size,
+                client_filter=client_filter,
+                args=args,
+                kwargs=kwargs,
+            )
+        else:
+            items, last_key = self._query_page(
+                last_key=last_key,
+                page_size=page_size,
+                client_filter=client_filter,
+                args=args,
+                kwargs=kwargs,
+            )
+
+        resp = {
+            # Deserializing everything that comes out of the database
+            'items': load_records_into_schemas(items, partial=kwargs.get('read_profile') is not None),
+            'pagination': {'pageSize': page_size, 'prevLastKey': pagination.get('lastKey')},
+        }
+
+        # Last key, if present, will be a dict like {'pk': 'some-pk', 'sk': 'aslp/PROVIDER'}
+        if last_key is not None:
+            last_key = b64encode(json.dumps(last_key).encode('utf-8')).decode('utf-8')
+        resp['pagination']['lastKey'] = last_key
+        return resp
+
+    def _query_page(
+        self,
+        *,
+        last_key: dict | None,
+        page_size: int,
+        client_filter: Callable[[dict], bool] | None,
+        args,
+        kwargs,
+    ) -> tuple[list[dict], dict | None]:
+        """Query for a page of raw items, returning them with the key to start the next page from, if there is one"""
         items = []
         raw_resp = {}
         last_known_evaluated_key = None
@@ -82,40 +160,117 @@ class _PaginatedQueryDecorator:
         # items can be longer than page_size, so we trim it to the page size:
         if len(items) > page_size:
             items = items[:page_size]
-            last_item = items[-1]
             # Since we truncated our items, we need to recalculate the last key
-            # We will use the last known evaluated key to determine the needed fields
-            # for the last key if we have one
-            if last_known_evaluated_key is not None:
-                last_key = {k: last_item[k] for k in last_known_evaluated_key.keys()}
-            # Else the first query was the last query, but there were more items to be returned than the specified page
-            # size. In this case, we need to determine the last key for getting the next page. The keys needed by the
-            # last key are not static (for example, if you are querying by a GSI you must include the GSI fields as
-            # part of the last key) so to have a generic solution for this scenario, we make a query with a limit of 1
-            # so we can get the LastEvaluatedKey from the response, and then map the keys from that to the values of
-            # the last item that will be returned in the response to create our own last key.
-            else:
-                last_key_resp = self._caught_query(client_filter, *args, dynamo_pagination={'Limit': 1}, **kwargs)
-                last_known_evaluated_key = last_key_resp.get('LastEvaluatedKey')
-                last_key = {k: last_item[k] for k in last_known_evaluated_key.keys()}
+            last_key = self._last_key_for_item(
+                items[-1],
+                known_key=last_known_evaluated_key,
+                client_filter=client_filter,
+                args=args,
+                kwargs=kwargs,
+            )
         # else if the page size matched the query, and there are more records to return, set the last key to match
         elif raw_resp.get('LastEvaluatedKey'):
             last_key = raw_resp.get('LastEvaluatedKey')
         # else there are not more records to fetch, set last key to none
         else:
             last_key = None
+        return items, last_key
 
-        resp = {
-            # Deserializing everything that comes out of the database
-            'items': load_records_into_schemas(items),
-            'pagination': {'pageSize': page_size, 'prevLastKey': pagination.get('lastKey')},
-        }
+    def _last_key_for_item(
+        self,
+        item: dict,
+        *,
+        known_key: dict | None,
+        client_filter: Callable[[dict], bool] | None,
+        args,
+        kwargs,
+    ) -> dict:
+        """Build a key to start a query from, immediately after the provided item"""
+        # We will use the last known evaluated key to determine the needed fields for the last key if we have one
+        # Else, we need to determine the fields needed for the key. They are not static (for example, if you are
+        # querying by a GSI you must include the GSI fields as part of the last key) so to have a generic solution for
+        # this scenario, we make a query with a limit of 1 so we can get the LastEvaluatedKey from the response, and
+        # then map the keys from that to the values of the item.
+        if known_key is None:
+            last_key_resp = self._caught_query(client_filter, *args, dynamo_pagination={'Limit': 1}, **kwargs)
+            known_key = last_key_resp.get('LastEvaluatedKey')
+        return {k: item[k] for k in known_key.keys()}
 
-        # Last key, if present, will be a dict like {'pk': 'some-pk', 'sk': 'aslp/PROVIDER'}
-        if last_key is not None:
-            last_key = b64encode(json.dumps(last_key).encode('utf-8')).decode('utf-8')
-        resp['pagination']['lastKey'] = last_key
-        return resp
+    def _scatter_gather(
+        self,
+        *,
+        shard_count: int,
+        last_key: dict | None,
+        page_size: int,
+        client_filter: Callable[[dict], bool] | None,
+        args,
+        kwargs,
+    ) -> tuple[list[dict], dict | None]:
+        """Query a page from each shard concurrently, then merge them, in sort key order, into a single page
+
+        The lastKey is composite, with a cursor for each shard: the key to start that shard's next query from (empty, if
+        nothing has been read from the shard yet), or None, once the shard has been read to its end.
+        """
+        if last_key is None:
+            shard_cursors = [{} for _ in range(shard_count)]
+        else:
+            shard_cursors = last_key.get('shards') if isinstance(last_key, dict) else None
+            if (
+                not isinstance(shard_cursors, list)
+                or len(shard_cursors) != shard_count
+                or not all(cursor is None or isinstance(cursor, dict) for cursor in shard_cursors)
+            ):
+                raise CCInvalidRequestException(message='Invalid lastKey')
+
+        def query_shard(shard: int) -> tuple[list[dict], dict | None]:
+            if shard_cursors[shard] is None:
+                return [], None
+            return self._query_page(
+                last_key=shard_cursors[shard] or None,
+                page_size=page_size,
+                client_filter=client_filter,
+                args=args,
+                kwargs={**kwargs, 'shard': shard},
+            )
+
+        with ThreadPoolExecutor(max_workers=shard_count) as executor:
+            shard_pages = list(executor.map(query_shard, range(shard_count)))
+
+        # Each shard's page is already in sort key order, so we only need to merge them
+        merged = heapq.merge(
+            *(zip(shard_items, repeat(shard)) for shard, (shard_items, _) in enumerate(shard_pages)),
+            key=lambda item_shard: item_shard[0][self.sort_key],
+            reverse=not kwargs.get('scan_forward', True),
+        )
+        items = []
+        taken_per_shard = [0] * shard_count
+        for item, shard in islice(merged, page_size):
+            items.append(item)
+            taken_per_shard[shard] += 1
+
+        next_cursors = []
+        for shard, (shard_items, shard_last_key) in enumerate(shard_pages):
+            taken = taken_per_shard[shard]
+            if taken == len(shard_items):
+                # Every item read from the shard is on this page, so the shard picks up where its query left off
+                next_cursors.append(shard_last_key)
+            elif taken == 0:
+                # Nothing from the shard made it onto this page, so it starts where it did this time
+                next_cursors.append(shard_cursors[shard])
+            else:
+                next_cursors.append(
+                    self._last_key_for_item(
+                        shard_items[taken - 1],
+                        known_key=shard_last_key,
+                        client_filter=client_filter,
+                        args=args,
+                        kwargs={**kwargs, 'shard': shard},
+                    )
+                )
+
+        if all(cursor is None for cursor in next_cursors):
+            return items, None
+        return items, {'shards': next_cursors}
 
     def _generate_pages(
         self,
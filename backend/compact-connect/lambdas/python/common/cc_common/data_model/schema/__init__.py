@@ -1,12 +1,28 @@
-# ruff: noqa: F401
-# We import all the record types with the package to ensure they are all registered
-from .adverse_action.record import AdverseActionRecordSchema
-from .attestation import AttestationRecordSchema
-from .compact.record import CompactRecordSchema
-from .jurisdiction.record import JurisdictionRecordSchema
-from .license.record import LicenseRecordSchema
-from .military_affiliation.record import MilitaryAffiliationRecordSchema
-from .privilege.record import PrivilegeRecordSchema
-from .provider.record import ProviderRecordSchema
-from .transaction.record import TransactionRecordSchema
-from .user.record import UserRecordSchema
+from importlib import import_module
+
+# Record schemas are imported the first time they are used, rather than with this package, to keep Lambda cold starts
+# short. See RECORD_SCHEMA_MODULES in base_record for how they are found by record type.
+_LAZY_IMPORTS = {
+    'AdverseActionRecordSchema': '.adverse_action.record',
+    'AttestationRecordSchema': '.attestation',
+    'CompactRecordSchema': '.compact.record',
+    'JurisdictionRecordSchema': '.jurisdiction.record',
+    'LicenseRecordSchema': '.license.record',
+    'MilitaryAffiliationRecordSchema': '.military_affiliation.record',
+    'PrivilegeRecordSchema': '.privilege.record',
+    'ProviderRecordSchema': '.provider.record',
+    'TransactionRecordSchema': '.transaction.record',
+    'UserRecordSchema': '.user.record',
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError as e:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from e
+    return getattr(import_module(module_name, __name__), name)
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_IMPORTS])
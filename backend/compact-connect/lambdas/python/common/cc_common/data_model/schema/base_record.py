@@ -2,6 +2,7 @@
 # We diverge from PEP8 variable naming in schema because they map to our API JSON Schema in which,
 # by convention, we use camelCase.
 from abc import ABC
+from importlib import import_module
 
 from marshmallow import EXCLUDE, RAISE, Schema, post_load, pre_dump
 from marshmallow.fields import UUID, AwareDateTime, String
@@ -10,6 +11,27 @@ from cc_common.config import config
 from cc_common.data_model.schema.fields import Compact, SocialSecurityNumber
 from cc_common.exceptions import CCInternalException
 
+# The module that registers the schema for each record type. Record schema modules are not imported with the schema
+# package, to keep Lambda cold starts short, so get_schema_by_type imports a record type's module the first time it is
+# requested.
+RECORD_SCHEMA_MODULES = {
+    'adverseAction': 'cc_common.data_model.schema.adverse_action.record',
+    'attestation': 'cc_common.data_model.schema.attestation.record',
+    'compact': 'cc_common.data_model.schema.compact.record',
+    'investigation': 'cc_common.data_model.schema.investigation.record',
+    'jurisdiction': 'cc_common.data_model.schema.jurisdiction.record',
+    'license': 'cc_common.data_model.schema.license.record',
+    'licenseUpdate': 'cc_common.data_model.schema.license.record',
+    'militaryAffiliation': 'cc_common.data_model.schema.military_affiliation.record',
+    'privilege': 'cc_common.data_model.schema.privilege.record',
+    'privilegeUpdate': 'cc_common.data_model.schema.privilege.record',
+    'provider': 'cc_common.data_model.schema.provider.record',
+    'providerUpdate': 'cc_common.data_model.schema.provider.record',
+    'transaction': 'cc_common.data_model.schema.transaction.record',
+    'unsettled_transaction': 'cc_common.data_model.schema.transaction.record',
+    'user': 'cc_common.data_model.schema.user.record',
+}
+
 
 class StrictSchema(Schema):
     """Base Schema explicitly stating what we do if unknown fields are included - raise an error"""
@@ -34,7 +56,9 @@ class BaseRecordSchema(ForgivingSchema, ABC):
     """
 
     _record_type = None
-    _registered_schema = {}
+    # Schema classes, by record type, which are only instantiated the first time they are requested
+    _registered_schema_classes: dict[str, type[Schema]] = {}
+    _registered_schema: dict[str, Schema] = {}
 
     # Generated fields
     pk = String(required=True, allow_none=False)
@@ -69,17 +93,24 @@ class BaseRecordSchema(ForgivingSchema, ABC):
         """Add the record type to the class map of schema, so we can look one up by type"""
 
         def do_register(schema_cls: type[Schema]) -> type[Schema]:
-            cls._registered_schema[record_type] = schema_cls()
+            cls._registered_schema_classes[record_type] = schema_cls
             return schema_cls
 
         return do_register
 
     @classmethod
     def get_schema_by_type(cls, record_type: str) -> Schema:
+        schema = cls._registered_schema.get(record_type)
+        if schema is not None:
+            return schema
+
+        if record_type not in cls._registered_schema_classes and record_type in RECORD_SCHEMA_MODULES:
+            import_module(RECORD_SCHEMA_MODULES[record_type])
         try:
-            return cls._registered_schema[record_type]
+            schema_cls = cls._registered_schema_classes[record_type]
         except KeyError as e:
             raise CCInternalException(f'Unsupported record type, "{record_type}"') from e
+        return cls._registered_schema.setdefault(record_type, schema_cls())
 
 
 class SSNIndexRecordSchema(StrictSchema):
@@ -10,6 +10,7 @@ from marshmallow import Schema, ValidationError, pre_load, validates_schema
 from marshmallow.fields import Dict, String, Url
 
 from cc_common.config import config
+from cc_common.data_model.schema.trusted_load import load_trusted_record
 
 
 class CCRequestSchema(Schema):
@@ -56,7 +57,8 @@ class CCDataClass:
 
     Data classes must be instantiated using one of the class factory methods:
     1. create_new(): For creating a new record that doesn't exist in the database yet
-    2. from_database_record(): For loading an existing record from the database
+    2. from_database_record(): For loading an existing record from the database, which can skip validation of
+       records our system wrote, with trusted=True
 
     When putting records into the database, call the serialize_to_database_record method to convert the data class to a
     dictionary using the record schema's dump method.
@@ -121,7 +123,7 @@ class CCDataClass:
         return cls(loaded_data, _is_from_factory=True)
 
     @classmethod
-    def from_database_record(cls, data: dict[str, Any]) -> 'CCDataClass':
+    def from_database_record(cls, data: dict[str, Any], *, trusted: bool = False) -> 'CCDataClass':
         """
         Create a new instance from a database record.
 
@@ -129,13 +131,18 @@ class CCDataClass:
         The data will be loaded directly through the schema without generating new GSIs.
 
         :param data: Database record data (containing 'pk'/'sk' keys)
+        :param trusted: Skip validation of the record, which is only safe for records read straight from our own
+            tables. The schema's load hooks still run. See cc_common.data_model.schema.trusted_load.
         :return: New instance of the data class
         """
         if not data:
             raise ValueError('Database record cannot be None or empty')
 
-        # Load directly through the schema
-        loaded_data = cls._record_schema.load(data)
+        if trusted:
+            loaded_data = load_trusted_record(cls._record_schema, data)
+        else:
+            # Load directly through the schema
+            loaded_data = cls._record_schema.load(data)
         return cls(loaded_data, _is_from_factory=True)
 
     @property
@@ -159,9 +166,7 @@ class CCDataClass:
         has both 'compact' and 'licenseType' fields, otherwise returns None.
         """
         if 'compact' in self._data and 'licenseType' in self._data:
-            license_type_abbr = config.license_type_abbreviations.get(self._data['compact'], {}).get(
-                self._data['licenseType']
-            )
+            license_type_abbr = config.license_type_abbreviation(self._data['compact'], self._data['licenseType'])
             return license_type_abbr.lower() if license_type_abbr else None
 
         return None
@@ -44,7 +44,7 @@ class InvestigationRecordSchema(BaseRecordSchema, ValidatesLicenseTypeMixin):
         in_data['pk'] = f'{in_data["compact"]}#PROVIDER#{in_data["providerId"]}'
         # ensure this is passed in lowercase
         try:
-            license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+            license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
         except KeyError as e:
             # Validation is usually done on load and this runs on dump, but we depend on this value being valid
             # so we might as well raise a ValidationError if we try to dump an invalid license type
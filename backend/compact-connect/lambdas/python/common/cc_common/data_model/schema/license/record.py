@@ -123,7 +123,7 @@ class LicenseRecordSchema(BaseRecordSchema, LicenseCommonSchema):
     @pre_dump
     def generate_pk_sk(self, in_data, **kwargs):  # noqa: ARG001 unused-argument
         in_data['pk'] = f'{in_data["compact"]}#PROVIDER#{in_data["providerId"]}'
-        license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+        license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
         in_data['sk'] = f'{in_data["compact"]}#PROVIDER#license/{in_data["jurisdiction"]}/{license_type_abbr}#'
         return in_data
 
@@ -147,7 +147,7 @@ class LicenseRecordSchema(BaseRecordSchema, LicenseCommonSchema):
             )
             # Generate GSI SK: TIME#{epoch_timestamp}#LT#{licenseType}#PID#{providerId}
             upload_epoch_time = int(upload_date.timestamp())
-            license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+            license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
             in_data['licenseUploadDateGSISK'] = (
                 f'TIME#{upload_epoch_time}#LT#{license_type_abbr}#PID#{in_data["providerId"]}'
             )
@@ -248,7 +248,7 @@ class LicenseUpdateRecordSchema(BaseRecordSchema, ChangeHashMixin):
         # to the record. We'll use the createDate and the hash of the updatedValues
         # field for this.
         change_hash = self.hash_changes(in_data)
-        license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+        license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
         in_data['sk'] = (
             f'{in_data["compact"]}#UPDATE#{UpdateTierEnum.TIER_THREE}#license/{in_data["jurisdiction"]}/{license_type_abbr}/{in_data["createDate"]}/{change_hash}'
         )
@@ -271,7 +271,7 @@ class LicenseUpdateRecordSchema(BaseRecordSchema, ChangeHashMixin):
 
             # Generate GSI SK: TIME#{epoch_timestamp}#LT#{licenseType}#PID#{providerId}
             upload_epoch_time = int(upload_date.timestamp())
-            license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+            license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
             in_data['licenseUploadDateGSISK'] = (
                 f'TIME#{upload_epoch_time}#LT#{license_type_abbr}#PID#{in_data["providerId"]}'
             )
@@ -119,7 +119,7 @@ class PrivilegeRecordSchema(BaseRecordSchema, ValidatesLicenseTypeMixin):
     @pre_dump
     def generate_pk_sk(self, in_data, **kwargs):  # noqa: ARG001 unused-argument
         in_data['pk'] = f'{in_data["compact"]}#PROVIDER#{in_data["providerId"]}'
-        license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+        license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
         in_data['sk'] = f'{in_data["compact"]}#PROVIDER#privilege/{in_data["jurisdiction"]}/{license_type_abbr}#'
         return in_data
 
@@ -237,7 +237,7 @@ class PrivilegeUpdateRecordSchema(BaseRecordSchema, ChangeHashMixin, ValidatesLi
         # to the record. We'll use the createDate and the hash of the updatedValues
         # field for this.
         change_hash = self.hash_changes(in_data)
-        license_type_abbr = config.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
+        license_type_abbr = config.snapshot.license_type_abbreviations[in_data['compact']][in_data['licenseType']]
         in_data['sk'] = (
             f'{in_data["compact"]}#UPDATE#{UpdateTierEnum.TIER_ONE}#privilege/{in_data["jurisdiction"]}/{license_type_abbr}/{in_data["createDate"]}/{change_hash}'
         )
@@ -2,7 +2,7 @@
 from datetime import timedelta
 
 from marshmallow import ValidationError, pre_load, validates_schema
-from marshmallow.fields import UUID, AwareDateTime, Date, Dict, Email, Integer, List, Nested, Raw, String
+from marshmallow.fields import UUID, AwareDateTime, Boolean, Date, Dict, Email, Integer, List, Nested, Raw, String
 from marshmallow.validate import Length, OneOf, Range, Regexp
 
 from cc_common.data_model.schema.base_record import ForgivingSchema, StrictSchema
@@ -764,6 +764,9 @@ class ExportPrivilegesRequestSchema(CCRequestSchema):
 
     # The OpenSearch query body, restricted to the clause types QueryClauseSchema declares
     query = Nested(QueryClauseSchema, required=True, allow_none=False)
+    # Run the export as a background job, for exports too large to complete within the API's timeout
+    # 'async_' in Python maps to 'async' in the JSON, as 'async' is a reserved word
+    async_ = Boolean(required=False, allow_none=False, data_key='async')
 
     @pre_load
     def validate_query_dsl(self, data, **kwargs):
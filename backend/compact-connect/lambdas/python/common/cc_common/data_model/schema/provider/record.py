@@ -1,4 +1,5 @@
 # ruff: noqa: N801, N815, ARG002  invalid-name unused-argument
+import uuid
 from datetime import date
 from urllib.parse import quote
 
@@ -29,6 +30,21 @@ from cc_common.data_model.schema.fields import (
 )
 from cc_common.data_model.update_tier_enum import UpdateTierEnum
 
+# The number of shards each compact's providers are spread across, in the sharded provider GSIs. Changing this requires
+# rewriting the providerGSIPK of every provider record, so it should be treated as fixed.
+PROVIDER_GSI_SHARD_COUNT = 8
+
+
+def provider_gsi_shard(provider_id: str | uuid.UUID) -> int:
+    """The sharded provider GSI shard that a provider belongs to"""
+    # Provider ids are random UUIDs, so they are already evenly distributed
+    return uuid.UUID(str(provider_id)).int % PROVIDER_GSI_SHARD_COUNT
+
+
+def provider_gsi_pk(compact: str, shard: int) -> str:
+    """The partition key of one shard of a compact's providers, in the sharded provider GSIs"""
+    return f'{compact}#PROVIDER#SHARD#{shard}'
+
 
 @BaseRecordSchema.register_schema('provider')
 class ProviderRecordSchema(BaseRecordSchema):
@@ -87,6 +103,7 @@ class ProviderRecordSchema(BaseRecordSchema):
     privilegeJurisdictions = Set(String, required=False, allow_none=False, load_default=set())
     providerFamGivMid = String(required=False, allow_none=False, validate=Length(2, 400))
     providerDateOfUpdate = AwareDateTime(required=True, allow_none=False)
+    providerGSIPK = String(required=False, allow_none=False)
 
     # This field is set whenever the provider registers with the compact connect system,
     # or updates their home jurisdiction.
@@ -163,6 +180,17 @@ class ProviderRecordSchema(BaseRecordSchema):
         del in_data['providerDateOfUpdate']
         return in_data
 
+    @pre_dump
+    def populate_provider_gsi_pk(self, in_data, **kwargs):  # noqa: ARG001 unused-argument
+        in_data['providerGSIPK'] = provider_gsi_pk(in_data['compact'], provider_gsi_shard(in_data['providerId']))
+        return in_data
+
+    @post_load
+    def drop_provider_gsi_pk(self, in_data, **kwargs):  # noqa: ARG001 unused-argument
+        # Provider records written before the sharded GSIs were introduced won't have this until they are backfilled
+        in_data.pop('providerGSIPK', None)
+        return in_data
+
     @pre_dump
     def populate_fam_giv_mid(self, in_data, **kwargs):  # noqa: ARG001 unused-argument
         in_data['providerFamGivMid'] = '#'.join(
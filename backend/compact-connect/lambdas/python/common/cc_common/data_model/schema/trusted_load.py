@@ -0,0 +1,159 @@
+"""
+Trusted loading of records that our own system wrote to the database.
+
+A full marshmallow Schema.load validates every field and runs every schema validator, which is the right thing to do
+for data coming from outside the system, but is wasted effort for records we dumped through the same schema when we
+wrote them. Loading a provider with thousands of update records through full validation adds up.
+
+A trusted load still runs every pre_load and post_load hook of the schema, so calculated fields (like license status)
+are populated and generated fields (like GSI keys) are dropped exactly as in a full load, and still converts every
+field to its Python type. It skips field validators, schema validators, required field checks and unknown field
+checks. Nested schemas are loaded the same way.
+
+Only use this for records read from our own tables. Any data that comes from outside the system must go through
+Schema.load.
+"""
+
+from collections.abc import Callable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from marshmallow import INCLUDE, Schema
+from marshmallow.decorators import POST_LOAD, PRE_LOAD
+from marshmallow.fields import Field, List, Nested, String
+from marshmallow.utils import missing
+
+# A field converter takes (value, data key, the raw record) and returns the deserialized value
+FieldConverter = Callable[[Any, str, dict], Any]
+
+
+class TrustedSchemaLoader:
+    """
+    Loads data through a schema, with the field conversions of the schema compiled once, up front
+    """
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self._has_pre_load = bool(schema._hooks[PRE_LOAD])  # noqa: SLF001 marshmallow does not expose its hooks
+        self._has_post_load = bool(schema._hooks[POST_LOAD])  # noqa: SLF001 marshmallow does not expose its hooks
+        self._include_unknown = schema.unknown == INCLUDE
+        # (data key, attribute, converter, load default) for each field
+        self._fields: list[tuple[str, str, FieldConverter, Any]] = [
+            (
+                field.data_key if field.data_key is not None else name,
+                field.attribute or name,
+                _compile_field(field),
+                field.load_default,
+            )
+            for name, field in schema.load_fields.items()
+        ]
+        self._data_keys = frozenset(data_key for data_key, _, _, _ in self._fields)
+
+    def load(self, data: dict, *, partial: bool | None = None) -> dict:
+        schema = self.schema
+        partial = schema.partial if partial is None else partial
+        if self._has_pre_load:
+            data = schema._invoke_load_processors(  # noqa: SLF001 run the schema's own hooks, as load would
+                PRE_LOAD, data, many=False, original_data=data, partial=partial, unknown=schema.unknown
+            )
+
+        result = schema.dict_class()
+        for data_key, attribute, convert, load_default in self._fields:
+            value = data.get(data_key, missing)
+            if value is missing:
+                if partial is True or load_default is missing:
+                    continue
+                result[attribute] = load_default() if callable(load_default) else load_default
+            elif value is None:
+                result[attribute] = None
+            else:
+                result[attribute] = convert(value, data_key, data)
+        if self._include_unknown:
+            for key in data.keys() - self._data_keys:
+                result[key] = data[key]
+
+        if self._has_post_load:
+            result = schema._invoke_load_processors(  # noqa: SLF001 run the schema's own hooks, as load would
+                POST_LOAD, result, many=False, original_data=data, partial=partial, unknown=schema.unknown
+            )
+        return result
+
+
+_loaders: WeakKeyDictionary[Schema, TrustedSchemaLoader] = WeakKeyDictionary()
+
+
+def get_trusted_loader(schema: Schema) -> TrustedSchemaLoader:
+    """
+    Get the trusted loader for a schema instance, which is only compiled the first time it is requested
+    """
+    try:
+        return _loaders[schema]
+    except KeyError:
+        loader = _loaders[schema] = TrustedSchemaLoader(schema)
+        return loader
+
+
+def load_trusted_record(schema: Schema, data: dict) -> dict:
+    """
+    Load a record our system wrote to the database through its schema, without validating it.
+
+    :param schema: The record schema, which the record was dumped through when it was written
+    :param data: The record, as read from the database
+    :return: The loaded record, as Schema.load would return it
+    """
+    return get_trusted_loader(schema).load(data)
+
+
+def _compile_field(field: Field) -> FieldConverter:
+    """
+    Build a function that deserializes a value for the field, without validating it
+    """
+    convert = _compile_field_type(field)
+    if not field.pre_load and not field.post_load:
+        return convert
+
+    def convert_with_processors(value, data_key, data):
+        for func in field.pre_load:
+            value = func(value)
+        value = convert(value, data_key, data)
+        for func in field.post_load:
+            value = func(value)
+        return value
+
+    return convert_with_processors
+
+
+def _compile_field_type(field: Field) -> FieldConverter:
+    field_type = type(field)
+
+    if isinstance(field, Nested):
+        # The nested schema is only resolved once the field is first used, since it may be given as a class
+        def convert_nested(value, _data_key, _data):
+            loader = get_trusted_loader(field.schema)
+            if field.many:
+                return [loader.load(item) for item in value]
+            return loader.load(value)
+
+        return convert_nested
+
+    if field_type is List:
+        convert_item = _compile_field(field.inner)
+
+        def convert_list(value, data_key, data):
+            return [None if item is None else convert_item(item, data_key, data) for item in value]
+
+        return convert_list
+
+    if field_type._deserialize is String._deserialize:  # noqa: SLF001 compares, does not call, the method
+        # Most of our fields are strings, which are stored as they are loaded, only with validators added
+        def convert_string(value, data_key, data):
+            if type(value) is str:
+                return value
+            return field._deserialize(value, data_key, data)  # noqa: SLF001 deserialize without validation
+
+        return convert_string
+
+    def convert_value(value, data_key, data):
+        return field._deserialize(value, data_key, data)  # noqa: SLF001 deserialize without validation
+
+    return convert_value
@@ -0,0 +1,294 @@
+import hashlib
+import json
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from uuid import uuid4
+
+from cc_common.config import logger
+
+# DynamoDB's hard limit on the number of items in a single TransactWriteItems call
+MAX_TRANSACTION_ITEMS = 100
+
+# DynamoDB's limit on the length of a ClientRequestToken
+_MAX_CLIENT_REQUEST_TOKEN_LENGTH = 36
+
+# The key attributes of our tables, used to tell when two operations act on the same item
+_KEY_ATTRIBUTES = ('pk', 'sk')
+
+
+class TransactionGroupStatus(StrEnum):
+    COMMITTED = 'committed'
+    FAILED = 'failed'
+    # The group was never attempted, because a transaction in an earlier stage of the plan failed
+    SKIPPED = 'skipped'
+
+
+@dataclass(eq=False)
+class PlannedTransaction:
+    """
+    A single TransactWriteItems call in a plan.
+
+    :param group_ids: The ids of the groups committed by this transaction
+    :param items: The transaction items of those groups
+    """
+
+    group_ids: list[int] = field(default_factory=list)
+    items: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class TransactionGroupResult:
+    """
+    The outcome of one group of a plan.
+
+    :param items: The group's transaction items
+    :param status: Whether the group was committed
+    :param error: The error the group's transaction failed with, if it failed
+    """
+
+    items: list[dict]
+    status: TransactionGroupStatus = TransactionGroupStatus.SKIPPED
+    error: Exception | None = None
+
+
+@dataclass
+class TransactionPlanResult:
+    """
+    The outcome of executing a plan.
+
+    :param groups: The result of each group, in the order the groups were added, so indexed by group id
+    :param transaction_count: The number of transactions that were attempted
+    """
+
+    groups: list[TransactionGroupResult]
+    transaction_count: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        return all(group.status == TransactionGroupStatus.COMMITTED for group in self.groups)
+
+    @property
+    def failed_groups(self) -> list[TransactionGroupResult]:
+        return [group for group in self.groups if group.status == TransactionGroupStatus.FAILED]
+
+    @property
+    def error(self) -> Exception | None:
+        """The first error any transaction of the plan failed with"""
+        failed_groups = self.failed_groups
+        return failed_groups[0].error if failed_groups else None
+
+
+class TransactionWritePlanner:
+    """
+    Plans and commits a set of DynamoDB transaction items that may not all fit in a single transaction.
+
+    Items are added in groups. The items of a group are always committed in the same transaction, so a group can
+    hold at most 100 items, DynamoDB's limit. A group can be ordered after other groups, in which case it is never
+    committed before them: it is either committed in the same transaction as them, or in a later one. Two groups
+    that act on the same item are implicitly ordered, in the order they were added, and are never in the same
+    transaction, which DynamoDB would reject.
+
+    Groups are packed, in the order they were added, into as few transactions of up to 100 items as their ordering
+    allows. Transactions are committed in stages: every transaction in a stage is independent of the others in that
+    stage, so they are committed concurrently, and each stage is only committed once every transaction of the
+    previous stage has been. If any transaction fails, no later stage is attempted, so that no group is ever
+    committed without the groups it is ordered after.
+
+    Each transaction is sent with a ClientRequestToken, so that a transaction retried by the SDK after a timeout is
+    not applied twice.
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        max_workers: int = 4,
+        max_transaction_items: int = MAX_TRANSACTION_ITEMS,
+        idempotency_key: str | None = None,
+    ):
+        """
+        :param client: The DynamoDB client to commit transactions with. Items must use the attribute value format
+            that client expects.
+        :param max_workers: Maximum number of transactions to commit concurrently
+        :param max_transaction_items: Maximum number of items to commit in one transaction
+        :param idempotency_key: A key the transaction tokens of this plan are derived from. Only pass this if the
+            same plan, with identical items, may be executed again within DynamoDB's ten minute idempotency window
+            and should not be re-applied. By default, every planner gets a unique key.
+        """
+        self._client = client
+        self._max_workers = max_workers
+        self._max_transaction_items = max_transaction_items
+        self._idempotency_key = idempotency_key or uuid4().hex
+        self._groups: list[list[dict]] = []
+        self._group_keys: list[frozenset[str]] = []
+        self._group_dependencies: list[tuple[int, ...]] = []
+
+    def add_group(self, items: Iterable[dict], *, after: Iterable[int] = ()) -> int:
+        """
+        Add a group of items that must be committed together.
+
+        :param items: The group's transaction items
+        :param after: The ids of groups this group must not be committed before
+        :return: The id of the new group
+        :raises ValueError: If the group is empty, too large for one transaction, acts on one item more than once
+            or is ordered after a group that does not exist
+        """
+        items = list(items)
+        after = tuple(after)
+        if not items:
+            raise ValueError('A transaction group must have at least one item')
+        if len(items) > self._max_transaction_items:
+            raise ValueError(
+                f'A transaction group can have at most {self._max_transaction_items} items, got {len(items)}'
+            )
+        keys = frozenset(_get_item_key(item) for item in items)
+        if len(keys) < len(items):
+            raise ValueError('A transaction group cannot act on the same item more than once')
+        for group_id in after:
+            if not 0 <= group_id < len(self._groups):
+                raise ValueError(f'Unknown transaction group: {group_id}')
+
+        self._groups.append(items)
+        self._group_keys.append(keys)
+        self._group_dependencies.append(after)
+        return len(self._groups) - 1
+
+    def add_items(self, items: Iterable[dict], *, after: Iterable[int] = ()) -> list[int]:
+        """
+        Add items that do not need to be committed together, each as its own group.
+
+        :param items: The transaction items
+        :param after: The ids of groups these items must not be committed before
+        :return: The ids of the new groups
+        """
+        after = tuple(after)
+        return [self.add_group([item], after=after) for item in items]
+
+    def plan(self) -> list[list[PlannedTransaction]]:
+        """
+        Pack the groups into transactions.
+
+        :return: The stages of the plan, each a list of transactions that can be committed concurrently
+        """
+        stages: list[list[PlannedTransaction]] = []
+        group_stages: list[int] = []
+        # The latest stage that has acted on each item
+        key_stages: dict[str, int] = {}
+
+        for group_id, items in enumerate(self._groups):
+            dependencies = self._group_dependencies[group_id]
+            stage_number = max(
+                [group_stages[dependency] for dependency in dependencies]
+                + [key_stages[key] + 1 for key in self._group_keys[group_id] if key in key_stages],
+                default=0,
+            )
+            while True:
+                if stage_number == len(stages):
+                    stages.append([])
+                transaction = _find_transaction(
+                    stages[stage_number],
+                    {dependency for dependency in dependencies if group_stages[dependency] == stage_number},
+                    len(items),
+                    self._max_transaction_items,
+                )
+                if transaction is not None:
+                    break
+                stage_number += 1
+
+            if not transaction.group_ids:
+                stages[stage_number].append(transaction)
+            transaction.group_ids.append(group_id)
+            transaction.items.extend(items)
+            group_stages.append(stage_number)
+            for key in self._group_keys[group_id]:
+                key_stages[key] = stage_number
+
+        return stages
+
+    def execute(self) -> TransactionPlanResult:
+        """
+        Commit every group.
+
+        Errors from DynamoDB are not raised. They are returned in the result, with the status of each group, for the
+        caller to handle.
+
+        :return: The outcome of each group
+        """
+        result = TransactionPlanResult(groups=[TransactionGroupResult(items=items) for items in self._groups])
+        stages = self.plan()
+        if not stages:
+            logger.info('No transaction items to execute')
+            return result
+
+        logger.info(
+            'Executing transaction plan',
+            total_items=sum(len(items) for items in self._groups),
+            total_groups=len(self._groups),
+            total_transactions=sum(len(stage) for stage in stages),
+            total_stages=len(stages),
+        )
+        for stage_number, stage in enumerate(stages):
+            tokens = [self._get_client_request_token(stage_number, index) for index in range(len(stage))]
+            if len(stage) == 1:
+                errors = [self._commit(stage[0], tokens[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self._max_workers, len(stage))) as executor:
+                    errors = list(executor.map(self._commit, stage, tokens))
+            result.transaction_count += len(stage)
+
+            for transaction, error in zip(stage, errors, strict=True):
+                for group_id in transaction.group_ids:
+                    result.groups[group_id].status = (
+                        TransactionGroupStatus.COMMITTED if error is None else TransactionGroupStatus.FAILED
+                    )
+                    result.groups[group_id].error = error
+            failed_count = sum(error is not None for error in errors)
+            if failed_count:
+                logger.error(
+                    'Transaction plan failed',
+                    stage_number=stage_number + 1,
+                    total_stages=len(stages),
+                    failed_transactions=failed_count,
+                    error=str(next(error for error in errors if error is not None)),
+                )
+                break
+        return result
+
+    def _commit(self, transaction: PlannedTransaction, client_request_token: str) -> Exception | None:
+        try:
+            self._client.transact_write_items(TransactItems=transaction.items, ClientRequestToken=client_request_token)
+        except Exception as e:  # noqa: BLE001 errors are returned with the result of each group
+            return e
+        logger.info('Committed transaction', item_count=len(transaction.items))
+        return None
+
+    def _get_client_request_token(self, stage_number: int, transaction_index: int) -> str:
+        token_source = f'{self._idempotency_key}#{stage_number}#{transaction_index}'
+        return hashlib.sha256(token_source.encode('utf-8')).hexdigest()[:_MAX_CLIENT_REQUEST_TOKEN_LENGTH]
+
+
+def _find_transaction(
+    stage: list[PlannedTransaction], dependencies_in_stage: set[int], item_count: int, max_transaction_items: int
+) -> PlannedTransaction | None:
+    """
+    Find a transaction in a stage that a group can be packed into, or a new transaction if the group can start its
+    own. A group ordered after groups in this stage can only join the transaction that holds all of them.
+    """
+    for transaction in stage:
+        if dependencies_in_stage.issubset(transaction.group_ids) and (
+            len(transaction.items) + item_count <= max_transaction_items
+        ):
+            return transaction
+    if dependencies_in_stage:
+        return None
+    return PlannedTransaction()
+
+
+def _get_item_key(item: dict) -> str:
+    """Get a string that identifies the item a transaction item acts on"""
+    ((operation_type, operation),) = item.items()
+    attributes = operation['Item'] if operation_type == 'Put' else operation['Key']
+    key = {attribute: attributes.get(attribute) for attribute in _KEY_ATTRIBUTES}
+    return json.dumps([operation['TableName'], key], sort_keys=True, default=str)
@@ -14,6 +14,10 @@ class EventBatchWriter:
         self._count = 0
         self.failed_entry_count = 0
         self.failed_entries = None
+        # The positions, in the order they were put, of entries that EventBridge reported as failed
+        self.failed_entry_indexes = None
+        # The count of entries that have been sent to EventBridge, whether they succeeded or not
+        self.sent_entry_count = 0
 
     def _do_put(self):
         resp = self._client.put_events(Entries=self._batch)
@@ -21,6 +25,11 @@ class EventBatchWriter:
         if failure_count > 0:
             self.failed_entry_count += failure_count
             self.failed_entries.extend(entry for entry in resp.get('Entries') if entry.get('ErrorCode'))
+            # EventBridge returns results in the same order as the entries were sent
+            self.failed_entry_indexes.extend(
+                self.sent_entry_count + i for i, entry in enumerate(resp.get('Entries')) if entry.get('ErrorCode')
+            )
+        self.sent_entry_count += len(self._batch)
         self._batch = []
         self._count = 0
 
@@ -28,7 +37,9 @@ class EventBatchWriter:
         self._batch = []
         self._count = 0
         self.failed_entries = []
+        self.failed_entry_indexes = []
         self.failed_entry_count = 0
+        self.sent_entry_count = 0
         return self
 
     def __exit__(self, exc_type=None, exc_val=None, exc_tb=None):
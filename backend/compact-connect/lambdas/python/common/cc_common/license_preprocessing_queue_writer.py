@@ -0,0 +1,109 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+
+from botocore.client import BaseClient
+
+from cc_common.config import logger
+
+
+class LicensePreprocessingQueueWriter:
+    """Utility class to pipeline license messages onto the license preprocessing queue
+
+    Licenses are collected into batches of 10 (the SQS batch limit) and each full batch is handed off to a bounded
+    pool of worker threads, so the caller can keep parsing and validating licenses while earlier batches are still
+    being sent. No more than twice the number of workers worth of batches are ever waiting or in flight at once. Once
+    that limit is reached, `put_license` blocks until a worker frees up, which keeps memory use bounded regardless of
+    how quickly licenses are produced.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        queue_url: str,
+        event_time: str,
+        max_workers: int = 8,
+        batch_size: int = 10,
+    ):
+        """:param BaseClient client: A boto3 SQS client to use for API calls
+        :param str queue_url: The URL of the license preprocessing queue
+        :param str event_time: ISO formatted event time string to include in each message
+        :param int max_workers: Number of batches to send concurrently, default: 8
+        :param int batch_size: Batch size to use for API calls, default: 10
+        """
+        self._client = client
+        self._queue_url = queue_url
+        self._event_time = event_time
+        self._max_workers = max_workers
+        self._batch_size = batch_size
+        self._batch = None
+        self._executor = None
+        self._in_flight = None
+        self._lock = Lock()
+        self.sent_count = 0
+        self.failed_license_numbers = None
+
+    def _send_batch(self, batch: list[dict]):
+        entries = [
+            {
+                'Id': f'msg-{idx}',
+                'MessageBody': json.dumps({'eventTime': self._event_time, **license_data}),
+            }
+            for idx, license_data in enumerate(batch)
+        ]
+        failed_license_numbers = []
+        try:
+            resp = self._client.send_message_batch(QueueUrl=self._queue_url, Entries=entries)
+            for failed in resp.get('Failed', []):
+                failed_index = int(failed['Id'].split('-')[-1])
+                failed_license_numbers.append(batch[failed_index].get('licenseNumber', 'unknown'))
+                logger.error(f'Failed to send message to preprocessing queue: {failed.get("Message", "Unknown error")}')
+        except Exception as e:  # noqa: BLE001 broad-exception-caught
+            # This is running in a worker thread, so anything we don't catch here would be silently lost. If the
+            # entire batch fails, count all messages as failed.
+            failed_license_numbers.extend(license_data.get('licenseNumber', 'unknown') for license_data in batch)
+            logger.error(f'Error sending batch to preprocessing queue: {str(e)}')
+
+        with self._lock:
+            self.sent_count += len(batch) - len(failed_license_numbers)
+            self.failed_license_numbers.extend(failed_license_numbers)
+
+    def _submit_batch(self):
+        batch = self._batch
+        self._batch = []
+        # Blocks if the workers are saturated, applying back-pressure to the producer
+        self._in_flight.acquire()
+        future = self._executor.submit(self._send_batch, batch)
+        future.add_done_callback(lambda _: self._in_flight.release())
+
+    def __enter__(self):
+        self._batch = []
+        self.sent_count = 0
+        self.failed_license_numbers = []
+        self._in_flight = BoundedSemaphore(self._max_workers * 2)
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self
+
+    def __exit__(self, exc_type=None, exc_val=None, exc_tb=None):
+        try:
+            # We'll check the actual batch length here, to be sure we don't try to send an empty batch
+            if len(self._batch) > 0:
+                self._submit_batch()
+        finally:
+            # Wait for every in-flight batch, so all failures are accounted for before the caller inspects them
+            self._executor.shutdown(wait=True)
+        if exc_val is not None:
+            raise exc_val
+
+    def put_license(self, license_data: dict):
+        """Queue a license to be sent to the preprocessing queue
+
+        :param dict license_data: SERIALIZED license data to send (must be serialized using the dump method of the
+        LicensePostRequestSchema)
+        """
+        if self._batch is None:
+            # Protecting ourselves from accidental misuse
+            raise RuntimeError('This object must be used as a context manager')
+        self._batch.append(license_data)
+        if len(self._batch) >= self._batch_size:
+            self._submit_batch()
@@ -26,14 +26,14 @@ class LicenseUtility:
         :return: LicenseType object
         """
         try:
-            abbreviations = config.license_type_abbreviations_for_compact(compact)
-            for name, abbr in abbreviations.items():
-                if abbr.lower() == abbreviation.lower():
-                    return LicenseType(name=name, abbreviation=abbr)
-            raise CCInvalidRequestException(f'Invalid license type abbreviation: {abbreviation}')
+            abbreviations = config.snapshot.license_type_abbreviations[compact]
         except KeyError as e:
             logger.error('Invalid license type abbreviation provided.', exc_info=e)
             raise CCInvalidRequestException(f'Invalid license type abbreviation: {abbreviation}') from e
+        name = config.license_type_name(compact, abbreviation)
+        if name is None:
+            raise CCInvalidRequestException(f'Invalid license type abbreviation: {abbreviation}')
+        return LicenseType(name=name, abbreviation=abbreviations[name])
 
     @staticmethod
     def get_valid_license_type_abbreviations(compact: str) -> set[str]:
@@ -43,8 +43,7 @@ class LicenseUtility:
         :param compact: The compact code
         :return: Set of valid license type abbreviations
         """
-        license_types = config.license_types_for_compact(compact)
-        return {config.license_type_abbreviations[compact][license_type] for license_type in license_types}
+        return set(config.snapshot.license_type_abbreviations[compact].values())
 
     @staticmethod
     def find_invalid_license_type_abbreviations(compact: str, abbreviations: list[str]) -> list[str]:
@@ -4,16 +4,13 @@ from collections import UserDict
 from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
-from functools import wraps
+from functools import cache, wraps
 from json import JSONEncoder
 from re import match
 from types import MethodType
 from typing import Any
 from uuid import UUID
 
-import requests
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from botocore.exceptions import ClientError
@@ -22,7 +19,6 @@ from marshmallow import ValidationError
 from cc_common.config import config, logger, metrics
 from cc_common.data_model.schema.base_record import BaseRecordSchema
 from cc_common.data_model.schema.common import CCPermissionsAction
-from cc_common.data_model.schema.provider.api import ProviderGeneralResponseSchema, ProviderReadPrivateResponseSchema
 from cc_common.exceptions import (
     CCAccessDeniedException,
     CCInternalException,
@@ -839,6 +835,11 @@ def sanitize_provider_data_based_on_caller_scopes(compact: str, provider: dict,
     :return: The provider record, sanitized based on the user's scopes.
     """
 
+    from cc_common.data_model.schema.provider.api import (
+        ProviderGeneralResponseSchema,
+        ProviderReadPrivateResponseSchema,
+    )
+
     caller_is_admin = caller_is_compact_admin(compact, caller_scopes=scopes)
     if caller_is_admin:
         # compact admins have the ability to download military affiliation records
@@ -919,10 +920,16 @@ def send_licenses_to_preprocessing_queue(licenses_data: list[dict], event_time:
     return failed_license_numbers
 
 
-def load_records_into_schemas(records: list[dict]):
-    """Load records into their defined schema"""
+def load_records_into_schemas(records: list[dict], *, partial: bool = False):
+    """
+    Load records into their defined schema
+
+    :param records: The records to load
+    :param partial: Whether the records are partial, having been read with a projection, so may be missing required
+        fields
+    """
     try:
-        return [BaseRecordSchema.get_schema_by_type(item['type']).load(item) for item in records]
+        return [BaseRecordSchema.get_schema_by_type(item['type']).load(item, partial=partial) for item in records]
     except ValidationError as e:
         logger.error('Validation error', error=e)
         raise CCInternalException('Data validation failure!') from e
@@ -974,6 +981,9 @@ def verify_recaptcha(token: str) -> bool:
     if config.environment_name.lower() not in ['test', 'beta', 'prod']:
         return True
 
+    # Imported here, since few of our lambdas make HTTP requests
+    import requests
+
     try:
         response = requests.post(
             'https://www.google.com/recaptcha/api/siteverify',
@@ -989,8 +999,15 @@ def verify_recaptcha(token: str) -> bool:
         return False
 
 
-# Module level PasswordHasher instance for password/token hashing
-_password_hasher = PasswordHasher()
+@cache
+def _get_password_hasher():
+    """
+    Get the PasswordHasher instance for password/token hashing. argon2 is only imported the first time it is needed,
+    since few of our lambdas hash anything.
+    """
+    from argon2 import PasswordHasher
+
+    return PasswordHasher()
 
 
 def hash_password(password: str) -> str:
@@ -1005,7 +1022,7 @@ def hash_password(password: str) -> str:
     :return: The Argon2 hash string
     :rtype: str
     """
-    return _password_hasher.hash(password)
+    return _get_password_hasher().hash(password)
 
 
 def verify_password(hashed_password: str, password: str) -> bool:
@@ -1017,8 +1034,10 @@ def verify_password(hashed_password: str, password: str) -> bool:
     :return: True if password matches the hash, False otherwise
     :rtype: bool
     """
+    from argon2.exceptions import VerifyMismatchError
+
     try:
-        _password_hasher.verify(hashed_password, password)
+        _get_password_hasher().verify(hashed_password, password)
         return True
     except VerifyMismatchError:
         # This is expected when passwords don't match
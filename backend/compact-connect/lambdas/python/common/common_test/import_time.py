@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Import time budgets are measured on developer machines and CI runners, which vary in speed. Slow machines can scale
+# every budget up with this environment variable.
+IMPORT_TIME_BUDGET_SCALE = float(os.environ.get('IMPORT_TIME_BUDGET_SCALE', '1'))
+
+
+@dataclass
+class ImportProfile:
+    """The cost of importing a module into a fresh interpreter, as reported by `python -X importtime`"""
+
+    module_name: str
+    cumulative_seconds: float
+    imported_modules: frozenset[str]
+
+
+def profile_import(module_name: str, *, repeat: int = 3) -> ImportProfile:
+    """
+    Import a module into a fresh interpreter, `repeat` times, with the current working directory, sys.path and
+    environment, and report the fastest import.
+
+    Each interpreter starts cold, so this reflects the import cost a Lambda container pays on a cold start, once the
+    interpreter itself is up.
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(path for path in sys.path if path)}
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(  # noqa: S603 the command is our own interpreter, with a module name from our tests
+            [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f'Failed to import {module_name}:\n{result.stderr}')
+        profile = _parse_importtime(module_name, result.stderr)
+        if best is None or profile.cumulative_seconds < best.cumulative_seconds:
+            best = profile
+    return best
+
+
+def _parse_importtime(module_name: str, stderr: str) -> ImportProfile:
+    """
+    Parse `-X importtime` output, which has a line per imported module, like:
+    import time:       self [us] |  cumulative | imported package
+    import time:             102 |         102 |   cc_common.exceptions
+    Nested imports are indented beneath the module that imported them, which is reported after them.
+    """
+    cumulative_us = None
+    imported_modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _self_us, cumulative, name = line.removeprefix('import time:').split('|', 2)
+        if not cumulative.strip().isdigit():
+            # The header line
+            continue
+        name = name.strip()
+        imported_modules.add(name)
+        if name == module_name:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f'{module_name} was not reported as imported, so it was likely imported at start up')
+    return ImportProfile(
+        module_name=module_name,
+        cumulative_seconds=cumulative_us / 1_000_000,
+        imported_modules=frozenset(imported_modules),
+    )
@@ -26,6 +26,7 @@ class TstLambdas(TestCase):
                 'TRANSACTION_HISTORY_TABLE_NAME': 'transaction-history-table',
                 'ENVIRONMENT_NAME': 'test',
                 'PROV_FAM_GIV_MID_INDEX_NAME': 'providerFamGivMid',
+                'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME': 'providerFamGivMidSharded',
                 'FAM_GIV_INDEX_NAME': 'famGiv',
                 'USER_POOL_ID': 'us-east-1-12345',
                 'USERS_TABLE_NAME': 'users-table',
@@ -34,6 +35,9 @@ class TstLambdas(TestCase):
                 'LICENSE_PREPROCESSING_QUEUE_URL': 'license-preprocessing-queue-url',
                 'RATE_LIMITING_TABLE_NAME': 'rate-limiting-table',
                 'PROV_DATE_OF_UPDATE_INDEX_NAME': 'providerDateOfUpdate',
+                'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME': 'providerDateOfUpdateSharded',
+                # moto's DynamoDB backend is not safe for concurrent transactions, so plans commit them one at a time
+                'TRANSACTION_WRITE_CONCURRENCY': '1',
                 'COMPACTS': '["aslp", "octp", "coun"]',
                 'JURISDICTIONS': json.dumps(
                     [
@@ -167,6 +167,7 @@ class TstFunction(TstLambdas):
                 {'AttributeName': 'sk', 'AttributeType': 'S'},
                 {'AttributeName': 'providerFamGivMid', 'AttributeType': 'S'},
                 {'AttributeName': 'providerDateOfUpdate', 'AttributeType': 'S'},
+                {'AttributeName': 'providerGSIPK', 'AttributeType': 'S'},
             ],
             TableName=os.environ['PROVIDER_TABLE_NAME'],
             GlobalSecondaryIndexes=[
@@ -186,6 +187,22 @@ class TstFunction(TstLambdas):
                     ],
                     'Projection': {'ProjectionType': 'ALL'},
                 },
+                {
+                    'IndexName': os.environ['PROV_FAM_GIV_MID_SHARDED_INDEX_NAME'],
+                    'KeySchema': [
+                        {'AttributeName': 'providerGSIPK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'providerFamGivMid', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                },
+                {
+                    'IndexName': os.environ['PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME'],
+                    'KeySchema': [
+                        {'AttributeName': 'providerGSIPK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'providerDateOfUpdate', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                },
             ],
         )
 
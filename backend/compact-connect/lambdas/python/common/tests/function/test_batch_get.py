@@ -0,0 +1,38 @@
+from common_test.test_constants import DEFAULT_COMPACT
+from moto import mock_aws
+
+from tests.function import TstFunction
+
+
+@mock_aws
+class TestBatchGetProvidersById(TstFunction):
+    def setUp(self):
+        super().setUp()
+
+        self.provider_ids = [
+            str(
+                self.test_data_generator.put_default_provider_record_in_provider_table(
+                    value_overrides={'providerId': f'00000000-0000-0000-0000-{i:012d}'}
+                ).providerId
+            )
+            for i in range(150)
+        ]
+
+    def test_batch_get_providers_by_id(self):
+        result = self.config.data_client.batch_get_providers_by_id(
+            DEFAULT_COMPACT, [*self.provider_ids, '00000000-0000-0000-0000-999999999999']
+        )
+
+        # Providers that don't exist are omitted
+        self.assertEqual(sorted(self.provider_ids), sorted(item['providerId'] for item in result.items))
+        self.assertEqual([], result.unprocessed_keys)
+        self.assertIn('givenName', result.items[0])
+
+    def test_batch_get_providers_by_id_with_projection(self):
+        result = self.config.data_client.batch_get_providers_by_id(
+            DEFAULT_COMPACT, self.provider_ids[:3], projection=('providerId', 'givenName', 'type')
+        )
+
+        self.assertEqual(3, len(result.items))
+        for item in result.items:
+            self.assertEqual({'providerId', 'givenName', 'type'}, item.keys())
@@ -1,4 +1,5 @@
 import json
+import os
 from datetime import UTC, date, datetime
 from unittest.mock import ANY, patch
 from uuid import UUID, uuid4
@@ -710,6 +711,73 @@ class TestDataClient(TstFunction):
         self.assertEqual('privilegeCount', counter_record['type'])
         self.assertEqual('aslp', counter_record['compact'])
 
+    @patch('cc_common.config._Config.privilege_number_block_size', 10)
+    def test_claim_privilege_number_reserves_blocks(self):
+        """Test that privilege numbers are handed out from reserved blocks"""
+        from cc_common.data_model.data_client import DataClient
+
+        client = DataClient(self.config)
+
+        # The first claim reserves a block of ten numbers, which the next claims are taken from
+        self.assertEqual([1, 2, 3], [client.claim_privilege_number(compact='aslp') for _ in range(3)])
+        counter_record = self.config.provider_table.get_item(
+            Key={
+                'pk': 'aslp#PRIVILEGE_COUNT',
+                'sk': 'aslp#PRIVILEGE_COUNT',
+            }
+        )['Item']
+        self.assertEqual(10, counter_record['privilegeCount'])
+
+        # Another container reserves the next block
+        other_client = DataClient(self.config)
+        self.assertEqual(11, other_client.claim_privilege_number(compact='aslp'))
+        # Each compact has its own counter
+        self.assertEqual(1, client.claim_privilege_number(compact='octp'))
+        # Once a block is used up, the next block is reserved
+        self.assertEqual([4, 5, 6, 7, 8, 9, 10, 21], [client.claim_privilege_number(compact='aslp') for _ in range(8)])
+
+    @patch('cc_common.config._Config.privilege_number_block_size', 7)
+    def test_concurrent_privilege_number_claims_are_unique(self):
+        """Test that concurrent claims, across threads and containers, never claim the same number"""
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Lock
+
+        from cc_common.data_model.data_client import DataClient
+
+        # DynamoDB applies each update to the counter atomically, but moto does not, when called from several threads
+        # at once, so we serialize calls to moto, leaving claims within and across containers concurrent
+        reserve_privilege_numbers = DataClient._reserve_privilege_numbers  # noqa: SLF001 protected-access
+        moto_lock = Lock()
+
+        def atomic_reserve_privilege_numbers(*args, **kwargs):
+            with moto_lock:
+                return reserve_privilege_numbers(*args, **kwargs)
+
+        # Several containers, each with several concurrent claims
+        clients = [DataClient(self.config) for _ in range(4)]
+        with (
+            patch.object(DataClient, '_reserve_privilege_numbers', atomic_reserve_privilege_numbers),
+            ThreadPoolExecutor(max_workers=16) as executor,
+        ):
+            privilege_numbers = list(
+                executor.map(
+                    lambda i: clients[i % len(clients)].claim_privilege_number(compact='aslp'),
+                    range(200),
+                )
+            )
+
+        self.assertEqual(len(privilege_numbers), len(set(privilege_numbers)))
+        counter_record = self.config.provider_table.get_item(
+            Key={
+                'pk': 'aslp#PRIVILEGE_COUNT',
+                'sk': 'aslp#PRIVILEGE_COUNT',
+            }
+        )['Item']
+        # Every number claimed was reserved, and no more blocks were reserved than needed: each container can only
+        # have one partly-used block
+        self.assertLessEqual(max(privilege_numbers), counter_record['privilegeCount'])
+        self.assertLess(counter_record['privilegeCount'], len(privilege_numbers) + len(clients) * 7)
+
     def test_get_ssn_by_provider_id_returns_ssn_if_provider_id_exists(self):
         """Test that get_ssn_by_provider_id returns the SSN if the provider ID exists"""
         from cc_common.data_model.data_client import DataClient
@@ -1969,3 +2037,30 @@ class TestDataClient(TstFunction):
         investigation_record.pop('dateOfUpdate')
 
         self.assertEqual(expected_investigation_close, investigation_record)
+
+    def test_count_providers_counts_only_providers_in_compact(self):
+        from cc_common.data_model.data_client import DataClient
+
+        client = DataClient(self.config)
+
+        for _ in range(3):
+            provider_id = str(uuid4())
+            self.test_data_generator.put_default_provider_record_in_provider_table(
+                value_overrides={'providerId': provider_id, 'compact': 'aslp'}
+            )
+            # Other records of the provider are not counted
+            self.test_data_generator.put_default_license_record_in_provider_table(
+                value_overrides={'providerId': provider_id, 'compact': 'aslp'}
+            )
+        self.test_data_generator.put_default_provider_record_in_provider_table(
+            value_overrides={'providerId': str(uuid4()), 'compact': 'octp'}
+        )
+
+        for sharded_reads in ['false', 'true']:
+            with (
+                self.subTest(sharded_reads=sharded_reads),
+                patch.dict(os.environ, {'PROVIDER_GSI_SHARDED_READS': sharded_reads}),
+            ):
+                self.assertEqual(3, client.count_providers(compact='aslp'))
+                self.assertEqual(1, client.count_providers(compact='octp'))
+                self.assertEqual(0, client.count_providers(compact='coun'))
@@ -1,5 +1,7 @@
 import json
+import os
 from base64 import b64decode
+from unittest.mock import patch
 
 from common_test.test_constants import DEFAULT_COMPACT
 from moto import mock_aws
@@ -94,3 +96,62 @@ class TestPaginated(TstFunction):
 
         # Should have NO last key since we've seen all available data
         self.assertIsNone(resp['pagination']['lastKey'])
+
+    def _put_providers(self, count: int) -> list[str]:
+        provider_ids = []
+        for i in range(1, count + 1):
+            provider_id = f'{MOCK_PROVIDER_ID_PREFIX}{i:02d}'
+            provider_ids.append(provider_id)
+            self.test_data_generator.put_default_provider_record_in_provider_table(
+                value_overrides={
+                    'providerId': provider_id,
+                    'familyName': f'Provider{i:02d}',
+                    'givenName': f'Test{i:02d}',
+                    # Every third provider is licensed in 'ky', for filtering
+                    'licenseJurisdiction': 'ky' if i % 3 == 0 else 'oh',
+                },
+                date_of_update_override=f'2024-01-{i:02d}T00:00:00+00:00',
+            )
+        return provider_ids
+
+    def _page_through(self, query, page_size: int, **kwargs) -> list[str]:
+        provider_ids = []
+        last_key = None
+        while True:
+            resp = query(compact='aslp', pagination={'pageSize': page_size, 'lastKey': last_key}, **kwargs)
+            self.assertLessEqual(len(resp['items']), page_size)
+            provider_ids.extend(str(item['providerId']) for item in resp['items'])
+            last_key = resp['pagination']['lastKey']
+            if last_key is None:
+                return provider_ids
+
+    @patch.dict(os.environ, {'PROVIDER_GSI_SHARDED_READS': 'true'})
+    def test_sharded_reads_return_every_provider_once_in_family_name_order(self):
+        provider_ids = self._put_providers(20)
+
+        self.assertEqual(
+            provider_ids,
+            self._page_through(self.config.data_client.get_providers_sorted_by_family_name, page_size=3),
+        )
+
+    @patch.dict(os.environ, {'PROVIDER_GSI_SHARDED_READS': 'true'})
+    def test_sharded_reads_return_every_provider_once_in_date_of_update_order(self):
+        provider_ids = self._put_providers(20)
+
+        self.assertEqual(
+            list(reversed(provider_ids)),
+            self._page_through(
+                self.config.data_client.get_providers_sorted_by_updated, page_size=7, scan_forward=False
+            ),
+        )
+
+    @patch.dict(os.environ, {'PROVIDER_GSI_SHARDED_READS': 'true'})
+    def test_sharded_reads_with_filter(self):
+        provider_ids = self._put_providers(20)
+
+        self.assertEqual(
+            provider_ids[2::3],
+            self._page_through(
+                self.config.data_client.get_providers_sorted_by_family_name, page_size=4, jurisdiction='ky'
+            ),
+        )
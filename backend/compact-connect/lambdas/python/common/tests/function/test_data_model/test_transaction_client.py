@@ -394,12 +394,8 @@ class TestTransactionClient(TstFunction):
         mock_table = MagicMock()
         mock_table.query.return_value = {'Items': []}
 
-        # Create a mock DynamoDB resource that returns our mock table
-        mock_resource = MagicMock()
-        mock_resource.Table.return_value = mock_table
-
-        # Patch boto3.resource to return our mock resource
-        with patch('cc_common.config.boto3.resource', return_value=mock_resource):
+        # Patch the config to return our mock table
+        with patch('cc_common.config._Config.transaction_history_table', mock_table):
             client = TransactionClient(self.config)
 
             # Try to get the most recent transaction for a compact with no transactions
@@ -0,0 +1,153 @@
+from datetime import datetime
+
+from common_test.test_constants import DEFAULT_COMPACT, DEFAULT_PROVIDER_ID
+from moto import mock_aws
+
+from tests.function import TstFunction
+
+
+@mock_aws
+class TestProviderReadProfiles(TstFunction):
+    def setUp(self):
+        super().setUp()
+
+        self.test_data_generator.put_default_provider_record_in_provider_table()
+        self.test_data_generator.put_default_license_record_in_provider_table()
+        self.test_data_generator.put_default_privilege_record_in_provider_table()
+        self.test_data_generator.put_default_privilege_update_record_in_provider_table()
+        self.test_data_generator.put_default_military_affiliation_in_provider_table()
+        self.test_data_generator.put_default_adverse_action_record_in_provider_table()
+        self.test_data_generator.put_default_investigation_record_in_provider_table()
+
+    def _get_provider_user_records(self, read_profile=None, **kwargs):
+        return self.config.data_client.get_provider_user_records(
+            compact=DEFAULT_COMPACT, provider_id=DEFAULT_PROVIDER_ID, read_profile=read_profile, **kwargs
+        )
+
+    def test_projection_fits_in_a_dynamodb_expression(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile, get_provider_query_projection
+
+        for read_profile in ProviderReadProfile:
+            with self.subTest(read_profile):
+                projection = get_provider_query_projection(read_profile)
+                # DynamoDB limits expressions to 4KB
+                self.assertLess(len(projection['ProjectionExpression'].encode()), 4096)
+
+    def test_profiles_omit_their_attributes(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile
+
+        full_records = self._get_provider_user_records().provider_records
+        full_attributes = {attribute for record in full_records for attribute in record}
+        self.assertTrue({'attestations', 'documentKeys', 'ssnLastFour'}.issubset(full_attributes))
+
+        for read_profile in ProviderReadProfile:
+            with self.subTest(read_profile):
+                records = self._get_provider_user_records(read_profile).provider_records
+                attributes = {attribute for record in records for attribute in record}
+
+                # Every record is still read, with its keys and type
+                self.assertEqual(
+                    sorted((record['pk'], record['sk'], record['type']) for record in full_records),
+                    sorted((record['pk'], record['sk'], record['type']) for record in records),
+                )
+                self.assertNotIn('documentKeys', attributes)
+                self.assertLess(attributes, full_attributes)
+
+    def test_search_document_profile_builds_the_same_document(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile
+        from cc_common.data_model.schema.provider.api import ProviderGeneralResponseSchema
+
+        schema = ProviderGeneralResponseSchema()
+
+        full_document = schema.load(self._get_provider_user_records().generate_api_response_object())
+        profile_document = schema.load(
+            self._get_provider_user_records(ProviderReadProfile.SEARCH_DOCUMENT).generate_api_response_object()
+        )
+
+        self.assertEqual(full_document, profile_document)
+
+    def test_notification_profile_loads_partial_records(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile
+        from cc_common.data_model.update_tier_enum import UpdateTierEnum
+
+        full_records = self._get_provider_user_records(include_update_tier=UpdateTierEnum.TIER_THREE)
+        provider_user_records = self._get_provider_user_records(
+            ProviderReadProfile.NOTIFICATION, include_update_tier=UpdateTierEnum.TIER_THREE
+        )
+
+        provider = provider_user_records.get_provider_record()
+        full_provider = full_records.get_provider_record()
+        self.assertEqual(full_provider.givenName, provider.givenName)
+        self.assertEqual(
+            full_provider.compactConnectRegisteredEmailAddress, provider.compactConnectRegisteredEmailAddress
+        )
+        self.assertNotIn('ssnLastFour', provider.to_dict())
+
+        # Calculated statuses are unaffected
+        self.assertEqual(
+            [(record.jurisdiction, record.status) for record in full_records.get_privilege_records()],
+            [(record.jurisdiction, record.status) for record in provider_user_records.get_privilege_records()],
+        )
+        self.assertEqual(
+            [(record.jurisdiction, record.licenseStatus) for record in full_records.get_license_records()],
+            [(record.jurisdiction, record.licenseStatus) for record in provider_user_records.get_license_records()],
+        )
+
+        # Update records load without the values they changed
+        (update,) = provider_user_records.get_all_privilege_update_records()
+        self.assertNotIn('previous', update.to_dict())
+        self.assertEqual(full_records.get_all_privilege_update_records()[0].updateType, update.updateType)
+
+    def test_get_provider_with_ingest_profile(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile
+
+        full_items = self.config.data_client.get_provider(compact=DEFAULT_COMPACT, provider_id=DEFAULT_PROVIDER_ID)[
+            'items'
+        ]
+        items = self.config.data_client.get_provider(
+            compact=DEFAULT_COMPACT, provider_id=DEFAULT_PROVIDER_ID, read_profile=ProviderReadProfile.INGEST
+        )['items']
+
+        # Ingest rewrites license and provider records, so reads them in full
+        for record_type in ('provider', 'license'):
+            self.assertEqual(
+                [item for item in full_items if item['type'] == record_type],
+                [item for item in items if item['type'] == record_type],
+            )
+        (privilege,) = [item for item in items if item['type'] == 'privilege']
+        self.assertNotIn('attestations', privilege)
+
+    def test_ingest_profile_round_trip_preserves_provider_record(self):
+        from cc_common.data_model.provider_read_profile import ProviderReadProfile
+        from cc_common.data_model.schema.base_record import BaseRecordSchema
+        from cc_common.data_model.schema.provider import ProviderData
+
+        # A provider record with every optional attribute set
+        self.test_data_generator.put_default_provider_record_in_provider_table(
+            value_overrides={
+                'suffix': 'Jr.',
+                'encumberedStatus': 'encumbered',
+                'militaryStatus': 'tentative',
+                'militaryStatusNote': 'Awaiting review',
+                'pendingEmailAddress': 'new-email@example.com',
+                'emailVerificationCode': '1234',
+                'emailVerificationExpiry': datetime.fromisoformat('2024-11-08T23:59:59+00:00'),
+                'recoveryToken': 'some-recovery-token',
+                'recoveryExpiry': datetime.fromisoformat('2024-11-08T23:59:59+00:00'),
+            }
+        )
+        (stored_provider,) = [
+            item for item in self.config.provider_table.scan()['Items'] if item['sk'] == f'{DEFAULT_COMPACT}#PROVIDER'
+        ]
+        # Every attribute the provider record schema stores is present, other than the statuses it calculates on load
+        schema = BaseRecordSchema.get_schema_by_type('provider')
+        declared_attributes = {field.data_key or name for name, field in schema.fields.items()}
+        self.assertEqual(declared_attributes - {'licenseStatus', 'compactEligibility'}, set(stored_provider))
+
+        items = self.config.data_client.get_provider(
+            compact=DEFAULT_COMPACT, provider_id=DEFAULT_PROVIDER_ID, read_profile=ProviderReadProfile.INGEST
+        )['items']
+        (provider,) = [item for item in items if item['type'] == 'provider']
+
+        # Ingest writes the provider record back, rebuilt from what it read
+        self.assertEqual(stored_provider, ProviderData.create_new(provider).serialize_to_database_record())
@@ -0,0 +1,69 @@
+import time
+
+from common_test.test_constants import DEFAULT_COMPACT
+from moto import mock_aws
+
+from tests.function import TstFunction
+
+
+@mock_aws
+class TestScanProviderPartitions(TstFunction):
+    def setUp(self):
+        super().setUp()
+
+        self.provider_ids = []
+        for i in range(20):
+            provider_id = f'00000000-0000-0000-0000-{i:012d}'
+            self.test_data_generator.put_default_provider_record_in_provider_table(
+                value_overrides={'providerId': provider_id}
+            )
+            self.test_data_generator.put_default_license_record_in_provider_table(
+                value_overrides={'providerId': provider_id}
+            )
+            self.provider_ids.append(provider_id)
+
+    def _scan_segment(self, segment: int, total_segments: int, **kwargs) -> list:
+        return list(
+            self.config.data_client.scan_provider_partitions(
+                segment=segment, total_segments=total_segments, page_size=3, **kwargs
+            )
+        )
+
+    def test_every_partition_is_assembled_once_across_segments(self):
+        partitions = {}
+        for segment in range(4):
+            pages = self._scan_segment(segment, 4)
+            self.assertIsNone(pages[-1].last_key)
+            for page in pages:
+                for pk in page.partitions:
+                    self.assertNotIn(pk, partitions)
+                partitions.update(page.partitions)
+
+        self.assertEqual(
+            sorted(f'{DEFAULT_COMPACT}#PROVIDER#{provider_id}' for provider_id in self.provider_ids),
+            sorted(partitions.keys()),
+        )
+        # Partitions span scan pages, but are only yielded whole
+        for records in partitions.values():
+            self.assertEqual(['license', 'provider'], sorted(record['type'] for record in records))
+
+    def test_resuming_from_a_page_reads_the_rest_of_the_segment(self):
+        pages = self._scan_segment(0, 1)
+        all_pks = [pk for page in pages for pk in page.partitions]
+
+        resumed_pages = self._scan_segment(0, 1, exclusive_start_key=pages[2].last_key)
+
+        self.assertEqual(
+            all_pks[len([pk for page in pages[:3] for pk in page.partitions]) :],
+            [pk for page in resumed_pages for pk in page.partitions],
+        )
+
+    def test_pages_record_when_their_partitions_started_to_be_read(self):
+        started_at = time.time()
+        pages = self._scan_segment(0, 1)
+        finished_at = time.time()
+
+        read_ats = [page.read_at for page in pages]
+        self.assertEqual(sorted(read_ats), read_ats)
+        for read_at in read_ats:
+            self.assertTrue(started_at <= read_at <= finished_at)
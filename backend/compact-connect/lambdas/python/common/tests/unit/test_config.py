@@ -0,0 +1,82 @@
+import os
+from unittest.mock import patch
+
+from tests import TstLambdas
+
+
+class TestConfigClientRegistry(TstLambdas):
+    def setUp(self):
+        import cc_common.config
+
+        # A fresh config for each test, so that no clients are carried over between tests
+        self.config = cc_common.config._Config()  # noqa: SLF001 protected-access
+
+    def test_table_handles_are_memoized(self):
+        for table_property in ('transaction_history_table', 'rate_limiting_table', 'event_state_table'):
+            with self.subTest(table_property):
+                self.assertIs(getattr(self.config, table_property), getattr(self.config, table_property))
+
+    def test_tables_share_a_dynamodb_client(self):
+        table_client = self.config.provider_table.meta.client
+
+        self.assertIs(table_client, self.config.transaction_history_table.meta.client)
+        self.assertIs(table_client, self.config.rate_limiting_table.meta.client)
+
+    def test_sqs_client_is_shared_with_the_preprocessing_queue(self):
+        self.assertIs(self.config.sqs_client, self.config.license_preprocessing_queue.meta.client)
+
+    def test_clients_use_shared_client_configuration(self):
+        client_config = self.config.events_client.meta.config
+
+        self.assertEqual(self.config.boto_max_pool_connections, client_config.max_pool_connections)
+        self.assertTrue(client_config.tcp_keepalive)
+        self.assertEqual('standard', client_config.retries['mode'])
+        self.assertEqual(10, client_config.retries['total_max_attempts'])
+
+    def test_dynamodb_clients_keep_legacy_attempt_count(self):
+        for client in (self.config.dynamodb_client, self.config.provider_table.meta.client):
+            self.assertEqual(10, client.meta.config.retries['total_max_attempts'])
+
+    def test_client_configuration_overrides_are_merged(self):
+        client_config = self.config.s3_client.meta.config
+
+        self.assertEqual('s3v4', client_config.signature_version)
+        self.assertEqual(self.config.boto_max_pool_connections, client_config.max_pool_connections)
+        self.assertTrue(client_config.tcp_keepalive)
+
+
+class TestConfigSnapshot(TstLambdas):
+    def setUp(self):
+        import cc_common.config
+
+        self.config = cc_common.config._Config()  # noqa: SLF001 protected-access
+
+    def test_snapshot_is_parsed_once(self):
+        self.assertIs(self.config.snapshot, self.config.snapshot)
+
+    def test_license_type_lookups(self):
+        self.assertEqual('slp', self.config.license_type_abbreviation('aslp', 'speech-language pathologist'))
+        self.assertEqual('speech-language pathologist', self.config.license_type_name('aslp', 'SLP'))
+        self.assertIsNone(self.config.license_type_abbreviation('aslp', 'occupational therapist'))
+        self.assertIsNone(self.config.license_type_name('not-a-compact', 'slp'))
+
+    def test_compact_and_jurisdiction_membership(self):
+        self.assertTrue(self.config.is_valid_compact('aslp'))
+        self.assertFalse(self.config.is_valid_compact('not-a-compact'))
+        self.assertTrue(self.config.is_valid_jurisdiction('oh'))
+        self.assertFalse(self.config.is_valid_jurisdiction('not-a-jurisdiction'))
+
+    def test_returned_collections_do_not_share_the_snapshot(self):
+        self.config.compacts.append('not-a-compact')
+        self.config.license_type_abbreviations['aslp']['not-a-license-type'] = 'nope'
+
+        self.assertFalse(self.config.is_valid_compact('not-a-compact'))
+        self.assertIsNone(self.config.license_type_abbreviation('aslp', 'not-a-license-type'))
+
+    def test_reload_snapshot_reads_the_environment_again(self):
+        with patch.dict(os.environ, {'COMPACTS': '["aslp"]'}):
+            self.config.reload_snapshot()
+            self.assertEqual(['aslp'], self.config.compacts)
+
+        self.config.reload_snapshot()
+        self.assertTrue(self.config.is_valid_compact('octp'))
@@ -0,0 +1,105 @@
+from unittest.mock import MagicMock
+
+from tests import TstLambdas
+
+
+class TestBatchGetItems(TstLambdas):
+    def setUp(self):
+        self.mock_table = MagicMock(name='provider-table')
+        self.mock_table.table_name = 'provider-table'
+        self.mock_client = self.mock_table.meta.client
+        self.sleeps = []
+
+    def _keys(self, count: int) -> list[dict]:
+        return [{'pk': f'aslp#PROVIDER#{i}', 'sk': 'aslp#PROVIDER'} for i in range(count)]
+
+    def _batch_get_items(self, keys, **kwargs):
+        from cc_common.data_model.batch_get import batch_get_items
+
+        return batch_get_items(self.mock_table, keys, sleep=self.sleeps.append, **kwargs)
+
+    def _respond(self, *, unprocessed_count: int = 0, always_unprocessed: bool = False):
+        """Respond with every requested key as an item, except the last unprocessed_count keys of the first request"""
+        requests = []
+
+        def batch_get_item(RequestItems):  # noqa: N803 invalid-name
+            keys = RequestItems['provider-table']['Keys']
+            if always_unprocessed:
+                unprocessed = keys
+            elif not requests:
+                unprocessed = keys[len(keys) - unprocessed_count :]
+            else:
+                unprocessed = []
+            requests.append(RequestItems)
+            processed = keys[: len(keys) - len(unprocessed)]
+            return {
+                'Responses': {'provider-table': [dict(key) for key in processed]},
+                'UnprocessedKeys': {'provider-table': {'Keys': unprocessed}} if unprocessed else {},
+            }
+
+        self.mock_client.batch_get_item.side_effect = batch_get_item
+        return requests
+
+    def test_keys_are_requested_in_batches_of_100(self):
+        requests = self._respond()
+
+        result = self._batch_get_items(self._keys(250))
+
+        self.assertEqual([100, 100, 50], sorted((len(r['provider-table']['Keys']) for r in requests), reverse=True))
+        self.assertEqual(sorted(key['pk'] for key in self._keys(250)), sorted(item['pk'] for item in result.items))
+        self.assertEqual([], result.unprocessed_keys)
+        self.assertEqual([], self.sleeps)
+
+    def test_duplicate_keys_are_requested_once(self):
+        requests = self._respond()
+
+        result = self._batch_get_items(self._keys(3) + self._keys(3))
+
+        self.assertEqual(1, len(requests))
+        self.assertEqual(3, len(result.items))
+
+    def test_no_keys_makes_no_requests(self):
+        result = self._batch_get_items([])
+
+        self.mock_client.batch_get_item.assert_not_called()
+        self.assertEqual([], result.items)
+
+    def test_unprocessed_keys_are_retried_after_backoff(self):
+        requests = self._respond(unprocessed_count=5)
+
+        result = self._batch_get_items(self._keys(10), base_delay=0.05, max_delay=5.0)
+
+        self.assertEqual(2, len(requests))
+        self.assertEqual(self._keys(10)[5:], requests[1]['provider-table']['Keys'])
+        self.assertEqual(10, len(result.items))
+        self.assertEqual([], result.unprocessed_keys)
+        self.assertEqual(1, len(self.sleeps))
+        self.assertTrue(0.05 <= self.sleeps[0] <= 0.15)
+
+    def test_keys_still_unprocessed_are_returned(self):
+        requests = self._respond(always_unprocessed=True)
+
+        result = self._batch_get_items(self._keys(10), max_attempts=4, base_delay=0.05, max_delay=0.2)
+
+        self.assertEqual(4, len(requests))
+        self.assertEqual([], result.items)
+        self.assertEqual(self._keys(10), result.unprocessed_keys)
+        # A backoff between each attempt, with jitter, but never longer than the max delay
+        self.assertEqual(3, len(self.sleeps))
+        for delay in self.sleeps:
+            self.assertTrue(0.05 <= delay <= 0.2)
+
+    def test_projection(self):
+        requests = self._respond()
+
+        self._batch_get_items(self._keys(1), projection=('providerId', 'type'), consistent_read=True)
+
+        self.assertEqual(
+            {
+                'Keys': self._keys(1),
+                'ConsistentRead': True,
+                'ProjectionExpression': '#providerId, #type',
+                'ExpressionAttributeNames': {'#providerId': 'providerId', '#type': 'type'},
+            },
+            requests[0]['provider-table'],
+        )
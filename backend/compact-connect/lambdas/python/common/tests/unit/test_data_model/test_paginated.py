@@ -1,6 +1,6 @@
 # ruff: noqa: ARG001, SLF001 unused-function-argument private-access
 import json
-from base64 import b64encode
+from base64 import b64decode, b64encode
 
 from botocore.exceptions import ClientError
 
@@ -440,3 +440,102 @@ class TestPaginated(TstLambdas):
             ],
             calls,
         )
+
+    def _sharded_query(self, shards: dict[int, list[str]], calls: list):
+        """Build a fake sharded query, where each shard holds items with the provided, pre-sorted, sort keys"""
+
+        def get_something(*args, shard: int, scan_forward: bool = True, dynamo_pagination: dict, **kwargs):
+            calls.append((shard, dynamo_pagination))
+            values = shards[shard] if scan_forward else list(reversed(shards[shard]))
+            start_key = dynamo_pagination.get('ExclusiveStartKey')
+            start = values.index(start_key['givenName']) + 1 if start_key else 0
+            page = values[start : start + dynamo_pagination['Limit']]
+            resp = {'Items': [], 'Count': len(page)}
+            for value in page:
+                item = self._item.copy()
+                item['givenName'] = value
+                resp['Items'].append(item)
+            if start + dynamo_pagination['Limit'] < len(values):
+                resp['LastEvaluatedKey'] = {'pk': self._item['pk'], 'givenName': page[-1]}
+            return resp
+
+        return get_something
+
+    def _page_through(self, get_something, page_size: int, **kwargs) -> list[list[str]]:
+        pages = []
+        last_key = None
+        while True:
+            resp = get_something(pagination={'lastKey': last_key, 'pageSize': page_size}, **kwargs)
+            pages.append([item['givenName'] for item in resp['items']])
+            last_key = resp['pagination']['lastKey']
+            if last_key is None:
+                return pages
+
+    def test_scatter_gather_merges_shards_in_sort_order(self):
+        from cc_common.data_model.query_paginator import paginated_query
+
+        calls = []
+        shards = {0: ['a', 'd', 'e', 'h'], 1: ['b', 'c'], 2: [], 3: ['f', 'g', 'i']}
+        get_something = paginated_query(shard_count=lambda: 4, sort_key='givenName')(self._sharded_query(shards, calls))
+
+        self.assertEqual([['a', 'b', 'c'], ['d', 'e', 'f'], ['g', 'h', 'i']], self._page_through(get_something, 3))
+        # Every shard is queried for the first page, but exhausted shards are not queried again
+        self.assertEqual([0, 1, 2, 3], sorted(shard for shard, _ in calls[:4]))
+        self.assertNotIn(2, [shard for shard, _ in calls[4:]])
+
+    def test_scatter_gather_reverse_order(self):
+        from cc_common.data_model.query_paginator import paginated_query
+
+        calls = []
+        shards = {0: ['a', 'd', 'e', 'h'], 1: ['b', 'c'], 2: ['f', 'g', 'i']}
+        get_something = paginated_query(shard_count=lambda: 3, sort_key='givenName')(self._sharded_query(shards, calls))
+
+        self.assertEqual(
+            [['i', 'h', 'g', 'f'], ['e', 'd', 'c', 'b'], ['a']],
+            self._page_through(get_something, 4, scan_forward=False),
+        )
+
+    def test_scatter_gather_lastkey_is_composite(self):
+        from cc_common.data_model.query_paginator import paginated_query
+
+        calls = []
+        shards = {0: ['a', 'c'], 1: ['b']}
+        get_something = paginated_query(shard_count=lambda: 2, sort_key='givenName')(self._sharded_query(shards, calls))
+
+        resp = get_something(pagination={'pageSize': 2})
+        self.assertEqual(
+            # Shard 0 resumes after 'a', shard 1 has been read to its end
+            {'shards': [{'pk': self._item['pk'], 'givenName': 'a'}, None]},
+            json.loads(b64decode(resp['pagination']['lastKey'])),
+        )
+
+    def test_scatter_gather_disabled(self):
+        from cc_common.data_model.query_paginator import paginated_query
+
+        calls = []
+
+        @paginated_query(shard_count=lambda: 0, sort_key='givenName')
+        def get_something(*args, **kwargs):
+            calls.append(kwargs)
+            return {'Items': [self._item], 'Count': 1}
+
+        get_something(pagination={'pageSize': 5})
+        # Without shards, the query is called once, as normal, with no shard
+        self.assertEqual([{'dynamo_pagination': {'Limit': 5}}], calls)
+
+    def test_scatter_gather_invalid_key(self):
+        from cc_common.data_model.query_paginator import paginated_query
+        from cc_common.exceptions import CCInvalidRequestException
+
+        get_something = paginated_query(shard_count=lambda: 2, sort_key='givenName')(self._sharded_query({}, []))
+
+        for last_key in ({'pk': 'not-composite'}, {'shards': [{}]}, {'shards': [{}, 'not-a-key']}):
+            with self.subTest(last_key=last_key):
+                with self.assertRaises(CCInvalidRequestException):
+                    get_something(pagination={'lastKey': b64encode(json.dumps(last_key).encode('utf-8'))})
+
+    def test_scatter_gather_requires_sort_key(self):
+        from cc_common.data_model.query_paginator import paginated_query
+
+        with self.assertRaises(ValueError):
+            paginated_query(shard_count=lambda: 2)
@@ -0,0 +1,89 @@
+import json
+from copy import deepcopy
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from tests import TstLambdas
+
+
+class TestTrustedLoad(TstLambdas):
+    @staticmethod
+    def _generate_database_records() -> dict[str, dict]:
+        """A record, as our system writes it to the database, for every registered record type"""
+        from cc_common.data_model.schema.base_record import BaseRecordSchema
+        from common_test.test_data_generator import TestDataGenerator
+
+        records = {
+            data.type: data.serialize_to_database_record()
+            for data in (
+                TestDataGenerator.generate_default_adverse_action(),
+                TestDataGenerator.generate_default_investigation(),
+                TestDataGenerator.generate_default_military_affiliation(),
+                TestDataGenerator.generate_default_license(),
+                TestDataGenerator.generate_default_license_update(),
+                TestDataGenerator.generate_default_privilege(),
+                TestDataGenerator.generate_default_privilege_update(),
+                TestDataGenerator.generate_default_provider(),
+                TestDataGenerator.generate_default_provider_update(),
+                TestDataGenerator.generate_default_compact_configuration(),
+                TestDataGenerator.generate_default_jurisdiction_configuration(),
+                TestDataGenerator.generate_default_transaction(),
+            )
+        }
+
+        with open('tests/resources/dynamo/attestation.json') as f:
+            records['attestation'] = json.load(f)
+
+        with open('tests/resources/dynamo/user.json') as f:
+            deserializer = TypeDeserializer()
+            records['user'] = {key: deserializer.deserialize(value) for key, value in json.load(f).items()}
+
+        records['unsettled_transaction'] = BaseRecordSchema.get_schema_by_type('unsettled_transaction').dump(
+            {'compact': 'aslp', 'transactionId': '123', 'transactionDate': '2024-01-01T12:00:00+00:00'}
+        )
+        return records
+
+    def test_trusted_load_matches_load_for_every_record_type(self):
+        from cc_common.data_model.schema.base_record import RECORD_SCHEMA_MODULES, BaseRecordSchema
+        from cc_common.data_model.schema.trusted_load import load_trusted_record
+
+        records = self._generate_database_records()
+
+        # Every record type must be covered, so new record types are checked too
+        self.assertEqual(set(RECORD_SCHEMA_MODULES), set(records))
+        for record_type, record in records.items():
+            with self.subTest(record_type):
+                schema = BaseRecordSchema.get_schema_by_type(record_type)
+
+                self.assertEqual(schema.load(deepcopy(record)), load_trusted_record(schema, deepcopy(record)))
+
+    def test_trusted_load_runs_load_hooks(self):
+        from cc_common.data_model.schema.license import LicenseData
+        from common_test.test_data_generator import TestDataGenerator
+
+        record = TestDataGenerator.generate_default_license().serialize_to_database_record()
+
+        self.assertNotIn('licenseStatus', record)
+
+        license_data = LicenseData.from_database_record(record, trusted=True)
+
+        # Calculated by a pre_load hook
+        self.assertEqual(LicenseData.from_database_record(record).licenseStatus, license_data.licenseStatus)
+        self.assertIn(license_data.licenseStatus, ('active', 'inactive'))
+        # GSI fields are dropped by post_load hooks
+        self.assertNotIn('pk', license_data.to_dict())
+        self.assertNotIn('licenseGSIPK', license_data.to_dict())
+
+    def test_trusted_load_skips_validation(self):
+        from cc_common.data_model.schema.license import LicenseData
+        from common_test.test_data_generator import TestDataGenerator
+        from marshmallow import ValidationError
+
+        record = TestDataGenerator.generate_default_license().serialize_to_database_record()
+        record['jurisdiction'] = 'not-a-jurisdiction'
+
+        with self.assertRaises(ValidationError):
+            LicenseData.from_database_record(record)
+
+        license_data = LicenseData.from_database_record(record, trusted=True)
+        self.assertEqual('not-a-jurisdiction', license_data.jurisdiction)
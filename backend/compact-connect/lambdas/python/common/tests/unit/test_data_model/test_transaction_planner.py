@@ -0,0 +1,210 @@
+from threading import Lock
+from unittest.mock import MagicMock
+
+from tests import TstLambdas
+
+
+class TestTransactionWritePlanner(TstLambdas):
+    def setUp(self):
+        self.mock_client = MagicMock(name='dynamodb-client')
+        self.transactions = []
+        self._lock = Lock()
+
+        def transact_write_items(TransactItems, ClientRequestToken):  # noqa: N803 invalid-name
+            with self._lock:
+                self.transactions.append({'items': TransactItems, 'token': ClientRequestToken})
+
+        self.mock_client.transact_write_items.side_effect = transact_write_items
+
+    def _planner(self, **kwargs):
+        from cc_common.data_model.transaction_planner import TransactionWritePlanner
+
+        return TransactionWritePlanner(self.mock_client, **kwargs)
+
+    @staticmethod
+    def _put(sk: str) -> dict:
+        return {'Put': {'TableName': 'provider-table', 'Item': {'pk': 'aslp#PROVIDER#1', 'sk': sk}}}
+
+    @staticmethod
+    def _delete(sk: str) -> dict:
+        return {'Delete': {'TableName': 'provider-table', 'Key': {'pk': 'aslp#PROVIDER#1', 'sk': sk}}}
+
+    @staticmethod
+    def _sks(items: list[dict]) -> list[str]:
+        return [operation.get('Item', operation.get('Key'))['sk'] for item in items for operation in item.values()]
+
+    def test_independent_items_are_packed_into_transactions_of_100(self):
+        from cc_common.data_model.transaction_planner import TransactionGroupStatus
+
+        planner = self._planner()
+        planner.add_items(self._put(f'record/{i}') for i in range(250))
+
+        result = planner.execute()
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual(3, result.transaction_count)
+        self.assertEqual([100, 100, 50], sorted((len(t['items']) for t in self.transactions), reverse=True))
+        self.assertEqual({TransactionGroupStatus.COMMITTED}, {group.status for group in result.groups})
+        # Every transaction gets its own idempotency token, within DynamoDB's length limit
+        tokens = [t['token'] for t in self.transactions]
+        self.assertEqual(3, len(set(tokens)))
+        for token in tokens:
+            self.assertTrue(1 <= len(token) <= 36)
+
+    def test_groups_are_never_split(self):
+        planner = self._planner()
+        for group in range(3):
+            planner.add_group(self._put(f'record/{group}/{i}') for i in range(60))
+
+        stages = planner.plan()
+
+        self.assertEqual(1, len(stages))
+        self.assertEqual([60, 60, 60], [len(transaction.items) for transaction in stages[0]])
+        self.assertEqual([[0], [1], [2]], [transaction.group_ids for transaction in stages[0]])
+
+    def test_small_groups_are_packed_together(self):
+        planner = self._planner()
+        for group in range(30):
+            planner.add_group([self._put(f'record/{group}'), self._put(f'record/{group}/update')])
+
+        stages = planner.plan()
+
+        self.assertEqual([[60]], [[len(transaction.items) for transaction in stage] for stage in stages])
+
+    def test_ordered_group_shares_a_transaction_with_its_dependencies_when_it_fits(self):
+        planner = self._planner()
+        first_ids = planner.add_items(self._put(f'record/{i}') for i in range(10))
+        planner.add_group([self._delete('old-record')], after=first_ids)
+
+        planner.execute()
+
+        self.assertEqual(1, len(self.transactions))
+        self.assertEqual(11, len(self.transactions[0]['items']))
+
+    def test_ordered_group_is_committed_after_its_dependencies(self):
+        planner = self._planner(max_transaction_items=3)
+        first_ids = planner.add_items(self._put(f'record/{i}') for i in range(5))
+        second_ids = planner.add_items((self._delete(f'old-record/{i}') for i in range(2)), after=first_ids)
+        planner.add_group([self._delete('final')], after=[*first_ids, *second_ids])
+
+        stages = planner.plan()
+        planner.execute()
+
+        # The dependencies are split over two transactions, so the ordered items can share neither
+        self.assertEqual(
+            [
+                [['record/0', 'record/1', 'record/2'], ['record/3', 'record/4']],
+                [['old-record/0', 'old-record/1', 'final']],
+            ],
+            [[self._sks(transaction.items) for transaction in stage] for stage in stages],
+        )
+        self.assertEqual(3, len(self.transactions))
+        self.assertEqual(['old-record/0', 'old-record/1', 'final'], self._sks(self.transactions[-1]['items']))
+
+    def test_items_acting_on_the_same_record_are_committed_in_order(self):
+        planner = self._planner()
+        planner.add_items([self._put('record/1'), self._put('record/2'), self._delete('record/1')])
+
+        stages = planner.plan()
+
+        self.assertEqual(
+            [[['record/1', 'record/2']], [['record/1']]],
+            [[self._sks(transaction.items) for transaction in stage] for stage in stages],
+        )
+        self.assertIn('Delete', stages[1][0].items[0])
+
+    def test_failed_transaction_skips_later_stages(self):
+        from cc_common.data_model.transaction_planner import TransactionGroupStatus
+
+        error = RuntimeError('Transaction cancelled')
+        self.mock_client.transact_write_items.side_effect = error
+
+        planner = self._planner()
+        first_id = planner.add_group([self._put('record/1')])
+        second_id = planner.add_group([self._delete('record/1')])
+
+        result = planner.execute()
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual(1, result.transaction_count)
+        self.assertIs(error, result.error)
+        self.assertEqual(TransactionGroupStatus.FAILED, result.groups[first_id].status)
+        self.assertEqual(TransactionGroupStatus.SKIPPED, result.groups[second_id].status)
+        self.assertEqual([result.groups[first_id]], result.failed_groups)
+
+    def test_failed_transaction_in_a_concurrent_stage(self):
+        from cc_common.data_model.transaction_planner import TransactionGroupStatus
+
+        error = RuntimeError('Transaction cancelled')
+
+        def transact_write_items(TransactItems, ClientRequestToken):  # noqa: N803 invalid-name
+            with self._lock:
+                self.transactions.append({'items': TransactItems, 'token': ClientRequestToken})
+            if 'privilege/ne' in self._sks(TransactItems):
+                raise error
+
+        self.mock_client.transact_write_items.side_effect = transact_write_items
+
+        # Each privilege's record and update record are a group of their own, so the first stage has one transaction
+        # per privilege, committed concurrently
+        planner = self._planner(max_transaction_items=2, max_workers=4)
+        privilege_ids = {
+            jurisdiction: planner.add_group(
+                [self._put(f'privilege/{jurisdiction}'), self._put(f'privilege/{jurisdiction}/update')]
+            )
+            for jurisdiction in ('ky', 'ne', 'oh')
+        }
+        provider_id = planner.add_group([self._put('provider')], after=privilege_ids.values())
+
+        result = planner.execute()
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual(3, result.transaction_count)
+        self.assertIs(error, result.error)
+        # Every group's items were sent together
+        self.assertEqual(
+            sorted(
+                [
+                    ['privilege/ky', 'privilege/ky/update'],
+                    ['privilege/ne', 'privilege/ne/update'],
+                    ['privilege/oh', 'privilege/oh/update'],
+                ]
+            ),
+            sorted(self._sks(t['items']) for t in self.transactions),
+        )
+        self.assertEqual(
+            {
+                'ky': TransactionGroupStatus.COMMITTED,
+                'ne': TransactionGroupStatus.FAILED,
+                'oh': TransactionGroupStatus.COMMITTED,
+            },
+            {jurisdiction: result.groups[group_id].status for jurisdiction, group_id in privilege_ids.items()},
+        )
+        self.assertEqual(TransactionGroupStatus.SKIPPED, result.groups[provider_id].status)
+        self.assertEqual([result.groups[privilege_ids['ne']]], result.failed_groups)
+
+    def test_idempotency_key_makes_tokens_repeatable(self):
+        for _ in range(2):
+            planner = self._planner(idempotency_key='message-id')
+            planner.add_items([self._put('record/1')])
+            planner.execute()
+
+        self.assertEqual(self.transactions[0]['token'], self.transactions[1]['token'])
+
+    def test_no_items_makes_no_requests(self):
+        result = self._planner().execute()
+
+        self.assertTrue(result.succeeded)
+        self.mock_client.transact_write_items.assert_not_called()
+
+    def test_invalid_groups_are_rejected(self):
+        planner = self._planner()
+
+        with self.assertRaises(ValueError):
+            planner.add_group([])
+        with self.assertRaises(ValueError):
+            planner.add_group(self._put(f'record/{i}') for i in range(101))
+        with self.assertRaises(ValueError):
+            planner.add_group([self._put('record/1'), self._delete('record/1')])
+        with self.assertRaises(ValueError):
+            planner.add_group([self._put('record/1')], after=[0])
@@ -167,6 +167,9 @@ class TestEventBatchWriter(TstLambdas):
         # 13 batches, one failure each
         self.assertEqual(13, writer.failed_entry_count)
         self.assertEqual(13, len(writer.failed_entries))
+        # The last entry of each batch
+        self.assertEqual([*range(9, 120, 10), 122], writer.failed_entry_indexes)
+        self.assertEqual(123, writer.sent_entry_count)
 
     def test_write_custom_batch_size(self):
         """Override the default batch size of 10"""
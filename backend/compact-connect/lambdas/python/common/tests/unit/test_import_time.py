@@ -0,0 +1,48 @@
+from common_test.import_time import IMPORT_TIME_BUDGET_SCALE, profile_import
+
+from tests import TstLambdas
+
+# Cold import time budgets, in seconds, for the modules our lambdas start from. These leave room for machine to machine
+# variation, so they catch substantial regressions, like a heavy dependency being imported eagerly.
+IMPORT_TIME_BUDGETS = {
+    'cc_common.config': 1.0,
+    'cc_common.utils': 1.5,
+    'cc_common.data_model.schema.base_record': 1.5,
+}
+
+# Modules that only some lambdas need, so must not be imported until they are used
+DEFERRED_MODULES = ('argon2', 'requests')
+
+
+class TestImportTime(TstLambdas):
+    def test_imports_are_within_budget(self):
+        for module_name, budget in IMPORT_TIME_BUDGETS.items():
+            with self.subTest(module_name):
+                profile = profile_import(module_name)
+
+                self.assertLessEqual(profile.cumulative_seconds, budget * IMPORT_TIME_BUDGET_SCALE)
+
+    def test_utils_defers_optional_imports(self):
+        profile = profile_import('cc_common.utils', repeat=1)
+
+        for module_name in DEFERRED_MODULES:
+            self.assertNotIn(module_name, profile.imported_modules)
+
+    def test_record_schemas_are_not_imported_with_the_schema_package(self):
+        profile = profile_import('cc_common.data_model.schema.base_record', repeat=1)
+
+        record_modules = {
+            module_name
+            for module_name in profile.imported_modules
+            if module_name.startswith('cc_common.data_model.schema.') and module_name.endswith('.record')
+        }
+        self.assertEqual(set(), record_modules)
+
+    def test_record_schema_is_registered_on_first_request(self):
+        from cc_common.data_model.schema.base_record import RECORD_SCHEMA_MODULES, BaseRecordSchema
+
+        for record_type in RECORD_SCHEMA_MODULES:
+            with self.subTest(record_type):
+                schema = BaseRecordSchema.get_schema_by_type(record_type)
+
+                self.assertIs(schema, BaseRecordSchema.get_schema_by_type(record_type))
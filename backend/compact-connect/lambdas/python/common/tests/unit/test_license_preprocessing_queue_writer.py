@@ -0,0 +1,175 @@
+# ruff: noqa: N803, ARG001 AWS defines the kwargs
+import json
+from threading import Event, Lock
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from tests import TstLambdas
+
+EVENT_TIME = '2024-12-04T08:08:08+00:00'
+
+
+class TestLicensePreprocessingQueueWriter(TstLambdas):
+    def setUp(self):
+        with open('tests/resources/api/license-post.json') as f:
+            self.license_record = json.load(f)
+        self.license_record['compact'] = 'aslp'
+        self.license_record['jurisdiction'] = 'oh'
+
+    def _licenses(self, count: int) -> list[dict]:
+        return [{**self.license_record, 'licenseNumber': f'licenseNumber-{i}'} for i in range(count)]
+
+    def test_write_big_batch(self):
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        sent = []
+        lock = Lock()
+
+        def mock_send_message_batch(QueueUrl: str, Entries: list[dict]):
+            with lock:
+                sent.extend(Entries)
+            return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.side_effect = mock_send_message_batch
+
+        with LicensePreprocessingQueueWriter(
+            client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME, max_workers=4
+        ) as writer:
+            for license_data in self._licenses(123):
+                writer.put_license(license_data)
+
+        # Make sure each message was eventually sent, with the event time included
+        self.assertEqual(123, len(sent))
+        self.assertEqual(123, writer.sent_count)
+        self.assertEqual([], writer.failed_license_numbers)
+        bodies = [json.loads(entry['MessageBody']) for entry in sent]
+        self.assertEqual({f'licenseNumber-{i}' for i in range(123)}, {body['licenseNumber'] for body in bodies})
+        self.assertEqual({EVENT_TIME}, {body['eventTime'] for body in bodies})
+        # Make sure these were sent in the expected number of batches:
+        # - 12 batches of 10
+        # - 1 batch of 3
+        # Total 13 batches
+        self.assertEqual(13, mock_client.send_message_batch.call_count)
+        for call in mock_client.send_message_batch.call_args_list:
+            self.assertEqual('some-queue-url', call.kwargs['QueueUrl'])
+
+    def test_write_exact_batch(self):
+        """Making sure that, in the event that we exit with exactly 0 messages remaining, we don't try
+        to send an empty batch
+        """
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+
+        with LicensePreprocessingQueueWriter(
+            client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME
+        ) as writer:
+            for license_data in self._licenses(10):
+                writer.put_license(license_data)
+
+        self.assertEqual(1, mock_client.send_message_batch.call_count)
+
+    def test_batches_are_sent_concurrently(self):
+        """The producer should be able to keep adding licenses while earlier batches are still in flight"""
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        release = Event()
+        in_flight = []
+        lock = Lock()
+
+        def mock_send_message_batch(QueueUrl: str, Entries: list[dict]):
+            with lock:
+                in_flight.append(Entries)
+            # Hold every batch until all workers are busy at once
+            release.wait(timeout=5)
+            return {'Successful': [], 'Failed': []}
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.side_effect = mock_send_message_batch
+
+        with LicensePreprocessingQueueWriter(
+            client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME, max_workers=3
+        ) as writer:
+            for license_data in self._licenses(30):
+                writer.put_license(license_data)
+            # We have put three full batches without blocking, even though none of them have completed
+            self.assertEqual(0, writer.sent_count)
+            release.set()
+
+        self.assertEqual(30, writer.sent_count)
+
+    def test_entry_failures(self):
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        def mock_send_message_batch(QueueUrl: str, Entries: list[dict]):
+            """Fail every last entry"""
+            return {
+                'Successful': [{'Id': entry['Id']} for entry in Entries[:-1]],
+                'Failed': [
+                    {'Id': Entries[-1]['Id'], 'SenderFault': False, 'Code': '1234', 'Message': 'Something went wrong'}
+                ],
+            }
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.side_effect = mock_send_message_batch
+
+        with LicensePreprocessingQueueWriter(
+            client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME
+        ) as writer:
+            for license_data in self._licenses(25):
+                writer.put_license(license_data)
+
+        self.assertEqual(22, writer.sent_count)
+        self.assertEqual(
+            ['licenseNumber-19', 'licenseNumber-24', 'licenseNumber-9'], sorted(writer.failed_license_numbers)
+        )
+
+    def test_batch_failure(self):
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.side_effect = ClientError(
+            error_response={'Error': {'Code': 'AccessDenied'}},
+            operation_name='SendMessageBatch',
+        )
+
+        with LicensePreprocessingQueueWriter(
+            client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME
+        ) as writer:
+            for license_data in self._licenses(5):
+                writer.put_license(license_data)
+
+        self.assertEqual(0, writer.sent_count)
+        self.assertEqual([f'licenseNumber-{i}' for i in range(5)], writer.failed_license_numbers)
+
+    def test_exception_recovery(self):
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        mock_client = MagicMock()
+        mock_client.send_message_batch.return_value = {'Successful': [], 'Failed': []}
+
+        def interrupted_with_exception():
+            with LicensePreprocessingQueueWriter(
+                client=mock_client, queue_url='some-queue-url', event_time=EVENT_TIME
+            ) as writer:
+                for license_data in self._licenses(3):
+                    writer.put_license(license_data)
+                raise RuntimeError('Oh noes!')
+
+        # Make sure the exception is not suppressed
+        with self.assertRaises(RuntimeError):
+            interrupted_with_exception()
+
+        # Make sure the pending batch was still sent
+        self.assertEqual(1, mock_client.send_message_batch.call_count)
+
+    def test_bad_use(self):
+        """LicensePreprocessingQueueWriter requires that it be used as a context manager"""
+        from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
+
+        writer = LicensePreprocessingQueueWriter(MagicMock(), queue_url='some-queue-url', event_time=EVENT_TIME)
+        with self.assertRaises(RuntimeError):
+            writer.put_license({})
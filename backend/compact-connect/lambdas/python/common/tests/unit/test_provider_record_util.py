@@ -1575,3 +1575,60 @@ class TestGetRecordsAssociatedWithLicense(TstLambdas):
 
     def test_returns_only_the_expected_records_and_nothing_else(self):
         self.assertEqual(self._keys(self.all_associated_records), self._keys(self.result))
+
+
+class TestProviderUserRecordsMaterialization(TstLambdas):
+    def setUp(self):
+        from common_test.test_data_generator import TestDataGenerator
+
+        privilege = TestDataGenerator.generate_default_privilege()
+        self.records = [
+            TestDataGenerator.generate_default_provider().serialize_to_database_record(),
+            TestDataGenerator.generate_default_license().serialize_to_database_record(),
+            privilege.serialize_to_database_record(),
+            TestDataGenerator.generate_default_privilege_update(
+                previous_privilege=privilege
+            ).serialize_to_database_record(),
+        ]
+
+    def test_records_are_only_converted_when_their_type_is_accessed(self):
+        from cc_common.data_model.provider_record_util import ProviderUserRecords
+        from cc_common.data_model.schema.privilege import PrivilegeUpdateData
+
+        with patch.object(
+            PrivilegeUpdateData, 'from_database_record', wraps=PrivilegeUpdateData.from_database_record
+        ) as mock_from_database_record:
+            provider_user_records = ProviderUserRecords(self.records)
+            provider_user_records.get_provider_record()
+            provider_user_records.get_license_records()
+            provider_user_records.get_privilege_records()
+            mock_from_database_record.assert_not_called()
+
+            update_records = provider_user_records.get_all_privilege_update_records()
+            self.assertEqual(1, len(update_records))
+            self.assertEqual(1, mock_from_database_record.call_count)
+
+            # Converted records are kept for later accesses
+            self.assertIs(update_records[0], provider_user_records.get_all_privilege_update_records()[0])
+            self.assertEqual(1, mock_from_database_record.call_count)
+
+    def test_unrecognized_record_types_are_ignored(self):
+        from cc_common.data_model.provider_record_util import ProviderUserRecords
+
+        provider_user_records = ProviderUserRecords([*self.records, {'type': 'not-a-record-type'}])
+
+        self.assertEqual(1, len(provider_user_records.get_privilege_records()))
+
+    def test_untrusted_records_are_validated_on_initialization(self):
+        from cc_common.data_model.provider_record_util import ProviderUserRecords
+        from marshmallow import ValidationError
+
+        invalid_records = [
+            {**record, 'jurisdictionUploadedLicenseStatus': 'foo'} if record['type'] == 'license' else record
+            for record in self.records
+        ]
+
+        # Trusted records are not validated, even once they are accessed
+        ProviderUserRecords(invalid_records).get_license_records()
+        with self.assertRaises(ValidationError):
+            ProviderUserRecords(invalid_records, trusted=False)
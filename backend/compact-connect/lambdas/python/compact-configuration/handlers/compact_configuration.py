@@ -49,7 +49,7 @@ def _validate_compact(compact: str) -> None:
     :param compact: The compact abbreviation to validate
     :raises CCInvalidRequestException: If the compact does not exist
     """
-    if compact.lower() not in config.compacts:
+    if not config.is_valid_compact(compact.lower()):
         logger.info('Invalid compact abbreviation', compact=compact)
         raise CCInvalidRequestException(f'Invalid compact abbreviation: {compact}')
 
@@ -61,7 +61,7 @@ def _validate_jurisdiction(jurisdiction: str) -> None:
     :param jurisdiction: The jurisdiction postal abbreviation to validate
     :raises CCInvalidRequestException: If the jurisdiction does not exist
     """
-    if jurisdiction.lower() not in config.jurisdictions:
+    if not config.is_valid_jurisdiction(jurisdiction.lower()):
         logger.info('Invalid jurisdiction postal abbreviation', jurisdiction=jurisdiction)
         raise CCInvalidRequestException(f'Invalid jurisdiction postal abbreviation: {jurisdiction}')
 
@@ -135,7 +135,7 @@ def _get_live_public_compact_jurisdictions(event: dict, context: LambdaContext):
     compacts_to_query = []
     if compact_filter:
         # Validate the compact
-        if compact_filter.lower() in config.compacts:
+        if config.is_valid_compact(compact_filter.lower()):
             compacts_to_query = [compact_filter.lower()]
             logger.info('Getting live jurisdictions for specific compact', compact=compact_filter)
         else:
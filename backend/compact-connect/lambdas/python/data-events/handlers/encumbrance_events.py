@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from cc_common.config import config, logger
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
 from cc_common.data_model.provider_record_util import ProviderData, ProviderUserRecords
 from cc_common.data_model.schema.common import LicenseEncumberedStatusEnum, PrivilegeEncumberedStatusEnum
 from cc_common.data_model.schema.data_event.api import (
@@ -43,6 +44,7 @@ def _get_provider_records(compact: str, provider_id: str) -> tuple[ProviderUserR
         provider_records = config.data_client.get_provider_user_records(
             compact=compact,
             provider_id=provider_id,
+            read_profile=ProviderReadProfile.NOTIFICATION,
         )
         provider_record = provider_records.get_provider_record()
         return provider_records, provider_record
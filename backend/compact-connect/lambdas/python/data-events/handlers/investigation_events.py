@@ -2,6 +2,7 @@ from typing import Any, Protocol
 from uuid import UUID
 
 from cc_common.config import config, logger
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
 from cc_common.data_model.provider_record_util import ProviderUserRecords
 from cc_common.data_model.schema.data_event.api import InvestigationEventDetailSchema
 from cc_common.data_model.schema.provider import ProviderData
@@ -31,6 +32,7 @@ def _get_provider_records(compact: str, provider_id: str) -> tuple[ProviderUserR
         provider_records = config.data_client.get_provider_user_records(
             compact=compact,
             provider_id=provider_id,
+            read_profile=ProviderReadProfile.NOTIFICATION,
         )
         provider_record = provider_records.get_provider_record()
         return provider_records, provider_record
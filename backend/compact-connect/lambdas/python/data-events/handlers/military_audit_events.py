@@ -1,4 +1,5 @@
 from cc_common.config import config, logger
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
 from cc_common.data_model.schema.data_event.api import MilitaryAuditEventDetailSchema
 from cc_common.data_model.schema.military_affiliation.common import MilitaryAuditStatus
 from cc_common.event_state_client import EventType, NotificationTracker, RecipientType
@@ -42,6 +43,7 @@ def military_audit_notification_listener(message: dict, tracker: NotificationTra
             provider_records = config.data_client.get_provider_user_records(
                 compact=compact,
                 provider_id=provider_id,
+                read_profile=ProviderReadProfile.NOTIFICATION,
             )
             provider_record = provider_records.get_provider_record()
         except Exception as e:
@@ -13,6 +13,7 @@ from cc_common.data_model.schema.license import LicenseData
 from cc_common.data_model.schema.license.record import LicenseRecordSchema
 from cc_common.data_model.schema.privilege import PrivilegeData
 from cc_common.data_model.schema.provider import ProviderData
+from cc_common.data_model.transaction_planner import TransactionWritePlanner
 from cc_common.data_model.update_tier_enum import UpdateTierEnum
 from cc_common.event_batch_writer import EventBatchWriter
 from cc_common.exceptions import CCInternalException, CCNotFoundException
@@ -543,30 +544,36 @@ def _extract_sk_from_transaction_item(transaction_item: dict) -> str | None:
     return None
 
 
-def _perform_transaction(transaction_items: list[dict], provider_id: str) -> None:
-    logger.info(f'Executing {len(transaction_items)} transaction items in batches of 100')
+def _perform_transaction(
+    primary_record_transaction_items: list[dict],
+    provider_id: str,
+    update_record_transaction_items: list[dict] | None = None,
+) -> None:
+    """
+    Commit the transaction items for a provider, committing no update record items before the primary record items.
+    """
+    # Use Table resource's client for automatic type conversion
+    planner = TransactionWritePlanner(
+        config.provider_table.meta.client, max_workers=config.transaction_write_concurrency
+    )
+    primary_group_ids = planner.add_items(primary_record_transaction_items)
+    planner.add_items(update_record_transaction_items or [], after=primary_group_ids)
 
-    for i in range(0, len(transaction_items), 100):
-        batch = transaction_items[i : i + 100]
-        # Use Table resource's client for automatic type conversion
-        try:
-            config.provider_table.meta.client.transact_write_items(TransactItems=batch)
-            logger.info(f'Executed batch {i // 100 + 1} with {len(batch)} items')
-        except ClientError as e:
-            # Extract all SKs from the failed transaction batch for debugging
-            failed_sks = [_extract_sk_from_transaction_item(item) for item in batch]
-            # filter out null values
-            failed_sks = [sk for sk in failed_sks if sk is not None]
+    result = planner.execute()
+    if not result.succeeded:
+        # Extract all SKs from the failed transactions for debugging
+        failed_sks = [_extract_sk_from_transaction_item(item) for group in result.failed_groups for item in group.items]
+        # filter out null values
+        failed_sks = [sk for sk in failed_sks if sk is not None]
 
-            logger.error(
-                'Transaction batch failed for provider',
-                provider_id=provider_id,
-                batch_number=i // 100 + 1,
-                batch_size=len(batch),
-                failed_sks=failed_sks,
-                error=str(e),
-            )
-            raise ProviderRollbackFailedException(message=str(e)) from e
+        logger.error(
+            'Transaction failed for provider',
+            provider_id=provider_id,
+            transaction_count=result.transaction_count,
+            failed_sks=failed_sks,
+            error=str(result.error),
+        )
+        raise ProviderRollbackFailedException(message=str(result.error)) from result.error
 
 
 def _check_for_orphaned_update_records(
@@ -686,6 +693,8 @@ def _build_and_execute_revert_transactions(
             provider_id=provider_id,
             # tier three includes all update records for the provider
             include_update_tier=UpdateTierEnum.TIER_THREE,
+            # records that no longer match their schema need manual review, so are validated before reverting them
+            trusted=False,
         )
     except ValidationError as e:
         logger.info('provider record data failed schema validation. Skipping provider', exc_info=e)
@@ -909,10 +918,7 @@ def _build_and_execute_revert_transactions(
             ineligible_updates=ineligible_updates,
         )
 
-    # process primary records first, then update records
-    transaction_items = primary_record_transaction_items + update_record_transactions_items
-
-    if not transaction_items:
+    if not primary_record_transaction_items and not update_record_transactions_items:
         # This should never happen, as it means that somehow the GSI query returned this provider id within
         # the search results, but the provider was not either skipped over or had something to revert as we expect.
         # If we do get here, we will exit the lambda in a failed state, as there is something unexpected happening that
@@ -924,7 +930,8 @@ def _build_and_execute_revert_transactions(
         logger.error(message, provider_id=provider_id)
         raise CCInternalException(message=f'{message} provider_id: {provider_id}')
 
-    _perform_transaction(transaction_items, provider_id)
+    # process primary records first, then update records
+    _perform_transaction(primary_record_transaction_items, provider_id, update_record_transactions_items)
     try:
         # Now read all the license records for the provider and update the provider record
         provider_records_after_rollback = config.data_client.get_provider_user_records(
@@ -0,0 +1,262 @@
+from collections.abc import Iterator
+from csv import Error as CSVError
+from csv import reader as csv_reader
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from io import TextIOWrapper
+
+from botocore.client import BaseClient
+from cc_common.config import logger
+from license_csv_reader import LicenseCSVReader
+from license_csv_validator import LicenseCSVValidator
+from marshmallow import ValidationError
+
+BOM = '\ufeff'
+
+
+@dataclass
+class BulkUploadShard:
+    """
+    A row-aligned byte range of a bulk upload file, which can be validated independently of the rest of the file
+
+    :param list[str] fieldnames: The file's CSV header
+    :param int start_byte: The offset of the first byte of the shard
+    :param int end_byte: The offset just past the last byte of the shard
+    :param int first_record_number: The record number of the first row in the shard
+    :param int record_count: The number of rows in the shard
+    :param dict[int, int] duplicate_ssn_records: Record numbers of rows in the shard that duplicate the
+    (ssn, licenseType) of an earlier row in the file, mapped to the record number of that earlier row
+    """
+
+    fieldnames: list[str]
+    start_byte: int
+    end_byte: int
+    first_record_number: int
+    record_count: int = 0
+    duplicate_ssn_records: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def byte_range(self) -> str:
+        """The shard's byte range, in the format of an HTTP Range header"""
+        return f'bytes={self.start_byte}-{self.end_byte - 1}'
+
+    def to_dict(self) -> dict:
+        return {
+            'fieldnames': self.fieldnames,
+            'startByte': self.start_byte,
+            'endByte': self.end_byte,
+            'firstRecordNumber': self.first_record_number,
+            'recordCount': self.record_count,
+            # JSON object keys have to be strings
+            'duplicateSsnRecords': {str(k): v for k, v in self.duplicate_ssn_records.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BulkUploadShard':
+        return cls(
+            fieldnames=data['fieldnames'],
+            start_byte=data['startByte'],
+            end_byte=data['endByte'],
+            first_record_number=data['firstRecordNumber'],
+            record_count=data['recordCount'],
+            duplicate_ssn_records={int(k): v for k, v in data['duplicateSsnRecords'].items()},
+        )
+
+
+class _OffsetTrackingLines:
+    """
+    Iterates over the lines of a text stream, keeping track of the byte offset of the end of the last line read.
+
+    The csv module only ever reads whole lines, so after it returns a row, `offset` is the end of that row.
+    """
+
+    def __init__(self, stream: TextIOWrapper, start_byte: int = 0):
+        self._lines = iter(stream)
+        self.offset = start_byte
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self.offset += len(line.encode('utf-8'))
+        return line
+
+
+def _ssn_digest(ssn: str, license_type: str) -> bytes:
+    # We only need to know which rows _might_ share an (ssn, licenseType), so a compact hash is all we keep
+    return blake2b(f'{ssn}\x00{license_type}'.encode(), digest_size=16).digest()
+
+
+def _column_index(fieldnames: list[str], name: str) -> int | None:
+    # DictReader keeps the last of any repeated column names, so we do the same
+    for i in reversed(range(len(fieldnames))):
+        if fieldnames[i] == name:
+            return i
+    return None
+
+
+def plan_bulk_upload_shards(
+    *,
+    s3_client: BaseClient,
+    bucket_name: str,
+    key: str,
+    compact: str,
+    jurisdiction: str,
+    target_shard_size: int,
+) -> list[BulkUploadShard] | None:
+    """
+    Split a bulk upload file into row-aligned shards of roughly `target_shard_size` bytes.
+
+    The file is read through once, with the csv module, to find where each row ends (rows may contain quoted line
+    breaks, so we can't just split on those) and to number the rows just as `LicenseCSVReader` would. Along the way,
+    we keep a digest of each row's (ssn, licenseType). Only rows whose digest appears more than once in the file
+    could possibly be duplicates, so only those rows are validated here, to find which of them are duplicates of an
+    earlier valid row. Each shard is told which of its rows are duplicates, so the shards can then be validated
+    independently, with the same results as validating the whole file in order.
+
+    :return: The shards, or None if the file is compressed or could not be read as CSV, in which case it should be
+    processed as a whole, so that it fails just as it would have without sharding.
+    """
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    body = response['Body']
+    if response.get('ContentEncoding'):
+        # Byte ranges of a compressed file can't be decompressed independently
+        logger.info(
+            'Bulk upload file is compressed, so will not be sharded', content_encoding=response['ContentEncoding']
+        )
+        body.close()
+        return None
+    # newline='' leaves line endings for the csv module to interpret, and keeps our byte count honest
+    lines = _OffsetTrackingLines(TextIOWrapper(body, encoding='utf-8', newline=''))
+    rows = csv_reader(_strip_bom(lines), dialect='excel', strict=True)
+
+    shards = []
+    # digest -> record numbers of every row with that digest
+    ssn_digests: dict[bytes, list[int]] = {}
+    # record number -> offset of the start of that row, for the first row with each digest
+    first_row_offsets: dict[int, int] = {}
+    try:
+        fieldnames = next(rows, [])
+        ssn_index = _column_index(fieldnames, 'ssn')
+        license_type_index = _column_index(fieldnames, 'licenseType')
+
+        record_number = 0
+        shard = BulkUploadShard(
+            fieldnames=fieldnames, start_byte=lines.offset, end_byte=lines.offset, first_record_number=1
+        )
+        row_start = lines.offset
+        for row in rows:
+            # Blank lines are skipped by DictReader, and so are not counted
+            if row:
+                record_number += 1
+                shard.record_count += 1
+                if ssn_index is not None and license_type_index is not None:
+                    ssn = row[ssn_index].strip() if ssn_index < len(row) else ''
+                    license_type = row[license_type_index].strip() if license_type_index < len(row) else ''
+                    # Rows without both values can't be valid, so can't duplicate anything
+                    if ssn and license_type:
+                        record_numbers = ssn_digests.setdefault(_ssn_digest(ssn, license_type), [])
+                        if not record_numbers:
+                            first_row_offsets[record_number] = row_start
+                        record_numbers.append(record_number)
+            row_start = lines.offset
+            if lines.offset - shard.start_byte >= target_shard_size:
+                shard.end_byte = lines.offset
+                shards.append(shard)
+                shard = BulkUploadShard(
+                    fieldnames=fieldnames,
+                    start_byte=lines.offset,
+                    end_byte=lines.offset,
+                    first_record_number=record_number + 1,
+                )
+        shard.end_byte = lines.offset
+        if shard.end_byte > shard.start_byte or not shards:
+            shards.append(shard)
+    except (CSVError, UnicodeDecodeError) as e:
+        logger.info('Bulk upload file could not be read as CSV, so will not be sharded', exc_info=e)
+        return None
+
+    # Merge the digests down to just the rows that might be duplicates
+    candidate_groups = [record_numbers for record_numbers in ssn_digests.values() if len(record_numbers) > 1]
+    if candidate_groups:
+        first_candidate_record_number = min(group[0] for group in candidate_groups)
+        duplicate_ssn_records = _find_duplicate_ssn_records(
+            s3_client=s3_client,
+            bucket_name=bucket_name,
+            key=key,
+            compact=compact,
+            jurisdiction=jurisdiction,
+            fieldnames=fieldnames,
+            candidate_record_numbers={record_number for group in candidate_groups for record_number in group},
+            start_record_number=first_candidate_record_number,
+            start_byte=first_row_offsets[first_candidate_record_number],
+        )
+        for shard in shards:
+            last_record_number = shard.first_record_number + shard.record_count - 1
+            shard.duplicate_ssn_records = {
+                record_number: matched_record_number
+                for record_number, matched_record_number in duplicate_ssn_records.items()
+                if shard.first_record_number <= record_number <= last_record_number
+            }
+
+    logger.info(
+        'Planned bulk upload shards',
+        shard_count=len(shards),
+        record_count=record_number,
+        duplicate_candidate_count=sum(len(group) for group in candidate_groups),
+    )
+    return shards
+
+
+def _strip_bom(lines: Iterator[str]) -> Iterator[str]:
+    # The BOM's bytes are still counted by `lines`, but it isn't part of the header
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+    yield first_line.removeprefix(BOM)
+    yield from lines
+
+
+def _find_duplicate_ssn_records(
+    *,
+    s3_client: BaseClient,
+    bucket_name: str,
+    key: str,
+    compact: str,
+    jurisdiction: str,
+    fieldnames: list[str],
+    candidate_record_numbers: set[int],
+    start_record_number: int,
+    start_byte: int,
+) -> dict[int, int]:
+    """
+    Validate the rows that might be duplicates, in file order, to find which are duplicates of an earlier valid row.
+
+    :return: The record numbers of duplicate rows, mapped to the record number of the row they duplicate
+    """
+    body = s3_client.get_object(Bucket=bucket_name, Key=key, Range=f'bytes={start_byte}-')['Body']
+    stream = TextIOWrapper(body, encoding='utf-8')
+    validator = LicenseCSVValidator(compact=compact, jurisdiction=jurisdiction)
+    last_record_number = max(candidate_record_numbers)
+
+    first_valid_records = {}
+    duplicate_ssn_records = {}
+    for record_number, raw_license in enumerate(
+        LicenseCSVReader().licenses(stream, fieldnames=fieldnames), start=start_record_number
+    ):
+        if record_number > last_record_number:
+            break
+        if record_number not in candidate_record_numbers:
+            continue
+        try:
+            loaded_license = validator.load_license(raw_license)
+        except ValidationError:
+            # Invalid rows are reported by their shard, and don't count as the first of their (ssn, licenseType)
+            continue
+        ssn_key = (loaded_license['ssn'], loaded_license['licenseType'])
+        if ssn_key in first_valid_records:
+            duplicate_ssn_records[record_number] = first_valid_records[ssn_key]
+        else:
+            first_valid_records[ssn_key] = record_number
+    return duplicate_ssn_records
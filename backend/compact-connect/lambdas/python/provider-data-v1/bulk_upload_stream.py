@@ -0,0 +1,52 @@
+from gzip import GzipFile
+from io import BufferedReader, RawIOBase
+from typing import BinaryIO
+
+# Content-Encodings a bulk upload file may be compressed with, mapped to a function that opens a decompressing stream
+DECOMPRESSORS = {'gzip': lambda body: GzipFile(fileobj=body, mode='rb')}
+
+SUPPORTED_CONTENT_ENCODINGS = tuple(DECOMPRESSORS)
+
+
+class _SizeLimitedReader(RawIOBase):
+    """Reads from a stream, raising an error if more than `max_bytes` are read from it"""
+
+    def __init__(self, stream: BinaryIO, max_bytes: int):
+        super().__init__()
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._stream.readinto(buffer)
+        self.bytes_read += count
+        if self.bytes_read > self._max_bytes:
+            raise ValueError(f'Decompressed file is larger than the maximum of {self._max_bytes} bytes')
+        return count
+
+
+def open_bulk_upload_stream(body: BinaryIO, *, content_encoding: str | None, max_decompressed_bytes: int) -> BinaryIO:
+    """
+    Open the body of a bulk upload object for reading, decompressing it as it is read, if it was uploaded compressed.
+
+    Decompression is incremental, so only a small window of the object is ever held in memory. Since a small
+    compressed file can expand to an enormous one, reading more than `max_decompressed_bytes` from a compressed file
+    raises an error.
+    :param body: The object's body, as returned by S3
+    :param content_encoding: The object's Content-Encoding
+    :param max_decompressed_bytes: The most bytes a compressed file may decompress to
+    :raises ValueError: If the object's Content-Encoding is not supported
+    """
+    if not content_encoding or content_encoding == 'identity':
+        return body
+    try:
+        decompressor = DECOMPRESSORS[content_encoding]
+    except KeyError as e:
+        raise ValueError(
+            f'Unsupported Content-Encoding, "{content_encoding}". Must be one of: '
+            f'{", ".join(SUPPORTED_CONTENT_ENCODINGS)}.'
+        ) from e
+    return BufferedReader(_SizeLimitedReader(decompressor(body), max_bytes=max_decompressed_bytes))
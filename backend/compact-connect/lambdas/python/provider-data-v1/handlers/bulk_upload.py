@@ -1,36 +1,43 @@
 import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from io import TextIOWrapper
+from typing import BinaryIO
 from uuid import uuid4
 
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from botocore.exceptions import ClientError
 from botocore.response import StreamingBody
+from bulk_upload_shards import BulkUploadShard, plan_bulk_upload_shards
+from bulk_upload_stream import SUPPORTED_CONTENT_ENCODINGS, open_bulk_upload_stream
 from cc_common.config import config, logger
-from cc_common.data_model.schema.license.api import (
-    LicensePostRequestSchema,
-    LicenseReportResponseSchema,
-)
+from cc_common.data_model.schema.license.api import LicenseReportResponseSchema
 from cc_common.event_batch_writer import EventBatchWriter
-from cc_common.exceptions import CCInternalException
+from cc_common.exceptions import CCInternalException, CCInvalidRequestException
 
 # initialize flag outside of handler so the flag is cached for the lifecycle of the lambda execution environment
 from cc_common.feature_flag_client import FeatureFlagEnum, is_feature_enabled  # noqa: E402
+from cc_common.license_preprocessing_queue_writer import LicensePreprocessingQueueWriter
 from cc_common.utils import (
     ResponseEncoder,
     api_handler,
     authorize_compact_jurisdiction,
-    send_licenses_to_preprocessing_queue,
+    sqs_handler,
 )
 from license_csv_reader import LicenseCSVReader
+from license_csv_validator import LicenseCSVValidator
 from marshmallow import ValidationError
-from marshmallow.exceptions import SCHEMA
 
 # this flag gates a record migration that deletes records, so we fail closed if the flag cannot be checked
 ssn_correction_migration_flag_enabled = is_feature_enabled(
     FeatureFlagEnum.LICENSE_SSN_CORRECTION_MIGRATION_FLAG, fail_default=False
 )
 
+# How long we keep track of which shards of a sharded file have been processed
+BULK_UPLOAD_SHARD_TRACKING_TTL = timedelta(days=7)
+# The most messages SQS accepts in a single batch
+SQS_SEND_BATCH_SIZE = 10
+
 
 @api_handler
 @authorize_compact_jurisdiction(action='write')
@@ -47,18 +54,36 @@ def _bulk_upload_url_handler(event: dict, context: LambdaContext):  # noqa: ARG0
     compact = event['pathParameters']['compact'].lower()
     jurisdiction = event['pathParameters']['jurisdiction'].lower()
 
-    logger.debug('Creating pre-signed POST', compact=compact, jurisdiction=jurisdiction)
+    # Uploads may optionally be compressed, in which case the file is decompressed as it is read for processing.
+    # Byte ranges of a compressed file can't be decompressed independently, so compressed files are never split into
+    # shards: the whole file is processed in a single invocation, within that invocation's time limit.
+    content_encoding = (event.get('queryStringParameters') or {}).get('contentEncoding')
+    if content_encoding is not None and content_encoding not in SUPPORTED_CONTENT_ENCODINGS:
+        raise CCInvalidRequestException(
+            f'Invalid contentEncoding, must be one of: {", ".join(SUPPORTED_CONTENT_ENCODINGS)}'
+        )
+
+    logger.debug(
+        'Creating pre-signed POST', compact=compact, jurisdiction=jurisdiction, content_encoding=content_encoding
+    )
+
+    # Limit content length to ~30MB, ~200k licenses (uncompressed)
+    conditions = [
+        ['content-length-range', 1, 30_000_000],
+        # Enforce that only CSV files can be uploaded
+        ['eq', '$Content-Type', 'text/csv'],
+    ]
+    fields = None
+    if content_encoding is not None:
+        conditions.append(['eq', '$Content-Encoding', content_encoding])
+        fields = {'Content-Encoding': content_encoding}
 
     upload = config.s3_client.generate_presigned_post(
         Bucket=config.bulk_bucket_name,
         Key=f'{compact}/{jurisdiction}/{uuid4().hex}',
         ExpiresIn=config.presigned_post_ttl_seconds,
-        # Limit content length to ~30MB, ~200k licenses
-        Conditions=[
-            ['content-length-range', 1, 30_000_000],
-            # Enforce that only CSV files can be uploaded
-            ['eq', '$Content-Type', 'text/csv'],
-        ],
+        Fields=fields,
+        Conditions=conditions,
     )
     logger.info('Created pre-signed POST', url=upload['url'])
     return {'upload': upload}
@@ -67,6 +92,10 @@ def _bulk_upload_url_handler(event: dict, context: LambdaContext):  # noqa: ARG0
 @logger.inject_lambda_context
 def parse_bulk_upload_file(event: dict, context: LambdaContext):  # noqa: ARG001 unused-argument
     """Receive an S3 put event, and parse/validate the new s3 file before deleting it
+
+    Files larger than the configured shard size are split into row-aligned shards, which are sent to the shard queue
+    for `process_bulk_upload_shards`, so large files are not bounded by a single invocation. The file is then deleted
+    once its last shard has been processed.
     :param event: Standard S3 ObjectCreated event
     :param LambdaContext context:
     """
@@ -82,8 +111,27 @@ def parse_bulk_upload_file(event: dict, context: LambdaContext):  # noqa: ARG001
             # Extract the compact and jurisdiction from the object upload path
             compact, jurisdiction = (i.lower() for i in key.split('/')[:2])
 
-            body: StreamingBody = config.s3_client.get_object(Bucket=bucket_name, Key=key)['Body']
+            shards = None
+            if 0 < config.bulk_upload_shard_size_bytes < size:
+                shards = plan_bulk_upload_shards(
+                    s3_client=config.s3_client,
+                    bucket_name=bucket_name,
+                    key=key,
+                    compact=compact,
+                    jurisdiction=jurisdiction,
+                    target_shard_size=config.bulk_upload_shard_size_bytes,
+                )
             try:
+                if shards is not None and len(shards) > 1:
+                    _send_bulk_upload_shards(shards=shards, event_time=event_time, bucket_name=bucket_name, key=key)
+                    # The object is deleted once its last shard has been processed
+                    continue
+                response = config.s3_client.get_object(Bucket=bucket_name, Key=key)
+                body = open_bulk_upload_stream(
+                    response['Body'],
+                    content_encoding=response.get('ContentEncoding'),
+                    max_decompressed_bytes=config.bulk_upload_max_decompressed_bytes,
+                )
                 process_bulk_upload_file(
                     event_time=event_time,
                     body=body,
@@ -124,97 +172,195 @@ def parse_bulk_upload_file(event: dict, context: LambdaContext):  # noqa: ARG001
         raise
 
 
+def _bulk_upload_shard_tracking_key(key: str) -> dict:
+    return {'pk': f'BULK_UPLOAD#{key}', 'sk': 'SHARDS'}
+
+
+def _send_bulk_upload_shards(
+    *,
+    shards: list[BulkUploadShard],
+    event_time: datetime,
+    bucket_name: str,
+    key: str,
+):
+    """
+    Send each shard of a bulk upload file to the shard queue, to be processed concurrently.
+
+    If this is a retry, shards that have already been processed are not sent again.
+    """
+    # Note how many shards there are, so the last shard to be processed knows it is the last
+    tracking = config.bulk_upload_shard_table.update_item(
+        Key=_bulk_upload_shard_tracking_key(key),
+        UpdateExpression='SET shardCount = :shard_count, #ttl = :ttl',
+        ExpressionAttributeNames={'#ttl': 'ttl'},
+        ExpressionAttributeValues={
+            ':shard_count': len(shards),
+            ':ttl': int(time.time() + BULK_UPLOAD_SHARD_TRACKING_TTL.total_seconds()),
+        },
+        ReturnValues='ALL_NEW',
+    )['Attributes']
+    completed_shards = tracking.get('completedShards', set())
+    pending_shards = [(index, shard) for index, shard in enumerate(shards) if index not in completed_shards]
+    logger.info(
+        'Sending bulk upload shards to the shard queue', shard_count=len(shards), pending_count=len(pending_shards)
+    )
+    if not pending_shards:
+        # Every shard was processed by an earlier attempt, but the object was not deleted
+        logger.info(f"Processing 's3://{bucket_name}/{key}' complete")
+        config.s3_client.delete_object(Bucket=bucket_name, Key=key)
+        return
+
+    for batch_start in range(0, len(pending_shards), SQS_SEND_BATCH_SIZE):
+        resp = config.bulk_upload_shard_queue.send_messages(
+            Entries=[
+                {
+                    'Id': str(index),
+                    'MessageBody': json.dumps(
+                        {
+                            'bucketName': bucket_name,
+                            'key': key,
+                            'eventTime': event_time.isoformat(),
+                            'shardIndex': index,
+                            'shard': shard.to_dict(),
+                        }
+                    ),
+                }
+                for index, shard in pending_shards[batch_start : batch_start + SQS_SEND_BATCH_SIZE]
+            ]
+        )
+        if resp.get('Failed'):
+            logger.error('Failed to send bulk upload shards!', failed=resp['Failed'])
+            raise CCInternalException('Failed to process object!')
+
+
+@sqs_handler
+def process_bulk_upload_shards(message: dict):
+    """
+    Process a shard of a bulk upload file from the shard queue, deleting the file once its last shard is processed.
+
+    Each shard is recorded as it completes, so a shard that is sent again, after it was processed, is skipped.
+    :param message: A shard of a bulk upload file, as sent by `parse_bulk_upload_file`
+    """
+    bucket_name = message['bucketName']
+    key = message['key']
+    shard_index = message['shardIndex']
+    with logger.append_context_keys(s3_url=f's3://{bucket_name}/{key}', shard_index=shard_index):
+        tracking = config.bulk_upload_shard_table.get_item(
+            Key=_bulk_upload_shard_tracking_key(key), ConsistentRead=True
+        ).get('Item', {})
+        if shard_index in tracking.get('completedShards', set()):
+            logger.info('Bulk upload shard has already been processed')
+            return
+
+        _process_bulk_upload_shard(message)
+
+        tracking = config.bulk_upload_shard_table.update_item(
+            Key=_bulk_upload_shard_tracking_key(key),
+            UpdateExpression='ADD completedShards :shard_index',
+            ExpressionAttributeValues={':shard_index': {shard_index}},
+            ReturnValues='ALL_NEW',
+        )['Attributes']
+        if len(tracking['completedShards']) >= tracking['shardCount']:
+            logger.info(f"Processing 's3://{bucket_name}/{key}' complete")
+            config.s3_client.delete_object(Bucket=bucket_name, Key=key)
+
+
+def _process_bulk_upload_shard(shard_event: dict):
+    """Process a single shard of a bulk upload file, with a ranged read of the object"""
+    bucket_name = shard_event['bucketName']
+    key = shard_event['key']
+    shard = BulkUploadShard.from_dict(shard_event['shard'])
+    compact, jurisdiction = (i.lower() for i in key.split('/')[:2])
+    logger.info(
+        'Processing bulk upload shard',
+        s3_url=f's3://{bucket_name}/{key}',
+        byte_range=shard.byte_range,
+        first_record_number=shard.first_record_number,
+        record_count=shard.record_count,
+    )
+
+    body: StreamingBody = config.s3_client.get_object(Bucket=bucket_name, Key=key, Range=shard.byte_range)['Body']
+    process_bulk_upload_file(
+        event_time=datetime.fromisoformat(shard_event['eventTime']),
+        body=body,
+        object_key=key,
+        compact=compact,
+        jurisdiction=jurisdiction,
+        shard=shard,
+    )
+
+
 def process_bulk_upload_file(
     *,
     event_time: datetime,
-    body: StreamingBody,
+    body: StreamingBody | BinaryIO,
     object_key: str,
     compact: str,
     jurisdiction: str,
+    shard: BulkUploadShard | None = None,
 ):
     """
     Stream each line of the new CSV file, validating it then publishing an ingest event for each line.
-    Process licenses in batches to avoid loading the entire file into memory.
+    Lines are validated in chunks by a compiled validator, which only falls back to the full license schema for lines
+    that fail validation, so that their errors are reported exactly as the schema describes them.
+    Valid licenses are handed to a pipelined queue writer, which sends them to the preprocessing queue from a bounded
+    pool of worker threads while parsing continues, so the entire file is never loaded into memory.
+
+    `body` is already decompressed, if the file was uploaded compressed.
+
+    If `shard` is provided, `body` is only that shard of the file, and record numbers and duplicate detection follow
+    the shard's place in the whole file.
     """
     report_schema = LicenseReportResponseSchema()
-    schema = LicensePostRequestSchema()
     reader = LicenseCSVReader()
+    if shard is None:
+        validator = LicenseCSVValidator(compact=compact, jurisdiction=jurisdiction)
+        fieldnames = None
+    else:
+        validator = LicenseCSVValidator(
+            compact=compact,
+            jurisdiction=jurisdiction,
+            first_record_number=shard.first_record_number,
+            duplicate_ssn_records=shard.duplicate_ssn_records,
+        )
+        fieldnames = shard.fieldnames
 
     # We need to use utf-8-sig to handle potential BOM characters at the beginning of the file
     stream = TextIOWrapper(body, encoding='utf-8-sig')
 
-    # Define batch size for processing to limit memory footprint
-    batch_size = 100
-    current_batch = []
-    total_processed = 0
     failed_validation_count = 0
-    # track which ssns were included in this file to detect duplicates,
-    # which are not allowed within the same file upload
-    # We track by (ssn, licenseType) tuple to allow same SSN for different license types
-    ssns_in_file_upload = {}
-
-    with EventBatchWriter(config.events_client) as event_writer:
-        for i, raw_license in enumerate(reader.licenses(stream)):
-            logger.debug('Processing line %s', i + 1)
-            try:
-                try:
-                    # dict() here, because it prevents `compact` and `jurisdiction` from being allowed in the
-                    # raw_license
-                    validated_license = schema.load(dict(compact=compact, jurisdiction=jurisdiction, **raw_license))
-                    # verify that this ssn/licenseType combination has not been used previously in the same batch
-                    ssn_key = (validated_license['ssn'], validated_license['licenseType'])
-                    matched_ssn_index = ssns_in_file_upload.get(ssn_key)
-                    if matched_ssn_index:
-                        # format the validation error as dict so it can be processed by email handler downstream
-                        raise ValidationError(
-                            {
-                                SCHEMA: [
-                                    f'Duplicate License SSN detected for license type '
-                                    f'{validated_license["licenseType"]}. SSN matches with record '
-                                    f'{matched_ssn_index}. Every record must have a unique SSN per license type '
-                                    f'within the same file.'
-                                ]
-                            }
-                        )
-                    ssns_in_file_upload.update({ssn_key: i + 1})
-                except TypeError as e:
-                    # This will be raised, if `raw_license` includes compact and/or jurisdiction fields
-                    logger.error('License contains unsupported fields', fields=list(raw_license.keys()), exc_info=e)
-                    raise ValidationError('License contains unsupported fields') from e
-                # TODO - remove this flag once the feature is proven stable  # noqa: FIX002
-                if not ssn_correction_migration_flag_enabled and validated_license.get('previousSSN'):
-                    logger.warning(
-                        'SSN-correction migration feature is disabled. Skipping record with previousSSN',
-                        record_number=i + 1,
-                    )
-                    continue
-                current_batch.append(schema.dump(validated_license))
-
-                # When batch is full, send to preprocessing queue
-                if len(current_batch) >= batch_size:
-                    _process_license_batch(current_batch, event_time, compact, jurisdiction)
-                    total_processed += len(current_batch)
-                    current_batch = []  # Reset batch
 
-            except ValidationError as e:
+    queue_writer = LicensePreprocessingQueueWriter(
+        client=config.sqs_client,
+        queue_url=config.license_preprocessing_queue_url,
+        event_time=event_time.isoformat(),
+        max_workers=config.license_preprocessing_queue_send_concurrency,
+    )
+    with EventBatchWriter(config.events_client) as event_writer, queue_writer:
+        for result in validator.validate(reader.licenses(stream, fieldnames=fieldnames)):
+            logger.debug('Processing line %s', result.record_number)
+            if result.error is not None:
                 failed_validation_count += 1
+                e = result.error
                 # This CSV line has failed validation. We will carefully collect what information we can
                 # and publish it as a failure event. Because this data may eventually be sent back over
                 # an email, we will only include the generally available values that we can still validate.
                 try:
-                    report_license_data = report_schema.load(raw_license)
+                    report_license_data = report_schema.load(result.raw_license)
                 except ValidationError as exc_second_try:
                     report_license_data = exc_second_try.valid_data
                 logger.info(
                     'Invalid license in line %s uploaded: %s',
-                    i + 1,
+                    result.record_number,
                     str(e),
                     compact=compact,
                     jurisdiction=jurisdiction,
                     exc_info=e,
                 )
                 # valid_data may contain licensee PII (name, license number, npi), so it is only logged at DEBUG
-                logger.debug('Invalid license record details', record_number=i + 1, valid_data=report_license_data)
+                logger.debug(
+                    'Invalid license record details', record_number=result.record_number, valid_data=report_license_data
+                )
                 event_writer.put_event(
                     Entry={
                         'Source': f'org.compactconnect.bulk-ingest.{object_key}',
@@ -224,7 +370,7 @@ def process_bulk_upload_file(
                                 'eventTime': config.current_standard_datetime.isoformat(),
                                 'compact': compact,
                                 'jurisdiction': jurisdiction,
-                                'recordNumber': i + 1,
+                                'recordNumber': result.record_number,
                                 'validData': report_license_data,
                                 'errors': e.messages,
                             },
@@ -235,50 +381,35 @@ def process_bulk_upload_file(
                 )
                 continue
 
-        # Process any remaining licenses in the final batch
-        if current_batch:
-            _process_license_batch(current_batch, event_time, compact, jurisdiction)
-            total_processed += len(current_batch)
+            # TODO - remove this flag once the feature is proven stable  # noqa: FIX002
+            if not ssn_correction_migration_flag_enabled and result.license.get('previousSSN'):
+                logger.warning(
+                    'SSN-correction migration feature is disabled. Skipping record with previousSSN',
+                    record_number=result.record_number,
+                )
+                continue
+            queue_writer.put_license(result.license)
 
     logger.info(
         'Bulk upload processing complete',
-        total_processed=total_processed,
+        total_processed=queue_writer.sent_count,
         failed_validation_count=failed_validation_count,
         compact=compact,
         jurisdiction=jurisdiction,
     )
 
-    if event_writer.failed_entry_count > 0:
-        logger.error('Failed to publish %s ingest failure events!', event_writer.failed_entry_count)
-        for failure in event_writer.failed_entries:
-            logger.debug('Failed event entry', entry=failure)
-
-        raise CCInternalException('Failed to process object!')
-
-
-def _process_license_batch(licenses_batch: list[dict], event_time: datetime, compact: str, jurisdiction: str):
-    """
-    Process a batch of licenses by sending them to the preprocessing queue.
-
-    :param licenses_batch: List of validated licenses to process
-    :param event_time: The event time
-    :param compact: The compact identifier
-    :param jurisdiction: The jurisdiction identifier
-    :raises CCInternalException: If any licenses fail to be sent to the queue
-    """
-    if not licenses_batch:
-        return
-
-    failed_license_numbers = send_licenses_to_preprocessing_queue(
-        licenses_data=licenses_batch,
-        event_time=event_time.isoformat(),
-    )
-
-    if failed_license_numbers:
+    if queue_writer.failed_license_numbers:
         logger.error(
             'Failed to send license messages to preprocessing queue!',
-            failed_license_numbers=failed_license_numbers,
+            failed_license_numbers=queue_writer.failed_license_numbers,
             compact=compact,
             jurisdiction=jurisdiction,
         )
         raise CCInternalException('Failed to process object!')
+
+    if event_writer.failed_entry_count > 0:
+        logger.error('Failed to publish %s ingest failure events!', event_writer.failed_entry_count)
+        for failure in event_writer.failed_entries:
+            logger.debug('Failed event entry', entry=failure)
+
+        raise CCInternalException('Failed to process object!')
@@ -1,9 +1,15 @@
 import json
+from collections.abc import Callable
 from copy import deepcopy
+from dataclasses import dataclass
+from hashlib import sha256
+from uuid import UUID
 
 from aws_lambda_powertools.metrics import MetricUnit
 from boto3.dynamodb.types import TypeSerializer
 from cc_common.config import config, logger, metrics
+from cc_common.data_model.data_client import MAX_DYNAMODB_TRANSACTION_ITEMS
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
 from cc_common.data_model.provider_record_util import ProviderRecordType, ProviderRecordUtility
 from cc_common.data_model.schema import LicenseRecordSchema
 from cc_common.data_model.schema.common import ActiveInactiveStatus, UpdateCategory
@@ -13,7 +19,7 @@ from cc_common.data_model.schema.license.record import LicenseUpdateRecordSchema
 from cc_common.data_model.schema.provider import ProviderData
 from cc_common.event_batch_writer import EventBatchWriter
 from cc_common.exceptions import CCNotFoundException
-from cc_common.utils import sqs_handler
+from cc_common.utils import sqs_batch_handler, sqs_handler
 
 license_schema = LicenseIngestSchema()
 license_update_schema = LicenseUpdateRecordSchema()
@@ -25,6 +31,28 @@ license_update_schema = LicenseUpdateRecordSchema()
 SSN_CORRECTION_FULL_MIGRATION_METRIC = 'ssn-correction-full-migration'
 SSN_CORRECTION_PARTIAL_MIGRATION_METRIC = 'ssn-correction-partial-migration'
 SSN_CORRECTION_NO_MIGRATION_METRIC = 'ssn-correction-no-migration'
+# Custom metric counting license uploads that were identical to the license already on record, so were not written
+UNCHANGED_LICENSE_SKIPPED_METRIC = 'unchanged-license-skipped'
+
+# Fields of a license record that are set at write time, rather than coming from the upload
+LICENSE_DYNAMIC_KEYS = frozenset({'dateOfUpdate', 'status', 'uploadDate', 'firstUploadDate'})
+
+
+@dataclass
+class _ProviderIngestState:
+    """
+    The parts of a provider's partition that license ingest needs, kept current as licenses are applied.
+
+    :param licenses_organized: License records, organized by jurisdiction, then license type
+    :param privilege_records: The provider's privilege records
+    :param current_provider_record: The provider record, if the provider exists yet
+    :param home_jurisdiction: The provider's current home jurisdiction selection, if any
+    """
+
+    licenses_organized: dict[str, dict[str, dict]]
+    privilege_records: list[dict]
+    current_provider_record: ProviderData | None = None
+    home_jurisdiction: str | None = None
 
 
 @sqs_handler
@@ -50,85 +78,212 @@ def preprocess_license_ingest(message: dict):
 
     with logger.append_context_keys(compact=compact, jurisdiction=jurisdiction):
         try:
-            # Get or create provider ID using the SSN and add it to the message_body
-            provider_id = config.data_client.get_or_create_provider_id(compact=compact, ssn=ssn)
-            message['providerId'] = provider_id
-
-            # Add the last 4 digits of SSN to the detail
-            message['ssnLastFour'] = ssn[-4:]
-
-            if previous_ssn is not None and previous_ssn != ssn:
-                # The state is correcting a previously-uploaded SSN. Resolve the previous SSN to its provider id
-                # so the ingest handler (which has no SSN access) can migrate that provider's records. If the
-                # previous SSN was never uploaded, this creates a mapping that simply resolves to a provider with
-                # no records, which the ingest handler treats as a no-op.
-                previous_provider_id = config.data_client.get_or_create_provider_id(compact=compact, ssn=previous_ssn)
-                if previous_provider_id != provider_id:
-                    message['previousProviderId'] = previous_provider_id
-                    logger.info(
-                        'SSN correction detected; forwarding previous provider id',
-                        new_provider_id=provider_id,
-                        previous_provider_id=previous_provider_id,
-                    )
+            _replace_ssns_with_provider_ids(
+                message,
+                compact=compact,
+                ssn=ssn,
+                previous_ssn=previous_ssn,
+                get_or_create_provider_id=config.data_client.get_or_create_provider_id,
+            )
 
             # delete the ssn values from memory so they can be cleaned up as soon as we are done with them
             del ssn
             del previous_ssn
 
             # Send the sanitized license data to the event bus
-            with logger.append_context_keys(provider_id=provider_id):
+            with logger.append_context_keys(provider_id=message['providerId']):
                 logger.info('Sending preprocessed license data to event bus')
 
-                config.events_client.put_events(
-                    Entries=[
-                        {
-                            'Source': 'org.compactconnect.provider-data',
-                            'DetailType': 'license.ingest',
-                            'Detail': json.dumps(message),
-                            'EventBusName': config.event_bus_name,
-                        }
-                    ]
-                )
+                config.events_client.put_events(Entries=[_license_ingest_event(message)])
         except Exception as e:  # noqa: BLE001 broad-exception-caught
             logger.error(f'Error preprocessing license data: {str(e)}', exc_info=True)
             # Send an ingest failure event
             config.events_client.put_events(
                 Entries=[
-                    {
-                        'Source': 'org.compactconnect.provider-data',
-                        'DetailType': 'license.ingest-failure',
-                        'Detail': json.dumps(
-                            {
-                                'eventTime': message.get('eventTime', config.current_standard_datetime.isoformat()),
-                                'compact': compact,
-                                'jurisdiction': jurisdiction,
-                                'errors': [f'Error preprocessing license data: {str(e)}'],
-                            }
-                        ),
-                        'EventBusName': config.event_bus_name,
-                    }
+                    _license_ingest_failure_event(message, compact=compact, jurisdiction=jurisdiction, error=str(e))
                 ]
             )
             # raise the exception so SQS will retry the message again
             raise e
 
 
+@sqs_batch_handler
+def preprocess_license_ingest_messages(records: list[dict]) -> dict:
+    """
+    Preprocess a batch of license messages to remove SSNs before sending them to the event bus.
+
+    This does the same work as preprocess_license_ingest, for a whole batch at once. Each distinct SSN in the batch is
+    resolved to its provider id only once, since states commonly upload several licenses for the same practitioner
+    together, and the resulting events are published to the event bus in batches of 10, rather than one at a time.
+
+    Any message that can not be preprocessed or published gets the same license.ingest-failure event as it would from
+    preprocess_license_ingest and is reported back to SQS as a batch item failure.
+    """
+    batch_failures = []
+    failure_events = []
+    # (message_id, compact, jurisdiction, message) for each message ready to be published
+    preprocessed_messages = []
+    # (compact, ssn) -> provider id, for each SSN resolved so far in this batch
+    resolved_provider_ids = {}
+
+    def get_or_create_provider_id(*, compact: str, ssn: str) -> str:
+        ssn_key = (compact, ssn)
+        if ssn_key not in resolved_provider_ids:
+            resolved_provider_ids[ssn_key] = config.data_client.get_or_create_provider_id(compact=compact, ssn=ssn)
+        return resolved_provider_ids[ssn_key]
+
+    for record in records:
+        message_id = record['messageId']
+        message = record['body']
+        try:
+            compact = message['compact']
+            jurisdiction = message['jurisdiction']
+            ssn = message.pop('ssn')  # Remove SSN from the detail
+            # Remove previousSSN (if present) from the detail; it must never reach the event bus
+            previous_ssn = message.pop('previousSSN', None)
+        except Exception as e:  # noqa: BLE001 broad-exception-caught
+            logger.error('Failed to process message', message_id=message_id, exc_info=e)
+            batch_failures.append({'itemIdentifier': message_id})
+            continue
+
+        with logger.append_context_keys(compact=compact, jurisdiction=jurisdiction):
+            try:
+                _replace_ssns_with_provider_ids(
+                    message,
+                    compact=compact,
+                    ssn=ssn,
+                    previous_ssn=previous_ssn,
+                    get_or_create_provider_id=get_or_create_provider_id,
+                )
+                preprocessed_messages.append((message_id, compact, jurisdiction, message))
+            except Exception as e:  # noqa: BLE001 broad-exception-caught
+                logger.error(f'Error preprocessing license data: {str(e)}', message_id=message_id, exc_info=True)
+                failure_events.append(
+                    _license_ingest_failure_event(message, compact=compact, jurisdiction=jurisdiction, error=str(e))
+                )
+                batch_failures.append({'itemIdentifier': message_id})
+
+    # drop the ssn values from memory so they can be cleaned up as soon as we are done with them
+    ssn = previous_ssn = None
+    resolved_provider_ids.clear()
+
+    logger.info('Sending preprocessed license data to event bus', message_count=len(preprocessed_messages))
+    # message index -> error, for each message whose event could not be published
+    publish_errors = {}
+    event_writer = EventBatchWriter(config.events_client)
+    try:
+        with event_writer:
+            for _message_id, _compact, _jurisdiction, message in preprocessed_messages:
+                event_writer.put_event(Entry=_license_ingest_event(message))
+    except Exception as e:  # noqa: BLE001 broad-exception-caught
+        logger.error(f'Error preprocessing license data: {str(e)}', exc_info=True)
+        # Any event that wasn't sent before the error might not have been published
+        for i in range(event_writer.sent_entry_count, len(preprocessed_messages)):
+            publish_errors[i] = str(e)
+    for i, failed_entry in zip(event_writer.failed_entry_indexes, event_writer.failed_entries, strict=False):
+        publish_errors[i] = f'{failed_entry.get("ErrorCode")}: {failed_entry.get("ErrorMessage")}'
+
+    for i, error in sorted(publish_errors.items()):
+        message_id, compact, jurisdiction, message = preprocessed_messages[i]
+        logger.error(
+            'Failed to publish preprocessed license data',
+            message_id=message_id,
+            compact=compact,
+            jurisdiction=jurisdiction,
+            provider_id=message['providerId'],
+            error=error,
+        )
+        failure_events.append(
+            _license_ingest_failure_event(message, compact=compact, jurisdiction=jurisdiction, error=error)
+        )
+        batch_failures.append({'itemIdentifier': message_id})
+
+    if failure_events:
+        # These messages are already reported as failures, so a problem sending these events must not fail the rest of
+        # the batch
+        try:
+            with EventBatchWriter(config.events_client) as failure_event_writer:
+                for failure_event in failure_events:
+                    failure_event_writer.put_event(Entry=failure_event)
+            if failure_event_writer.failed_entry_count > 0:
+                logger.error(
+                    'Failed to publish license ingest failure events',
+                    failed_entries=failure_event_writer.failed_entries,
+                )
+        except Exception as e:  # noqa: BLE001 broad-exception-caught
+            logger.error('Failed to publish license ingest failure events', exc_info=e)
+
+    logger.info('Completed batch', batch_failures=len(batch_failures))
+    return {'batchItemFailures': batch_failures}
+
+
+def _replace_ssns_with_provider_ids(
+    message: dict, *, compact: str, ssn: str, previous_ssn: str | None, get_or_create_provider_id: Callable
+) -> None:
+    """
+    Add the provider ids that a license message's SSNs resolve to, along with the last 4 digits of its SSN.
+
+    :param message: The license message, with its ssn and previousSSN already removed
+    :param compact: The compact the license belongs to
+    :param ssn: The license's SSN
+    :param previous_ssn: The SSN the state previously uploaded this license under, if the upload is an SSN correction
+    :param get_or_create_provider_id: Resolves a (compact, ssn) to a provider id, creating one if needed
+    """
+    # Get or create provider ID using the SSN and add it to the message_body
+    provider_id = get_or_create_provider_id(compact=compact, ssn=ssn)
+    message['providerId'] = provider_id
+
+    # Add the last 4 digits of SSN to the detail
+    message['ssnLastFour'] = ssn[-4:]
+
+    if previous_ssn is not None and previous_ssn != ssn:
+        # The state is correcting a previously-uploaded SSN. Resolve the previous SSN to its provider id
+        # so the ingest handler (which has no SSN access) can migrate that provider's records. If the
+        # previous SSN was never uploaded, this creates a mapping that simply resolves to a provider with
+        # no records, which the ingest handler treats as a no-op.
+        previous_provider_id = get_or_create_provider_id(compact=compact, ssn=previous_ssn)
+        if previous_provider_id != provider_id:
+            message['previousProviderId'] = previous_provider_id
+            logger.info(
+                'SSN correction detected; forwarding previous provider id',
+                new_provider_id=provider_id,
+                previous_provider_id=previous_provider_id,
+            )
+
+
+def _license_ingest_event(message: dict) -> dict:
+    return {
+        'Source': 'org.compactconnect.provider-data',
+        'DetailType': 'license.ingest',
+        'Detail': json.dumps(message),
+        'EventBusName': config.event_bus_name,
+    }
+
+
+def _license_ingest_failure_event(message: dict, *, compact: str, jurisdiction: str, error: str) -> dict:
+    return {
+        'Source': 'org.compactconnect.provider-data',
+        'DetailType': 'license.ingest-failure',
+        'Detail': json.dumps(
+            {
+                'eventTime': message.get('eventTime', config.current_standard_datetime.isoformat()),
+                'compact': compact,
+                'jurisdiction': jurisdiction,
+                'errors': [f'Error preprocessing license data: {error}'],
+            }
+        ),
+        'EventBusName': config.event_bus_name,
+    }
+
+
 @sqs_handler
 def ingest_license_message(message: dict):
     """For each message, validate the license data and persist it in the database"""
-    # We're not using the event time here, currently, so we'll discard it
-    message['detail'].pop('eventTime')
-
-    # This schema load will transform the 'licenseStatus' and 'compactEligibility' fields to
-    # 'jurisdictionUploadedLicenseStatus' and 'jurisdictionUploadedCompactEligibility' for internal references, and
-    # will also validate the data.
-    license_ingest_message = license_schema.load(message['detail'])
+    posted_license_record, previous_provider_id = _load_posted_license_record(message)
 
-    compact = license_ingest_message['compact']
-    jurisdiction = license_ingest_message['jurisdiction']
-    provider_id = license_ingest_message['providerId']
-    # Transient migration routing data set by the preprocessor for SSN corrections; must never be persisted
-    previous_provider_id = license_ingest_message.pop('previousProviderId', None)
+    compact = posted_license_record['compact']
+    jurisdiction = posted_license_record['jurisdiction']
+    provider_id = posted_license_record['providerId']
 
     with logger.append_context_keys(compact=compact, jurisdiction=jurisdiction):
         with logger.append_context_keys(provider_id=provider_id):
@@ -142,128 +297,359 @@ def ingest_license_message(message: dict):
                     previous_provider_id=str(previous_provider_id),
                     new_provider_id=str(provider_id),
                     jurisdiction=jurisdiction,
-                    license_type=license_ingest_message['licenseType'],
-                    new_ssn_last_four=license_ingest_message['ssnLastFour'],
+                    license_type=posted_license_record['licenseType'],
+                    new_ssn_last_four=posted_license_record['ssnLastFour'],
                 )
+            elif _is_license_unchanged(posted_license_record):
+                return
 
             # Start preparing our db transactions
+            transact_items = {}
             data_events = []
 
-            license_record_schema = LicenseRecordSchema()
-            dumped_license = license_record_schema.dumps(license_ingest_message)
+            provider_state = _load_provider_ingest_state(compact=compact, provider_id=provider_id)
+            _apply_license_ingest(
+                posted_license_record=posted_license_record,
+                provider_state=provider_state,
+                transact_items=transact_items,
+                data_events=data_events,
+            )
 
-            del license_ingest_message
+            _write_license_ingest(transact_items=transact_items, data_events=data_events)
 
-            # We fully JSON serialize then load again so that we have a completely independent copy of the data
-            posted_license_record = license_record_schema.load(json.loads(dumped_license))
 
-            dynamo_transactions = []
+@sqs_batch_handler
+def ingest_license_messages(records: list[dict]) -> dict:
+    """Validate and persist a batch of license messages, coalescing the messages that belong to the same provider.
 
-            home_jurisdiction = None
-            try:
-                provider_data = config.data_client.get_provider(
-                    compact=compact,
-                    provider_id=provider_id,
-                    detail=True,
-                    consistent_read=True,
-                )
-                provider_records = provider_data['items']
-                license_records = ProviderRecordUtility.get_records_of_type(
-                    provider_records,
-                    ProviderRecordType.LICENSE,
-                )
-                licenses_organized = {}
-                for record in license_records:
-                    licenses_organized.setdefault(record['jurisdiction'], {})
-                    licenses_organized[record['jurisdiction']][record['licenseType']] = record
-
-                # Get all privilege jurisdictions, directly from privilege records
-                privilege_records = ProviderRecordUtility.get_records_of_type(
-                    provider_records,
-                    ProviderRecordType.PRIVILEGE,
-                )
+    States commonly upload several licenses for the same practitioner (i.e. AUD and SLP licenses) together, so
+    messages are grouped by (compact, providerId). Each provider partition is read once, all of that provider's
+    license updates are applied in message order, and the resulting writes are committed as a single transaction.
+    Any message that can not be ingested is reported back to SQS as a batch item failure.
+    """
+    batch_failures = []
+    provider_messages = {}
+    for record in records:
+        message_id = record['messageId']
+        try:
+            posted_license_record, previous_provider_id = _load_posted_license_record(record['body'])
+        except Exception as e:  # noqa: BLE001 broad-exception-caught
+            logger.error('Failed to process message', message_id=message_id, exc_info=e)
+            batch_failures.append({'itemIdentifier': message_id})
+            continue
+        provider_key = (posted_license_record['compact'], str(posted_license_record['providerId']))
+        provider_messages.setdefault(provider_key, []).append((message_id, posted_license_record, previous_provider_id))
+
+    logger.info('Coalesced license messages by provider', provider_count=len(provider_messages))
+    for (compact, provider_id), messages in provider_messages.items():
+        with logger.append_context_keys(compact=compact, provider_id=provider_id):
+            failed_message_ids = _ingest_provider_license_messages(
+                compact=compact, provider_id=provider_id, messages=messages
+            )
+        batch_failures.extend({'itemIdentifier': message_id} for message_id in failed_message_ids)
 
-                # Get the home jurisdiction selection, if it exists
-                current_provider_record = ProviderData.create_new(
-                    ProviderRecordUtility.get_provider_record(provider_records)
-                )
-                home_jurisdiction = current_provider_record.currentHomeJurisdiction
+    logger.info('Completed batch', batch_failures=len(batch_failures))
+    return {'batchItemFailures': batch_failures}
 
-            except CCNotFoundException:
-                licenses_organized = {}
-                privilege_records = []
-                current_provider_record = None
 
-            # Set (or replace) the posted license for its jurisdiction
-            existing_license = licenses_organized.get(posted_license_record['jurisdiction'], {}).get(
-                posted_license_record['licenseType']
-            )
-            if existing_license is not None:
-                _process_license_update(
-                    existing_license=existing_license,
-                    new_license=posted_license_record,
-                    dynamo_transactions=dynamo_transactions,
+def _ingest_provider_license_messages(*, compact: str, provider_id: str, messages: list[tuple]) -> list[str]:
+    """
+    Apply every license message for a single provider against one read of the provider's partition.
+
+    Writes are accumulated into a single transaction, which is flushed early only if it would otherwise exceed the
+    DynamoDB transaction item limit, or before an SSN-correction migration (which rewrites the partition itself).
+    :param str compact: The compact the provider belongs to
+    :param str provider_id: The provider id
+    :param list[tuple] messages: Ordered (message_id, posted_license_record, previous_provider_id) tuples
+    :return: The message ids that could not be ingested
+    """
+    failed_message_ids = []
+    pending_message_ids = []
+    transact_items = {}
+    data_events = []
+    provider_state = None
+
+    def flush():
+        nonlocal provider_state, transact_items, data_events, pending_message_ids
+        if transact_items:
+            try:
+                _write_license_ingest(transact_items=transact_items, data_events=data_events)
+            except Exception as e:  # noqa: BLE001 broad-exception-caught
+                logger.error('Failed to write license ingest transaction', exc_info=e)
+                failed_message_ids.extend(pending_message_ids)
+                # Our view of the partition no longer matches the database, so we'll need to read it again
+                provider_state = None
+        transact_items = {}
+        data_events = []
+        pending_message_ids = []
+
+    for message_id, posted_license_record, previous_provider_id in messages:
+        jurisdiction = posted_license_record['jurisdiction']
+        with logger.append_context_keys(jurisdiction=jurisdiction, message_id=message_id):
+            logger.info('Ingesting license data')
+            try:
+                if previous_provider_id is not None and str(previous_provider_id) != provider_id:
+                    # The migration moves records into this provider's partition, so anything we've staged must be
+                    # written first and the partition read again afterward
+                    flush()
+                    provider_state = None
+                    _perform_ssn_correction_migration(
+                        compact=compact,
+                        previous_provider_id=str(previous_provider_id),
+                        new_provider_id=provider_id,
+                        jurisdiction=jurisdiction,
+                        license_type=posted_license_record['licenseType'],
+                        new_ssn_last_four=posted_license_record['ssnLastFour'],
+                    )
+                elif _license_record_key(posted_license_record) not in transact_items and _is_license_unchanged(
+                    posted_license_record
+                ):
+                    # Nothing staged for this license, so the record we just checked is still current
+                    continue
+
+                # Each license can add a license record, a license update record and the provider record
+                if len(transact_items) + 3 > MAX_DYNAMODB_TRANSACTION_ITEMS:
+                    flush()
+
+                if provider_state is None:
+                    provider_state = _load_provider_ingest_state(compact=compact, provider_id=provider_id)
+
+                _apply_license_ingest(
+                    posted_license_record=posted_license_record,
+                    provider_state=provider_state,
+                    transact_items=transact_items,
                     data_events=data_events,
                 )
-                # now grab the firstUploadDate from the existing record if available and put it in the posted_license
-                # for the license upload date GSI
-                if existing_license.get('firstUploadDate'):
-                    posted_license_record['firstUploadDate'] = existing_license.get('firstUploadDate')
-            else:
-                # If this is the first time creating the license record,
-                # set the firstUploadDate to the current time for license upload date GSI tracking
-                posted_license_record['firstUploadDate'] = config.current_standard_datetime
-
-            # write the record to the table to reflect the latest values from the upload
-            license_data = LicenseData.create_new(deepcopy(posted_license_record))
-            dynamo_transactions.append(
-                {
-                    'Put': {
-                        'TableName': config.provider_table_name,
-                        'Item': TypeSerializer().serialize(license_data.serialize_to_database_record())['M'],
-                    }
+                pending_message_ids.append(message_id)
+            except Exception as e:  # noqa: BLE001 broad-exception-caught
+                logger.error('Failed to process message', exc_info=e)
+                failed_message_ids.append(message_id)
+
+    flush()
+    return failed_message_ids
+
+
+def _load_posted_license_record(message: dict) -> tuple[dict, UUID | None]:
+    """
+    Validate an ingest message and transform it into the license record to persist.
+
+    :param dict message: The license.ingest event
+    :return: The license record, and the previous provider id if the preprocessor flagged an SSN correction
+    """
+    # We're not using the event time here, currently, so we'll discard it
+    message['detail'].pop('eventTime')
+
+    # This schema load will transform the 'licenseStatus' and 'compactEligibility' fields to
+    # 'jurisdictionUploadedLicenseStatus' and 'jurisdictionUploadedCompactEligibility' for internal references, and
+    # will also validate the data.
+    license_ingest_message = license_schema.load(message['detail'])
+
+    # Transient migration routing data set by the preprocessor for SSN corrections; must never be persisted
+    previous_provider_id = license_ingest_message.pop('previousProviderId', None)
+
+    license_record_schema = LicenseRecordSchema()
+    dumped_license = license_record_schema.dumps(license_ingest_message)
+
+    # We fully JSON serialize then load again so that we have a completely independent copy of the data
+    return license_record_schema.load(json.loads(dumped_license)), previous_provider_id
+
+
+def _load_provider_ingest_state(*, compact: str, provider_id: str) -> _ProviderIngestState:
+    try:
+        provider_data = config.data_client.get_provider(
+            compact=compact,
+            provider_id=provider_id,
+            detail=True,
+            consistent_read=True,
+            read_profile=ProviderReadProfile.INGEST,
+        )
+    except CCNotFoundException:
+        return _ProviderIngestState(licenses_organized={}, privilege_records=[])
+
+    provider_records = provider_data['items']
+    license_records = ProviderRecordUtility.get_records_of_type(
+        provider_records,
+        ProviderRecordType.LICENSE,
+    )
+    licenses_organized = {}
+    for record in license_records:
+        licenses_organized.setdefault(record['jurisdiction'], {})
+        licenses_organized[record['jurisdiction']][record['licenseType']] = record
+
+    # Get all privilege jurisdictions, directly from privilege records
+    privilege_records = ProviderRecordUtility.get_records_of_type(
+        provider_records,
+        ProviderRecordType.PRIVILEGE,
+    )
+
+    # Get the home jurisdiction selection, if it exists
+    current_provider_record = ProviderData.create_new(ProviderRecordUtility.get_provider_record(provider_records))
+    return _ProviderIngestState(
+        licenses_organized=licenses_organized,
+        privilege_records=privilege_records,
+        current_provider_record=current_provider_record,
+        home_jurisdiction=current_provider_record.currentHomeJurisdiction,
+    )
+
+
+def _apply_license_ingest(
+    *,
+    posted_license_record: dict,
+    provider_state: _ProviderIngestState,
+    transact_items: dict,
+    data_events: list,
+):
+    """
+    Stage the writes needed to persist a posted license, then update the provider state to reflect them.
+
+    Nothing is staged and the provider state is left untouched if this raises.
+    :param dict posted_license_record: The newly-uploaded license record
+    :param _ProviderIngestState provider_state: The provider's current state
+    :param dict transact_items: Pending transaction items, keyed by (pk, sk), so a later write to the same record
+    replaces an earlier one
+    :param list data_events: Pending data events to publish once the transaction is written
+    """
+    dynamo_transactions = []
+    license_data_events = []
+
+    # Set (or replace) the posted license for its jurisdiction
+    existing_license = provider_state.licenses_organized.get(posted_license_record['jurisdiction'], {}).get(
+        posted_license_record['licenseType']
+    )
+    if existing_license is not None:
+        _process_license_update(
+            existing_license=existing_license,
+            new_license=posted_license_record,
+            dynamo_transactions=dynamo_transactions,
+            data_events=license_data_events,
+        )
+        # now grab the firstUploadDate from the existing record if available and put it in the posted_license
+        # for the license upload date GSI
+        if existing_license.get('firstUploadDate'):
+            posted_license_record['firstUploadDate'] = existing_license.get('firstUploadDate')
+    else:
+        # If this is the first time creating the license record,
+        # set the firstUploadDate to the current time for license upload date GSI tracking
+        posted_license_record['firstUploadDate'] = config.current_standard_datetime
+
+    # write the record to the table to reflect the latest values from the upload
+    license_data = LicenseData.create_new(deepcopy(posted_license_record))
+    license_record = license_data.serialize_to_database_record()
+    license_record['ingestFingerprint'] = _license_ingest_fingerprint(
+        posted_license_record, date_of_update=license_record['dateOfUpdate']
+    )
+    dynamo_transactions.append(
+        {
+            'Put': {
+                'TableName': config.provider_table_name,
+                'Item': TypeSerializer().serialize(license_record)['M'],
+            }
+        }
+    )
+
+    licenses_organized = {
+        jurisdiction: dict(jurisdiction_licenses)
+        for jurisdiction, jurisdiction_licenses in provider_state.licenses_organized.items()
+    }
+    licenses_organized.setdefault(posted_license_record['jurisdiction'], {})
+    licenses_organized[posted_license_record['jurisdiction']][posted_license_record['licenseType']] = (
+        posted_license_record
+    )
+    licenses_flattened = [
+        license_record
+        for jurisdiction_licenses in licenses_organized.values()
+        for license_record in jurisdiction_licenses.values()
+    ]
+
+    best_license = ProviderRecordUtility.find_best_license(
+        license_records=licenses_flattened,
+        home_jurisdiction=provider_state.home_jurisdiction,
+    )
+
+    current_provider_record = provider_state.current_provider_record
+    if best_license is posted_license_record:
+        logger.info('Updating provider data')
+
+        current_provider_record = ProviderRecordUtility.populate_provider_record(
+            current_provider_record=current_provider_record,
+            license_record=posted_license_record,
+            privilege_records=provider_state.privilege_records,
+        )
+        # Update our provider data
+        dynamo_transactions.append(
+            {
+                'Put': {
+                    'TableName': config.provider_table_name,
+                    'Item': TypeSerializer().serialize(current_provider_record.serialize_to_database_record())['M'],
                 }
-            )
+            }
+        )
 
-            licenses_organized.setdefault(posted_license_record['jurisdiction'], {})
-            licenses_organized[posted_license_record['jurisdiction']][posted_license_record['licenseType']] = (
-                posted_license_record
-            )
-            licenses_flattened = [
-                license_record
-                for jurisdiction_licenses in licenses_organized.values()
-                for license_record in jurisdiction_licenses.values()
-            ]
-
-            best_license = ProviderRecordUtility.find_best_license(
-                license_records=licenses_flattened,
-                home_jurisdiction=home_jurisdiction,
-            )
+    for transaction in dynamo_transactions:
+        item = transaction['Put']['Item']
+        transact_items[(item['pk']['S'], item['sk']['S'])] = transaction
+    data_events.extend(license_data_events)
+    provider_state.licenses_organized = licenses_organized
+    provider_state.current_provider_record = current_provider_record
+
+
+def _license_record_key(license_record: dict) -> tuple[str, str]:
+    """The (pk, sk) of the database record for a license"""
+    compact = license_record['compact']
+    license_type_abbr = config.snapshot.license_type_abbreviations[compact][license_record['licenseType']]
+    return (
+        f'{compact}#PROVIDER#{license_record["providerId"]}',
+        f'{compact}#PROVIDER#license/{license_record["jurisdiction"]}/{license_type_abbr}#',
+    )
 
-            if best_license is posted_license_record:
-                logger.info('Updating provider data')
 
-                provider_record = ProviderRecordUtility.populate_provider_record(
-                    current_provider_record=current_provider_record,
-                    license_record=posted_license_record,
-                    privilege_records=privilege_records,
-                )
-                # Update our provider data
-                dynamo_transactions.append(
-                    {
-                        'Put': {
-                            'TableName': config.provider_table_name,
-                            'Item': TypeSerializer().serialize(provider_record.serialize_to_database_record())['M'],
-                        }
-                    }
-                )
+def _license_ingest_fingerprint(posted_license_record: dict, *, date_of_update: str) -> str:
+    """
+    Produce a stable fingerprint of a posted license, bound to the dateOfUpdate of the record it is stored on.
+
+    The calculated status fields are part of the fingerprint, so a license that has expired since it was written is
+    not considered unchanged. Since every write to a license record sets its dateOfUpdate, including that in the
+    fingerprint means any change to the record outside of license ingest (i.e. an encumbrance) also invalidates it.
+    """
+    normalized_license = {key: value for key, value in posted_license_record.items() if key not in LICENSE_DYNAMIC_KEYS}
+    fingerprint = sha256(date_of_update.encode('utf-8'))
+    fingerprint.update(json.dumps(normalized_license, sort_keys=True, default=str).encode('utf-8'))
+    return fingerprint.hexdigest()
+
+
+def _is_license_unchanged(posted_license_record: dict) -> bool:
+    """
+    Check whether a posted license is identical to the license already on record, so there is nothing to write.
+
+    This only reads the stored fingerprint and dateOfUpdate of the one license record, which is much cheaper than
+    reading the provider's whole partition.
+    """
+    pk, sk = _license_record_key(posted_license_record)
+    existing_license_record = config.provider_table.get_item(
+        Key={'pk': pk, 'sk': sk},
+        ProjectionExpression='ingestFingerprint, dateOfUpdate',
+        ConsistentRead=True,
+    ).get('Item')
+    if existing_license_record is None or 'ingestFingerprint' not in existing_license_record:
+        return False
+
+    if existing_license_record['ingestFingerprint'] != _license_ingest_fingerprint(
+        posted_license_record, date_of_update=existing_license_record['dateOfUpdate']
+    ):
+        return False
+
+    logger.info('No changes detected for this license. Skipping write.')
+    metrics.add_metric(name=UNCHANGED_LICENSE_SKIPPED_METRIC, unit=MetricUnit.Count, value=1)
+    return True
+
 
-            # Write the records together as a transaction that succeeds or fails as one, to ensure consistency
-            config.dynamodb_client.transact_write_items(TransactItems=dynamo_transactions)
-            # We'll save our events until after the transaction is written, to ensure consistency
-            with EventBatchWriter(config.events_client) as event_writer:
-                for event in data_events:
-                    event_writer.put_event(Entry=event)
+def _write_license_ingest(*, transact_items: dict, data_events: list):
+    # Write the records together as a transaction that succeeds or fails as one, to ensure consistency
+    config.dynamodb_client.transact_write_items(TransactItems=list(transact_items.values()))
+    # We'll save our events until after the transaction is written, to ensure consistency
+    with EventBatchWriter(config.events_client) as event_writer:
+        for event in data_events:
+            event_writer.put_event(Entry=event)
 
 
 def _process_license_update(*, existing_license: dict, new_license: dict, dynamo_transactions: list, data_events: list):
@@ -277,15 +663,14 @@ def _process_license_update(*, existing_license: dict, new_license: dict, dynamo
     # Remove fields that are calculated at runtime, not stored in the database
     # uploadDate is metadata tracking when the license was first uploaded, not part of the license data
     # firstUploadDate is metadata tracking when the license was first uploaded, not part of the license data
-    dynamic_keys = {'dateOfUpdate', 'status', 'uploadDate', 'firstUploadDate'}
     updated_values = {
         key: value
         for key, value in new_license.items()
-        if key not in dynamic_keys and (key not in existing_license.keys() or value != existing_license[key])
+        if key not in LICENSE_DYNAMIC_KEYS and (key not in existing_license.keys() or value != existing_license[key])
     }
     # If any fields are missing from the new license, we'll consider them removed
     # Exclude dynamic keys from removed values since they're metadata, not part of the license data
-    removed_values = existing_license.keys() - new_license.keys() - dynamic_keys
+    removed_values = existing_license.keys() - new_license.keys() - LICENSE_DYNAMIC_KEYS
     if not updated_values and not removed_values:
         logger.info('No changes detected for this license.')
         return
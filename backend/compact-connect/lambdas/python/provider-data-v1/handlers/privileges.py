@@ -35,7 +35,7 @@ def deactivate_privilege(event: dict, context: LambdaContext):  # noqa: ARG001 u
         compact=compact, provider_id=provider_id, jurisdiction=jurisdiction, license_type=license_type_abbr
     ):
         # Validate the license type is a supported abbreviation
-        if license_type_abbr not in config.license_type_abbreviations[compact].values():
+        if license_type_abbr not in config.snapshot.license_type_abbreviations[compact].values():
             logger.warning('Invalid license type abbreviation')
             raise CCInvalidRequestException(f'Invalid license type abbreviation: {license_type_abbr}')
 
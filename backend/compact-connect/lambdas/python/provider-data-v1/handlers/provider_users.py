@@ -94,7 +94,7 @@ def _put_provider_home_jurisdiction(event: dict, context: LambdaContext):  # noq
     selected_jurisdiction = event_body['jurisdiction'].lower()
 
     # ensure selected_jurisdiction is one of the known jurisdictions or the word 'other':
-    if selected_jurisdiction not in config.jurisdictions and selected_jurisdiction != OTHER_JURISDICTION:
+    if not config.is_valid_jurisdiction(selected_jurisdiction) and selected_jurisdiction != OTHER_JURISDICTION:
         raise CCInvalidRequestException('Invalid jurisdiction selected.')
 
     compact, provider_id = get_provider_user_attributes_from_authorizer_claims(event)
@@ -9,8 +9,13 @@ class LicenseCSVReader:
     def __init__(self):
         self.schema = LicensePostRequestSchema()
 
-    def licenses(self, stream: TextIOBase) -> Generator[dict, None, None]:
-        reader = DictReader(stream, restkey='invalid', dialect='excel', strict=True)
+    def licenses(self, stream: TextIOBase, fieldnames: list[str] | None = None) -> Generator[dict, None, None]:
+        """
+        :param TextIOBase stream: The CSV data
+        :param list[str] fieldnames: The CSV header, if the stream does not start with it (i.e. it is a shard of a
+        larger file)
+        """
+        reader = DictReader(stream, fieldnames=fieldnames, restkey='invalid', dialect='excel', strict=True)
         for license_row in reader:
             # Drop fields that are blank
             drop_fields = [k for k, v in license_row.items() if v == '']
@@ -0,0 +1,332 @@
+from collections.abc import Callable, Generator, Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from cc_common.config import logger
+from cc_common.data_model.schema.license.api import LicensePostRequestSchema
+from marshmallow import RAISE, Schema, ValidationError
+from marshmallow.decorators import POST_DUMP, POST_LOAD, PRE_DUMP, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+from marshmallow.exceptions import SCHEMA
+from marshmallow.fields import Date, Field, String
+from marshmallow.utils import missing
+from marshmallow.validate import Length, OneOf, Regexp
+
+# Sentinel returned by compiled field loaders for a value the schema would reject
+_INVALID = object()
+
+
+@dataclass
+class LicenseRowResult:
+    """
+    The outcome of validating a single license row from a bulk upload file
+
+    :param int record_number: The 1-based position of the row in the file
+    :param dict raw_license: The row, as read from the file
+    :param dict license: The validated license, serialized with `LicensePostRequestSchema.dump`, if the row is valid
+    :param ValidationError error: The validation error for the row, if it is invalid
+    """
+
+    record_number: int
+    raw_license: dict
+    license: dict | None = None
+    error: ValidationError | None = None
+
+
+class _CompiledField:
+    """A schema field reduced to the plain checks needed to load and dump CSV string values"""
+
+    __slots__ = ('name', 'required', 'load', 'dump')
+
+    def __init__(self, name: str, field: Field):
+        self.name = name
+        self.required = field.required
+        self.load = _compile_load(field)
+        self.dump = _compile_dump(name, field)
+
+
+def _compile_validator(validator: Callable) -> Callable[[object], bool]:
+    if type(validator) is Length:
+        equal, min_length, max_length = validator.equal, validator.min, validator.max
+        if equal is not None:
+            return lambda value: len(value) == equal
+        return lambda value: (
+            (min_length is None or len(value) >= min_length) and (max_length is None or len(value) <= max_length)
+        )
+    if type(validator) is Regexp:
+        match = validator.regex.match
+        return lambda value: match(value) is not None
+    if type(validator) is OneOf:
+        try:
+            return frozenset(validator.choices).__contains__
+        except TypeError:
+            # Unhashable choices, we'll have to check them the slow way
+            pass
+
+    def check(value) -> bool:
+        try:
+            # Marshmallow treats a validator returning False as a failure, too
+            return validator(value) is not False
+        except ValidationError:
+            return False
+
+    return check
+
+
+def _compile_load(field: Field) -> Callable[[object], object]:
+    parse = None
+    if isinstance(field, Date) and type(field)._deserialize is Date._deserialize and field.format in (None, 'iso'):  # noqa: SLF001 protected-access
+        parse = date.fromisoformat
+    elif not (isinstance(field, String) and type(field)._deserialize is String._deserialize) or (  # noqa: SLF001 protected-access
+        field.pre_load or field.post_load or field.allow_none
+    ):
+        # Not something we know how to compile, so we defer to the field itself for the exact behavior
+        def load(value):
+            try:
+                return field.deserialize(value)
+            except ValidationError:
+                return _INVALID
+
+        return load
+
+    checks = tuple(_compile_validator(validator) for validator in field.validators)
+
+    def load(value):
+        if parse is None:
+            # Marshmallow will also decode bytes, but the CSV reader only ever gives us str
+            if value.__class__ is not str:
+                return _INVALID
+        else:
+            try:
+                value = parse(value)
+            except (TypeError, AttributeError, ValueError):
+                return _INVALID
+        for check in checks:
+            if not check(value):
+                return _INVALID
+        return value
+
+    return load
+
+
+def _compile_dump(name: str, field: Field) -> Callable[[object], object]:
+    if isinstance(field, Date) and type(field)._serialize is Date._serialize and field.format in (None, 'iso'):  # noqa: SLF001 protected-access
+        return date.isoformat
+    if isinstance(field, String) and type(field)._serialize is String._serialize:  # noqa: SLF001 protected-access
+        # Loaded strings are already text, so serializing them is a no-op
+        return lambda value: value
+    return lambda value: field._serialize(value, name, None)  # noqa: SLF001 protected-access
+
+
+def _supports_compiled_validation(schema: Schema) -> bool:
+    """
+    Check that the schema only uses the features the compiled validator reproduces. Anything else (new hooks, field
+    renaming, load defaults, etc.) sends every row through the schema itself, so behavior can never silently diverge.
+    """
+    hooks = schema._hooks  # noqa: SLF001 protected-access
+    if [name for name, _many, _kwargs in hooks[PRE_LOAD]] != ['strip_whitespace']:
+        return False
+    if any(hooks[hook] for hook in (POST_LOAD, PRE_DUMP, POST_DUMP, VALIDATES)):
+        return False
+    if any(many or kwargs.get('pass_original') for _name, many, kwargs in hooks[VALIDATES_SCHEMA]):
+        return False
+    if schema.unknown != RAISE or schema.load_fields.keys() != schema.dump_fields.keys():
+        return False
+    return all(
+        field.data_key is None and field.load_default is missing and field.dump_default is missing
+        for field in schema.fields.values()
+    )
+
+
+class LicenseCSVValidator:
+    """
+    Validates the license rows of a single bulk upload file, a chunk of rows at a time.
+
+    A full `LicensePostRequestSchema` load and dump round trip for every row dominates the CPU time of processing
+    large files, so the schema's fields are compiled once into plain checks which are applied one column at a time
+    across each chunk of rows. Rows that pass every check are loaded and serialized without going through the schema.
+    Any row that fails a check is handed to the schema itself, so invalid rows are always reported with the exact
+    errors the schema produces.
+
+    This validator also rejects rows that duplicate the (ssn, licenseType) of an earlier row in the same file, so a
+    fresh validator must be used for each file. When validating one shard of a larger file, duplicates of rows in
+    other shards can't be seen, so they must be identified up front and provided as `duplicate_ssn_records`.
+    """
+
+    def __init__(
+        self,
+        *,
+        compact: str,
+        jurisdiction: str,
+        chunk_size: int = 500,
+        first_record_number: int = 1,
+        duplicate_ssn_records: dict[int, int] | None = None,
+    ):
+        """
+        :param str compact: The compact the file was uploaded for
+        :param str jurisdiction: The jurisdiction the file was uploaded for
+        :param int chunk_size: Number of rows to validate at a time, default: 500
+        :param int first_record_number: The record number of the first row to be validated, default: 1
+        :param dict[int, int] duplicate_ssn_records: Record numbers of rows already known to duplicate the
+        (ssn, licenseType) of an earlier row, mapped to the record number of that earlier row
+        """
+        self.schema = LicensePostRequestSchema()
+        self._compact = compact
+        self._jurisdiction = jurisdiction
+        self._chunk_size = chunk_size
+        self._record_count = first_record_number - 1
+        # track which ssns were included in this file to detect duplicates,
+        # which are not allowed within the same file upload
+        # We track by (ssn, licenseType) tuple to allow same SSN for different license types
+        self._ssns_in_file_upload = {}
+        self._duplicate_ssn_records = duplicate_ssn_records or {}
+
+        self._fields = [_CompiledField(name, field) for name, field in self.schema.fields.items()]
+        self._schema_validators = [
+            getattr(self.schema, name)
+            for name, _many, _kwargs in self.schema._hooks[VALIDATES_SCHEMA]  # noqa: SLF001 protected-access
+        ]
+        # compact and jurisdiction come from the upload path, not the file, so they are the same for every row
+        upload_path_values = {'compact': compact, 'jurisdiction': jurisdiction}
+        self._constants = {
+            field.name: field.load(upload_path_values[field.name].strip())
+            for field in self._fields
+            if field.name in upload_path_values
+        }
+        # If the upload path itself is invalid, every row will fail, and the schema will describe why
+        self._compiled = _supports_compiled_validation(self.schema) and _INVALID not in self._constants.values()
+        self._row_field_names = frozenset(self.schema.fields.keys() - self._constants.keys())
+
+    def validate(self, licenses: Iterable[dict]) -> Generator[LicenseRowResult, None, None]:
+        """
+        Validate license rows, as read by `LicenseCSVReader.licenses`, yielding a result for each row in order.
+
+        :param Iterable[dict] licenses: The raw license rows
+        """
+        rows = iter(licenses)
+        while True:
+            chunk = []
+            try:
+                for raw_license in rows:
+                    chunk.append(raw_license)
+                    if len(chunk) >= self._chunk_size:
+                        break
+            except Exception:
+                # Rows read before the file turned out to be unreadable are still reported, as they would be if we
+                # were processing the file row by row
+                yield from self._validate_chunk(chunk)
+                raise
+            if not chunk:
+                return
+            yield from self._validate_chunk(chunk)
+
+    def _validate_chunk(self, chunk: list[dict]) -> Generator[LicenseRowResult, None, None]:
+        first_record_number = self._record_count + 1
+        self._record_count += len(chunk)
+
+        loaded_licenses = self._load_chunk(chunk)
+        for offset, (raw_license, loaded_license) in enumerate(zip(chunk, loaded_licenses, strict=True)):
+            record_number = first_record_number + offset
+            try:
+                if loaded_license is None:
+                    loaded_license = self._load_license_with_schema(raw_license)
+                    dumped_license = self.schema.dump(loaded_license)
+                else:
+                    dumped_license = self._dump_license(loaded_license)
+                self._check_duplicate_ssn(loaded_license, record_number)
+            except ValidationError as e:
+                yield LicenseRowResult(record_number=record_number, raw_license=raw_license, error=e)
+                continue
+            yield LicenseRowResult(record_number=record_number, raw_license=raw_license, license=dumped_license)
+
+    def _load_chunk(self, chunk: list[dict]) -> list[dict | None]:
+        """
+        Load a chunk of rows column by column, with the compiled field checks.
+
+        :return: The loaded license for each row, or None where the row has to be loaded by the schema
+        """
+        if not self._compiled:
+            return [None] * len(chunk)
+
+        row_field_names = self._row_field_names
+        # Rows with fields we don't know about (or that try to set compact or jurisdiction) are left to the schema
+        loaded_licenses = [{} if raw_license.keys() <= row_field_names else None for raw_license in chunk]
+        for field in self._fields:
+            name = field.name
+            if name in self._constants:
+                constant = self._constants[name]
+                for loaded_license in loaded_licenses:
+                    if loaded_license is not None:
+                        loaded_license[name] = constant
+                continue
+
+            load, required = field.load, field.required
+            for idx, raw_license in enumerate(chunk):
+                if loaded_licenses[idx] is None:
+                    continue
+                value = raw_license.get(name, missing)
+                if value is missing:
+                    if required:
+                        loaded_licenses[idx] = None
+                    continue
+                if isinstance(value, str):
+                    value = value.strip()
+                value = load(value)
+                if value is _INVALID:
+                    loaded_licenses[idx] = None
+                    continue
+                loaded_licenses[idx][name] = value
+
+        for idx, loaded_license in enumerate(loaded_licenses):
+            if loaded_license is None:
+                continue
+            try:
+                for validator in self._schema_validators:
+                    validator(loaded_license, partial=None, many=False, unknown=RAISE)
+            except ValidationError:
+                loaded_licenses[idx] = None
+        return loaded_licenses
+
+    def _dump_license(self, loaded_license: dict) -> dict:
+        # Serialized in schema field order, just as `schema.dump` would be
+        return {
+            field.name: field.dump(loaded_license[field.name]) for field in self._fields if field.name in loaded_license
+        }
+
+    def load_license(self, raw_license: dict) -> dict:
+        """
+        Validate and load a single license row, without checking it for duplicates.
+
+        :param dict raw_license: The row, as read from the file
+        :raises ValidationError: If the row is invalid
+        """
+        loaded_license = self._load_chunk([raw_license])[0]
+        if loaded_license is None:
+            loaded_license = self._load_license_with_schema(raw_license)
+        return loaded_license
+
+    def _load_license_with_schema(self, raw_license: dict) -> dict:
+        try:
+            # dict() here, because it prevents `compact` and `jurisdiction` from being allowed in the raw_license
+            return self.schema.load(dict(compact=self._compact, jurisdiction=self._jurisdiction, **raw_license))
+        except TypeError as e:
+            # This will be raised, if `raw_license` includes compact and/or jurisdiction fields
+            logger.error('License contains unsupported fields', fields=list(raw_license.keys()), exc_info=e)
+            raise ValidationError('License contains unsupported fields') from e
+
+    def _check_duplicate_ssn(self, loaded_license: dict, record_number: int):
+        # verify that this ssn/licenseType combination has not been used previously in the same file
+        ssn_key = (loaded_license['ssn'], loaded_license['licenseType'])
+        matched_ssn_index = self._duplicate_ssn_records.get(record_number) or self._ssns_in_file_upload.get(ssn_key)
+        if matched_ssn_index:
+            # format the validation error as dict so it can be processed by email handler downstream
+            raise ValidationError(
+                {
+                    SCHEMA: [
+                        f'Duplicate License SSN detected for license type '
+                        f'{loaded_license["licenseType"]}. SSN matches with record '
+                        f'{matched_ssn_index}. Every record must have a unique SSN per license type '
+                        f'within the same file.'
+                    ]
+                }
+            )
+        self._ssns_in_file_upload[ssn_key] = record_number
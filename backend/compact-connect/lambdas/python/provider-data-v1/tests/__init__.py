@@ -23,15 +23,19 @@ class TstLambdas(TestCase):
                 'COMPACT_CONFIGURATION_TABLE_NAME': 'compact-configuration-table',
                 'ENVIRONMENT_NAME': 'test',
                 'PROV_FAM_GIV_MID_INDEX_NAME': 'providerFamGivMid',
+                'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME': 'providerFamGivMidSharded',
                 'FAM_GIV_INDEX_NAME': 'famGiv',
                 'LICENSE_GSI_NAME': 'licenseGSI',
                 'PROVIDER_USER_POOL_ID': 'us-east-1-12345',
                 'USERS_TABLE_NAME': 'staff-users-table',
                 'EMAIL_NOTIFICATION_SERVICE_LAMBDA_NAME': 'email-notification-service-lambda',
                 'PROV_DATE_OF_UPDATE_INDEX_NAME': 'providerDateOfUpdate',
+                'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME': 'providerDateOfUpdateSharded',
                 'SSN_INDEX_NAME': 'ssnIndex',
                 'USER_POOL_ID': 'us-east-1-12345',
                 'LICENSE_PREPROCESSING_QUEUE_URL': 'license-preprocessing-queue-url',
+                'BULK_UPLOAD_SHARD_QUEUE_URL': 'bulk-upload-shard-queue-url',
+                'BULK_UPLOAD_SHARD_TABLE_NAME': 'bulk-upload-shard-table',
                 'PROVIDER_USER_BUCKET_NAME': 'provider-user-bucket',
                 'COMPACTS': '["aslp", "octp", "coun"]',
                 'JURISDICTIONS': json.dumps(
@@ -56,6 +56,8 @@ class TstFunction(TstLambdas):
         self.create_rate_limiting_table()
         self.create_compact_configuration_table()
         self.create_license_preprocessing_queue()
+        self.create_bulk_upload_shard_queue()
+        self.create_bulk_upload_shard_table()
         self.create_staff_user_pool()
 
         boto3.client('events').create_event_bus(Name=os.environ['EVENT_BUS_NAME'])
@@ -127,6 +129,7 @@ class TstFunction(TstLambdas):
                 {'AttributeName': 'sk', 'AttributeType': 'S'},
                 {'AttributeName': 'providerFamGivMid', 'AttributeType': 'S'},
                 {'AttributeName': 'providerDateOfUpdate', 'AttributeType': 'S'},
+                {'AttributeName': 'providerGSIPK', 'AttributeType': 'S'},
                 {'AttributeName': 'licenseGSIPK', 'AttributeType': 'S'},
                 {'AttributeName': 'licenseGSISK', 'AttributeType': 'S'},
                 {'AttributeName': 'licenseUploadDateGSIPK', 'AttributeType': 'S'},
@@ -152,6 +155,22 @@ class TstFunction(TstLambdas):
                     ],
                     'Projection': {'ProjectionType': 'ALL'},
                 },
+                {
+                    'IndexName': os.environ['PROV_FAM_GIV_MID_SHARDED_INDEX_NAME'],
+                    'KeySchema': [
+                        {'AttributeName': 'providerGSIPK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'providerFamGivMid', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                },
+                {
+                    'IndexName': os.environ['PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME'],
+                    'KeySchema': [
+                        {'AttributeName': 'providerGSIPK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'providerDateOfUpdate', 'KeyType': 'RANGE'},
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                },
                 {
                     'IndexName': os.environ['LICENSE_GSI_NAME'],
                     'KeySchema': [
@@ -229,6 +248,21 @@ class TstFunction(TstLambdas):
         self._license_preprocessing_queue = boto3.resource('sqs').create_queue(QueueName='workflow-queue')
         os.environ['LICENSE_PREPROCESSING_QUEUE_URL'] = self._license_preprocessing_queue.url
 
+    def create_bulk_upload_shard_queue(self):
+        self._bulk_upload_shard_queue = boto3.resource('sqs').create_queue(QueueName='bulk-upload-shard-queue')
+        os.environ['BULK_UPLOAD_SHARD_QUEUE_URL'] = self._bulk_upload_shard_queue.url
+
+    def create_bulk_upload_shard_table(self):
+        self._bulk_upload_shard_table = boto3.resource('dynamodb').create_table(
+            AttributeDefinitions=[
+                {'AttributeName': 'pk', 'AttributeType': 'S'},
+                {'AttributeName': 'sk', 'AttributeType': 'S'},
+            ],
+            TableName=os.environ['BULK_UPLOAD_SHARD_TABLE_NAME'],
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}, {'AttributeName': 'sk', 'KeyType': 'RANGE'}],
+            BillingMode='PAY_PER_REQUEST',
+        )
+
     def delete_resources(self):
         self._bucket.objects.delete()
         self._bucket.delete()
@@ -238,6 +272,8 @@ class TstFunction(TstLambdas):
         self._compact_configuration_table.delete()
         self._rate_limiting_table.delete()
         self._license_preprocessing_queue.delete()
+        self._bulk_upload_shard_queue.delete()
+        self._bulk_upload_shard_table.delete()
         boto3.client('events').delete_event_bus(Name=os.environ['EVENT_BUS_NAME'])
 
         # Delete the Cognito user pool
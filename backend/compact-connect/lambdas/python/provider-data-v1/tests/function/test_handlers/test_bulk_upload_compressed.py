@@ -0,0 +1,183 @@
+import gzip
+import json
+import os
+from base64 import b64decode
+from csv import DictWriter
+from io import StringIO
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from moto import mock_aws
+
+from .. import TstFunction
+
+mock_flag_client = MagicMock()
+mock_flag_client.return_value = True
+
+
+@mock_aws
+@patch('cc_common.feature_flag_client.is_feature_enabled', mock_flag_client)
+class TestBulkUploadCompressed(TstFunction):
+    def setUp(self):
+        super().setUp()
+        with open('../common/tests/resources/api/license-post.json') as f:
+            self.license_row = json.load(f)
+
+    def _license_csv(self, count: int) -> bytes:
+        rows = [{**self.license_row, 'ssn': f'123-45-{i:04}', 'licenseNumber': f'LICENSE{i}'} for i in range(count)]
+        rows[3]['dateOfBirth'] = 'not a date'
+        stream = StringIO()
+        writer = DictWriter(stream, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+        return b'\xef\xbb\xbf' + stream.getvalue().encode('utf-8')
+
+    def _put_object(self, content: bytes, content_encoding: str | None = None) -> str:
+        object_key = f'aslp/oh/{uuid4().hex}'
+        extra_args = {'ContentEncoding': content_encoding} if content_encoding else {}
+        self._bucket.put_object(Key=object_key, Body=content, **extra_args)
+        return object_key
+
+    def _s3_event(self, object_key: str) -> dict:
+        with open('../common/tests/resources/put-event.json') as f:
+            event = json.load(f)
+
+        event['Records'][0]['s3']['bucket'] = {
+            'name': self._bucket.name,
+            'arn': f'arn:aws:s3:::{self._bucket.name}',
+            'ownerIdentity': {'principalId': 'ASDFG123'},
+        }
+        event['Records'][0]['s3']['object']['key'] = object_key
+        event['Records'][0]['s3']['object']['size'] = self._bucket.Object(object_key).content_length
+        return event
+
+    def _receive_all_messages(self) -> list[dict]:
+        messages = []
+        while batch := self._license_preprocessing_queue.receive_messages(MaxNumberOfMessages=10):
+            for message in batch:
+                messages.append(json.loads(message.body))
+                message.delete()
+        return messages
+
+    def _parse(self, object_key: str, env: dict | None = None) -> tuple[list[dict], list[dict]]:
+        """Process an upload, returning the events and preprocessing queue messages it produced"""
+        from handlers import bulk_upload
+
+        with (
+            patch.dict(os.environ, env or {}),
+            patch.object(
+                bulk_upload.config.events_client, 'put_events', wraps=bulk_upload.config.events_client.put_events
+            ) as put_events,
+        ):
+            bulk_upload.parse_bulk_upload_file(self._s3_event(object_key), self.mock_context)
+
+        events = [json.loads(entry['Detail']) for call in put_events.call_args_list for entry in call.kwargs['Entries']]
+        for detail in events:
+            del detail['eventTime']
+        # The object should be gone, once parsing is complete
+        self.assertEqual([], [obj.key for obj in self._bucket.objects.filter(Prefix=object_key)])
+        return events, self._receive_all_messages()
+
+    def test_gzip_upload_matches_uncompressed(self):
+        content = self._license_csv(30)
+        uncompressed_events, uncompressed_messages = self._parse(self._put_object(content))
+
+        # Concatenated gzip members, as produced by compressing a file in pieces, are all read
+        compressed = gzip.compress(content[:1_000]) + gzip.compress(content[1_000:])
+        compressed_events, compressed_messages = self._parse(self._put_object(compressed, content_encoding='gzip'))
+
+        self.assertEqual([4], [detail['recordNumber'] for detail in compressed_events])
+        self.assertEqual(uncompressed_events, compressed_events)
+        self.assertEqual(29, len(compressed_messages))
+        # Messages are sent from a pool of worker threads, so their order on the queue is not guaranteed
+        self.assertEqual(
+            sorted(uncompressed_messages, key=lambda message: message['ssn']),
+            sorted(compressed_messages, key=lambda message: message['ssn']),
+        )
+
+    def test_compressed_upload_is_not_sharded(self):
+        from bulk_upload_shards import plan_bulk_upload_shards
+
+        object_key = self._put_object(gzip.compress(self._license_csv(30)), content_encoding='gzip')
+
+        self.assertIsNone(
+            plan_bulk_upload_shards(
+                s3_client=self.config.s3_client,
+                bucket_name=self._bucket.name,
+                key=object_key,
+                compact='aslp',
+                jurisdiction='oh',
+                target_shard_size=100,
+            )
+        )
+
+        events, messages = self._parse(object_key, env={'BULK_UPLOAD_SHARD_SIZE_BYTES': '100'})
+        self.assertEqual([4], [detail['recordNumber'] for detail in events])
+        self.assertEqual(29, len(messages))
+
+    def test_decompressed_size_is_limited(self):
+        content = self._license_csv(30)
+        object_key = self._put_object(gzip.compress(content), content_encoding='gzip')
+
+        events, messages = self._parse(object_key, env={'BULK_UPLOAD_MAX_DECOMPRESSED_BYTES': str(len(content) // 2)})
+
+        self.assertEqual(
+            [f'Decompressed file is larger than the maximum of {len(content) // 2} bytes'],
+            events[-1]['errors'],
+        )
+        # Licenses read before the limit was reached may already have been sent, but never the whole file
+        self.assertLess(len(messages), 29)
+
+    def test_unsupported_content_encoding_fails_upload(self):
+        object_key = self._put_object(self._license_csv(5), content_encoding='br')
+
+        events, messages = self._parse(object_key)
+
+        self.assertEqual(
+            [
+                {
+                    'compact': 'aslp',
+                    'jurisdiction': 'oh',
+                    'errors': [events[0]['errors'][0]],
+                }
+            ],
+            events,
+        )
+        self.assertTrue(events[0]['errors'][0].startswith('Unsupported Content-Encoding, "br".'))
+        self.assertEqual([], messages)
+
+
+@mock_aws
+class TestBulkUploadUrlCompressed(TstFunction):
+    def _get_url(self, query_string_parameters: dict | None) -> dict:
+        from handlers.bulk_upload import bulk_upload_url_handler
+
+        with open('../common/tests/resources/api-event.json') as f:
+            event = json.load(f)
+
+        event['requestContext']['authorizer']['claims']['scope'] = 'openid email stuff oh/aslp.write'
+        event['pathParameters'] = {'compact': 'aslp', 'jurisdiction': 'oh'}
+        event['queryStringParameters'] = query_string_parameters
+        return bulk_upload_url_handler(event, self.mock_context)
+
+    def test_get_bulk_upload_url_with_content_encoding(self):
+        resp = self._get_url({'contentEncoding': 'gzip'})
+
+        self.assertEqual(200, resp['statusCode'])
+        upload = json.loads(resp['body'])['upload']
+        self.assertEqual('gzip', upload['fields']['Content-Encoding'])
+        # The policy requires the Content-Encoding the file is uploaded with
+        policy = json.loads(b64decode(upload['fields']['policy']))
+        self.assertIn(['eq', '$Content-Encoding', 'gzip'], policy['conditions'])
+
+    def test_get_bulk_upload_url_without_content_encoding(self):
+        resp = self._get_url(None)
+
+        self.assertEqual(200, resp['statusCode'])
+        self.assertNotIn('Content-Encoding', json.loads(resp['body'])['upload']['fields'])
+
+    def test_get_bulk_upload_url_invalid_content_encoding(self):
+        resp = self._get_url({'contentEncoding': 'br'})
+
+        self.assertEqual(400, resp['statusCode'])
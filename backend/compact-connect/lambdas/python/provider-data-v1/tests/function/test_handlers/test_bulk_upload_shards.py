@@ -0,0 +1,262 @@
+import json
+import os
+from csv import DictWriter
+from io import StringIO, TextIOWrapper
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from moto import mock_aws
+
+from .. import TstFunction
+
+mock_flag_client = MagicMock()
+mock_flag_client.return_value = True
+
+
+@mock_aws
+@patch('cc_common.feature_flag_client.is_feature_enabled', mock_flag_client)
+class TestBulkUploadShards(TstFunction):
+    def setUp(self):
+        super().setUp()
+        with open('../common/tests/resources/api/license-post.json') as f:
+            self.license_row = json.load(f)
+
+    def _license_rows(self, count: int) -> list[dict]:
+        return [{**self.license_row, 'ssn': f'123-45-{i:04}', 'licenseNumber': f'LICENSE{i}'} for i in range(count)]
+
+    @staticmethod
+    def _csv(rows: list[dict]) -> str:
+        stream = StringIO()
+        writer = DictWriter(stream, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+        return stream.getvalue()
+
+    def _put_object(self, content: bytes) -> str:
+        object_key = f'aslp/oh/{uuid4().hex}'
+        self._bucket.put_object(Key=object_key, Body=content)
+        return object_key
+
+    def _plan(self, object_key: str, target_shard_size: int):
+        from bulk_upload_shards import plan_bulk_upload_shards
+
+        return plan_bulk_upload_shards(
+            s3_client=self.config.s3_client,
+            bucket_name=self._bucket.name,
+            key=object_key,
+            compact='aslp',
+            jurisdiction='oh',
+            target_shard_size=target_shard_size,
+        )
+
+    def _read_shard(self, object_key: str, shard) -> list[dict]:
+        from license_csv_reader import LicenseCSVReader
+
+        body = self._bucket.Object(object_key).get(Range=shard.byte_range)['Body']
+        return list(LicenseCSVReader().licenses(TextIOWrapper(body, encoding='utf-8-sig'), fieldnames=shard.fieldnames))
+
+    def _s3_event(self, object_key: str) -> dict:
+        with open('../common/tests/resources/put-event.json') as f:
+            event = json.load(f)
+
+        event['Records'][0]['s3']['bucket'] = {
+            'name': self._bucket.name,
+            'arn': f'arn:aws:s3:::{self._bucket.name}',
+            'ownerIdentity': {'principalId': 'ASDFG123'},
+        }
+        event['Records'][0]['s3']['object']['key'] = object_key
+        event['Records'][0]['s3']['object']['size'] = self._bucket.Object(object_key).content_length
+        return event
+
+    def _receive_all_messages(self) -> list[dict]:
+        messages = []
+        while batch := self._license_preprocessing_queue.receive_messages(MaxNumberOfMessages=10):
+            for message in batch:
+                messages.append(json.loads(message.body))
+                message.delete()
+        return messages
+
+    def test_shards_are_row_aligned(self):
+        from license_csv_reader import LicenseCSVReader
+
+        rows = self._license_rows(40)
+        # A line break inside a quoted value, which must not be mistaken for the end of a row
+        rows[7]['homeAddressStreet2'] = 'Apt 321\nAround back'
+        # Multibyte characters throw off any count of characters vs bytes
+        rows[8]['givenName'] = '覃'
+        content = self._csv(rows)
+        # A blank line in the middle of the file isn't counted as a record
+        content = content.replace('LICENSE20\r\n', 'LICENSE20\r\n\r\n')
+        # Along with a BOM
+        content_bytes = b'\xef\xbb\xbf' + content.encode('utf-8')
+        object_key = self._put_object(content_bytes)
+
+        shards = self._plan(object_key, target_shard_size=1_000)
+
+        self.assertGreater(len(shards), 5)
+        # The shards are contiguous, covering every row after the header
+        self.assertEqual(content_bytes.index(b'\r\n') + 2, shards[0].start_byte)
+        for shard, next_shard in zip(shards, shards[1:], strict=False):
+            self.assertEqual(shard.end_byte, next_shard.start_byte)
+            self.assertEqual(shard.first_record_number + shard.record_count, next_shard.first_record_number)
+        self.assertEqual(len(content_bytes), shards[-1].end_byte)
+
+        # Reading each shard gives the same rows as reading the whole file
+        expected_rows = list(LicenseCSVReader().licenses(StringIO(content_bytes.decode('utf-8-sig'))))
+        self.assertEqual(40, len(expected_rows))
+        for shard in shards:
+            self.assertEqual(
+                expected_rows[shard.first_record_number - 1 : shard.first_record_number - 1 + shard.record_count],
+                self._read_shard(object_key, shard),
+            )
+
+    def test_duplicates_are_found_across_shards(self):
+        rows = self._license_rows(40)
+        # An invalid row doesn't claim its SSN, so the first duplicate is the next one
+        rows[2].update({'ssn': '999-99-9999', 'licenseStatus': 'translucent'})
+        rows[9]['ssn'] = '999-99-9999'
+        rows[30]['ssn'] = '999-99-9999'
+        rows[35]['ssn'] = ' 999-99-9999 '
+        # A different license type is not a duplicate
+        rows[36].update({'ssn': '999-99-9999', 'licenseType': 'audiologist'})
+        # Duplicated within a single shard
+        rows[32]['ssn'] = rows[31]['ssn']
+        object_key = self._put_object(self._csv(rows).encode('utf-8'))
+
+        shards = self._plan(object_key, target_shard_size=2_000)
+
+        self.assertGreater(len(shards), 2)
+        duplicates = {}
+        for shard in shards:
+            duplicates.update(shard.duplicate_ssn_records)
+        self.assertEqual({31: 10, 33: 32, 36: 10}, duplicates)
+
+    def test_unreadable_file_is_not_sharded(self):
+        content_bytes = self._csv(self._license_rows(10)).encode('utf-8') + b'\xff\xfe\r\n'
+        object_key = self._put_object(content_bytes)
+
+        self.assertIsNone(self._plan(object_key, target_shard_size=1_000))
+
+    def _process_shard_messages(self) -> list[dict]:
+        """Process every message on the shard queue, as the shard handler would, returning any batch item failures"""
+        from handlers import bulk_upload
+
+        failures = []
+        while batch := self._bulk_upload_shard_queue.receive_messages(MaxNumberOfMessages=10):
+            for message in batch:
+                resp = bulk_upload.process_bulk_upload_shards(
+                    {'Records': [{'messageId': message.message_id, 'body': message.body}]}, self.mock_context
+                )
+                failures.extend(resp['batchItemFailures'])
+                message.delete()
+        return failures
+
+    def _parse_with_shards(self, object_key: str, target_shard_size: int) -> tuple[int, list[dict]]:
+        """Process an upload as the deployed functions would, returning the number of shards and the failure events"""
+        from handlers import bulk_upload
+
+        with (
+            patch.dict(os.environ, {'BULK_UPLOAD_SHARD_SIZE_BYTES': str(target_shard_size)}),
+            patch('handlers.bulk_upload.EventBatchWriter') as mock_event_writer_class,
+        ):
+            mock_event_writer = mock_event_writer_class.return_value.__enter__.return_value
+            mock_event_writer.failed_entry_count = 0
+
+            bulk_upload.parse_bulk_upload_file(self._s3_event(object_key), self.mock_context)
+            shard_count = int(self._bulk_upload_shard_queue.attributes['ApproximateNumberOfMessages'])
+            self.assertEqual([], self._process_shard_messages())
+
+        events = sorted(
+            (json.loads(call.kwargs['Entry']['Detail']) for call in mock_event_writer.put_event.call_args_list),
+            key=lambda detail: detail['recordNumber'],
+        )
+        for detail in events:
+            del detail['eventTime']
+        return shard_count, events
+
+    def test_sharded_upload_matches_unsharded(self):
+        rows = self._license_rows(60)
+        rows[3]['dateOfBirth'] = 'not a date'
+        rows[12]['ssn'] = rows[50]['ssn'] = rows[5]['ssn']
+        rows[44]['homeAddressPostalCode'] = '1'
+        rows[57]['licenseStatus'] = 'translucent'
+        content_bytes = self._csv(rows).encode('utf-8')
+
+        # Sharding disabled
+        unsharded_shard_count, unsharded_events = self._parse_with_shards(
+            self._put_object(content_bytes), target_shard_size=0
+        )
+        unsharded_messages = self._receive_all_messages()
+        self.assertEqual(0, unsharded_shard_count)
+
+        sharded_key = self._put_object(content_bytes)
+        sharded_shard_count, sharded_events = self._parse_with_shards(sharded_key, target_shard_size=2_000)
+        sharded_messages = self._receive_all_messages()
+
+        self.assertGreater(sharded_shard_count, 3)
+        self.assertEqual([4, 13, 45, 51, 58], [detail['recordNumber'] for detail in sharded_events])
+        self.assertEqual(unsharded_events, sharded_events)
+        self.assertEqual(55, len(sharded_messages))
+        self.assertEqual(
+            sorted(unsharded_messages, key=lambda message: message['licenseNumber']),
+            sorted(sharded_messages, key=lambda message: message['licenseNumber']),
+        )
+        # The object should be gone, once all the shards are complete
+        self.assertEqual([], [obj.key for obj in self._bucket.objects.filter(Prefix=sharded_key)])
+
+    def test_only_failed_shards_are_retried(self):
+        from handlers import bulk_upload
+
+        object_key = self._put_object(self._csv(self._license_rows(40)).encode('utf-8'))
+        s3_event = self._s3_event(object_key)
+        process_bulk_upload_file = bulk_upload.process_bulk_upload_file
+
+        def fail_one_shard(**kwargs):
+            if kwargs['shard'].first_record_number > 1 and not fail_one_shard.failed:
+                fail_one_shard.failed = True
+                raise RuntimeError('Oh noes!')
+            process_bulk_upload_file(**kwargs)
+
+        fail_one_shard.failed = False
+
+        with patch.dict(os.environ, {'BULK_UPLOAD_SHARD_SIZE_BYTES': '2000'}):
+            bulk_upload.parse_bulk_upload_file(s3_event, self.mock_context)
+            with patch('handlers.bulk_upload.process_bulk_upload_file', side_effect=fail_one_shard):
+                failures = self._process_shard_messages()
+
+            self.assertEqual(1, len(failures))
+            # The object is left in place, until the failed shard has been processed
+            self.assertEqual([object_key], [obj.key for obj in self._bucket.objects.filter(Prefix=object_key)])
+            first_attempt_messages = self._receive_all_messages()
+
+            # If the whole upload is retried, only the failed shard is sent again
+            bulk_upload.parse_bulk_upload_file(s3_event, self.mock_context)
+            self.assertEqual('1', self._bulk_upload_shard_queue.attributes['ApproximateNumberOfMessages'])
+            self.assertEqual([], self._process_shard_messages())
+
+        retry_messages = self._receive_all_messages()
+        self.assertEqual(
+            sorted(f'LICENSE{i}' for i in range(40)),
+            sorted(message['licenseNumber'] for message in first_attempt_messages + retry_messages),
+        )
+        # The object should be gone, once all the shards are complete
+        self.assertEqual([], [obj.key for obj in self._bucket.objects.filter(Prefix=object_key)])
+
+    def test_processed_shard_is_not_processed_again(self):
+        from handlers import bulk_upload
+
+        object_key = self._put_object(self._csv(self._license_rows(40)).encode('utf-8'))
+
+        with patch.dict(os.environ, {'BULK_UPLOAD_SHARD_SIZE_BYTES': '2000'}):
+            bulk_upload.parse_bulk_upload_file(self._s3_event(object_key), self.mock_context)
+        message = self._bulk_upload_shard_queue.receive_messages(MaxNumberOfMessages=1)[0]
+        event = {'Records': [{'messageId': message.message_id, 'body': message.body}]}
+
+        self.assertEqual({'batchItemFailures': []}, bulk_upload.process_bulk_upload_shards(event, self.mock_context))
+        first_delivery_messages = self._receive_all_messages()
+        self.assertGreater(len(first_delivery_messages), 0)
+
+        # SQS may deliver a message more than once
+        self.assertEqual({'batchItemFailures': []}, bulk_upload.process_bulk_upload_shards(event, self.mock_context))
+        self.assertEqual([], self._receive_all_messages())
@@ -0,0 +1,247 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+from cc_common.data_model.update_tier_enum import UpdateTierEnum
+from moto import mock_aws
+
+from .. import TstFunction
+
+
+@mock_aws
+@patch('cc_common.config._Config.current_standard_datetime', datetime.fromisoformat('2024-11-08T23:59:59+00:00'))
+class TestIngestBatch(TstFunction):
+    @staticmethod
+    def _message(message_id: str, **detail_overrides) -> dict:
+        with open('../common/tests/resources/ingest/event-bridge-message.json') as f:
+            message = json.load(f)
+        message['detail'].update(detail_overrides)
+        return {'messageId': message_id, 'body': json.dumps(message)}
+
+    def _get_provider_via_api(self, provider_id: str) -> dict:
+        from handlers.providers import get_provider
+
+        with open('../common/tests/resources/api-event.json') as f:
+            event = json.load(f)
+
+        event['pathParameters'] = {'compact': 'aslp', 'providerId': provider_id}
+        event['requestContext']['authorizer']['claims']['scope'] = (
+            'openid email stuff aslp/readGeneral aslp/readPrivate'
+        )
+        resp = get_provider(event, self.mock_context)
+        self.assertEqual(resp['statusCode'], 200)
+        return json.loads(resp['body'])
+
+    def test_licenses_for_same_provider_are_coalesced(self):
+        from handlers import ingest
+
+        slp_message = self._message('slp')
+        provider_id = json.loads(slp_message['body'])['detail']['providerId']
+        aud_message = self._message(
+            'aud',
+            licenseType='audiologist',
+            dateOfIssuance='2020-06-06',
+            licenseNumber='B0608337260',
+            givenName='Audrey',
+        )
+
+        with (
+            patch.object(
+                ingest.config.data_client, 'get_provider', wraps=ingest.config.data_client.get_provider
+            ) as get_provider,
+            patch.object(
+                ingest.config.dynamodb_client,
+                'transact_write_items',
+                wraps=ingest.config.dynamodb_client.transact_write_items,
+            ) as transact_write_items,
+        ):
+            resp = ingest.ingest_license_messages({'Records': [slp_message, aud_message]}, self.mock_context)
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        # One read and one write for the provider, rather than one of each per message
+        get_provider.assert_called_once()
+        transact_write_items.assert_called_once()
+        # Two licenses and one provider record, with the provider record only written once
+        self.assertEqual(3, len(transact_write_items.call_args.kwargs['TransactItems']))
+
+        provider_data = self._get_provider_via_api(provider_id)
+        self.assertEqual(
+            {'speech-language pathologist', 'audiologist'},
+            {license_data['licenseType'] for license_data in provider_data['licenses']},
+        )
+        # The provider data should be copied from the audiologist license, which has the newer issuance date
+        self.assertEqual('Audrey', provider_data['givenName'])
+
+    def test_licenses_for_different_providers_are_ingested(self):
+        from handlers.ingest import ingest_license_messages
+
+        other_provider_id = str(uuid4())
+        first_message = self._message('first')
+        provider_id = json.loads(first_message['body'])['detail']['providerId']
+        second_message = self._message('second', providerId=other_provider_id, givenName='Otto')
+
+        resp = ingest_license_messages({'Records': [first_message, second_message]}, self.mock_context)
+        self.assertEqual({'batchItemFailures': []}, resp)
+
+        self.assertEqual('Björk', self._get_provider_via_api(provider_id)['givenName'])
+        self.assertEqual('Otto', self._get_provider_via_api(other_provider_id)['givenName'])
+
+    def test_repeated_license_in_batch_is_applied_in_order(self):
+        from handlers.ingest import ingest_license_messages
+
+        first_message = self._message('first')
+        provider_id = json.loads(first_message['body'])['detail']['providerId']
+        second_message = self._message('second', familyName='Johnson')
+
+        resp = ingest_license_messages({'Records': [first_message, second_message]}, self.mock_context)
+        self.assertEqual({'batchItemFailures': []}, resp)
+
+        provider_data = self._get_provider_via_api(provider_id)
+        self.assertEqual(1, len(provider_data['licenses']))
+        self.assertEqual('Johnson', provider_data['familyName'])
+
+        # The second message should have been recorded as an update to the license from the first
+        provider_user_records = self.config.data_client.get_provider_user_records(
+            compact='aslp', provider_id=provider_id, include_update_tier=UpdateTierEnum.TIER_THREE
+        )
+        update_records = provider_user_records._license_update_records  # noqa: SLF001 protected-access
+        self.assertEqual(1, len(update_records))
+        self.assertEqual({'familyName': 'Johnson'}, update_records[0].updatedValues)
+
+    def test_invalid_message_fails_alone(self):
+        from handlers.ingest import ingest_license_messages
+
+        good_message = self._message('good')
+        provider_id = json.loads(good_message['body'])['detail']['providerId']
+        bad_message = self._message('bad', licenseType='not a license type')
+
+        resp = ingest_license_messages({'Records': [good_message, bad_message]}, self.mock_context)
+        self.assertEqual({'batchItemFailures': [{'itemIdentifier': 'bad'}]}, resp)
+
+        self.assertEqual(1, len(self._get_provider_via_api(provider_id)['licenses']))
+
+    def test_failed_transaction_fails_all_messages_for_provider(self):
+        from handlers import ingest
+
+        slp_message = self._message('slp')
+        aud_message = self._message('aud', licenseType='audiologist', licenseNumber='B0608337260')
+        other_message = self._message('other', providerId=str(uuid4()))
+
+        original_transact_write_items = ingest.config.dynamodb_client.transact_write_items
+
+        def fail_first_transaction(**kwargs):
+            if not fail_first_transaction.failed:
+                fail_first_transaction.failed = True
+                raise ClientError(
+                    error_response={'Error': {'Code': 'TransactionCanceledException'}},
+                    operation_name='TransactWriteItems',
+                )
+            return original_transact_write_items(**kwargs)
+
+        fail_first_transaction.failed = False
+
+        with patch.object(ingest.config.dynamodb_client, 'transact_write_items', side_effect=fail_first_transaction):
+            resp = ingest.ingest_license_messages(
+                {'Records': [slp_message, aud_message, other_message]}, self.mock_context
+            )
+
+        self.assertEqual({'batchItemFailures': [{'itemIdentifier': 'slp'}, {'itemIdentifier': 'aud'}]}, resp)
+
+    def _ingest_and_count_writes(self, records: list[dict]) -> tuple[dict, int, int]:
+        """Run the batch ingest, returning its response, and the number of partition reads and transactions"""
+        from handlers import ingest
+
+        with (
+            patch.object(
+                ingest.config.data_client, 'get_provider', wraps=ingest.config.data_client.get_provider
+            ) as get_provider,
+            patch.object(
+                ingest.config.dynamodb_client,
+                'transact_write_items',
+                wraps=ingest.config.dynamodb_client.transact_write_items,
+            ) as transact_write_items,
+        ):
+            resp = ingest.ingest_license_messages({'Records': records}, self.mock_context)
+        return resp, get_provider.call_count, transact_write_items.call_count
+
+    @patch('handlers.ingest.metrics')
+    def test_unchanged_license_is_not_rewritten(self, mock_metrics):
+        from aws_lambda_powertools.metrics import MetricUnit
+
+        resp, _reads, _writes = self._ingest_and_count_writes([self._message('first')])
+        self.assertEqual({'batchItemFailures': []}, resp)
+        mock_metrics.add_metric.assert_not_called()
+
+        # The same license, uploaded again
+        resp, reads, writes = self._ingest_and_count_writes([self._message('again')])
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        self.assertEqual(0, reads)
+        self.assertEqual(0, writes)
+        mock_metrics.add_metric.assert_called_once_with(
+            name='unchanged-license-skipped', unit=MetricUnit.Count, value=1
+        )
+
+        # While a changed license is written, as usual
+        resp, reads, writes = self._ingest_and_count_writes([self._message('changed', familyName='Johnson')])
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        self.assertEqual(1, reads)
+        self.assertEqual(1, writes)
+
+    def test_unchanged_license_is_not_rewritten_by_single_message_ingest(self):
+        from handlers import ingest
+
+        message = self._message('first')
+        self.assertEqual(
+            {'batchItemFailures': []}, ingest.ingest_license_message({'Records': [message]}, self.mock_context)
+        )
+
+        with patch.object(ingest.config.dynamodb_client, 'transact_write_items') as transact_write_items:
+            resp = ingest.ingest_license_message({'Records': [self._message('again')]}, self.mock_context)
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        transact_write_items.assert_not_called()
+
+    def test_license_changed_outside_of_ingest_is_rewritten(self):
+        message = self._message('first')
+        detail = json.loads(message['body'])['detail']
+        self.assertEqual({'batchItemFailures': []}, self._ingest_and_count_writes([message])[0])
+
+        # Any other change to the license record, like an encumbrance, updates its dateOfUpdate
+        license_record = self.config.provider_table.query(
+            KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
+            ExpressionAttributeValues={
+                ':pk': f'aslp#PROVIDER#{detail["providerId"]}',
+                ':sk': 'aslp#PROVIDER#license/',
+            },
+        )['Items'][0]
+        self.assertIn('ingestFingerprint', license_record)
+        self.config.provider_table.update_item(
+            Key={'pk': license_record['pk'], 'sk': license_record['sk']},
+            UpdateExpression='SET encumberedStatus = :status, dateOfUpdate = :dateOfUpdate',
+            ExpressionAttributeValues={':status': 'encumbered', ':dateOfUpdate': '2024-11-09T00:00:00+00:00'},
+        )
+
+        resp, reads, writes = self._ingest_and_count_writes([self._message('again')])
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        self.assertEqual(1, reads)
+        self.assertEqual(1, writes)
+
+    def test_license_reverted_within_batch_is_rewritten(self):
+        first_message = self._message('first')
+        provider_id = json.loads(first_message['body'])['detail']['providerId']
+        self.assertEqual({'batchItemFailures': []}, self._ingest_and_count_writes([first_message])[0])
+
+        # The license changes, then changes back, in the same batch. The second message matches what is in the
+        # database, but not what the first message staged, so must still be written.
+        resp, _reads, writes = self._ingest_and_count_writes(
+            [self._message('changed', familyName='Johnson'), self._message('reverted')]
+        )
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        self.assertEqual(1, writes)
+        self.assertEqual('Guðmundsdóttir', self._get_provider_via_api(provider_id)['familyName'])
@@ -0,0 +1,139 @@
+import json
+from unittest.mock import patch
+
+from moto import mock_aws
+
+from .. import TstFunction
+
+
+@mock_aws
+class TestPreprocessBatch(TstFunction):
+    @staticmethod
+    def _message(message_id: str, **overrides) -> dict:
+        with open('../common/tests/resources/ingest/preprocessor-sqs-message.json') as f:
+            message = json.load(f)
+        message.update(overrides)
+        return {'messageId': message_id, 'body': json.dumps(message)}
+
+    def _preprocess(self, records: list[dict], put_events_side_effect=None) -> tuple[dict, list[dict], int]:
+        """Run the batch preprocessor, returning its response, the event entries it published, and SSN table puts"""
+        from handlers import ingest
+
+        with (
+            patch.object(ingest.config.ssn_table, 'put_item', wraps=ingest.config.ssn_table.put_item) as put_item,
+            patch.object(
+                ingest.config.events_client,
+                'put_events',
+                side_effect=put_events_side_effect,
+                wraps=ingest.config.events_client.put_events,
+            ) as put_events,
+        ):
+            resp = ingest.preprocess_license_ingest_messages({'Records': records}, self.mock_context)
+
+        self.put_events_call_count = put_events.call_count
+        entries = [entry for call in put_events.call_args_list for entry in call.kwargs['Entries']]
+        return resp, entries, put_item.call_count
+
+    def _provider_id_for(self, ssn: str) -> str:
+        return self._ssn_table.get_item(Key={'pk': f'aslp#SSN#{ssn}', 'sk': f'aslp#SSN#{ssn}'})['Item']['providerId']
+
+    def test_each_ssn_is_resolved_once_and_events_are_batched(self):
+        records = [
+            self._message('slp-1', ssn='123-12-0001'),
+            self._message('aud-1', ssn='123-12-0001', licenseType='audiologist', licenseNumber='B0001'),
+            # A correction, whose previousSSN is also in the batch
+            self._message('slp-2', ssn='123-12-0002', previousSSN='123-12-0001'),
+        ]
+        records.extend(self._message(f'other-{i}', ssn=f'123-12-{i:04}') for i in range(3, 15))
+
+        resp, entries, put_item_count = self._preprocess(records)
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        # One conditional put per distinct SSN, rather than per message
+        self.assertEqual(14, put_item_count)
+        # 15 events, in two calls
+        self.assertEqual(2, self.put_events_call_count)
+        self.assertEqual(['license.ingest'] * 15, [entry['DetailType'] for entry in entries])
+
+        details = [json.loads(entry['Detail']) for entry in entries]
+        for detail in details:
+            self.assertNotIn('ssn', detail)
+            self.assertNotIn('previousSSN', detail)
+        provider_id = self._provider_id_for('123-12-0001')
+        self.assertEqual(provider_id, details[0]['providerId'])
+        self.assertEqual(provider_id, details[1]['providerId'])
+        self.assertEqual('0001', details[1]['ssnLastFour'])
+        self.assertEqual(self._provider_id_for('123-12-0002'), details[2]['providerId'])
+        self.assertEqual(provider_id, details[2]['previousProviderId'])
+
+    def test_batch_matches_single_message_preprocessing(self):
+        from handlers import ingest
+
+        records = [
+            self._message('1', ssn='123-12-0001'),
+            self._message('2', ssn='123-12-0002', previousSSN='123-12-0003'),
+            self._message('3', ssn='123-12-0004', previousSSN='123-12-0004'),
+        ]
+        # Map the SSNs to provider ids first, so both runs resolve them to the same ids
+        ingest.preprocess_license_ingest({'Records': records}, self.mock_context)
+
+        with patch.object(
+            ingest.config.events_client, 'put_events', wraps=ingest.config.events_client.put_events
+        ) as put_events:
+            resp = ingest.preprocess_license_ingest({'Records': records}, self.mock_context)
+        self.assertEqual({'batchItemFailures': []}, resp)
+        expected_entries = [entry for call in put_events.call_args_list for entry in call.kwargs['Entries']]
+
+        resp, entries, _put_item_count = self._preprocess(records)
+
+        self.assertEqual({'batchItemFailures': []}, resp)
+        self.assertEqual(expected_entries, entries)
+
+    def test_failed_message_does_not_fail_batch(self):
+        no_ssn_message = json.loads(self._message('no-ssn')['body'])
+        del no_ssn_message['ssn']
+        records = [
+            self._message('good', ssn='123-12-0001'),
+            # adding an invalid ssn here to force an exception
+            self._message('bad-ssn', ssn=False),
+            # A malformed message fails without a failure event, just as it does from preprocess_license_ingest
+            {'messageId': 'no-ssn', 'body': json.dumps(no_ssn_message)},
+            self._message('also-good', ssn='123-12-0002'),
+        ]
+
+        resp, entries, _put_item_count = self._preprocess(records)
+
+        self.assertEqual({'batchItemFailures': [{'itemIdentifier': 'bad-ssn'}, {'itemIdentifier': 'no-ssn'}]}, resp)
+        self.assertEqual(
+            ['license.ingest', 'license.ingest', 'license.ingest-failure'], [entry['DetailType'] for entry in entries]
+        )
+        failure_detail = json.loads(entries[2]['Detail'])
+        self.assertEqual('aslp', failure_detail['compact'])
+        self.assertEqual('oh', failure_detail['jurisdiction'])
+        self.assertEqual('2024-07-11T19:57:45Z', failure_detail['eventTime'])
+        self.assertTrue(failure_detail['errors'][0].startswith('Error preprocessing license data: '))
+
+    def test_unpublished_events_are_batch_item_failures(self):
+        from handlers import ingest
+
+        real_put_events = ingest.config.events_client.put_events
+
+        def put_events(Entries: list[dict]):  # noqa: N803 invalid-name
+            if Entries[0]['DetailType'] == 'license.ingest-failure':
+                return real_put_events(Entries=Entries)
+            # EventBridge failed to accept the second entry
+            resp = real_put_events(Entries=Entries[:1] + Entries[2:])
+            resp['FailedEntryCount'] = 1
+            resp['Entries'].insert(1, {'ErrorCode': 'InternalFailure', 'ErrorMessage': 'Oh noes!'})
+            return resp
+
+        records = [self._message(f'message-{i}', ssn=f'123-12-{i:04}') for i in range(3)]
+
+        resp, entries, _put_item_count = self._preprocess(records, put_events_side_effect=put_events)
+
+        self.assertEqual({'batchItemFailures': [{'itemIdentifier': 'message-1'}]}, resp)
+        failure_detail = json.loads(entries[-1]['Detail'])
+        self.assertEqual(
+            ['Error preprocessing license data: InternalFailure: Oh noes!'],
+            failure_detail['errors'],
+        )
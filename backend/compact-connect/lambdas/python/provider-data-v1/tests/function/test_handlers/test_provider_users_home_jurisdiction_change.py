@@ -362,6 +362,58 @@ class TestPutProviderHomeJurisdiction(TstFunction):
         self.assertEqual('inactive', stored_privilege_data.status)
         self.assertEqual('inactive', stored_privilege_data.homeJurisdictionChangeStatus)
 
+    def test_put_provider_home_jurisdiction_does_not_change_privileges_if_provider_record_update_fails(self):
+        from botocore.exceptions import ClientError
+        from cc_common.data_model.schema.privilege import PrivilegeData
+        from cc_common.exceptions import CCInternalException
+        from handlers import provider_users
+
+        (event, test_provider_record, test_current_license_record, test_privilege_record) = (
+            self._when_provider_has_no_license_in_new_selected_jurisdiction()
+        )
+        second_privilege_record = self.test_data_generator.put_default_privilege_record_in_provider_table(
+            value_overrides={
+                'compact': TEST_COMPACT,
+                'jurisdiction': 'co',
+                'licenseJurisdiction': STARTING_JURISDICTION,
+                'licenseType': TEST_LICENSE_TYPE,
+            }
+        )
+
+        provider_sk = f'{TEST_COMPACT}#PROVIDER'
+        original_transact_write_items = provider_users.config.dynamodb_client.transact_write_items
+
+        def fail_provider_record_transaction(**kwargs):
+            for item in kwargs['TransactItems']:
+                ((operation_type, operation),) = item.items()
+                attributes = operation['Item'] if operation_type == 'Put' else operation['Key']
+                if attributes['sk'] == {'S': provider_sk}:
+                    raise ClientError(
+                        error_response={'Error': {'Code': 'TransactionCanceledException'}},
+                        operation_name='TransactWriteItems',
+                    )
+            return original_transact_write_items(**kwargs)
+
+        # Small enough transactions that no two groups fit in one, so the privileges could be committed separately
+        with (
+            patch('cc_common.data_model.data_client.MAX_DYNAMODB_TRANSACTION_ITEMS', 4),
+            patch.object(
+                provider_users.config.dynamodb_client,
+                'transact_write_items',
+                side_effect=fail_provider_record_transaction,
+            ) as transact_write_items,
+        ):
+            with self.assertRaises(CCInternalException):
+                provider_users.provider_users_api_handler(event, self.mock_context)
+
+        # Only the provider record's transaction was attempted, and neither privilege was deactivated
+        self.assertEqual(1, transact_write_items.call_count)
+        for privilege_record in [test_privilege_record, second_privilege_record]:
+            stored_privilege_data = PrivilegeData.from_database_record(
+                self.test_data_generator.load_provider_data_record_from_database(privilege_record)
+            )
+            self.assertEqual('active', stored_privilege_data.status)
+
     def test_put_provider_home_jurisdiction_only_deactivates_privileges_for_non_existent_license_in_new_jurisdiction(
         self,
     ):
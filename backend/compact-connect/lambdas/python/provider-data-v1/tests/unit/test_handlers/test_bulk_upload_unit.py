@@ -17,7 +17,8 @@ class TestProcessS3Event(TstLambdas):
     def test_process_s3_event(self, mock_config, mock_process):
         from handlers.bulk_upload import parse_bulk_upload_file
 
-        mock_config.s3_client.get_object.response = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.s3_client.get_object.return_value = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.bulk_upload_shard_size_bytes = 0
 
         mock_process.return_value = None
 
@@ -42,7 +43,8 @@ class TestProcessS3Event(TstLambdas):
     def test_internal_exception(self, mock_config, mock_process):
         from handlers.bulk_upload import parse_bulk_upload_file
 
-        mock_config.s3_client.get_object.response = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.s3_client.get_object.return_value = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.bulk_upload_shard_size_bytes = 0
 
         # What if we've misconfigured something, so we can't access an AWS resource?
         mock_process.side_effect = ClientError(
@@ -70,7 +72,8 @@ class TestProcessS3Event(TstLambdas):
     def test_bad_data(self, mock_config, mock_process):
         from handlers.bulk_upload import parse_bulk_upload_file
 
-        mock_config.s3_client.get_object.response = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.s3_client.get_object.return_value = {'Body': StreamingBody(b'foo', '3')}
+        mock_config.bulk_upload_shard_size_bytes = 0
         mock_config.events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': [{'EventId': '123'}]}
 
         # Force a UnicodeDecodeError to reuse
@@ -99,15 +102,19 @@ class TestProcessS3Event(TstLambdas):
         mock_config.events_client.put_events.assert_called_once()
 
 
+def _mock_send_message_batch(QueueUrl, Entries):  # noqa: N803, ARG001 AWS defines the kwargs
+    return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+
 class TestProcessBulkUploadFile(TstLambdas):
     # We can't autospec because it causes the patch to evaluate properties that look up environment variables that we
     # don't intend to set for these tests.
-    @patch('handlers.bulk_upload.send_licenses_to_preprocessing_queue')
-    def test_good_data(self, mock_send_licenses_to_preprocessing_queue):
+    @patch('handlers.bulk_upload.config', autospec=False)
+    def test_good_data(self, mock_config):
         from handlers.bulk_upload import process_bulk_upload_file
 
-        # this method returns a list of any message ids that failed to send, in this test case, there are no failures
-        mock_send_licenses_to_preprocessing_queue.return_value = []
+        mock_config.license_preprocessing_queue_send_concurrency = 4
+        mock_config.sqs_client.send_message_batch.side_effect = _mock_send_message_batch
 
         with open('../common/tests/resources/licenses.csv', 'rb') as f:
             line_count = len(f.readlines())
@@ -125,29 +132,92 @@ class TestProcessBulkUploadFile(TstLambdas):
                 jurisdiction='oh',
             )
 
-        # Collect events sent to SQS for inspection
+        # Collect messages sent to SQS for inspection
 
-        # There should only be successful ingest events
+        # There should only be successful ingest messages
         entries = [
             entry
-            for call in mock_send_licenses_to_preprocessing_queue.call_args_list
-            for entry in call.kwargs['licenses_data']
+            for call in mock_config.sqs_client.send_message_batch.call_args_list
+            for entry in call.kwargs['Entries']
         ]
-        # Make sure we put the right number of events on the queue
+        # Make sure we put the right number of messages on the queue
         self.assertEqual(line_count - 1, len(entries))
 
     # We can't autospec because it causes the patch to evaluate properties that look up environment variables that we
     # don't intend to set for these tests.
     @patch('handlers.bulk_upload.config', autospec=False)
-    @patch('handlers.bulk_upload.send_licenses_to_preprocessing_queue')
-    def test_bad_data(self, mock_send_licenses_to_preprocessing_queue, mock_config):
+    def test_many_licenses_are_sent_in_concurrent_batches(self, mock_config):
+        from handlers.bulk_upload import process_bulk_upload_file
+
+        mock_config.license_preprocessing_queue_send_concurrency = 4
+        mock_config.sqs_client.send_message_batch.side_effect = _mock_send_message_batch
+
+        with open('../common/tests/resources/licenses.csv') as f:
+            header = f.readline()
+            row = f.readline()
+        # Give each row a unique SSN so they don't trip duplicate detection
+        ssn_index = header.split(',').index('ssn')
+        rows = []
+        for i in range(123):
+            cells = row.strip().split(',')
+            cells[ssn_index] = f'123-45-{i:04}'
+            rows.append(','.join(cells))
+        csv_data = (header + '\n'.join(rows)).encode('utf-8')
+
+        process_bulk_upload_file(
+            event_time=datetime.now(tz=UTC),
+            body=StreamingBody(BytesIO(csv_data), len(csv_data)),
+            object_key='aslp/oh/1234',
+            compact='aslp',
+            jurisdiction='oh',
+        )
+
+        entries = [
+            json.loads(entry['MessageBody'])
+            for call in mock_config.sqs_client.send_message_batch.call_args_list
+            for entry in call.kwargs['Entries']
+        ]
+        self.assertEqual(123, len(entries))
+        self.assertEqual({f'123-45-{i:04}' for i in range(123)}, {entry['ssn'] for entry in entries})
+        # 12 batches of 10, 1 batch of 3
+        self.assertEqual(13, mock_config.sqs_client.send_message_batch.call_count)
+
+    # We can't autospec because it causes the patch to evaluate properties that look up environment variables that we
+    # don't intend to set for these tests.
+    @patch('handlers.bulk_upload.config', autospec=False)
+    def test_queue_failure_raises(self, mock_config):
+        from cc_common.exceptions import CCInternalException
+        from handlers.bulk_upload import process_bulk_upload_file
+
+        mock_config.license_preprocessing_queue_send_concurrency = 4
+        mock_config.sqs_client.send_message_batch.side_effect = ClientError(
+            error_response={'Error': {'Code': 'AccessDenied'}},
+            operation_name='SendMessageBatch',
+        )
+
+        with open('../common/tests/resources/licenses.csv', 'rb') as f:
+            content = f.read()
+
+        with self.assertRaises(CCInternalException):
+            process_bulk_upload_file(
+                event_time=datetime.now(tz=UTC),
+                body=StreamingBody(BytesIO(content), len(content)),
+                object_key='aslp/oh/1234',
+                compact='aslp',
+                jurisdiction='oh',
+            )
+
+    # We can't autospec because it causes the patch to evaluate properties that look up environment variables that we
+    # don't intend to set for these tests.
+    @patch('handlers.bulk_upload.config', autospec=False)
+    def test_bad_data(self, mock_config):
         from handlers.bulk_upload import process_bulk_upload_file
 
         # mock static response for the events client when we put messages on the event bus
         mock_config.events_client.put_events.return_value = {'FailedEntryCount': 0, 'Entries': [{'EventId': '123'}]}
         mock_config.current_standard_datetime = datetime.now(tz=UTC)
-        # this method returns a list of any message ids that failed to send, in this test case, there are no failures
-        mock_send_licenses_to_preprocessing_queue.return_value = []
+        mock_config.license_preprocessing_queue_send_concurrency = 4
+        mock_config.sqs_client.send_message_batch.side_effect = _mock_send_message_batch
 
         # We'll do a little processing to mangle our CSV data a bit
         with open('../common/tests/resources/licenses.csv') as f:
@@ -194,8 +264,8 @@ class TestProcessBulkUploadFile(TstLambdas):
         # there should be three successful messages
         preprocessor_entries = [
             entry
-            for call in mock_send_licenses_to_preprocessing_queue.call_args_list
-            for entry in call.kwargs['licenses_data']
+            for call in mock_config.sqs_client.send_message_batch.call_args_list
+            for entry in call.kwargs['Entries']
         ]
         # the payload contract for these messages is covered in other tests, so we just check that the expected
         # number of messages was sent
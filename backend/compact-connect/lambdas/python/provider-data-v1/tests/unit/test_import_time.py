@@ -0,0 +1,43 @@
+from common_test.import_time import IMPORT_TIME_BUDGET_SCALE, profile_import
+
+from tests import TstLambdas
+
+# The measured cold import time, in seconds, of each handler module, which every cold start of its lambdas pays.
+# These were measured as the fastest of several imports on a developer machine, and should be measured again when a
+# handler's imports change on purpose.
+HANDLER_IMPORT_TIME_BASELINES = {
+    'handlers.account_recovery': 0.26,
+    'handlers.bulk_upload': 0.32,
+    'handlers.encumbrance': 0.22,
+    'handlers.ingest': 0.32,
+    'handlers.investigation': 0.22,
+    'handlers.licenses': 0.29,
+    'handlers.military_audit': 0.26,
+    'handlers.privilege_history': 0.27,
+    'handlers.privileges': 0.25,
+    'handlers.provider_s3_events': 0.28,
+    'handlers.provider_users': 0.30,
+    'handlers.providers': 0.30,
+    'handlers.public_lookup': 0.38,
+    'handlers.registration': 0.37,
+    'handlers.state_api': 0.37,
+}
+# The slowdown, in seconds, each handler's import is allowed over its baseline, before the budget is scaled for the
+# machine. It leaves room for machine to machine variation, while still catching a heavy dependency being imported
+# eagerly, which typically costs more than this on its own.
+IMPORT_TIME_MARGIN_SECONDS = 0.75
+
+
+class TestHandlerImportTime(TstLambdas):
+    def test_handler_imports_are_within_budget(self):
+        for module_name, baseline in HANDLER_IMPORT_TIME_BASELINES.items():
+            with self.subTest(module_name):
+                profile = profile_import(module_name, repeat=2)
+
+                budget = (baseline + IMPORT_TIME_MARGIN_SECONDS) * IMPORT_TIME_BUDGET_SCALE
+                self.assertLessEqual(profile.cumulative_seconds, budget)
+
+    def test_password_hashing_is_only_imported_when_used(self):
+        profile = profile_import('handlers.providers', repeat=1)
+
+        self.assertNotIn('argon2', profile.imported_modules)
@@ -0,0 +1,240 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from tests import TstLambdas
+
+
+class TestLicenseCSVValidator(TstLambdas):
+    def setUp(self):
+        with open('../common/tests/resources/api/license-post.json') as f:
+            self.license_row = json.load(f)
+
+    @staticmethod
+    def _legacy_validate(rows: list[dict], *, compact: str = 'aslp', jurisdiction: str = 'oh') -> list[tuple]:
+        """The row-by-row schema load, duplicate check, and dump that the compiled validator must reproduce"""
+        from cc_common.data_model.schema.license.api import LicensePostRequestSchema
+        from marshmallow import ValidationError
+        from marshmallow.exceptions import SCHEMA
+
+        schema = LicensePostRequestSchema()
+        ssns_in_file_upload = {}
+        results = []
+        for i, raw_license in enumerate(rows):
+            try:
+                try:
+                    validated_license = schema.load(dict(compact=compact, jurisdiction=jurisdiction, **raw_license))
+                    ssn_key = (validated_license['ssn'], validated_license['licenseType'])
+                    matched_ssn_index = ssns_in_file_upload.get(ssn_key)
+                    if matched_ssn_index:
+                        raise ValidationError(
+                            {
+                                SCHEMA: [
+                                    f'Duplicate License SSN detected for license type '
+                                    f'{validated_license["licenseType"]}. SSN matches with record '
+                                    f'{matched_ssn_index}. Every record must have a unique SSN per license type '
+                                    f'within the same file.'
+                                ]
+                            }
+                        )
+                    ssns_in_file_upload.update({ssn_key: i + 1})
+                except TypeError as e:
+                    raise ValidationError('License contains unsupported fields') from e
+                results.append((i + 1, list(schema.dump(validated_license).items()), None))
+            except ValidationError as e:
+                results.append((i + 1, None, e.messages))
+        return results
+
+    @staticmethod
+    def _validate(rows: list[dict], *, compact: str = 'aslp', jurisdiction: str = 'oh', **kwargs) -> list[tuple]:
+        from license_csv_validator import LicenseCSVValidator
+
+        validator = LicenseCSVValidator(compact=compact, jurisdiction=jurisdiction, **kwargs)
+        return [
+            (
+                result.record_number,
+                list(result.license.items()) if result.license is not None else None,
+                result.error.messages if result.error is not None else None,
+            )
+            for result in validator.validate(rows)
+        ]
+
+    def _assert_parity(self, rows: list[dict], **kwargs):
+        # Validators hold state for duplicate detection, so each gets its own copy of the rows
+        expected = self._legacy_validate([dict(row) for row in rows], **kwargs)
+        # A small chunk size makes sure rows are compared across chunk boundaries, too
+        for chunk_size in (1, 3, 500):
+            self.assertEqual(expected, self._validate([dict(row) for row in rows], chunk_size=chunk_size, **kwargs))
+        return expected
+
+    def _read_csv(self, path: str) -> list[dict]:
+        from license_csv_reader import LicenseCSVReader
+
+        with open(path) as f:
+            return list(LicenseCSVReader().licenses(f))
+
+    def test_valid_csv_parity(self):
+        rows = self._read_csv('../common/tests/resources/licenses.csv')
+
+        results = self._assert_parity(rows)
+        # Every row in this file is valid
+        self.assertEqual([None] * len(rows), [errors for _record_number, _license, errors in results])
+
+    def test_invalid_csv_parity(self):
+        rows = self._read_csv('../common/tests/resources/licenses-invalid-records.csv')
+
+        results = self._assert_parity(rows)
+        self.assertNotEqual([None] * len(rows), [errors for _record_number, _license, errors in results])
+
+    def test_field_value_parity(self):
+        """Each field, with a variety of values that marshmallow accepts, normalizes, or rejects"""
+        from cc_common.data_model.schema.license.api import LicensePostRequestSchema
+
+        candidate_values = [
+            '',
+            ' ',
+            'x',
+            '  padded value  ',
+            'a' * 100,
+            'a' * 101,
+            'active',
+            'inactive',
+            'eligible',
+            'ineligible',
+            'ACTIVE',
+            'speech-language pathologist',
+            'audiologist',
+            'plumber',
+            '123-45-6789',
+            '123456789',
+            ' 123-45-6789 ',
+            '1234567890',
+            '123456789a',
+            '+13213214321',
+            '13213214321',
+            'someone@example.com',
+            'not an email',
+            '2024-06-30',
+            ' 2024-06-30 ',
+            '20240630',
+            '2024-02-30',
+            '2024-06-30T00:00:00',
+            '06/30/2024',
+            '43004',
+            '430041234',
+            None,
+        ]
+        rows = []
+        for field_name in LicensePostRequestSchema().fields:
+            if field_name in ('compact', 'jurisdiction'):
+                continue
+            for value in candidate_values:
+                # Each row gets its own SSN, unless we're testing the ssn field itself
+                rows.append({**self.license_row, 'ssn': f'{len(rows) // 10_000:03}-45-{len(rows) % 10_000:04}'})
+                rows[-1][field_name] = value
+            # And once with the field missing entirely
+            rows.append({**self.license_row, 'ssn': f'{len(rows) // 10_000:03}-45-{len(rows) % 10_000:04}'})
+            rows[-1].pop(field_name, None)
+
+        results = self._assert_parity(rows)
+        # Make sure we actually covered both outcomes
+        self.assertIn(None, [errors for _record_number, _license, errors in results])
+        self.assertIn(None, [license_data for _record_number, license_data, _errors in results])
+
+    def test_schema_level_parity(self):
+        rows = [
+            # Inactive licenses cannot be eligible
+            {**self.license_row, 'ssn': '123-45-0001', 'licenseStatus': 'inactive', 'compactEligibility': 'eligible'},
+            # License type from another compact
+            {**self.license_row, 'ssn': '123-45-0002', 'licenseType': 'occupational therapist'},
+            # Unknown field
+            {**self.license_row, 'ssn': '123-45-0003', 'foo': 'bar'},
+            # Extra values beyond the header, as the CSV reader reports them
+            {**self.license_row, 'ssn': '123-45-0004', 'invalid': ['extra', 'values']},
+            # Fields that are set from the upload path, rather than the file
+            {**self.license_row, 'ssn': '123-45-0005', 'compact': 'aslp'},
+            {**self.license_row, 'ssn': '123-45-0006', 'jurisdiction': 'oh'},
+            # With a previousSSN
+            {**self.license_row, 'ssn': '123-45-0007', 'previousSSN': '123-45-0008'},
+        ]
+
+        self._assert_parity(rows)
+
+    def test_duplicate_ssn_parity(self):
+        rows = [
+            {**self.license_row, 'ssn': '123-45-0001'},
+            # Same SSN, different license type is allowed
+            {**self.license_row, 'ssn': '123-45-0001', 'licenseType': 'audiologist'},
+            # An invalid row does not claim its SSN
+            {**self.license_row, 'ssn': '123-45-0002', 'licenseStatus': 'translucent'},
+            {**self.license_row, 'ssn': '123-45-0002'},
+            {**self.license_row, 'ssn': '123-45-0003'},
+            # Duplicates, with whitespace that is stripped before comparing
+            {**self.license_row, 'ssn': ' 123-45-0001'},
+            {**self.license_row, 'ssn': '123-45-0003', 'licenseNumber': 'different'},
+            {**self.license_row, 'ssn': '123-45-0002'},
+        ]
+
+        results = self._assert_parity(rows)
+        self.assertEqual(
+            [
+                {
+                    '_schema': [
+                        'Duplicate License SSN detected for license type speech-language pathologist. SSN matches '
+                        'with record 1. Every record must have a unique SSN per license type within the same file.'
+                    ]
+                },
+                {
+                    '_schema': [
+                        'Duplicate License SSN detected for license type speech-language pathologist. SSN matches '
+                        'with record 5. Every record must have a unique SSN per license type within the same file.'
+                    ]
+                },
+                {
+                    '_schema': [
+                        'Duplicate License SSN detected for license type speech-language pathologist. SSN matches '
+                        'with record 4. Every record must have a unique SSN per license type within the same file.'
+                    ]
+                },
+            ],
+            [errors for _record_number, _license, errors in results[5:]],
+        )
+
+    def test_invalid_upload_path_parity(self):
+        self._assert_parity([self.license_row], compact='aslp', jurisdiction='zz')
+        self._assert_parity([self.license_row], compact='zz', jurisdiction='oh')
+
+    def test_valid_rows_skip_schema(self):
+        from license_csv_validator import LicenseCSVValidator
+
+        validator = LicenseCSVValidator(compact='aslp', jurisdiction='oh')
+        with patch.object(validator.schema, 'load', wraps=validator.schema.load) as mock_load:
+            results = list(validator.validate([{**self.license_row, 'ssn': f'123-45-{i:04}'} for i in range(10)]))
+
+        self.assertEqual([None] * 10, [result.error for result in results])
+        mock_load.assert_not_called()
+
+    def test_unsupported_schema_uses_schema_for_every_row(self):
+        """If the schema grows features the compiled checks don't reproduce, every row should go through the schema"""
+        rows = self._read_csv('../common/tests/resources/licenses-invalid-records.csv')
+
+        with patch('license_csv_validator._supports_compiled_validation', return_value=False):
+            self._assert_parity(rows)
+
+    def test_unreadable_file_reports_rows_read(self):
+        """Rows read before the file turns out to be unreadable should still be reported"""
+        from license_csv_reader import LicenseCSVReader
+        from license_csv_validator import LicenseCSVValidator
+
+        rows = self._read_csv('../common/tests/resources/licenses.csv')
+        with open('../common/tests/resources/licenses.csv') as f:
+            # Lop off the end of the last line, leaving an unterminated quote
+            stream = StringIO(f.read().rstrip()[:-25] + '"unterminated')
+
+        validator = LicenseCSVValidator(compact='aslp', jurisdiction='oh')
+        results = []
+        with self.assertRaises(Exception):  # noqa: B017 assert-raises-exception
+            for result in validator.validate(LicenseCSVReader().licenses(stream)):
+                results.append(result)
+
+        self.assertEqual(list(range(1, len(rows))), [result.record_number for result in results])
@@ -365,7 +365,9 @@ def post_purchase_privileges(event: dict, context: LambdaContext):  # noqa: ARG0
     purchase_client = PurchaseClient()
     transaction_response = None
     try:
-        license_type_abbr = config.license_type_abbreviations[compact_abbr][matching_license_record.licenseType]
+        license_type_abbr = config.snapshot.license_type_abbreviations[compact_abbr][
+            matching_license_record.licenseType
+        ]
         transaction_response = purchase_client.process_charge_for_licensee_privileges(
             licensee_id=provider_id,
             order_information=body['orderInformation'],
@@ -401,7 +403,7 @@ def post_purchase_privileges(event: dict, context: LambdaContext):  # noqa: ARG0
                 'compact': p.compact,
                 'providerId': p.providerId,
                 'jurisdiction': p.jurisdiction,
-                'licenseTypeAbbrev': config.license_type_abbreviations[compact_abbr][
+                'licenseTypeAbbrev': config.snapshot.license_type_abbreviations[compact_abbr][
                     matching_license_record.licenseType
                 ],
                 'privilegeId': p.privilegeId,
@@ -186,11 +186,27 @@ def generate_transaction_reports(event: dict, context: LambdaContext) -> dict:
     provider_ids = {t['licenseeId'] for t in transactions}
     providers = {}
     if provider_ids:
-        providers = {p['providerId']: p for p in data_client.batch_get_providers_by_id(compact, list(provider_ids))}
+        # The reports only include each provider's name
+        provider_result = data_client.batch_get_providers_by_id(
+            compact, provider_ids, projection=('providerId', 'givenName', 'familyName')
+        )
+        providers = {p['providerId']: p for p in provider_result.items}
+
+        if provider_result.unprocessed_keys:
+            logger.error(
+                'Some providers could not be read from the database',
+                unprocessed_keys=provider_result.unprocessed_keys,
+                compact=compact,
+            )
+            lambda_error_messages.append(
+                'Some providers could not be read from the database. Unprocessed keys: '
+                f'{provider_result.unprocessed_keys}'
+            )
 
         # the batch_get_item api call will silently omit any records that are not found, so we need to check for it here
         # This should not happen, but if it does, we log it
-        missing_providers = provider_ids - providers.keys()
+        unprocessed_provider_ids = {key['pk'].split('#')[-1] for key in provider_result.unprocessed_keys}
+        missing_providers = provider_ids - providers.keys() - unprocessed_provider_ids
         if missing_providers:
             logger.error(
                 'Some providers were not found in the database',
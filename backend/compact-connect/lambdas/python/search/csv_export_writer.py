@@ -0,0 +1,99 @@
+import csv
+import io
+
+from cc_common.config import config, logger
+
+# S3 requires every part of a multipart upload, except the last, to be at least 5 MiB
+MIN_PART_SIZE_BYTES = 5 * 1024 * 1024
+
+
+class S3MultipartCsvWriter:
+    """
+    Writes CSV rows straight into an S3 multipart upload, so that a CSV file of any size can be written while only
+    holding about one part of it in memory.
+
+    Rows are buffered until there is a full part to upload. The object is only created in S3 once `complete` is
+    called. If the writer is used as a context manager and exits without having been completed, the upload is
+    aborted, so no partial file is left behind.
+
+    See: https://docs.aws.amazon.com/AmazonS3/latest/userguide/mpuoverview.html
+    """
+
+    def __init__(self, *, bucket_name: str, key: str, fieldnames: list[str], part_size: int = MIN_PART_SIZE_BYTES):
+        """
+        :param bucket_name: The bucket to write the CSV file to
+        :param key: The key to write the CSV file to
+        :param fieldnames: The CSV columns. Fields of each row that are not in this list are ignored.
+        :param part_size: The size to buffer rows up to before uploading them as a part
+        """
+        self._bucket_name = bucket_name
+        self._key = key
+        self._part_size = part_size
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=fieldnames, extrasaction='ignore')
+        self._parts: list[dict] = []
+        self._upload_id: str | None = None
+        self._completed = False
+        self.row_count = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._completed:
+            self.abort()
+
+    def start(self):
+        """Start the multipart upload and write the CSV header row"""
+        self._upload_id = config.s3_client.create_multipart_upload(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            ContentType='text/csv',
+        )['UploadId']
+        self._writer.writeheader()
+
+    def write_rows(self, rows: list[dict]):
+        """
+        Write rows to the CSV file, uploading a part whenever enough rows are buffered.
+
+        :param rows: The rows to write
+        """
+        self._writer.writerows(rows)
+        self.row_count += len(rows)
+        # Characters are never more than their UTF-8 encoding, so the part is at least this many bytes
+        if self._buffer.tell() >= self._part_size:
+            self._upload_part()
+
+    def complete(self):
+        """Upload any buffered rows as the last part, and complete the upload into a single CSV file"""
+        self._upload_part()
+        config.s3_client.complete_multipart_upload(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts},
+        )
+        self._completed = True
+        logger.info('Completed CSV upload', key=self._key, row_count=self.row_count, part_count=len(self._parts))
+
+    def abort(self):
+        """Abort the upload, discarding every part uploaded so far"""
+        if self._upload_id is None:
+            return
+        logger.info('Aborting CSV upload', key=self._key, row_count=self.row_count, part_count=len(self._parts))
+        config.s3_client.abort_multipart_upload(Bucket=self._bucket_name, Key=self._key, UploadId=self._upload_id)
+        self._upload_id = None
+
+    def _upload_part(self):
+        part_number = len(self._parts) + 1
+        response = config.s3_client.upload_part(
+            Bucket=self._bucket_name,
+            Key=self._key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=self._buffer.getvalue().encode('utf-8'),
+        )
+        self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+        self._buffer.seek(0)
+        self._buffer.truncate()
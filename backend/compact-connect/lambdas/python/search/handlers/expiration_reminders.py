@@ -106,7 +106,7 @@ def process_expiration_reminders(event: dict, context: LambdaContext):
     if days_before not in DAYS_BEFORE_TO_EVENT_TYPE:
         raise CCInvalidRequestException(f'Invalid daysBefore value: {days_before}. Must be 30, 7, or 0.')
 
-    if compact not in config.compacts:
+    if not config.is_valid_compact(compact):
         raise CCInvalidRequestException(f'Invalid compact: {compact}. Must be one of {config.compacts}.')
 
     # Parse continuation state (if this is a continuation invocation)
@@ -1,13 +1,23 @@
+import re
 import time
 
 from cc_common.config import config, logger
 from cc_common.exceptions import CCInternalException
 from custom_resource_handler import CustomResourceHandler, CustomResourceResponse
 from opensearch_client import OpenSearchClient
+from utils import get_provider_reindex_alias_name
 
 # Initial index version for new deployments
 INITIAL_INDEX_VERSION = 'v1'
 
+# Settings for an index while it is bulk loaded by a blue/green reindex. Nothing searches it until the alias is
+# swapped over, so it needs no replicas, and no refreshes, until the load is finished. The tombstones of deleted
+# documents are kept for as long as a load could take, rather than the default 60 seconds, so that the reindex never
+# brings back a provider the provider update ingest deleted after the reindex read the provider's records.
+BULK_LOAD_INDEX_SETTINGS = {'number_of_replicas': 0, 'refresh_interval': '-1', 'gc_deletes': '1d'}
+# The number of segments a bulk loaded index is merged down to, before it serves searches
+BULK_LOAD_FORCE_MERGE_MAX_NUM_SEGMENTS = 1
+
 # Readiness check configuration
 # OpenSearch domains may take time to become responsive after CloudFormation reports them as created.
 DOMAIN_READINESS_CHECK_INTERVAL_SECONDS = 10
@@ -21,7 +31,8 @@ class OpenSearchIndexManager(CustomResourceHandler):
     Creates versioned indices (e.g., compact_aslp_providers_v1) with aliases
     (e.g., compact_aslp_providers) to enable safe blue-green migrations for
     future mapping changes. Queries use the alias, allowing the underlying
-    index to be swapped without application changes.
+    index to be swapped without application changes. The populate provider
+    documents function uses start_bulk_load and finish_bulk_load for such a swap.
     See https://docs.opensearch.org/latest/im-plugin/index-alias/
     """
 
@@ -224,6 +235,132 @@ class OpenSearchIndexManager(CustomResourceHandler):
             f'Last error: {last_exception}'
         )
 
+    def start_bulk_load(self, client: OpenSearchClient, compact: str) -> str:
+        """
+        Create the next version of a compact's provider index, tuned for bulk loading, for a blue/green reindex.
+
+        The new index has the same number of shards as the live index, but no replicas and no refreshes. The reindex
+        alias is pointed at it, which also signals the provider update ingest to write every change to it, as well as
+        to the live index, until the live alias is swapped over. If a reindex is already in progress, its index is
+        returned, so that the load can be resumed.
+
+        :param client: The OpenSearch client
+        :param compact: The compact abbreviation
+        :return: The name of the index to load
+        :raises CCInternalException: If the compact has no live index
+        """
+        alias_name = f'compact_{compact}_providers'
+        reindex_alias_name = get_provider_reindex_alias_name(compact)
+
+        reindex_index_names = client.get_alias_index_names(reindex_alias_name)
+        if reindex_index_names:
+            logger.info(f"Reindex of '{alias_name}' into '{reindex_index_names[0]}' already in progress. Resuming.")
+            return reindex_index_names[0]
+
+        live_index_name = self._get_live_index_name(client, alias_name)
+        live_index_settings = client.get_index_settings(live_index_name)[live_index_name]['settings']['index']
+        index_name = self._get_next_index_name(client, live_index_name)
+
+        logger.info(f"Creating index '{index_name}' to bulk load, replacing '{live_index_name}'...")
+        index_mapping = self._get_provider_index_mapping(
+            number_of_shards=int(live_index_settings['number_of_shards']),
+            number_of_replicas=BULK_LOAD_INDEX_SETTINGS['number_of_replicas'],
+        )
+        index_mapping['settings']['index'].update(BULK_LOAD_INDEX_SETTINGS)
+        client.create_index(index_name, index_mapping)
+        client.create_alias(index_name, reindex_alias_name)
+        logger.info(f"Alias '{reindex_alias_name}' -> '{index_name}' created successfully.")
+        return index_name
+
+    def finish_bulk_load(
+        self,
+        client: OpenSearchClient,
+        compact: str,
+        expected_document_count: int,
+        max_document_count_difference: int = 0,
+    ) -> str:
+        """
+        Finish a blue/green reindex of a compact, swapping its live alias over to the loaded index.
+
+        The loaded index is given the replica count and refresh interval of the live index, refreshed and force merged.
+        Its document count is then verified, before the live alias is moved to it and the reindex alias is removed,
+        in a single atomic alias update. The previous index is left in place, so that the swap can be reversed.
+
+        :param client: The OpenSearch client
+        :param compact: The compact abbreviation
+        :param expected_document_count: The number of documents the loaded index should hold
+        :param max_document_count_difference: How far the document count may be from the expected count, to allow
+            for providers that cannot be indexed, or that are added while the count is taken
+        :return: The name of the index the live alias now points to
+        :raises CCInternalException: If no reindex is in progress, or the document count does not match
+        """
+        alias_name = f'compact_{compact}_providers'
+        reindex_alias_name = get_provider_reindex_alias_name(compact)
+
+        reindex_index_names = client.get_alias_index_names(reindex_alias_name)
+        if not reindex_index_names:
+            raise CCInternalException(f"No reindex of '{alias_name}' is in progress")
+        index_name = reindex_index_names[0]
+        live_index_name = self._get_live_index_name(client, alias_name)
+        live_index_settings = client.get_index_settings(live_index_name)[live_index_name]['settings']['index']
+
+        # A refresh_interval of None resets the index to the default
+        restored_settings = {
+            'number_of_replicas': int(live_index_settings['number_of_replicas']),
+            'refresh_interval': live_index_settings.get('refresh_interval'),
+            # Back to the default
+            'gc_deletes': None,
+        }
+        logger.info(f"Restoring the settings of '{index_name}'", settings=restored_settings)
+        client.update_index_settings(index_name, {'index': restored_settings})
+        client.refresh_index(index_name)
+        client.force_merge(index_name, max_num_segments=BULK_LOAD_FORCE_MERGE_MAX_NUM_SEGMENTS)
+
+        document_count = client.count_documents(index_name)
+        if abs(document_count - expected_document_count) > max_document_count_difference:
+            logger.error(
+                f"Document count of '{index_name}' does not match, not swapping '{alias_name}'",
+                document_count=document_count,
+                expected_document_count=expected_document_count,
+            )
+            raise CCInternalException(
+                f"'{index_name}' holds {document_count} documents, expected {expected_document_count}"
+            )
+
+        logger.info(f"Swapping alias '{alias_name}' from '{live_index_name}' to '{index_name}'...")
+        client.update_aliases(
+            [
+                {'remove': {'index': live_index_name, 'alias': alias_name}},
+                {'add': {'index': index_name, 'alias': alias_name}},
+                {'remove': {'index': index_name, 'alias': reindex_alias_name}},
+            ]
+        )
+        logger.info(f"Alias '{alias_name}' -> '{index_name}' swapped successfully.")
+        return index_name
+
+    @staticmethod
+    def _get_live_index_name(client: OpenSearchClient, alias_name: str) -> str:
+        live_index_names = client.get_alias_index_names(alias_name)
+        if len(live_index_names) != 1:
+            raise CCInternalException(
+                f"Alias '{alias_name}' must point to exactly one index, but points to {live_index_names}"
+            )
+        return live_index_names[0]
+
+    @staticmethod
+    def _get_next_index_name(client: OpenSearchClient, live_index_name: str) -> str:
+        """
+        Get the name of the next version of an index (e.g., compact_aslp_providers_v2 after ..._v1), skipping any
+        version that already exists.
+        """
+        match = re.fullmatch(r'(?P<base>.+)_v(?P<version>\d+)', live_index_name)
+        base_name, version = (match['base'], int(match['version'])) if match else (live_index_name, 1)
+        while True:
+            version += 1
+            index_name = f'{base_name}_v{version}'
+            if not client.index_exists(index_name):
+                return index_name
+
     def _create_provider_index_with_alias(
         self,
         client: OpenSearchClient,
@@ -20,27 +20,77 @@ Example input for resumption:
 }
 
 Race Condition Consideration:
-A potential race condition can occur when running this function while provider
-data is being actively updated:
-1. This Lambda queries the current data from DynamoDB for a provider
-2. A change is made in DynamoDB for that same provider
-3. The DynamoDB stream handler queries the data and indexes the change into
-   OpenSearch after the ~30 second delay of sitting in SQS
-4. This Lambda finally indexes the stale data into OpenSearch, overwriting
-   the change indexed by the DynamoDB stream handler
-
-For this reason, it is recommended that this process be run during a period of
-low traffic. Given that it is a one-time process to initially populate the
-table, the risk is low and if needed, this Lambda function can be run again to
-synchronize all the provider documents.
+This function can run while provider data is being actively updated, and the
+provider update ingest indexes each change concurrently. So that this Lambda
+never overwrites a change the ingest indexed with the stale data it read
+before the change was made, both index every document with an external
+version of when its records were read (see get_provider_document_version).
+OpenSearch only writes a document whose version is at least the indexed
+document's, so whichever document was built from the latest read is kept, and
+a provider the ingest deleted is not brought back for as long as the index
+keeps the delete's tombstone.
+
+Parallel Mode:
+For a full reindex, the Lambda can instead split the provider table into
+segments of a DynamoDB parallel scan, and reindex every segment concurrently.
+Each provider's records are assembled from the scan pages, rather than
+queried again for each provider, and every compact is reindexed at once.
+If processing cannot complete within 12 minutes, the function returns the key
+to resume each unfinished segment from, as input for the next invocation.
+
+Example input for a parallel reindex:
+{
+    "parallel": true,
+    "totalSegments": 8
+}
+
+Example input for resumption of a parallel reindex:
+{
+    "parallel": true,
+    "totalSegments": 8,
+    "segmentCursors": {"3": {"pk": "...", "sk": "..."}, "5": null}
+}
+
+Blue/Green Mode:
+Either mode can instead load a new version of each compact's index, leaving the
+live index to serve searches untouched until the new one is ready. The new index
+is created without replicas or refreshes for a faster load, and the provider
+update ingest writes every change to it, as well as to the live index, while it
+is loaded. Once the load completes, the new index is given the live index's
+settings, force merged, and its document count is verified against the provider
+table, before the compact's alias is swapped over to it atomically. The previous
+index is kept, so that the swap can be reversed.
+
+Example input for a blue/green parallel reindex:
+{
+    "blueGreen": true,
+    "parallel": true,
+    "totalSegments": 8
+}
+
+The resumeFrom output of an incomplete blue/green reindex includes "blueGreen",
+and "loadCompleted" once only the swap remains.
 """
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from cc_common.config import config, logger
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
+from cc_common.data_model.provider_record_util import ProviderUserRecords
 from cc_common.exceptions import CCInternalException
 from marshmallow import ValidationError
 from opensearch_client import OpenSearchClient
-from utils import generate_provider_opensearch_document
+from utils import (
+    generate_opensearch_document_from_provider_records,
+    generate_provider_opensearch_document,
+    get_provider_document_version,
+    get_provider_reindex_alias_name,
+)
+
+from handlers.manage_opensearch_indices import OpenSearchIndexManager
 
 # Batch size for DynamoDB pagination
 DYNAMODB_PAGE_SIZE = 1000
@@ -49,6 +99,31 @@ OPENSEARCH_BULK_SIZE = 1000
 # Time threshold in milliseconds - stop when less than 3 minutes remain
 # This leaves a 3-minute buffer before the 15-minute Lambda timeout
 TIME_THRESHOLD_MS = 60 * 3000
+# Default number of segments a parallel reindex splits the provider table into, each of which is scanned concurrently
+DEFAULT_TOTAL_SEGMENTS = 8
+
+
+@dataclass
+class _SegmentResult:
+    """
+    The outcome of reindexing one segment of a parallel reindex in this invocation.
+
+    :param segment: The segment number
+    :param last_key: The key to resume the segment from, if it is not completed
+    :param completed: Whether every provider in the segment has been indexed
+    :param error: The error that stopped the segment, if indexing failed
+    :param compact_stats: Statistics for each compact, in the same form as the sequential mode's
+    """
+
+    segment: int
+    last_key: dict | None
+    completed: bool = False
+    error: str | None = None
+    compact_stats: dict[str, dict[str, int]] = field(
+        default_factory=lambda: defaultdict(
+            lambda: {'providers_processed': 0, 'providers_indexed': 0, 'providers_failed': 0}
+        )
+    )
 
 
 def populate_provider_documents(event: dict, context: LambdaContext):
@@ -64,11 +139,68 @@ def populate_provider_documents(event: dict, context: LambdaContext):
     :param event: Lambda event with optional parameters:
         - startingCompact: The compact to start/resume processing from
         - startingLastKey: The DynamoDB pagination key to resume from
+        - parallel: Reindex every compact with a parallel scan of the provider table, instead
+        - totalSegments: The number of segments to split the parallel scan into
+        - segmentCursors: The unfinished segments of a parallel reindex, and the key to resume each from
+        - blueGreen: Load a new version of each index, and swap the aliases over to them once loaded
+        - loadCompleted: The blue/green load is complete, so only the alias swaps remain
+        - maxDocumentCountDifference: How far each new index's document count may be from the provider count
     :param context: Lambda context
     :return: Summary of indexing operation, including pagination info if incomplete
     """
-    data_client = config.data_client
     opensearch_client = OpenSearchClient()
+    if not event.get('blueGreen'):
+        index_names = {compact: f'compact_{compact}_providers' for compact in config.compacts}
+        if event.get('parallel'):
+            return _populate_provider_documents_in_parallel(event, context, opensearch_client, index_names)
+        return _populate_provider_documents_sequentially(event, context, opensearch_client, index_names)
+
+    index_manager = OpenSearchIndexManager('populate-provider-documents')
+    if event.get('loadCompleted'):
+        stats = {
+            'total_providers_processed': 0,
+            'total_providers_indexed': 0,
+            'total_providers_failed': 0,
+            'compacts_processed': [],
+            'errors': [],
+            'completed': True,
+        }
+    else:
+        for compact in config.compacts:
+            index_manager.start_bulk_load(opensearch_client, compact)
+        # Bulk writes go through the reindex aliases, which point at the new indices
+        index_names = {compact: get_provider_reindex_alias_name(compact) for compact in config.compacts}
+        if event.get('parallel'):
+            stats = _populate_provider_documents_in_parallel(event, context, opensearch_client, index_names)
+        else:
+            stats = _populate_provider_documents_sequentially(event, context, opensearch_client, index_names)
+        if not stats['completed']:
+            stats['resumeFrom']['blueGreen'] = True
+            return stats
+
+    remaining_time_ms = context.get_remaining_time_in_millis()
+    if remaining_time_ms < TIME_THRESHOLD_MS:
+        logger.info('Approaching time limit, returning before swapping indices', remaining_time_ms=remaining_time_ms)
+        stats['completed'] = False
+        stats['resumeFrom'] = _get_blue_green_swap_resume_event(event)
+        return stats
+
+    return _swap_bulk_loaded_indices(event, stats, opensearch_client, index_manager)
+
+
+def _populate_provider_documents_sequentially(
+    event: dict, context: LambdaContext, opensearch_client: OpenSearchClient, index_names: dict[str, str]
+) -> dict:
+    """
+    Reindex each compact in turn, paging through its providers in the provider date of update GSI.
+
+    :param event: Lambda event, with optional startingCompact and startingLastKey parameters
+    :param context: Lambda context
+    :param opensearch_client: The OpenSearch client
+    :param index_names: The index (or alias) to write each compact's documents to
+    :return: Summary of indexing operation, including pagination info if incomplete
+    """
+    data_client = config.data_client
 
     # Get optional pagination parameters from event for resumption (normal mode)
     starting_compact = event.get('startingCompact')
@@ -108,6 +240,8 @@ def populate_provider_documents(event: dict, context: LambdaContext):
         logger.info('Processing compact', compact=compact)
 
         documents_to_index = []
+        # The version of the documents to index, from before the first of them was read
+        documents_version = None
         compact_stats = {
             'providers_processed': 0,
             'providers_indexed': 0,
@@ -138,7 +272,14 @@ def populate_provider_documents(event: dict, context: LambdaContext):
 
                 # Index any remaining documents before returning
                 try:
-                    _index_records_and_track_stats(documents_to_index, compact, opensearch_client, compact_stats)
+                    _index_records_and_track_stats(
+                        documents_to_index,
+                        index_names[compact],
+                        compact,
+                        opensearch_client,
+                        compact_stats,
+                        documents_version,
+                    )
                 except CCInternalException as e:
                     # Indexing failed after retries, return pagination info for manual retry
                     return _build_error_response(
@@ -219,6 +360,8 @@ def populate_provider_documents(event: dict, context: LambdaContext):
                     compact_stats['providers_failed'] += 1
                     continue
 
+                if not documents_to_index:
+                    documents_version = get_provider_document_version()
                 try:
                     # Use the shared utility to process the provider
                     serializable_document = generate_provider_opensearch_document(compact, provider_id)
@@ -237,7 +380,14 @@ def populate_provider_documents(event: dict, context: LambdaContext):
                 # Bulk index when batch is full
                 if len(documents_to_index) >= OPENSEARCH_BULK_SIZE:
                     try:
-                        _index_records_and_track_stats(documents_to_index, compact, opensearch_client, compact_stats)
+                        _index_records_and_track_stats(
+                            documents_to_index,
+                            index_names[compact],
+                            compact,
+                            opensearch_client,
+                            compact_stats,
+                            documents_version,
+                        )
                         documents_to_index = []
                     except CCInternalException as e:
                         # Indexing failed after retries, return pagination info for manual retry
@@ -252,7 +402,14 @@ def populate_provider_documents(event: dict, context: LambdaContext):
         # Index any remaining documents for this compact
         if documents_to_index:
             try:
-                _index_records_and_track_stats(documents_to_index, compact, opensearch_client, compact_stats)
+                _index_records_and_track_stats(
+                    documents_to_index,
+                    index_names[compact],
+                    compact,
+                    opensearch_client,
+                    compact_stats,
+                    documents_version,
+                )
             except CCInternalException as e:
                 # Indexing failed after retries, return pagination info for manual retry
                 return _build_error_response(
@@ -292,12 +449,229 @@ def populate_provider_documents(event: dict, context: LambdaContext):
     return stats
 
 
+def _swap_bulk_loaded_indices(
+    event: dict, stats: dict, opensearch_client: OpenSearchClient, index_manager: OpenSearchIndexManager
+) -> dict:
+    """
+    Swap each compact's alias over to its bulk loaded index, once its document count is verified.
+
+    Compacts that were already swapped by a previous invocation are skipped, so a failed swap can be retried.
+
+    :param event: Lambda event, with an optional maxDocumentCountDifference parameter
+    :param stats: The statistics of the load, to add the swap results to
+    :param opensearch_client: The OpenSearch client
+    :param index_manager: The index manager to finish each load with
+    :return: Summary of the reindex, with the blue/green resume event if any swap failed
+    """
+    max_document_count_difference = int(event.get('maxDocumentCountDifference', 0))
+    stats['swapped_indices'] = {}
+    swap_failed = False
+    for compact in config.compacts:
+        if not opensearch_client.alias_exists(get_provider_reindex_alias_name(compact)):
+            logger.info('No bulk load in progress for compact, skipping swap', compact=compact)
+            continue
+        try:
+            stats['swapped_indices'][compact] = index_manager.finish_bulk_load(
+                opensearch_client,
+                compact,
+                expected_document_count=config.data_client.count_providers(compact=compact),
+                max_document_count_difference=max_document_count_difference,
+            )
+        except CCInternalException as e:
+            logger.error('Failed to swap bulk loaded index', compact=compact, error=str(e))
+            stats['errors'].append({'compact': compact, 'error': str(e)})
+            swap_failed = True
+
+    if swap_failed:
+        stats['completed'] = False
+        stats['resumeFrom'] = _get_blue_green_swap_resume_event(event)
+    return stats
+
+
+def _get_blue_green_swap_resume_event(event: dict) -> dict:
+    """Get the input to resume a blue/green reindex from, once only the alias swaps remain"""
+    resume_event = {'blueGreen': True, 'loadCompleted': True}
+    if 'maxDocumentCountDifference' in event:
+        resume_event['maxDocumentCountDifference'] = event['maxDocumentCountDifference']
+    return resume_event
+
+
+def _populate_provider_documents_in_parallel(
+    event: dict, context: LambdaContext, opensearch_client: OpenSearchClient, index_names: dict[str, str]
+) -> dict:
+    """
+    Reindex every compact by scanning the segments of a parallel scan of the provider table concurrently.
+
+    :param event: Lambda event, with optional totalSegments and segmentCursors parameters
+    :param context: Lambda context
+    :param opensearch_client: The OpenSearch client
+    :param index_names: The index (or alias) to write each compact's documents to
+    :return: Summary of indexing operation, including the cursor of each unfinished segment if incomplete
+    """
+    total_segments = int(event.get('totalSegments', DEFAULT_TOTAL_SEGMENTS))
+    # The segments that are not finished yet, and the key to resume each from. A new reindex starts every segment
+    # from its beginning.
+    segment_cursors = event.get('segmentCursors')
+    if segment_cursors is None:
+        segment_cursors = {str(segment): None for segment in range(total_segments)}
+    logger.info(
+        'Starting parallel reindex',
+        total_segments=total_segments,
+        segments_to_process=sorted(int(segment) for segment in segment_cursors),
+    )
+
+    segment_results: list[_SegmentResult] = []
+    if segment_cursors:
+        with ThreadPoolExecutor(max_workers=len(segment_cursors)) as executor:
+            segment_results = list(
+                executor.map(
+                    lambda segment_cursor: _reindex_segment(
+                        segment=int(segment_cursor[0]),
+                        total_segments=total_segments,
+                        start_key=segment_cursor[1],
+                        opensearch_client=opensearch_client,
+                        index_names=index_names,
+                        context=context,
+                    ),
+                    segment_cursors.items(),
+                )
+            )
+
+    # Combine the statistics of every segment
+    stats = {
+        'total_providers_processed': 0,
+        'total_providers_indexed': 0,
+        'total_providers_failed': 0,
+        'compacts_processed': [],
+        'errors': [],
+        'completed': all(segment_result.completed for segment_result in segment_results),
+    }
+    for compact in config.compacts:
+        compact_stats = {'providers_processed': 0, 'providers_indexed': 0, 'providers_failed': 0}
+        for segment_result in segment_results:
+            for stat_name, value in segment_result.compact_stats.get(compact, {}).items():
+                compact_stats[stat_name] += value
+        stats['total_providers_processed'] += compact_stats['providers_processed']
+        stats['total_providers_indexed'] += compact_stats['providers_indexed']
+        stats['total_providers_failed'] += compact_stats['providers_failed']
+        if compact_stats['providers_processed'] > 0:
+            stats['compacts_processed'].append({'compact': compact, **compact_stats})
+    for segment_result in segment_results:
+        if segment_result.error is not None:
+            stats['errors'].append({'segment': segment_result.segment, 'error': segment_result.error})
+
+    if not stats['completed']:
+        stats['resumeFrom'] = {
+            'parallel': True,
+            'totalSegments': total_segments,
+            'segmentCursors': {
+                str(segment_result.segment): segment_result.last_key
+                for segment_result in segment_results
+                if not segment_result.completed
+            },
+        }
+
+    logger.info(
+        'Completed parallel reindex invocation',
+        total_providers_processed=stats['total_providers_processed'],
+        total_providers_indexed=stats['total_providers_indexed'],
+        total_providers_failed=stats['total_providers_failed'],
+        completed=stats['completed'],
+    )
+    return stats
+
+
+def _reindex_segment(
+    *,
+    segment: int,
+    total_segments: int,
+    start_key: dict | None,
+    opensearch_client: OpenSearchClient,
+    index_names: dict[str, str],
+    context: LambdaContext,
+) -> _SegmentResult:
+    """
+    Reindex the providers of one segment of a parallel scan, until the segment is finished, the invocation is running
+    out of time or indexing fails.
+
+    The segment's cursor only moves past a scan page once every document built from it has been indexed, so resuming
+    from the cursor never skips a provider.
+    """
+    result = _SegmentResult(segment=segment, last_key=start_key)
+    pages = config.data_client.scan_provider_partitions(
+        segment=segment,
+        total_segments=total_segments,
+        exclusive_start_key=start_key,
+        page_size=DYNAMODB_PAGE_SIZE,
+        read_profile=ProviderReadProfile.SEARCH_DOCUMENT,
+    )
+    for page in pages:
+        documents_by_compact: dict[str, list[dict]] = defaultdict(list)
+        for pk, records in page.partitions.items():
+            compact = pk.split('#', 1)[0]
+            if compact not in config.compacts:
+                logger.warning('Unknown compact in provider partition', segment=segment, pk=pk)
+                continue
+            compact_stats = result.compact_stats[compact]
+            compact_stats['providers_processed'] += 1
+            try:
+                documents_by_compact[compact].append(
+                    generate_opensearch_document_from_provider_records(ProviderUserRecords(records))
+                )
+            except (ValidationError, CCInternalException) as e:
+                logger.warning('Failed to process provider partition', segment=segment, pk=pk, error=str(e))
+                compact_stats['providers_failed'] += 1
+
+        try:
+            for compact, documents in documents_by_compact.items():
+                for start in range(0, len(documents), OPENSEARCH_BULK_SIZE):
+                    _index_records_and_track_stats(
+                        documents[start : start + OPENSEARCH_BULK_SIZE],
+                        index_names[compact],
+                        compact,
+                        opensearch_client,
+                        result.compact_stats[compact],
+                        get_provider_document_version(page.read_at),
+                    )
+        except CCInternalException as e:
+            # Indexing failed after retries, so the segment is resumed from before this page
+            logger.error(
+                'Bulk indexing failed after retries, stopping segment',
+                segment=segment,
+                last_key=result.last_key,
+                error=str(e),
+            )
+            result.error = str(e)
+            return result
+
+        result.last_key = page.last_key
+        if page.last_key is None:
+            result.completed = True
+            logger.info('Completed segment', segment=segment)
+            return result
+
+        remaining_time_ms = context.get_remaining_time_in_millis()
+        if remaining_time_ms < TIME_THRESHOLD_MS:
+            logger.info(
+                'Approaching time limit, stopping segment',
+                segment=segment,
+                remaining_time_ms=remaining_time_ms,
+                last_key=result.last_key,
+            )
+            return result
+    return result
+
+
 def _index_records_and_track_stats(
-    documents_to_index: list[dict], compact: str, opensearch_client: OpenSearchClient, compact_stats: dict
+    documents_to_index: list[dict],
+    index_name: str,
+    compact: str,
+    opensearch_client: OpenSearchClient,
+    compact_stats: dict,
+    version: int | None,
 ):
-    index_name = f'compact_{compact}_providers'
     if documents_to_index:
-        failed_ids = _bulk_index_documents(opensearch_client, index_name, documents_to_index)
+        failed_ids = _bulk_index_documents(opensearch_client, index_name, documents_to_index, version)
         compact_stats['providers_indexed'] += len(documents_to_index) - len(failed_ids)
         if failed_ids:
             compact_stats['providers_failed'] += len(failed_ids)
@@ -357,13 +731,16 @@ def _build_error_response(
     return stats
 
 
-def _bulk_index_documents(opensearch_client: OpenSearchClient, index_name: str, documents: list[dict]) -> set[str]:
+def _bulk_index_documents(
+    opensearch_client: OpenSearchClient, index_name: str, documents: list[dict], version: int | None
+) -> set[str]:
     """
     Bulk index documents into OpenSearch.
 
     :param opensearch_client: The OpenSearch client
     :param index_name: The index to write to
     :param documents: List of documents to index
+    :param version: The version to index the documents with, from before any of them were read
     :return: Set of failed document IDs (empty set if all documents succeeded)
     :raises CCInternalException: If bulk indexing fails after max retry attempts
     """
@@ -371,14 +748,15 @@ def _bulk_index_documents(opensearch_client: OpenSearchClient, index_name: str,
         return set()
 
     # This will raise CCInternalException if all retries fail
-    response = opensearch_client.bulk_index(index_name=index_name, documents=documents)
+    response = opensearch_client.bulk_index(index_name=index_name, documents=documents, version=version)
 
     # Check for errors in the bulk response (individual document failures, not connection issues)
     if response.get('errors'):
         failed_ids = set()
         for item in response.get('items', []):
             index_result = item.get('index', {})
-            if index_result.get('error'):
+            # 409 (version_conflict) is not a failure - a document built from a newer read is already indexed
+            if index_result.get('error') and index_result.get('status') != 409:
                 doc_id = index_result.get('_id')
                 failed_ids.add(doc_id)
                 logger.warning(
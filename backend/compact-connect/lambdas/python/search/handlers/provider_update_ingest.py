@@ -5,20 +5,31 @@ provider documents into OpenSearch.
 This Lambda is triggered by SQS (via EventBridge Pipe from DynamoDB streams) from
 the provider table. It processes events in batches, deduplicates provider IDs by
 compact, and bulk indexes the sanitized provider documents into the appropriate
-OpenSearch indices.
+OpenSearch indices. Documents are built concurrently, and each compact is indexed
+as soon as its documents are built. While a blue/green reindex is loading a new
+index for a compact, the compact's documents are written to both indices, so that
+no change is lost when the alias is swapped over to the new index.
 
 The handler uses the @sqs_batch_handler decorator which passes all SQS messages
 to the handler at once, enabling batch processing and deduplication. The handler
 returns batchItemFailures directly for partial success handling.
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from aws_lambda_powertools.metrics import MetricUnit
 from boto3.dynamodb.types import TypeDeserializer
-from cc_common.config import config, logger
+from cc_common.config import config, logger, metrics
 from cc_common.exceptions import CCInternalException, CCNotFoundException
 from cc_common.utils import sqs_batch_handler
 from marshmallow import ValidationError
 from opensearch_client import OpenSearchClient
-from utils import generate_provider_opensearch_document
+from utils import (
+    generate_provider_opensearch_document,
+    get_provider_document_version,
+    get_provider_reindex_alias_name,
+)
 
 # Instantiate the OpenSearch client outside of the handler to cache connection between invocations
 opensearch_client = OpenSearchClient(timeout=30)
@@ -32,8 +43,9 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
     This function:
     1. Creates a set for each compact to deduplicate provider IDs
     2. Extracts compact and providerId from each stream record (old or new image)
-    3. Processes each unique provider by compact using the shared utility
-    4. Bulk indexes the documents into the appropriate OpenSearch index
+    3. Builds a document for each unique provider using the shared utility, concurrently across all compacts
+    4. Bulk indexes each compact's documents into the appropriate OpenSearch index, once they are all built
+    5. Reports the lag from each compact's oldest provider table write to it being indexed
 
     :param records: List of SQS records, each containing 'messageId' and 'body' (DynamoDB stream record)
     :return: Response with batch item failures for partial success handling
@@ -49,6 +61,8 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
 
     # Track which message IDs correspond to which compact/provider for failure reporting
     record_mapping: dict[str, tuple[str, str]] = {}  # message_id -> (compact, provider_id)
+    # When each record was written to the provider table, in epoch seconds, for reporting index lag
+    write_times: dict[str, float] = {}  # message_id -> ApproximateCreationDateTime
 
     batch_item_failures = []
 
@@ -93,23 +107,35 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
         if compact in providers_by_compact:
             providers_by_compact[compact].add(provider_id)
             record_mapping[message_id] = (compact, provider_id)
+            write_time = stream_record.get('dynamodb', {}).get('ApproximateCreationDateTime')
+            if write_time is not None:
+                write_times[message_id] = float(write_time)
         else:
             logger.warning('Unknown compact in record', compact=compact, provider_id=provider_id)
 
-    # Process providers and bulk index by compact
+    # Build documents concurrently, across every compact, and bulk index each compact as soon as all of its documents
+    # are built, while the documents of other compacts are still being built
     failed_providers: dict[str, set] = {compact: set() for compact in config.compacts}
-
+    documents_by_compact: dict[str, list[dict]] = {compact: [] for compact in config.compacts}
+    # Provider IDs that no longer exist and need to be deleted from the index
+    providers_to_delete_by_compact: dict[str, list[str]] = {compact: [] for compact in config.compacts}
+    remaining_by_compact = {compact: len(provider_ids) for compact, provider_ids in providers_by_compact.items()}
     for compact, provider_ids in providers_by_compact.items():
-        index_name = f'compact_{compact}_providers'
         logger.info('Processing providers for compact', compact=compact, provider_count=len(provider_ids))
-
-        documents_to_index = []
-        providers_to_delete = []  # Provider IDs that no longer exist and need to be deleted from the index
-
-        for provider_id in provider_ids:
+    # Every document is written with the time before any of their records are read as their version, so that none
+    # replaces a document built from a later read, such as by a concurrent invocation or reindex
+    document_version = get_provider_document_version()
+
+    with ThreadPoolExecutor(max_workers=config.search_document_concurrency) as executor:
+        futures = {
+            executor.submit(generate_provider_opensearch_document, compact, provider_id): (compact, provider_id)
+            for compact, provider_ids in providers_by_compact.items()
+            for provider_id in provider_ids
+        }
+        for future in as_completed(futures):
+            compact, provider_id = futures[future]
             try:
-                document = generate_provider_opensearch_document(compact, provider_id)
-                documents_to_index.append(document)
+                documents_by_compact[compact].append(future.result())
             except CCNotFoundException as e:
                 # if no provider records are found, the provider needs to be deleted from the index
                 logger.warning(
@@ -119,7 +145,7 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
                     compact=compact,
                     error=str(e),
                 )
-                providers_to_delete.append(provider_id)
+                providers_to_delete_by_compact[compact].append(provider_id)
             except ValidationError as e:
                 logger.warning(
                     'Failed to process provider for indexing',
@@ -129,76 +155,25 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
                 )
                 failed_providers[compact].add(provider_id)
 
-        if failed_providers[compact]:
-            logger.warning(
-                'Some providers failed serialization',
-                compact=compact,
-                failed_provider_ids=failed_providers[compact],
-                successful_count=len(documents_to_index),
-            )
-
-        # Bulk index the documents
-        if documents_to_index:
-            try:
-                response = opensearch_client.bulk_index(index_name=index_name, documents=documents_to_index)
-
-                # Check for individual document failures
-                if response.get('errors'):
-                    for item in response.get('items', []):
-                        index_result = item.get('index', {})
-                        if index_result.get('error'):
-                            doc_id = index_result.get('_id')
-                            logger.error(
-                                'Document indexing failed',
-                                provider_id=doc_id,
-                                error=index_result.get('error'),
-                            )
-                            failed_providers[compact].add(doc_id)
-
-                logger.info(
-                    'Bulk indexed documents',
-                    index_name=index_name,
-                    document_count=len(documents_to_index),
-                    had_errors=response.get('errors', False),
-                )
-            except CCInternalException as e:
-                # All documents for this compact failed to index
-                logger.error(
-                    'Failed to bulk index documents after retries',
-                    index_name=index_name,
-                    document_count=len(documents_to_index),
-                    error=str(e),
-                )
-                # Mark all providers in this compact as failed
-                document_provider_ids = [document['providerId'] for document in documents_to_index]
-                for provider_id in document_provider_ids:
-                    failed_providers[compact].add(provider_id)
-
-        # Bulk delete providers that no longer exist
-        if providers_to_delete:
-            try:
-                failed_provider_ids = opensearch_client.bulk_delete(
-                    index_name=index_name, document_ids=providers_to_delete
-                )
-                failed_providers[compact].update(failed_provider_ids)
-
-                logger.info(
-                    'Bulk deleted documents',
-                    index_name=index_name,
-                    document_count=len(providers_to_delete),
-                    failed_provider_ids=list(failed_provider_ids),
+            remaining_by_compact[compact] -= 1
+            if remaining_by_compact[compact] == 0:
+                _index_compact(
+                    compact=compact,
+                    documents_to_index=documents_by_compact[compact],
+                    providers_to_delete=providers_to_delete_by_compact[compact],
+                    failed_provider_ids=failed_providers[compact],
+                    document_version=document_version,
                 )
-            except CCInternalException as e:
-                # All deletes for this compact failed
-                logger.error(
-                    'Failed to bulk delete documents after retries',
-                    index_name=index_name,
-                    document_count=len(providers_to_delete),
-                    error=str(e),
+                _report_index_lag(
+                    compact=compact,
+                    write_times=[
+                        write_times[message_id]
+                        for message_id, (message_compact, provider_id) in record_mapping.items()
+                        if message_compact == compact
+                        and message_id in write_times
+                        and provider_id not in failed_providers[compact]
+                    ],
                 )
-                # Mark all providers to delete as failed
-                for provider_id in providers_to_delete:
-                    failed_providers[compact].add(provider_id)
 
     # Build batch item failures response for failed providers
     # Map back from failed providers to their SQS message IDs
@@ -216,3 +191,149 @@ def provider_update_ingest_handler(records: list[dict]) -> dict:
         logger.warning('Reporting batch item failures', failure_count=len(batch_item_failures))
 
     return {'batchItemFailures': batch_item_failures}
+
+
+def _index_compact(
+    *,
+    compact: str,
+    documents_to_index: list[dict],
+    providers_to_delete: list[str],
+    failed_provider_ids: set,
+    document_version: int,
+) -> None:
+    """
+    Bulk index a compact's documents and bulk delete the documents of its providers that no longer exist, in the
+    compact's live index, and in the index a blue/green reindex is loading, if one is in progress.
+
+    :param compact: The compact abbreviation
+    :param documents_to_index: The documents to index
+    :param providers_to_delete: The IDs of providers whose documents should be deleted
+    :param failed_provider_ids: The IDs of providers that failed, which any that fail to index or delete are added to
+    :param document_version: The version to index and delete the documents with
+    """
+    if failed_provider_ids:
+        logger.warning(
+            'Some providers failed serialization',
+            compact=compact,
+            failed_provider_ids=failed_provider_ids,
+            successful_count=len(documents_to_index),
+        )
+    if not documents_to_index and not providers_to_delete:
+        return
+
+    index_names = [f'compact_{compact}_providers']
+    try:
+        # If a blue/green reindex of the compact is in progress, changes also go to the index it is loading
+        index_names.extend(opensearch_client.get_alias_index_names(get_provider_reindex_alias_name(compact)))
+    except CCInternalException as e:
+        logger.error('Failed to check for a reindex in progress', compact=compact, error=str(e))
+        failed_provider_ids.update(document['providerId'] for document in documents_to_index)
+        failed_provider_ids.update(providers_to_delete)
+        return
+
+    for index_name in index_names:
+        _write_index(
+            index_name=index_name,
+            documents_to_index=documents_to_index,
+            providers_to_delete=providers_to_delete,
+            failed_provider_ids=failed_provider_ids,
+            document_version=document_version,
+        )
+
+
+def _write_index(
+    *,
+    index_name: str,
+    documents_to_index: list[dict],
+    providers_to_delete: list[str],
+    failed_provider_ids: set,
+    document_version: int,
+) -> None:
+    """
+    Bulk index documents into an index and bulk delete the documents of providers that no longer exist from it.
+
+    :param index_name: The index to write to
+    :param documents_to_index: The documents to index
+    :param providers_to_delete: The IDs of providers whose documents should be deleted
+    :param failed_provider_ids: The IDs of providers that failed, which any that fail to index or delete are added to
+    :param document_version: The version to index and delete the documents with
+    """
+    # Bulk index the documents
+    if documents_to_index:
+        try:
+            response = opensearch_client.bulk_index(
+                index_name=index_name, documents=documents_to_index, version=document_version
+            )
+
+            # Check for individual document failures
+            if response.get('errors'):
+                for item in response.get('items', []):
+                    index_result = item.get('index', {})
+                    # 409 (version_conflict) is not a failure - a document built from a newer read is already indexed
+                    if index_result.get('error') and index_result.get('status') != 409:
+                        doc_id = index_result.get('_id')
+                        logger.error(
+                            'Document indexing failed',
+                            provider_id=doc_id,
+                            error=index_result.get('error'),
+                        )
+                        failed_provider_ids.add(doc_id)
+
+            logger.info(
+                'Bulk indexed documents',
+                index_name=index_name,
+                document_count=len(documents_to_index),
+                had_errors=response.get('errors', False),
+            )
+        except CCInternalException as e:
+            # All documents for this compact failed to index
+            logger.error(
+                'Failed to bulk index documents after retries',
+                index_name=index_name,
+                document_count=len(documents_to_index),
+                error=str(e),
+            )
+            # Mark all providers in this compact as failed
+            document_provider_ids = [document['providerId'] for document in documents_to_index]
+            for provider_id in document_provider_ids:
+                failed_provider_ids.add(provider_id)
+
+    # Bulk delete providers that no longer exist
+    if providers_to_delete:
+        try:
+            delete_failed_provider_ids = opensearch_client.bulk_delete(
+                index_name=index_name, document_ids=providers_to_delete, version=document_version
+            )
+            failed_provider_ids.update(delete_failed_provider_ids)
+
+            logger.info(
+                'Bulk deleted documents',
+                index_name=index_name,
+                document_count=len(providers_to_delete),
+                failed_provider_ids=list(delete_failed_provider_ids),
+            )
+        except CCInternalException as e:
+            # All deletes for this compact failed
+            logger.error(
+                'Failed to bulk delete documents after retries',
+                index_name=index_name,
+                document_count=len(providers_to_delete),
+                error=str(e),
+            )
+            # Mark all providers to delete as failed
+            for provider_id in providers_to_delete:
+                failed_provider_ids.add(provider_id)
+
+
+def _report_index_lag(*, compact: str, write_times: list[float]) -> None:
+    """
+    Report the end-to-end lag, from the oldest provider table write in the batch to it being searchable, for a compact.
+
+    :param compact: The compact abbreviation
+    :param write_times: When each of the compact's successfully indexed records was written, in epoch seconds
+    """
+    if not write_times:
+        return
+    index_lag = max(0.0, time.time() - min(write_times))
+    logger.info('Indexed provider updates', compact=compact, index_lag_seconds=index_lag)
+    metrics.add_metric(name='search-index-lag', unit=MetricUnit.Seconds, value=index_lag)
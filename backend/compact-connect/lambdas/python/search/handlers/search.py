@@ -1,5 +1,6 @@
-import csv
-import io
+import json
+from enum import StrEnum
+from uuid import UUID, uuid4
 
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from cc_common.config import config, logger
@@ -17,6 +18,7 @@ from cc_common.exceptions import (
     CCNotFoundException,
 )
 from cc_common.utils import api_handler, authorize_compact_level_only_action
+from csv_export_writer import S3MultipartCsvWriter
 from marshmallow import ValidationError
 from opensearch_client import OpenSearchClient
 
@@ -27,6 +29,14 @@ MAX_MATCH_TOTAL_ALLOWED = 10000
 # Presigned URL expiration time in seconds (1 minute)
 PRESIGNED_URL_EXPIRATION_SECONDS = 60
 
+# Number of providers to fetch in each page of a privilege export
+EXPORT_PAGE_SIZE = 1000
+# How long the point in time of an export is kept alive between pages
+EXPORT_POINT_IN_TIME_KEEP_ALIVE = '2m'
+# Time threshold in milliseconds - an export job stops when less than 3 minutes remain before the lambda times out,
+# which leaves time for a page's searches to be retried, its upload to be aborted and its failure to be recorded
+EXPORT_JOB_TIME_THRESHOLD_MS = 60 * 3000
+
 # CSV field names for privilege export
 PRIVILEGE_CSV_FIELDS = [
     'type',
@@ -52,6 +62,12 @@ PRIVILEGE_CSV_FIELDS = [
 ]
 
 
+class PrivilegeExportJobStatus(StrEnum):
+    IN_PROGRESS = 'inProgress'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
+
+
 # Instantiate the OpenSearch client outside of the handler to cache connection between invocations
 # Set timeout to 20 seconds to give API gateway time to respond with response
 opensearch_client = OpenSearchClient(timeout=20)
@@ -78,6 +94,8 @@ def search_api_handler(event: dict, context: LambdaContext):
             return _search_providers(event, context)
         case ('POST', '/v1/compacts/{compact}/privileges/export'):
             return _export_privileges(event, context)
+        case ('GET', '/v1/compacts/{compact}/privileges/export/{jobId}'):
+            return _get_privilege_export_job(event, context)
 
     # If we get here, the method/resource combination is not supported
     raise CCInvalidRequestException(f'Unsupported method or resource: {http_method} {resource_path}')
@@ -188,9 +206,13 @@ def _export_privileges(event: dict, context: LambdaContext):  # noqa: ARG001 unu
         }
     }
 
+    An export that matches MAX_MATCH_TOTAL_ALLOWED or more providers is rejected, since it could not complete within
+    the API's timeout. Those exports can instead be run in the background, by including `"async": true` in the
+    request body, in which case a job id is returned, to fetch the result of the export with once it completes.
+
     :param event: Standard API Gateway event, API schema documented in the CDK ApiStack
     :param LambdaContext context:
-    :return: Dictionary with fileUrl containing presigned URL to download the CSV file
+    :return: Dictionary with fileUrl containing presigned URL to download the CSV file, or the jobId of an async export
     """
     compact = event['pathParameters']['compact']
 
@@ -200,109 +222,308 @@ def _export_privileges(event: dict, context: LambdaContext):  # noqa: ARG001 unu
     # Parse and validate the request body using the schema
     body = _parse_and_validate_export_request_body(event)
 
-    # Build the OpenSearch search body
-    search_body = _build_export_search_body(body)
+    if body.get('async_'):
+        return _start_privilege_export_job(compact=compact, caller_user_id=caller_user_id, request_body=event['body'])
 
-    # Build the index name for this compact
-    index_name = f'compact_{compact}_providers'
+    # Generate S3 key path
+    request_datetime = config.current_standard_datetime.isoformat()
+    s3_key = f'compact/{compact}/privilegeSearch/caller/{caller_user_id}/time/{request_datetime}/export.csv'
 
-    logger.info('Executing OpenSearch privilege export', compact=compact, index_name=index_name)
+    _export_privileges_to_s3(compact=compact, body=body, s3_key=s3_key, max_match_total=MAX_MATCH_TOTAL_ALLOWED)
 
-    # Execute the search
-    response = opensearch_client.search(index_name=index_name, body=search_body)
+    return {'fileUrl': _generate_export_file_url(s3_key)}
 
-    # Extract hits from the response
-    hits_data = response.get('hits', {})
-    hits = hits_data.get('hits', [])
-    total = hits_data['total']
 
-    if total['value'] >= MAX_MATCH_TOTAL_ALLOWED:
-        logger.info('request scope too large for current implementation, returning 400 with custom response')
-        raise CCInvalidRequestCustomResponseException(
-            response_body={
-                'message': 'Search scope too broad. Please narrow your search.',
-            }
+def _get_privilege_export_job(event: dict, context: LambdaContext):  # noqa: ARG001 unused-argument
+    """
+    Get the status of a privilege export job, with a presigned URL to download the CSV file once it is complete.
+
+    Jobs are stored under the caller's user id, so callers can only see the jobs they started.
+
+    :param event: Standard API Gateway event, API schema documented in the CDK ApiStack
+    :param LambdaContext context:
+    :return: Dictionary with the jobId, status and, once complete, the fileUrl of the job
+    :raises CCNotFoundException: If the caller has no job with the given id
+    """
+    compact = event['pathParameters']['compact']
+    job_id = event['pathParameters']['jobId']
+    caller_user_id = _get_caller_user_id(event)
+
+    try:
+        # Job ids are always UUIDs, so anything else can not be a job
+        UUID(job_id)
+        status_object = config.s3_client.get_object(
+            Bucket=config.export_results_bucket_name,
+            Key=_get_export_job_key(compact, caller_user_id, job_id, 'status.json'),
         )
+    except (ValueError, config.s3_client.exceptions.NoSuchKey) as e:
+        raise CCNotFoundException('Export job not found') from e
+
+    job_status = json.loads(status_object['Body'].read())
+    response_body = {'jobId': job_id, **job_status}
+    if job_status['status'] == PrivilegeExportJobStatus.COMPLETE:
+        response_body['fileUrl'] = _generate_export_file_url(
+            _get_export_job_key(compact, caller_user_id, job_id, 'export.csv')
+        )
+    return response_body
 
-    # Extract and flatten privileges from provider records
-    flattened_privileges = []
+
+def export_privileges_job_handler(event: dict, context: LambdaContext):
+    """
+    Run a privilege export job, started by an export request with `"async": true`.
+
+    There is no limit on the number of providers the export can match. The CSV file and the status of the job are
+    written under the job's key prefix in the export results bucket, for the caller to fetch through the API. An
+    export that can not complete before the lambda times out is stopped, and recorded as failed, since the job is not
+    retried.
+
+    :param event: The job, with the compact, callerUserId, jobId and original request body of the export
+    :param LambdaContext context:
+    :return: The final status of the job
+    """
+    compact = event['compact']
+    caller_user_id = event['callerUserId']
+    job_id = event['jobId']
+    logger.info('Running privilege export job', compact=compact, job_id=job_id)
+
+    try:
+        # The request was validated before the job was started, so this is not expected to fail
+        body = ExportPrivilegesRequestSchema().loads(event['body'])
+        privilege_count = _export_privileges_to_s3(
+            compact=compact,
+            body=body,
+            s3_key=_get_export_job_key(compact, caller_user_id, job_id, 'export.csv'),
+            max_match_total=None,
+            with_retries=True,
+            context=context,
+        )
+        job_status = {'status': PrivilegeExportJobStatus.COMPLETE, 'privilegeCount': privilege_count}
+    except CCInvalidRequestException as e:
+        job_status = {'status': PrivilegeExportJobStatus.FAILED, 'message': e.message}
+    except Exception as e:  # noqa: BLE001 any failure is recorded as the status of the job
+        logger.error('Privilege export job failed', compact=compact, job_id=job_id, error=str(e))
+        job_status = {
+            'status': PrivilegeExportJobStatus.FAILED,
+            'message': 'The export failed. Please try again, or narrow your search.',
+        }
+
+    _put_export_job_status(compact, caller_user_id, job_id, job_status)
+    return job_status
+
+
+def _start_privilege_export_job(*, compact: str, caller_user_id: str, request_body: str) -> dict:
+    """
+    Start a privilege export job, which runs asynchronously in its own lambda.
+
+    :param compact: The compact to export privileges from
+    :param caller_user_id: The user id of the caller, to store the job under
+    :param request_body: The validated request body, as sent, for the job to export
+    :return: Dictionary with the jobId and status of the new job
+    """
+    job_id = str(uuid4())
+    job_status = {'status': PrivilegeExportJobStatus.IN_PROGRESS}
+    _put_export_job_status(compact, caller_user_id, job_id, job_status)
+
+    logger.info('Starting privilege export job', compact=compact, job_id=job_id)
+    config.lambda_client.invoke(
+        FunctionName=config.privilege_export_job_lambda_name,
+        InvocationType='Event',
+        Payload=json.dumps({'compact': compact, 'callerUserId': caller_user_id, 'jobId': job_id, 'body': request_body}),
+    )
+    return {'jobId': job_id, **job_status}
+
+
+def _get_export_job_key(compact: str, caller_user_id: str, job_id: str, file_name: str) -> str:
+    return f'compact/{compact}/privilegeSearch/caller/{caller_user_id}/job/{job_id}/{file_name}'
+
+
+def _put_export_job_status(compact: str, caller_user_id: str, job_id: str, job_status: dict):
+    config.s3_client.put_object(
+        Bucket=config.export_results_bucket_name,
+        Key=_get_export_job_key(compact, caller_user_id, job_id, 'status.json'),
+        Body=json.dumps(job_status).encode('utf-8'),
+        ContentType='application/json',
+    )
+
+
+def _export_privileges_to_s3(
+    *,
+    compact: str,
+    body: dict,
+    s3_key: str,
+    max_match_total: int | None,
+    with_retries: bool = False,
+    context: LambdaContext | None = None,
+) -> int:
+    """
+    Stream every privilege matching the request into a CSV file in S3.
+
+    Matching providers are paged through with search_after, over a point in time of the compact's index, so every page
+    comes from the same view of the index. Each page's privileges are flattened, sanitized and written to an S3
+    multipart upload before the next page is fetched, so memory use does not grow with the size of the export.
+
+    :param compact: The compact to export privileges from
+    :param body: Validated request body
+    :param s3_key: The key to write the CSV file to
+    :param max_match_total: The number of providers at which the request is rejected, or None for no limit
+    :param with_retries: Retry searches that fail on transient errors, rather than failing fast
+    :param context: The Lambda context of an export job, to stop the export before the lambda times out
+    :return: The number of privileges exported
+    :raises CCInvalidRequestCustomResponseException: If the request matches max_match_total or more providers
+    :raises CCNotFoundException: If the request does not match any privileges
+    :raises CCInvalidRequestException: If the export is stopped before the lambda times out
+    """
+    # Build the index name for this compact
+    index_name = f'compact_{compact}_providers'
+    search = opensearch_client.search_with_retry if with_retries else opensearch_client.search
     privilege_schema = StatePrivilegeGeneralResponseSchema()
 
-    for hit in hits:
-        provider = hit.get('_source', {})
-        # Check if inner_hits are present for privileges
-        # If so, use only the matched privileges; otherwise, use all privileges
-        # see https://docs.opensearch.org/latest/search-plugins/searching-data/inner-hits/ for more information
-        # about inner_hits.
-        inner_hits = hit.get('inner_hits', {})
-        privileges_inner_hits = inner_hits.get('privileges', {}).get('hits', {}).get('hits', [])
-
-        if privileges_inner_hits:
-            # Use only the privileges that matched the nested query
-            matched_privileges = [ih.get('_source', {}) for ih in privileges_inner_hits]
-            provider_privileges = _extract_flattened_privileges_from_list(
-                privileges=matched_privileges,
-                licenses=provider.get('licenses', []),
-                provider=provider,
-            )
-        else:
-            # No inner_hits, return all privileges for this provider
-            provider_privileges = _extract_flattened_privileges(provider)
-
-        for flattened_privilege in provider_privileges:
-            try:
-                # Sanitize using StatePrivilegeGeneralResponseSchema
-                sanitized_privilege = privilege_schema.load(flattened_privilege)
-                # Verify compact matches path parameter
-                if sanitized_privilege.get('compact') != compact:
-                    logger.error(
-                        'Privilege compact field does not match path parameter',
-                        # This case is most likely the result of abuse or misconfiguration.
-                        # We log the request body for triaging purposes. We redact the leaf values
-                        # from the request body to obscure PII.
-                        request_body=_redact_leaf_values(body),
-                        provider_id=provider.get('providerId'),
-                        privilege_id=flattened_privilege.get('privilegeId'),
-                        privilege_compact=sanitized_privilege.get('compact'),
-                        path_compact=compact,
+    logger.info('Executing OpenSearch privilege export', compact=compact, index_name=index_name)
+    pit_id = opensearch_client.create_point_in_time(index_name=index_name, keep_alive=EXPORT_POINT_IN_TIME_KEEP_ALIVE)
+    try:
+        with S3MultipartCsvWriter(
+            bucket_name=config.export_results_bucket_name, key=s3_key, fieldnames=PRIVILEGE_CSV_FIELDS
+        ) as writer:
+            search_after = None
+            while True:
+                response = search(
+                    index_name=None, body=_build_export_search_body(body, pit_id=pit_id, search_after=search_after)
+                )
+                # The PIT id can change with each search, and the latest one must be used for the next
+                pit_id = response.get('pit_id', pit_id)
+                hits_data = response.get('hits', {})
+                hits = hits_data.get('hits', [])
+
+                if search_after is None and max_match_total is not None:
+                    total = hits_data['total']
+                    if total['value'] >= max_match_total:
+                        logger.info(
+                            'request scope too large for current implementation, returning 400 with custom response'
+                        )
+                        raise CCInvalidRequestCustomResponseException(
+                            response_body={
+                                'message': 'Search scope too broad. Please narrow your search.',
+                            }
+                        )
+
+                for hit in hits:
+                    writer.write_rows(
+                        _get_sanitized_privileges_from_hit(
+                            hit, compact=compact, body=body, privilege_schema=privilege_schema
+                        )
+                    )
+
+                if len(hits) < EXPORT_PAGE_SIZE:
+                    break
+                search_after = hits[-1]['sort']
+
+                if context is not None and context.get_remaining_time_in_millis() < EXPORT_JOB_TIME_THRESHOLD_MS:
+                    # Leaving the writer aborts the upload, so no partial file is left behind
+                    logger.warning(
+                        'Approaching time limit, stopping privilege export',
+                        compact=compact,
+                        remaining_time_ms=context.get_remaining_time_in_millis(),
+                        row_count=writer.row_count,
+                    )
+                    raise CCInvalidRequestException(
+                        'The export could not be completed in time. Please narrow your search.'
                     )
-                    # do not include the privilege in the results
-                    continue
-                flattened_privileges.append(sanitized_privilege)
-            except ValidationError as e:
+
+            logger.info('Found privileges to export', count=writer.row_count)
+
+            # If no privileges were found, return 404
+            if not writer.row_count:
+                raise CCNotFoundException('The search parameters did not match any privileges.')
+
+            logger.info('Uploading CSV to S3', bucket=config.export_results_bucket_name, key=s3_key)
+            writer.complete()
+            return writer.row_count
+    finally:
+        _delete_point_in_time(pit_id)
+
+
+def _get_sanitized_privileges_from_hit(
+    hit: dict, *, compact: str, body: dict, privilege_schema: StatePrivilegeGeneralResponseSchema
+) -> list[dict]:
+    """
+    Get the flattened and sanitized privileges of a provider search hit.
+
+    :param hit: The provider search hit
+    :param compact: The compact of the export, which every privilege must belong to
+    :param body: Validated request body, for logging
+    :param privilege_schema: The schema to sanitize each privilege with
+    :return: The sanitized privileges
+    :raises CCInternalException: If any privilege fails to sanitize
+    """
+    provider = hit.get('_source', {})
+    # Check if inner_hits are present for privileges
+    # If so, use only the matched privileges; otherwise, use all privileges
+    # see https://docs.opensearch.org/latest/search-plugins/searching-data/inner-hits/ for more information
+    # about inner_hits.
+    inner_hits = hit.get('inner_hits', {})
+    privileges_inner_hits = inner_hits.get('privileges', {}).get('hits', {}).get('hits', [])
+
+    if privileges_inner_hits:
+        # Use only the privileges that matched the nested query
+        matched_privileges = [ih.get('_source', {}) for ih in privileges_inner_hits]
+        provider_privileges = _extract_flattened_privileges_from_list(
+            privileges=matched_privileges,
+            licenses=provider.get('licenses', []),
+            provider=provider,
+        )
+    else:
+        # No inner_hits, return all privileges for this provider
+        provider_privileges = _extract_flattened_privileges(provider)
+
+    sanitized_privileges = []
+    for flattened_privilege in provider_privileges:
+        try:
+            # Sanitize using StatePrivilegeGeneralResponseSchema
+            sanitized_privilege = privilege_schema.load(flattened_privilege)
+            # Verify compact matches path parameter
+            if sanitized_privilege.get('compact') != compact:
                 logger.error(
-                    'Failed to sanitize flattened privilege record',
+                    'Privilege compact field does not match path parameter',
+                    # This case is most likely the result of abuse or misconfiguration.
+                    # We log the request body for triaging purposes. We redact the leaf values
+                    # from the request body to obscure PII.
+                    request_body=_redact_leaf_values(body),
                     provider_id=provider.get('providerId'),
                     privilege_id=flattened_privilege.get('privilegeId'),
-                    errors=e.messages,
+                    privilege_compact=sanitized_privilege.get('compact'),
+                    path_compact=compact,
                 )
-                # We don't want to return partial privilege reports
-                # If we experience a failure here we need to exit
-                raise CCInternalException('Failed to process privilege results') from e
-
-    logger.info('Found privileges to export', count=len(flattened_privileges))
+                # do not include the privilege in the results
+                continue
+            sanitized_privileges.append(sanitized_privilege)
+        except ValidationError as e:
+            logger.error(
+                'Failed to sanitize flattened privilege record',
+                provider_id=provider.get('providerId'),
+                privilege_id=flattened_privilege.get('privilegeId'),
+                errors=e.messages,
+            )
+            # We don't want to return partial privilege reports
+            # If we experience a failure here we need to exit
+            raise CCInternalException('Failed to process privilege results') from e
+    return sanitized_privileges
 
-    # If no privileges were found, return 404
-    if not flattened_privileges:
-        raise CCNotFoundException('The search parameters did not match any privileges.')
 
-    # Generate CSV content from the flattened privileges
-    csv_content = _generate_csv_content(flattened_privileges)
+def _delete_point_in_time(pit_id: str):
+    """Delete a point in time once an export is done with it. If that fails, it will still expire on its own."""
+    try:
+        opensearch_client.delete_point_in_time(pit_id)
+    except CCInternalException as e:
+        logger.warning('Failed to delete point in time', error=str(e))
 
-    # Generate S3 key path
-    request_datetime = config.current_standard_datetime.isoformat()
-    s3_key = f'compact/{compact}/privilegeSearch/caller/{caller_user_id}/time/{request_datetime}/export.csv'
 
-    # Upload CSV to S3
-    logger.info('Uploading CSV to S3', bucket=config.export_results_bucket_name, key=s3_key)
-    config.s3_client.put_object(
-        Bucket=config.export_results_bucket_name,
-        Key=s3_key,
-        Body=csv_content.encode('utf-8'),
-        ContentType='text/csv',
-    )
+def _generate_export_file_url(s3_key: str) -> str:
+    """
+    Generate a presigned URL to download an export file.
 
-    # Generate presigned URL for download
+    :param s3_key: The key of the export file
+    :return: The presigned URL
+    """
     presigned_url = config.s3_client.generate_presigned_url(
         'get_object',
         Params={
@@ -313,8 +534,7 @@ def _export_privileges(event: dict, context: LambdaContext):  # noqa: ARG001 unu
     )
 
     logger.info('Generated presigned URL for export', url_expires_in=PRESIGNED_URL_EXPIRATION_SECONDS)
-
-    return {'fileUrl': presigned_url}
+    return presigned_url
 
 
 def _parse_and_validate_request_body(event: dict) -> dict:
@@ -423,41 +643,28 @@ def _build_opensearch_search_body(body: dict, size_override: int) -> dict:
     return search_body
 
 
-def _build_export_search_body(body: dict) -> dict:
+def _build_export_search_body(body: dict, *, pit_id: str, search_after: list | None) -> dict:
     """
-    Build the OpenSearch search body for export requests.
+    Build the OpenSearch search body for a page of an export.
 
-    Export requests retrieve all matching results in a single request, up to MAX_MATCH_TOTAL_ALLOWED.
-    OpenSearch's default index.max_result_window is 10,000, which aligns with our limit.
-    If there are more results than the limit, the export will fail with a 400 error.
+    Exports page through every matching result with search_after, over a point in time of the index. The point in
+    time takes the place of the index name, so the body is searched without one.
 
     :param body: Validated request body
+    :param pit_id: The id of the point in time to search
+    :param search_after: The sort values of the last hit of the previous page, or None for the first page
     :return: OpenSearch search body
     """
-    return {
+    search_body = {
         'query': body.get('query', {'match_all': {}}),
-        'size': MAX_MATCH_TOTAL_ALLOWED,
+        'size': EXPORT_PAGE_SIZE,
+        'pit': {'id': pit_id, 'keep_alive': EXPORT_POINT_IN_TIME_KEEP_ALIVE},
+        # Required for search_after pagination. Each provider has one document, so this is a total order.
+        'sort': [{'providerId': 'asc'}],
     }
-
-
-def _generate_csv_content(privileges: list[dict]) -> str:
-    """
-    Generate CSV content from a list of privilege records.
-
-    :param privileges: List of flattened privilege records
-    :return: CSV content as a string
-    """
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=PRIVILEGE_CSV_FIELDS, extrasaction='ignore')
-
-    # Write header row
-    writer.writeheader()
-
-    # Write data rows
-    for privilege in privileges:
-        writer.writerow(privilege)
-
-    return output.getvalue()
+    if search_after is not None:
+        search_body['search_after'] = search_after
+    return search_body
 
 
 def _extract_flattened_privileges(provider: dict) -> list[dict]:
@@ -1,10 +1,12 @@
+import threading
 import time
 
 import boto3
 from cc_common.config import config, logger
 from cc_common.exceptions import CCInternalException, CCInvalidRequestException
 from opensearchpy import AWSV4SignerAuth, OpenSearch, RequestsHttpConnection
-from opensearchpy.exceptions import ConnectionTimeout, RequestError, TransportError
+from opensearchpy.exceptions import ConnectionTimeout, NotFoundError, RequestError, TransportError
+from opensearchpy.serializer import JSONSerializer
 
 # Retry configuration for operations
 MAX_RETRY_ATTEMPTS = 5
@@ -12,6 +14,18 @@ INITIAL_BACKOFF_SECONDS = 2
 MAX_BACKOFF_SECONDS = 32
 
 DEFAULT_TIMEOUT = 30
+# A force merge only responds once the merge is complete, which can take minutes for a freshly bulk loaded index
+FORCE_MERGE_TIMEOUT = 600
+
+# Bulk requests are split so that no request body is larger than this, before compression. The domain rejects request
+# bodies over 10 MiB on smaller instance types.
+# See: https://docs.aws.amazon.com/opensearch-service/latest/developerguide/limits.html#network-limits
+MAX_BULK_REQUEST_BYTES = 5 * 1024 * 1024
+# The number of operations sent in each bulk request adapts to the cluster's latency, within these bounds
+INITIAL_BULK_BATCH_SIZE = 500
+MIN_BULK_BATCH_SIZE = 10
+MAX_BULK_BATCH_SIZE = 5000
+TARGET_BULK_LATENCY_SECONDS = 2.0
 
 
 class OpenSearchClient:
@@ -26,7 +40,10 @@ class OpenSearchClient:
             connection_class=RequestsHttpConnection,
             timeout=timeout,
             pool_maxsize=20,
+            # gzip request bodies, which shrinks large bulk requests considerably
+            http_compress=True,
         )
+        self._bulk_writer = BulkWriter(self._client)
 
     def create_index(self, index_name: str, index_mapping: dict) -> None:
         """
@@ -127,6 +144,110 @@ class OpenSearchClient:
             operation_name=f'update_index_settings({index_name})',
         )
 
+    def get_alias_index_names(self, alias_name: str) -> list[str]:
+        """
+        Get the names of the indices an alias points to.
+
+        :param alias_name: The name of the alias
+        :return: The names of the indices, or an empty list if the alias does not exist
+        :raises CCInternalException: If all retry attempts fail
+        """
+
+        def get_alias() -> list[str]:
+            try:
+                # Look the alias up by its own path, which our domain access policies allow for compact indices
+                return list(self._client.indices.get_alias(index=alias_name).keys())
+            except NotFoundError:
+                return []
+
+        return self._execute_with_retry(operation=get_alias, operation_name=f'get_alias_index_names({alias_name})')
+
+    def update_aliases(self, actions: list[dict]) -> None:
+        """
+        Apply a set of alias actions atomically, so that searches never see the aliases part way through the change.
+
+        See: https://docs.opensearch.org/latest/im-plugin/index-alias/
+
+        :param actions: The alias actions (e.g., [{'remove': {'index': ..., 'alias': ...}}, {'add': {...}}])
+        :raises CCInternalException: If all retry attempts fail
+        """
+        self._execute_with_retry(
+            operation=lambda: self._client.indices.update_aliases(body={'actions': actions}),
+            operation_name='update_aliases',
+        )
+
+    def refresh_index(self, index_name: str) -> None:
+        """
+        Refresh an index, making every document indexed so far searchable.
+
+        :param index_name: The name of the index (can be an alias)
+        :raises CCInternalException: If all retry attempts fail
+        """
+        self._execute_with_retry(
+            operation=lambda: self._client.indices.refresh(index=index_name),
+            operation_name=f'refresh_index({index_name})',
+        )
+
+    def force_merge(self, index_name: str, max_num_segments: int) -> None:
+        """
+        Merge the segments of an index, waiting for the merge to complete.
+
+        This should only be run against an index that is not receiving heavy writes, such as one that was just bulk
+        loaded. See: https://docs.opensearch.org/latest/api-reference/index-apis/force-merge/
+
+        :param index_name: The name of the index (can be an alias)
+        :param max_num_segments: The number of segments to merge each shard down to
+        :raises CCInternalException: If all retry attempts fail
+        """
+        self._execute_with_retry(
+            operation=lambda: self._client.indices.forcemerge(
+                index=index_name, max_num_segments=max_num_segments, request_timeout=FORCE_MERGE_TIMEOUT
+            ),
+            operation_name=f'force_merge({index_name})',
+        )
+
+    def count_documents(self, index_name: str) -> int:
+        """
+        Count the documents in an index.
+
+        :param index_name: The name of the index (can be an alias)
+        :return: The number of documents
+        :raises CCInternalException: If all retry attempts fail
+        """
+        return self._execute_with_retry(
+            operation=lambda: self._client.count(index=index_name)['count'],
+            operation_name=f'count_documents({index_name})',
+        )
+
+    def create_point_in_time(self, index_name: str, keep_alive: str) -> str:
+        """
+        Create a point in time (PIT) of an index, to page through a consistent view of it with search_after.
+
+        A search of the PIT is made with the PIT in the query body, and no index name.
+        See: https://docs.opensearch.org/latest/search-plugins/searching-data/point-in-time/
+
+        :param index_name: The name of the index (can be an alias)
+        :param keep_alive: How long to keep the PIT alive for, e.g. '1m'. Each search of the PIT can extend this.
+        :return: The PIT id
+        :raises CCInternalException: If all retry attempts fail
+        """
+        return self._execute_with_retry(
+            operation=lambda: self._client.create_pit(index=index_name, params={'keep_alive': keep_alive})['pit_id'],
+            operation_name=f'create_point_in_time({index_name})',
+        )
+
+    def delete_point_in_time(self, pit_id: str) -> None:
+        """
+        Delete a point in time, releasing the resources held for it before it would otherwise expire.
+
+        :param pit_id: The PIT id
+        :raises CCInternalException: If all retry attempts fail
+        """
+        self._execute_with_retry(
+            operation=lambda: self._client.delete_pit(body={'pit_id': [pit_id]}),
+            operation_name='delete_point_in_time',
+        )
+
     def _execute_with_retry(self, operation: callable, operation_name: str):
         """
         Execute an operation with retry logic and exponential backoff.
@@ -174,14 +295,14 @@ class OpenSearchClient:
             f'{operation_name} failed after {MAX_RETRY_ATTEMPTS} attempts. Last error: {last_exception}'
         )
 
-    def search(self, index_name: str, body: dict) -> dict:
+    def search(self, index_name: str | None, body: dict) -> dict:
         """
         Execute a search query against the specified index.
 
         This method is intended to be used for user-facing search requests that need a response quickly (UI/API).
         For background/batch operations, use search_with_retry instead.
 
-        :param index_name: The name of the index to search
+        :param index_name: The name of the index to search, or None to search the point in time in the body
         :param body: The OpenSearch query body
         :return: The search response from OpenSearch
         :raises CCInvalidRequestException: If the query is invalid (400 error) or times out
@@ -213,14 +334,14 @@ class OpenSearchClient:
             # Re-raise non-400 RequestErrors
             raise
 
-    def search_with_retry(self, index_name: str, body: dict) -> dict:
+    def search_with_retry(self, index_name: str | None, body: dict) -> dict:
         """
         Execute a search query with retry logic and exponential backoff.
 
         Use this method for background/batch operations where retrying on transient
         failures is preferred over immediately returning an error to a user.
 
-        :param index_name: The name of the index to search
+        :param index_name: The name of the index to search, or None to search the point in time in the body
         :param body: The OpenSearch query body
         :return: The search response from OpenSearch
         :raises CCInternalException: If all retry attempts fail due to connection issues
@@ -302,40 +423,45 @@ class OpenSearchClient:
             )
             return str(e.error)
 
-    def bulk_index(self, index_name: str, documents: list[dict], id_field: str = 'providerId') -> dict:
+    def bulk_index(
+        self, index_name: str, documents: list[dict], id_field: str = 'providerId', version: int | None = None
+    ) -> dict:
         """
         Bulk index multiple documents into the specified index.
 
-        This method implements retry logic with exponential backoff to handle transient
-        connection issues (e.g., ConnectionTimeout, TransportError). If all retry attempts
-        fail, a CCInternalException is raised to signal the caller to handle the failure.
+        Documents are written with the client's BulkWriter, which splits them into requests by their size, retries
+        requests that fail on transient connection issues (e.g., ConnectionTimeout, TransportError) and retries
+        documents the cluster rejects under load. If a request still fails after all retry attempts, a
+        CCInternalException is raised to signal the caller to handle the failure.
 
         :param index_name: The name of the index to write to
         :param documents: List of documents to index
         :param id_field: The field name to use as the document ID (default: 'providerId')
-        :return: The bulk response from OpenSearch
+        :param version: An external version to index the documents with. Documents are then only written if their
+            version is at least the indexed document's (external_gte), and the items of any that are not have a 409
+            status.
+        :return: A bulk response from OpenSearch, with the result of every document, in the order given
         :raises CCInternalException: If all retry attempts fail due to connection issues
         """
         if not documents:
             return {'items': [], 'errors': False}
 
-        actions = []
-        for doc in documents:
-            actions.append({'index': {'_id': doc[id_field]}})
-            actions.append(doc)
-
-        return self._bulk_index_with_retry(actions=actions, index_name=index_name, document_count=len(documents))
+        operations = [
+            ({'index': {'_id': doc[id_field], **_get_external_version_parameters(version)}}, doc) for doc in documents
+        ]
+        return self._bulk_writer.write(index_name=index_name, operations=operations, operation_type='index')
 
-    def bulk_delete(self, index_name: str, document_ids: list[str]) -> set[str]:
+    def bulk_delete(self, index_name: str, document_ids: list[str], version: int | None = None) -> set[str]:
         """
         Bulk delete multiple documents from the specified index.
 
-        This method implements retry logic with exponential backoff to handle transient
-        connection issues (e.g., ConnectionTimeout, TransportError). If all retry attempts
-        fail, a CCInternalException is raised to signal the caller to handle the failure.
+        Documents are deleted with the client's BulkWriter. See bulk_index for how requests are split and retried.
+        If all retry attempts fail, a CCInternalException is raised to signal the caller to handle the failure.
 
         :param index_name: The name of the index to delete from
         :param document_ids: List of document IDs to delete
+        :param version: An external version to delete the documents with. Documents are then only deleted if their
+            version is at most this one (external_gte).
         :return: A list of document ids that failed to delete (if any)
         :raises CCInternalException: If all retry attempts fail due to connection issues
         """
@@ -343,13 +469,10 @@ class OpenSearchClient:
         if not document_ids:
             return failed_document_ids
 
-        actions = []
-        for doc_id in document_ids:
-            actions.append({'delete': {'_id': doc_id}})
-
-        response = self._bulk_operation_with_retry(
-            actions=actions, index_name=index_name, operation_count=len(document_ids), operation_type='delete'
-        )
+        operations = [
+            ({'delete': {'_id': doc_id, **_get_external_version_parameters(version)}}, None) for doc_id in document_ids
+        ]
+        response = self._bulk_writer.write(index_name=index_name, operations=operations, operation_type='delete')
 
         # Check for individual delete failures
         if response.get('errors'):
@@ -357,8 +480,9 @@ class OpenSearchClient:
                 delete_result = item.get('delete', {})
                 if delete_result.get('error'):
                     doc_id = delete_result.get('_id')
-                    # 404 (not_found) is not an error for delete - the document was already gone
-                    if delete_result.get('status') != 404:
+                    # 404 (not_found) is not an error for delete - the document was already gone, nor is 409
+                    # (version_conflict) - the document was indexed again from a newer read
+                    if delete_result.get('status') not in (404, 409):
                         logger.error(
                             'Document deletion failed',
                             provider_id=doc_id,
@@ -368,31 +492,214 @@ class OpenSearchClient:
 
         return failed_document_ids
 
-    def _bulk_index_with_retry(self, actions: list, index_name: str, document_count: int) -> dict:
+
+class BulkWriter:
+    """
+    Writes bulk operations to OpenSearch, in requests sized by their serialized bytes rather than their count.
+
+    - Operations are split into requests of at most max_request_bytes, and at most batch_size operations. An operation
+      larger than max_request_bytes is sent in a request of its own. If the cluster rejects a request as too large,
+      it is split in half and each half is sent separately.
+    - A request that fails outright on a transient connection issue is retried, with exponential backoff.
+    - Items the cluster rejects under load (429), or fails on with a server error, are retried on their own, with
+      exponential backoff, rather than replaying the whole request. Other item errors, such as a document that does
+      not match the index mapping, will not succeed on a retry, so they are returned as they are.
+    - batch_size adapts to how long the cluster takes to respond: it is halved whenever a request is slower than
+      target_latency_seconds or has items rejected, and grows gradually while full requests are well under it.
+
+    The writer is thread safe, so it can be shared by concurrent callers, which then share one adaptive batch size.
+    """
+
+    def __init__(
+        self,
+        client: OpenSearch,
+        *,
+        max_request_bytes: int = MAX_BULK_REQUEST_BYTES,
+        initial_batch_size: int = INITIAL_BULK_BATCH_SIZE,
+        min_batch_size: int = MIN_BULK_BATCH_SIZE,
+        max_batch_size: int = MAX_BULK_BATCH_SIZE,
+        target_latency_seconds: float = TARGET_BULK_LATENCY_SECONDS,
+    ):
         """
-        Execute bulk index with retry logic and exponential backoff.
+        :param client: The OpenSearch client to send bulk requests with
+        :param max_request_bytes: The largest request body to send, before compression
+        :param initial_batch_size: The number of operations to send in each request, until it adapts
+        :param min_batch_size: The fewest operations batch_size can adapt down to
+        :param max_batch_size: The most operations batch_size can adapt up to
+        :param target_latency_seconds: The request latency batch_size adapts to stay under
+        """
+        self._client = client
+        self._serializer = JSONSerializer()
+        self._max_request_bytes = max_request_bytes
+        self._min_batch_size = min_batch_size
+        self._max_batch_size = max_batch_size
+        self._target_latency_seconds = target_latency_seconds
+        self._lock = threading.Lock()
+        self.batch_size = initial_batch_size
+
+    def write(self, *, index_name: str, operations: list[tuple[dict, dict | None]], operation_type: str) -> dict:
+        """
+        Write bulk operations to an index.
 
-        :param actions: The bulk actions to execute
-        :param index_name: The name of the index to write to
-        :param document_count: Number of documents being indexed (for logging)
-        :return: The bulk response from OpenSearch
-        :raises CCInternalException: If all retry attempts fail
+        :param index_name: The name of the index to operate on
+        :param operations: Each operation's action, e.g. {'index': {'_id': ...}}, and its document, if it has one
+        :param operation_type: Type of operation ('index' or 'delete') for logging
+        :return: A bulk response, with the final result of every operation, in the order given
+        :raises CCInternalException: If a request fails after all retry attempts
         """
-        return self._bulk_operation_with_retry(
-            actions=actions, index_name=index_name, operation_count=document_count, operation_type='index'
-        )
+        serialized_operations = [self._serialize(action, document) for action, document in operations]
+        items: list[dict | None] = [None] * len(operations)
+        pending = list(range(len(operations)))
+        backoff_seconds = INITIAL_BACKOFF_SECONDS
 
-    def _bulk_operation_with_retry(
-        self, actions: list, index_name: str, operation_count: int, operation_type: str
-    ) -> dict:
+        for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
+            rejected = []
+            for batch in self._split(pending, serialized_operations):
+                rejected.extend(
+                    self._send(
+                        index_name=index_name,
+                        batch=batch,
+                        operations=operations,
+                        serialized_operations=serialized_operations,
+                        items=items,
+                        operation_type=operation_type,
+                    )
+                )
+            if not rejected:
+                break
+            if attempt == MAX_RETRY_ATTEMPTS:
+                logger.error(
+                    f'Bulk {operation_type} items still rejected after max retry attempts',
+                    attempts=MAX_RETRY_ATTEMPTS,
+                    index_name=index_name,
+                    rejected_count=len(rejected),
+                )
+                break
+            logger.warning(
+                f'Bulk {operation_type} items rejected, retrying them with backoff',
+                attempt=attempt,
+                max_attempts=MAX_RETRY_ATTEMPTS,
+                backoff_seconds=backoff_seconds,
+                index_name=index_name,
+                rejected_count=len(rejected),
+            )
+            time.sleep(backoff_seconds)
+            # Exponential backoff with cap
+            backoff_seconds = min(backoff_seconds * 2, MAX_BACKOFF_SECONDS)
+            pending = rejected
+
+        items = [item for item in items if item is not None]
+        return {'items': items, 'errors': any(_get_bulk_item_result(item).get('error') for item in items)}
+
+    def _serialize(self, action: dict, document: dict | None) -> bytes:
+        lines = [self._serializer.dumps(action)]
+        if document is not None:
+            lines.append(self._serializer.dumps(document))
+        return ''.join(f'{line}\n' for line in lines).encode('utf-8')
+
+    def _split(self, pending: list[int], serialized_operations: list[bytes]):
+        """Split the pending operations into batches, by both the batch size and the request size"""
+        batch = []
+        batch_bytes = 0
+        for operation_index in pending:
+            operation_bytes = len(serialized_operations[operation_index])
+            # batch_size is read for each batch, so that it adapts part way through a write
+            if batch and (len(batch) >= self.batch_size or batch_bytes + operation_bytes > self._max_request_bytes):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(operation_index)
+            batch_bytes += operation_bytes
+        if batch:
+            yield batch
+
+    def _send(
+        self,
+        *,
+        index_name: str,
+        batch: list[int],
+        operations: list[tuple[dict, dict | None]],
+        serialized_operations: list[bytes],
+        items: list[dict | None],
+        operation_type: str,
+    ) -> list[int]:
         """
-        Execute bulk operation with retry logic and exponential backoff.
+        Send one batch of operations, recording the result of each.
 
-        :param actions: The bulk actions to execute
+        :return: The operations that were rejected, and should be retried
+        """
+        body = b''.join(serialized_operations[operation_index] for operation_index in batch)
+        start = time.monotonic()
+        try:
+            response = self._bulk_with_retry(
+                body=body, index_name=index_name, operation_count=len(batch), operation_type=operation_type
+            )
+        except TransportError as e:
+            if e.status_code != 413:
+                raise
+            if len(batch) > 1:
+                logger.warning(
+                    f'Bulk {operation_type} request too large, splitting it',
+                    index_name=index_name,
+                    operation_count=len(batch),
+                    request_bytes=len(body),
+                )
+                middle = len(batch) // 2
+                return [
+                    *self._send(
+                        index_name=index_name,
+                        batch=batch[:middle],
+                        operations=operations,
+                        serialized_operations=serialized_operations,
+                        items=items,
+                        operation_type=operation_type,
+                    ),
+                    *self._send(
+                        index_name=index_name,
+                        batch=batch[middle:],
+                        operations=operations,
+                        serialized_operations=serialized_operations,
+                        items=items,
+                        operation_type=operation_type,
+                    ),
+                ]
+            # A single operation too large to send can never succeed, so it fails like any other item error
+            ((action_type, action),) = operations[batch[0]][0].items()
+            logger.error(
+                f'Bulk {operation_type} operation too large to send',
+                index_name=index_name,
+                document_id=action.get('_id'),
+                request_bytes=len(body),
+            )
+            items[batch[0]] = {
+                action_type: {
+                    '_id': action.get('_id'),
+                    'status': 413,
+                    'error': {'type': 'request_entity_too_large', 'reason': str(e)},
+                }
+            }
+            return []
+        latency_seconds = time.monotonic() - start
+
+        rejected = []
+        for operation_index, item in zip(batch, response.get('items', []), strict=False):
+            items[operation_index] = item
+            status = _get_bulk_item_result(item).get('status', 200)
+            if status == 429 or status >= 500:
+                rejected.append(operation_index)
+        self._adapt_batch_size(latency_seconds=latency_seconds, batch_len=len(batch), throttled=bool(rejected))
+        return rejected
+
+    def _bulk_with_retry(self, *, body: bytes, index_name: str, operation_count: int, operation_type: str) -> dict:
+        """
+        Execute a bulk request with retry logic and exponential backoff.
+
+        :param body: The serialized bulk request body
         :param index_name: The name of the index to operate on
         :param operation_count: Number of operations being performed (for logging)
         :param operation_type: Type of operation ('index' or 'delete') for logging
         :return: The bulk response from OpenSearch
+        :raises TransportError: If the request is too large (413), which a retry would not fix
         :raises CCInternalException: If all retry attempts fail
         """
         last_exception = None
@@ -400,8 +707,10 @@ class OpenSearchClient:
 
         for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
             try:
-                return self._client.bulk(body=actions, index=index_name)
+                return self._client.bulk(body=body, index=index_name)
             except (ConnectionTimeout, TransportError) as e:
+                if e.status_code == 413:
+                    raise
                 last_exception = e
                 if attempt < MAX_RETRY_ATTEMPTS:
                     logger.warning(
@@ -430,3 +739,33 @@ class OpenSearchClient:
             f'Failed to bulk {operation_type} {operation_count} documents to {index_name} '
             f'after {MAX_RETRY_ATTEMPTS} attempts. Last error: {last_exception}'
         )
+
+    def _adapt_batch_size(self, *, latency_seconds: float, batch_len: int, throttled: bool):
+        """Halve the batch size when the cluster is slow or rejecting items, and grow it while it keeps up"""
+        with self._lock:
+            previous_batch_size = self.batch_size
+            if throttled or latency_seconds > self._target_latency_seconds:
+                self.batch_size = max(self._min_batch_size, self.batch_size // 2)
+            elif batch_len >= self.batch_size and latency_seconds < self._target_latency_seconds / 2:
+                # Only a full batch says whether the cluster could take a larger one
+                self.batch_size = min(self._max_batch_size, self.batch_size + max(1, self.batch_size // 10))
+            if self.batch_size != previous_batch_size:
+                logger.debug(
+                    'Adapted bulk batch size',
+                    previous_batch_size=previous_batch_size,
+                    batch_size=self.batch_size,
+                    latency_seconds=latency_seconds,
+                    throttled=throttled,
+                )
+
+
+def _get_external_version_parameters(version: int | None) -> dict:
+    """Get the parameters of a bulk action that apply an external version, if there is one"""
+    if version is None:
+        return {}
+    return {'version': version, 'version_type': 'external_gte'}
+
+
+def _get_bulk_item_result(item: dict) -> dict:
+    """Get the result of a bulk response item, which is keyed by its action type"""
+    return next(iter(item.values()), {})
@@ -25,6 +25,7 @@ class TstLambdas(TestCase):
                 'LICENSE_UPLOAD_DATE_INDEX_NAME': 'licenseUploadDateGSI',
                 'OPENSEARCH_HOST_ENDPOINT': 'vpc-providersearchd-5bzuqxhpxffk-w6dkpddu.us-east-1.es.amazonaws.com',
                 'EXPORT_RESULTS_BUCKET_NAME': 'test-export-results-bucket',
+                'PRIVILEGE_EXPORT_JOB_LAMBDA_NAME': 'privilege-export-job-function',
                 'JURISDICTIONS': json.dumps(
                     [
                         'al',
@@ -0,0 +1,59 @@
+import boto3
+from moto import mock_aws
+
+from . import TstFunction
+
+
+@mock_aws
+class TestS3MultipartCsvWriter(TstFunction):
+    """Test suite for S3MultipartCsvWriter"""
+
+    def _list_keys(self) -> list[str]:
+        response = boto3.client('s3').list_objects_v2(Bucket='test-export-results-bucket')
+        return [s3_object['Key'] for s3_object in response.get('Contents', [])]
+
+    def test_rows_larger_than_a_part_are_uploaded_in_parts(self):
+        from csv_export_writer import MIN_PART_SIZE_BYTES, S3MultipartCsvWriter
+
+        # Enough rows of about 1 KiB to fill more than one part
+        row_count = 2 * MIN_PART_SIZE_BYTES // 1024 + 100
+        with S3MultipartCsvWriter(
+            bucket_name='test-export-results-bucket', key='export.csv', fieldnames=['id', 'value']
+        ) as writer:
+            for i in range(0, row_count, 1000):
+                writer.write_rows(
+                    [{'id': str(j), 'value': 'x' * 1024, 'ignored': 'y'} for j in range(i, min(i + 1000, row_count))]
+                )
+            writer.complete()
+
+        self.assertEqual(row_count, writer.row_count)
+        # The ETag of an object uploaded in parts ends with the number of parts
+        e_tag = boto3.client('s3').head_object(Bucket='test-export-results-bucket', Key='export.csv')['ETag']
+        self.assertTrue(e_tag.strip('"').endswith('-2'))
+
+        rows = (
+            boto3.client('s3')
+            .get_object(Bucket='test-export-results-bucket', Key='export.csv')['Body']
+            .read()
+            .decode('utf-8')
+            .splitlines()
+        )
+        self.assertEqual(row_count + 1, len(rows))
+        self.assertEqual('id,value', rows[0])
+        self.assertEqual(f'0,{"x" * 1024}', rows[1])
+        self.assertEqual(f'{row_count - 1},{"x" * 1024}', rows[-1])
+
+    def test_upload_is_aborted_if_not_completed(self):
+        from csv_export_writer import S3MultipartCsvWriter
+
+        with self.assertRaises(RuntimeError):
+            with S3MultipartCsvWriter(
+                bucket_name='test-export-results-bucket', key='export.csv', fieldnames=['id']
+            ) as writer:
+                writer.write_rows([{'id': '1'}])
+                raise RuntimeError('Export failed')
+
+        self.assertEqual([], self._list_keys())
+        self.assertEqual(
+            [], boto3.client('s3').list_multipart_uploads(Bucket='test-export-results-bucket').get('Uploads', [])
+        )
@@ -754,3 +754,122 @@ class TestOpenSearchIndexManager(TstFunction):
 
         # Assert that OpenSearchClient was instantiated max attempts times
         self.assertEqual(DOMAIN_READINESS_MAX_ATTEMPTS, mock_opensearch_client.call_count)
+
+
+@mock_aws
+class TestOpenSearchIndexManagerBulkLoad(TstFunction):
+    """Test suite for the blue/green bulk load methods of OpenSearchIndexManager."""
+
+    def _when_testing_mock_opensearch_client(self, alias_indices: dict, document_count: int = 10) -> Mock:
+        """
+        :param alias_indices: The indices each alias points to
+        :param document_count: The document count of every index
+        """
+        mock_client_instance = Mock()
+        mock_client_instance.get_alias_index_names.side_effect = lambda alias_name: alias_indices.get(alias_name, [])
+        mock_client_instance.index_exists.return_value = False
+        mock_client_instance.get_index_settings.side_effect = lambda index_name: {
+            index_name: {
+                'settings': {'index': {'number_of_shards': '2', 'number_of_replicas': '1', 'refresh_interval': '5s'}}
+            }
+        }
+        mock_client_instance.count_documents.return_value = document_count
+        return mock_client_instance
+
+    def _index_manager(self):
+        from handlers.manage_opensearch_indices import OpenSearchIndexManager
+
+        return OpenSearchIndexManager('test')
+
+    def test_start_bulk_load_creates_next_index_version_tuned_for_bulk_loading(self):
+        mock_client_instance = self._when_testing_mock_opensearch_client(
+            {'compact_aslp_providers': ['compact_aslp_providers_v1']}
+        )
+
+        index_name = self._index_manager().start_bulk_load(mock_client_instance, 'aslp')
+
+        self.assertEqual('compact_aslp_providers_v2', index_name)
+        (created_index_name, index_mapping), _ = mock_client_instance.create_index.call_args
+        self.assertEqual('compact_aslp_providers_v2', created_index_name)
+        # The live index's shard count, with no replicas or refreshes while loading, and deletes remembered
+        self.assertEqual(
+            {'number_of_shards': 2, 'number_of_replicas': 0, 'refresh_interval': '-1', 'gc_deletes': '1d'},
+            index_mapping['settings']['index'],
+        )
+        self.assertIn('licenses', index_mapping['mappings']['properties'])
+        mock_client_instance.create_alias.assert_called_once_with(
+            'compact_aslp_providers_v2', 'compact_aslp_providers_reindex'
+        )
+
+    def test_start_bulk_load_skips_versions_that_already_exist(self):
+        mock_client_instance = self._when_testing_mock_opensearch_client(
+            {'compact_aslp_providers': ['compact_aslp_providers_v1']}
+        )
+        mock_client_instance.index_exists.side_effect = lambda index_name: index_name == 'compact_aslp_providers_v2'
+
+        index_name = self._index_manager().start_bulk_load(mock_client_instance, 'aslp')
+
+        self.assertEqual('compact_aslp_providers_v3', index_name)
+
+    def test_start_bulk_load_resumes_load_in_progress(self):
+        mock_client_instance = self._when_testing_mock_opensearch_client(
+            {
+                'compact_aslp_providers': ['compact_aslp_providers_v1'],
+                'compact_aslp_providers_reindex': ['compact_aslp_providers_v2'],
+            }
+        )
+
+        index_name = self._index_manager().start_bulk_load(mock_client_instance, 'aslp')
+
+        self.assertEqual('compact_aslp_providers_v2', index_name)
+        mock_client_instance.create_index.assert_not_called()
+        mock_client_instance.create_alias.assert_not_called()
+
+    def test_finish_bulk_load_restores_settings_and_swaps_alias(self):
+        mock_client_instance = self._when_testing_mock_opensearch_client(
+            {
+                'compact_aslp_providers': ['compact_aslp_providers_v1'],
+                'compact_aslp_providers_reindex': ['compact_aslp_providers_v2'],
+            },
+            document_count=10,
+        )
+
+        index_name = self._index_manager().finish_bulk_load(mock_client_instance, 'aslp', expected_document_count=10)
+
+        self.assertEqual('compact_aslp_providers_v2', index_name)
+        mock_client_instance.update_index_settings.assert_called_once_with(
+            'compact_aslp_providers_v2',
+            {'index': {'number_of_replicas': 1, 'refresh_interval': '5s', 'gc_deletes': None}},
+        )
+        mock_client_instance.refresh_index.assert_called_once_with('compact_aslp_providers_v2')
+        mock_client_instance.force_merge.assert_called_once_with('compact_aslp_providers_v2', max_num_segments=1)
+        # The live alias moves, and the reindex alias is removed, in one atomic update
+        mock_client_instance.update_aliases.assert_called_once_with(
+            [
+                {'remove': {'index': 'compact_aslp_providers_v1', 'alias': 'compact_aslp_providers'}},
+                {'add': {'index': 'compact_aslp_providers_v2', 'alias': 'compact_aslp_providers'}},
+                {'remove': {'index': 'compact_aslp_providers_v2', 'alias': 'compact_aslp_providers_reindex'}},
+            ]
+        )
+
+    def test_finish_bulk_load_does_not_swap_alias_when_document_count_does_not_match(self):
+        from cc_common.exceptions import CCInternalException
+
+        mock_client_instance = self._when_testing_mock_opensearch_client(
+            {
+                'compact_aslp_providers': ['compact_aslp_providers_v1'],
+                'compact_aslp_providers_reindex': ['compact_aslp_providers_v2'],
+            },
+            document_count=8,
+        )
+        index_manager = self._index_manager()
+
+        with self.assertRaises(CCInternalException):
+            index_manager.finish_bulk_load(mock_client_instance, 'aslp', expected_document_count=10)
+        mock_client_instance.update_aliases.assert_not_called()
+
+        # Unless the difference is allowed
+        index_manager.finish_bulk_load(
+            mock_client_instance, 'aslp', expected_document_count=10, max_document_count_difference=2
+        )
+        mock_client_instance.update_aliases.assert_called_once()
@@ -1,4 +1,7 @@
-from unittest.mock import MagicMock, Mock, call, patch
+import json
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from unittest.mock import ANY, MagicMock, Mock, call, patch
 
 from common_test.test_constants import (
     DEFAULT_LICENSE_EXPIRATION_DATE,
@@ -28,6 +31,48 @@ test_provider_id_mapping = {
 }
 
 
+class _VersionedIndex:
+    """
+    An in-memory stand-in for the documents of OpenSearch indices, which applies external_gte versions as OpenSearch
+    does: a document is only indexed or deleted if its version is at least the current one, and deletes are remembered.
+    """
+
+    def __init__(self):
+        # document id -> (version, document, or None if deleted)
+        self.documents: dict[str, tuple[int, dict | None]] = {}
+
+    def get_alias_index_names(self, alias_name: str) -> list[str]:  # noqa: ARG002 unused-argument
+        return []
+
+    def bulk_index(self, index_name: str, documents: list[dict], version: int) -> dict:  # noqa: ARG002 unused-argument
+        items = []
+        for document in documents:
+            document_id = document['providerId']
+            if self._is_newer_than(document_id, version):
+                items.append(
+                    {
+                        'index': {
+                            '_id': document_id,
+                            'status': 409,
+                            'error': {'type': 'version_conflict_engine_exception'},
+                        }
+                    }
+                )
+            else:
+                self.documents[document_id] = (version, document)
+                items.append({'index': {'_id': document_id, 'status': 201}})
+        return {'items': items, 'errors': any('error' in item['index'] for item in items)}
+
+    def bulk_delete(self, index_name: str, document_ids: list[str], version: int) -> set[str]:  # noqa: ARG002 unused-argument
+        for document_id in document_ids:
+            if not self._is_newer_than(document_id, version):
+                self.documents[document_id] = (version, None)
+        return set()
+
+    def _is_newer_than(self, document_id: str, version: int) -> bool:
+        return document_id in self.documents and self.documents[document_id][0] > version
+
+
 @mock_aws
 class TestPopulateProviderDocuments(TstFunction):
     """Test suite for populate provider documents handler."""
@@ -149,6 +194,7 @@ class TestPopulateProviderDocuments(TstFunction):
                     'militaryAffiliations': [],
                 }
             ],
+            version=ANY,
         )
 
     @patch('handlers.populate_provider_documents.OpenSearchClient')
@@ -347,3 +393,249 @@ class TestPopulateProviderDocuments(TstFunction):
         # Verify octp and coun were indexed
         self.assertEqual(2, second_result['total_providers_indexed'])
         self.assertEqual(2, mock_client_instance.bulk_index.call_count)
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_parallel_reindex_indexes_provider_records_from_all_compacts(self, mock_opensearch_client):
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_client_instance = self._when_testing_mock_opensearch_client(mock_opensearch_client)
+
+        for compact in ['aslp', 'octp', 'coun']:
+            self._put_test_provider_and_license_record_in_dynamodb_table(compact)
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        result = populate_provider_documents({'parallel': True, 'totalSegments': 4}, mock_context)
+
+        self.assertTrue(result['completed'])
+        self.assertNotIn('resumeFrom', result)
+        self.assertEqual(3, result['total_providers_processed'])
+        self.assertEqual(3, result['total_providers_indexed'])
+        self.assertEqual(0, result['total_providers_failed'])
+        self.assertEqual([], result['errors'])
+        self.assertEqual(
+            ['aslp', 'octp', 'coun'], [compact_stats['compact'] for compact_stats in result['compacts_processed']]
+        )
+
+        # The documents match those the sequential reindex builds, whichever segment each provider was in
+        self.assertEqual(3, mock_client_instance.bulk_index.call_count)
+        bulk_index_calls = sorted(
+            mock_client_instance.bulk_index.call_args_list, key=lambda bulk_call: bulk_call.kwargs['index_name']
+        )
+        self.assertEqual(
+            sorted(
+                [self._generate_expected_call_for_document(compact) for compact in ['aslp', 'octp', 'coun']],
+                key=lambda bulk_call: bulk_call.kwargs['index_name'],
+            ),
+            bulk_index_calls,
+        )
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_parallel_reindex_resumes_unfinished_segments(self, mock_opensearch_client):
+        from cc_common.exceptions import CCInternalException
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_client_instance = Mock()
+        mock_opensearch_client.return_value = mock_client_instance
+        mock_client_instance.bulk_index.side_effect = CCInternalException('Connection timeout after 5 retries')
+
+        for compact in ['aslp', 'octp', 'coun']:
+            self._put_test_provider_and_license_record_in_dynamodb_table(compact)
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        # A single segment, so that every provider is in the segment that fails
+        result = populate_provider_documents({'parallel': True, 'totalSegments': 1}, mock_context)
+
+        self.assertFalse(result['completed'])
+        self.assertEqual(0, result['total_providers_indexed'])
+        self.assertEqual(1, len(result['errors']))
+        self.assertEqual(0, result['errors'][0]['segment'])
+        self.assertIn('Connection timeout', result['errors'][0]['error'])
+        self.assertEqual(
+            {'parallel': True, 'totalSegments': 1, 'segmentCursors': {'0': None}},
+            result['resumeFrom'],
+        )
+
+        # Resuming from the failed segment's cursor indexes every provider
+        mock_client_instance.bulk_index.side_effect = None
+        mock_client_instance.bulk_index.return_value = {'items': [], 'errors': False}
+
+        second_result = populate_provider_documents(result['resumeFrom'], mock_context)
+
+        self.assertTrue(second_result['completed'])
+        self.assertNotIn('resumeFrom', second_result)
+        self.assertEqual(3, second_result['total_providers_indexed'])
+
+    def _when_testing_blue_green_mock_opensearch_client(self, mock_opensearch_client):
+        mock_client_instance = self._when_testing_mock_opensearch_client(mock_opensearch_client)
+        # The live aliases each point to a first version of their index, and no reindex is in progress
+        alias_indices = {
+            f'compact_{compact}_providers': [f'compact_{compact}_providers_v1'] for compact in ['aslp', 'octp', 'coun']
+        }
+
+        def create_alias(index_name, alias_name):
+            alias_indices[alias_name] = [index_name]
+
+        mock_client_instance.get_alias_index_names.side_effect = lambda alias_name: alias_indices.get(alias_name, [])
+        mock_client_instance.create_alias.side_effect = create_alias
+        mock_client_instance.alias_exists.side_effect = lambda alias_name: alias_name in alias_indices
+        mock_client_instance.index_exists.return_value = False
+        mock_client_instance.get_index_settings.side_effect = lambda index_name: {
+            index_name: {'settings': {'index': {'number_of_shards': '1', 'number_of_replicas': '1'}}}
+        }
+        # Each compact has one provider
+        mock_client_instance.count_documents.return_value = 1
+        return mock_client_instance
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_blue_green_reindex_loads_new_indices_and_swaps_aliases(self, mock_opensearch_client):
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_client_instance = self._when_testing_blue_green_mock_opensearch_client(mock_opensearch_client)
+
+        for compact in ['aslp', 'octp', 'coun']:
+            self._put_test_provider_and_license_record_in_dynamodb_table(compact)
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        result = populate_provider_documents({'blueGreen': True}, mock_context)
+
+        self.assertTrue(result['completed'])
+        self.assertNotIn('resumeFrom', result)
+        self.assertEqual(3, result['total_providers_indexed'])
+        self.assertEqual(
+            {compact: f'compact_{compact}_providers_v2' for compact in ['aslp', 'octp', 'coun']},
+            result['swapped_indices'],
+        )
+        # Documents are written through the reindex aliases, not the live ones
+        self.assertEqual(
+            ['compact_aslp_providers_reindex', 'compact_octp_providers_reindex', 'compact_coun_providers_reindex'],
+            [bulk_call.kwargs['index_name'] for bulk_call in mock_client_instance.bulk_index.call_args_list],
+        )
+        self.assertEqual(3, mock_client_instance.update_aliases.call_count)
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_blue_green_reindex_does_not_swap_alias_when_document_count_does_not_match(self, mock_opensearch_client):
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_client_instance = self._when_testing_blue_green_mock_opensearch_client(mock_opensearch_client)
+        mock_client_instance.count_documents.return_value = 0
+
+        for compact in ['aslp', 'octp', 'coun']:
+            self._put_test_provider_and_license_record_in_dynamodb_table(compact)
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        result = populate_provider_documents({'blueGreen': True}, mock_context)
+
+        self.assertFalse(result['completed'])
+        self.assertEqual({}, result['swapped_indices'])
+        self.assertEqual(['aslp', 'octp', 'coun'], [error['compact'] for error in result['errors']])
+        mock_client_instance.update_aliases.assert_not_called()
+        # Only the swap needs to be retried
+        self.assertEqual({'blueGreen': True, 'loadCompleted': True}, result['resumeFrom'])
+
+    @contextmanager
+    def _when_testing_ingest_during_reindex(self, mock_opensearch_client, change_provider) -> Iterator[_VersionedIndex]:
+        """
+        Set up the reindex and the provider update ingest to write to the same index, and the ingest to process a
+        change to the aslp provider, made by change_provider, just after the reindex reads the provider's records.
+        """
+        import handlers.populate_provider_documents as populate_module
+        from handlers.provider_update_ingest import provider_update_ingest_handler
+
+        index = _VersionedIndex()
+        mock_client_instance = Mock()
+        mock_opensearch_client.return_value = mock_client_instance
+        mock_client_instance.bulk_index.side_effect = index.bulk_index
+
+        def ingest_change_after(generate_document):
+            def generate_document_then_change_provider(*args, **kwargs):
+                document = generate_document(*args, **kwargs)
+                change_provider()
+                stream_record = {
+                    'eventName': 'MODIFY',
+                    'dynamodb': {
+                        'ApproximateCreationDateTime': 1234567890,
+                        'NewImage': {
+                            'compact': {'S': 'aslp'},
+                            'providerId': {'S': MOCK_ASLP_PROVIDER_ID},
+                            'type': {'S': 'provider'},
+                        },
+                        'SequenceNumber': '1',
+                    },
+                }
+                with patch('handlers.provider_update_ingest.opensearch_client', index):
+                    result = provider_update_ingest_handler(
+                        {'Records': [{'messageId': '1', 'body': json.dumps(stream_record)}]}, MagicMock()
+                    )
+                self.assertEqual({'batchItemFailures': []}, result)
+                return document
+
+            return generate_document_then_change_provider
+
+        self._put_test_provider_and_license_record_in_dynamodb_table('aslp')
+        with ExitStack() as stack:
+            for name in ['generate_provider_opensearch_document', 'generate_opensearch_document_from_provider_records']:
+                stack.enter_context(
+                    patch.object(populate_module, name, ingest_change_after(getattr(populate_module, name)))
+                )
+            yield index
+
+    def _update_aslp_provider_family_name(self):
+        self.config.provider_table.update_item(
+            Key={'pk': f'aslp#PROVIDER#{MOCK_ASLP_PROVIDER_ID}', 'sk': 'aslp#PROVIDER'},
+            UpdateExpression='SET familyName = :family_name',
+            ExpressionAttributeValues={':family_name': 'UpdatedFamilyName'},
+        )
+
+    def _delete_aslp_provider(self):
+        pk = f'aslp#PROVIDER#{MOCK_ASLP_PROVIDER_ID}'
+        for record in self.config.provider_table.query(
+            KeyConditionExpression='pk = :pk', ExpressionAttributeValues={':pk': pk}
+        )['Items']:
+            self.config.provider_table.delete_item(Key={'pk': record['pk'], 'sk': record['sk']})
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_reindex_does_not_overwrite_newer_document_indexed_by_ingest(self, mock_opensearch_client):
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        for event in [{}, {'parallel': True, 'totalSegments': 2}]:
+            with (
+                self.subTest(event=event),
+                self._when_testing_ingest_during_reindex(
+                    mock_opensearch_client, self._update_aslp_provider_family_name
+                ) as index,
+            ):
+                result = populate_provider_documents(event, mock_context)
+
+                # The reindex read the provider before the change, so its document is stale and is not written
+                self.assertTrue(result['completed'])
+                self.assertEqual(0, result['total_providers_failed'])
+                self.assertEqual('UpdatedFamilyName', index.documents[MOCK_ASLP_PROVIDER_ID][1]['familyName'])
+
+    @patch('handlers.populate_provider_documents.OpenSearchClient')
+    def test_reindex_does_not_restore_provider_deleted_by_ingest(self, mock_opensearch_client):
+        from handlers.populate_provider_documents import TIME_THRESHOLD_MS, populate_provider_documents
+
+        mock_context = MagicMock()
+        mock_context.get_remaining_time_in_millis.return_value = TIME_THRESHOLD_MS + 60000
+
+        for event in [{}, {'parallel': True, 'totalSegments': 2}]:
+            with (
+                self.subTest(event=event),
+                self._when_testing_ingest_during_reindex(mock_opensearch_client, self._delete_aslp_provider) as index,
+            ):
+                result = populate_provider_documents(event, mock_context)
+
+                self.assertTrue(result['completed'])
+                self.assertEqual(0, result['total_providers_failed'])
+                self.assertIsNone(index.documents[MOCK_ASLP_PROVIDER_ID][1])
@@ -847,3 +847,114 @@ class TestProviderUpdateIngest(TstFunction):
 
         # Verify no batch item failures (privilege count records are skipped, not failed)
         self.assertEqual({'batchItemFailures': []}, result)
+
+    @patch('handlers.provider_update_ingest.opensearch_client')
+    def test_failures_are_mapped_to_their_messages_when_building_documents_concurrently(self, mock_opensearch_client):
+        """Test that only the messages of the compact that failed to index are returned as batch item failures."""
+        from cc_common.exceptions import CCInternalException
+        from handlers.provider_update_ingest import provider_update_ingest_handler
+
+        def bulk_index(index_name, documents, version):  # noqa: ARG001 unused-argument
+            if index_name == 'compact_octp_providers':
+                raise CCInternalException('Connection timeout after 5 retries')
+            return {'items': [], 'errors': False}
+
+        mock_opensearch_client.bulk_index.side_effect = bulk_index
+
+        records = []
+        provider_ids_by_compact = {'aslp': [], 'octp': []}
+        for i in range(10):
+            for compact_number, (compact, provider_ids) in enumerate(provider_ids_by_compact.items()):
+                provider_id = f'00000000-0000-0000-{compact_number:04d}-{i:012d}'
+                provider_ids.append(provider_id)
+                self._put_test_provider_and_license_record_in_dynamodb_table(compact, provider_id=provider_id)
+                records.append(
+                    {
+                        'messageId': f'{compact}-{i}',
+                        'body': json.dumps(
+                            self._create_dynamodb_stream_record(
+                                compact=compact, provider_id=provider_id, sequence_number=f'{compact}-{i}'
+                            )
+                        ),
+                    }
+                )
+
+        result = provider_update_ingest_handler({'Records': records}, MagicMock())
+
+        self.assertEqual(
+            sorted(f'octp-{i}' for i in range(10)),
+            sorted(failure['itemIdentifier'] for failure in result['batchItemFailures']),
+        )
+        aslp_calls = [
+            c
+            for c in mock_opensearch_client.bulk_index.call_args_list
+            if c.kwargs['index_name'] == 'compact_aslp_providers'
+        ]
+        self.assertEqual(1, len(aslp_calls))
+        self.assertEqual(
+            sorted(provider_ids_by_compact['aslp']),
+            sorted(document['providerId'] for document in aslp_calls[0].kwargs['documents']),
+        )
+
+    @patch('handlers.provider_update_ingest.metrics')
+    @patch('handlers.provider_update_ingest.opensearch_client')
+    def test_index_lag_is_reported(self, mock_opensearch_client, mock_metrics):
+        """Test that the lag from the provider table write to indexing is reported as a metric."""
+        import time
+
+        from aws_lambda_powertools.metrics import MetricUnit
+        from handlers.provider_update_ingest import provider_update_ingest_handler
+
+        self._when_testing_mock_opensearch_client(mock_opensearch_client)
+        self._put_test_provider_and_license_record_in_dynamodb_table('aslp')
+
+        stream_record = self._create_dynamodb_stream_record(
+            compact='aslp', provider_id=MOCK_ASLP_PROVIDER_ID, sequence_number='some-sequence-number-1'
+        )
+        stream_record['dynamodb']['ApproximateCreationDateTime'] = int(time.time()) - 5
+
+        provider_update_ingest_handler(
+            {'Records': [{'messageId': '12345', 'body': json.dumps(stream_record)}]}, MagicMock()
+        )
+
+        mock_metrics.add_metric.assert_called_once()
+        kwargs = mock_metrics.add_metric.call_args.kwargs
+        self.assertEqual('search-index-lag', kwargs['name'])
+        self.assertEqual(MetricUnit.Seconds, kwargs['unit'])
+        self.assertTrue(5 <= kwargs['value'] < 60)
+
+    @patch('handlers.provider_update_ingest.opensearch_client')
+    def test_documents_are_also_written_to_index_being_bulk_loaded(self, mock_opensearch_client):
+        """Test that changes made during a blue/green reindex are written to the new index, as well as the live one."""
+        from handlers.provider_update_ingest import provider_update_ingest_handler
+
+        self._when_testing_mock_opensearch_client(mock_opensearch_client)
+        mock_opensearch_client.get_alias_index_names.return_value = ['compact_aslp_providers_v2']
+
+        self._put_test_provider_and_license_record_in_dynamodb_table('aslp')
+
+        event = {
+            'Records': [
+                {
+                    'messageId': '12345',
+                    'body': json.dumps(
+                        self._create_dynamodb_stream_record(
+                            compact='aslp',
+                            provider_id=MOCK_ASLP_PROVIDER_ID,
+                            sequence_number='some-sequence-number',
+                        )
+                    ),
+                }
+            ]
+        }
+
+        result = provider_update_ingest_handler(event, MagicMock())
+
+        mock_opensearch_client.get_alias_index_names.assert_called_once_with('compact_aslp_providers_reindex')
+        self.assertEqual(
+            ['compact_aslp_providers', 'compact_aslp_providers_v2'],
+            [bulk_call.kwargs['index_name'] for bulk_call in mock_opensearch_client.bulk_index.call_args_list],
+        )
+        for bulk_call in mock_opensearch_client.bulk_index.call_args_list:
+            self.assertEqual([self._generate_expected_document('aslp')], bulk_call.kwargs['documents'])
+        self.assertEqual({'batchItemFailures': []}, result)
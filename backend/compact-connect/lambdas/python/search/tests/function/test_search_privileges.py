@@ -1,6 +1,7 @@
 import json
-from unittest.mock import patch
+from unittest.mock import ANY, MagicMock, patch
 
+from aws_lambda_powertools.utilities.typing import LambdaContext
 from moto import mock_aws
 
 from . import TstFunction
@@ -900,3 +901,265 @@ class TestExportPrivileges(TstFunction):
         body = json.loads(response['body'])
         self.assertIn('terms', body['message'])
         mock_opensearch_client.search.assert_not_called()
+
+    def _create_get_export_job_event(self, compact: str, job_id: str) -> dict:
+        """Create a standard API Gateway event for getting a privilege export job."""
+        event = self._create_api_event(compact, resource_override='/v1/compacts/{compact}/privileges/export/{jobId}')
+        event['httpMethod'] = 'GET'
+        event['path'] = f'/v1/compacts/{compact}/privileges/export/{job_id}'
+        event['pathParameters']['jobId'] = job_id
+        event['requestContext']['resourcePath'] = '/v1/compacts/{compact}/privileges/export/{jobId}'
+        event['requestContext']['httpMethod'] = 'GET'
+        return event
+
+    def _get_exported_csv_rows(self, key_prefix: str) -> list[str]:
+        import boto3
+
+        s3_client = boto3.client('s3')
+        response = s3_client.list_objects_v2(Bucket='test-export-results-bucket', Prefix=key_prefix)
+        keys = [s3_object['Key'] for s3_object in response.get('Contents', []) if s3_object['Key'].endswith('.csv')]
+        self.assertEqual(1, len(keys))
+        csv_obj = s3_client.get_object(Bucket='test-export-results-bucket', Key=keys[0])
+        return csv_obj['Body'].read().decode('utf-8').splitlines()
+
+    @patch('handlers.search.EXPORT_PAGE_SIZE', 1)
+    @patch('handlers.search.opensearch_client')
+    def test_privilege_export_pages_through_point_in_time(self, mock_opensearch_client):
+        """Test that the export pages through every result with search_after, over a point in time of the index."""
+        from handlers.search import search_api_handler
+
+        provider_ids = [f'00000000-0000-0000-0000-00000000000{i}' for i in range(1, 4)]
+        mock_opensearch_client.create_point_in_time.return_value = 'pit-1'
+        # OpenSearch can return an updated PIT id with any search
+        mock_opensearch_client.search.side_effect = [
+            {
+                'pit_id': f'pit-{page_number + 1}',
+                'hits': {
+                    'total': {'value': 3, 'relation': 'eq'},
+                    'hits': [
+                        self._create_mock_provider_hit_with_privileges(
+                            provider_id=provider_id, sort_values=[provider_id]
+                        )
+                    ],
+                },
+            }
+            for page_number, provider_id in enumerate(provider_ids)
+        ] + [{'pit_id': 'pit-4', 'hits': {'total': {'value': 3, 'relation': 'eq'}, 'hits': []}}]
+
+        event = self._create_api_event('aslp', body={'query': {'match_all': {}}})
+
+        response = search_api_handler(event, self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        mock_opensearch_client.create_point_in_time.assert_called_once_with(
+            index_name='compact_aslp_providers', keep_alive='2m'
+        )
+        search_bodies = [search_call.kwargs['body'] for search_call in mock_opensearch_client.search.call_args_list]
+        self.assertEqual(4, len(search_bodies))
+        for search_call in mock_opensearch_client.search.call_args_list:
+            # The PIT is searched in place of the index
+            self.assertIsNone(search_call.kwargs['index_name'])
+        self.assertEqual(
+            {
+                'query': {'match_all': {}},
+                'size': 1,
+                'pit': {'id': 'pit-1', 'keep_alive': '2m'},
+                'sort': [{'providerId': 'asc'}],
+            },
+            search_bodies[0],
+        )
+        self.assertEqual(
+            [(f'pit-{page_number + 1}', [provider_id]) for page_number, provider_id in enumerate(provider_ids)],
+            [(body['pit']['id'], body['search_after']) for body in search_bodies[1:]],
+        )
+        # The PIT is released as soon as the export is done with it
+        mock_opensearch_client.delete_point_in_time.assert_called_once_with('pit-4')
+
+        csv_rows = self._get_exported_csv_rows('compact/aslp/privilegeSearch/caller/test-user-id')
+        # A header row, then one row for the privilege of each provider
+        self.assertEqual(4, len(csv_rows))
+        for provider_id, csv_row in zip(provider_ids, csv_rows[1:], strict=True):
+            self.assertIn(provider_id, csv_row)
+
+    @patch('handlers.search.opensearch_client')
+    def test_privilege_export_with_too_many_matches_returns_400(self, mock_opensearch_client):
+        """Test that an export too large to complete within the API timeout is rejected, without leaving a file."""
+        from handlers.search import search_api_handler
+
+        search_response = {
+            'hits': {
+                'total': {'value': 10000, 'relation': 'gte'},
+                'hits': [self._create_mock_provider_hit_with_privileges(sort_values=['sort'])],
+            }
+        }
+        self._when_testing_mock_opensearch_client(mock_opensearch_client, search_response=search_response)
+
+        event = self._create_api_event('aslp', body={'query': {'match_all': {}}})
+
+        response = search_api_handler(event, self.mock_context)
+
+        self.assertEqual(400, response['statusCode'])
+        self.assertEqual(
+            {'message': 'Search scope too broad. Please narrow your search.'}, json.loads(response['body'])
+        )
+        mock_opensearch_client.search.assert_called_once()
+        mock_opensearch_client.delete_point_in_time.assert_called_once()
+
+        import boto3
+
+        s3_client = boto3.client('s3')
+        self.assertEqual(0, s3_client.list_objects_v2(Bucket='test-export-results-bucket').get('KeyCount', 0))
+        self.assertEqual([], s3_client.list_multipart_uploads(Bucket='test-export-results-bucket').get('Uploads', []))
+
+    @patch('cc_common.config._Config.lambda_client')
+    @patch('handlers.search.opensearch_client')
+    def test_async_privilege_export_starts_job(self, mock_opensearch_client, mock_lambda_client):
+        """Test that an async export starts a job, rather than searching, and returns its id."""
+        from handlers.search import search_api_handler
+
+        request_body = {'query': {'match_all': {}}, 'async': True}
+        event = self._create_api_event('aslp', body=request_body)
+
+        response = search_api_handler(event, self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        body = json.loads(response['body'])
+        self.assertEqual({'jobId': ANY, 'status': 'inProgress'}, body)
+        mock_opensearch_client.search.assert_not_called()
+
+        mock_lambda_client.invoke.assert_called_once()
+        invoke_kwargs = mock_lambda_client.invoke.call_args.kwargs
+        self.assertEqual('privilege-export-job-function', invoke_kwargs['FunctionName'])
+        self.assertEqual('Event', invoke_kwargs['InvocationType'])
+        self.assertEqual(
+            {
+                'compact': 'aslp',
+                'callerUserId': 'test-user-id',
+                'jobId': body['jobId'],
+                'body': json.dumps(request_body),
+            },
+            json.loads(invoke_kwargs['Payload']),
+        )
+
+        # The job can be fetched while it is in progress
+        response = search_api_handler(self._create_get_export_job_event('aslp', body['jobId']), self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        self.assertEqual({'jobId': body['jobId'], 'status': 'inProgress'}, json.loads(response['body']))
+
+    @patch('cc_common.config._Config.lambda_client')
+    @patch('handlers.search.opensearch_client')
+    def test_privilege_export_job_exports_without_match_limit(self, mock_opensearch_client, mock_lambda_client):
+        """Test that a job exports every match, however many, and its file can then be fetched."""
+        from handlers.search import export_privileges_job_handler, search_api_handler
+
+        event = self._create_api_event('aslp', body={'query': {'match_all': {}}, 'async': True})
+        job_id = json.loads(search_api_handler(event, self.mock_context)['body'])['jobId']
+        job_event = json.loads(mock_lambda_client.invoke.call_args.kwargs['Payload'])
+
+        # More matches than a synchronous export allows
+        mock_opensearch_client.search_with_retry.return_value = {
+            'hits': {
+                'total': {'value': 10000, 'relation': 'gte'},
+                'hits': [self._create_mock_provider_hit_with_privileges(sort_values=['sort'])],
+            }
+        }
+
+        result = export_privileges_job_handler(job_event, self.mock_context)
+
+        self.assertEqual({'status': 'complete', 'privilegeCount': 1}, result)
+        # Background jobs retry transient search failures
+        mock_opensearch_client.search_with_retry.assert_called_once()
+        mock_opensearch_client.search.assert_not_called()
+        csv_rows = self._get_exported_csv_rows(f'compact/aslp/privilegeSearch/caller/test-user-id/job/{job_id}')
+        self.assertEqual(2, len(csv_rows))
+        self.assertIn('PRIV-001', csv_rows[1])
+
+        response = search_api_handler(self._create_get_export_job_event('aslp', job_id), self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        body = json.loads(response['body'])
+        self.assertEqual({'jobId': job_id, 'status': 'complete', 'privilegeCount': 1, 'fileUrl': ANY}, body)
+        self.assertIn(f'job/{job_id}/export.csv', body['fileUrl'])
+
+    @patch('cc_common.config._Config.lambda_client')
+    @patch('handlers.search.opensearch_client')
+    def test_privilege_export_job_without_matches_fails(self, mock_opensearch_client, mock_lambda_client):
+        """Test that a job that matches no privileges is recorded as failed, with the reason."""
+        from handlers.search import export_privileges_job_handler, search_api_handler
+
+        event = self._create_api_event('aslp', body={'query': {'match_all': {}}, 'async': True})
+        job_id = json.loads(search_api_handler(event, self.mock_context)['body'])['jobId']
+        job_event = json.loads(mock_lambda_client.invoke.call_args.kwargs['Payload'])
+        mock_opensearch_client.search_with_retry.return_value = {
+            'hits': {'total': {'value': 0, 'relation': 'eq'}, 'hits': []}
+        }
+
+        export_privileges_job_handler(job_event, self.mock_context)
+
+        response = search_api_handler(self._create_get_export_job_event('aslp', job_id), self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        self.assertEqual(
+            {
+                'jobId': job_id,
+                'status': 'failed',
+                'message': 'The search parameters did not match any privileges.',
+            },
+            json.loads(response['body']),
+        )
+
+    @patch('handlers.search.EXPORT_PAGE_SIZE', 1)
+    @patch('cc_common.config._Config.lambda_client')
+    @patch('handlers.search.opensearch_client')
+    def test_privilege_export_job_stops_before_lambda_times_out(self, mock_opensearch_client, mock_lambda_client):
+        """Test that a job running out of time aborts its upload and is recorded as failed, rather than left running."""
+        from handlers.search import EXPORT_JOB_TIME_THRESHOLD_MS, export_privileges_job_handler, search_api_handler
+
+        event = self._create_api_event('aslp', body={'query': {'match_all': {}}, 'async': True})
+        job_id = json.loads(search_api_handler(event, self.mock_context)['body'])['jobId']
+        job_event = json.loads(mock_lambda_client.invoke.call_args.kwargs['Payload'])
+        # Every page is full, so there is always another page to fetch
+        mock_opensearch_client.search_with_retry.return_value = {
+            'hits': {
+                'total': {'value': 10000, 'relation': 'gte'},
+                'hits': [self._create_mock_provider_hit_with_privileges(sort_values=['sort'])],
+            }
+        }
+        mock_context = MagicMock(spec=LambdaContext)
+        mock_context.get_remaining_time_in_millis.return_value = EXPORT_JOB_TIME_THRESHOLD_MS - 1
+
+        result = export_privileges_job_handler(job_event, mock_context)
+
+        expected_status = {
+            'status': 'failed',
+            'message': 'The export could not be completed in time. Please narrow your search.',
+        }
+        self.assertEqual(expected_status, result)
+        mock_opensearch_client.search_with_retry.assert_called_once()
+        mock_opensearch_client.delete_point_in_time.assert_called_once()
+
+        import boto3
+
+        s3_client = boto3.client('s3')
+        self.assertEqual([], s3_client.list_multipart_uploads(Bucket='test-export-results-bucket').get('Uploads', []))
+        response = s3_client.list_objects_v2(
+            Bucket='test-export-results-bucket', Prefix=f'compact/aslp/privilegeSearch/caller/test-user-id/job/{job_id}'
+        )
+        self.assertEqual(['status.json'], [s3_object['Key'].rsplit('/', 1)[-1] for s3_object in response['Contents']])
+
+        response = search_api_handler(self._create_get_export_job_event('aslp', job_id), self.mock_context)
+
+        self.assertEqual(200, response['statusCode'])
+        self.assertEqual({'jobId': job_id, **expected_status}, json.loads(response['body']))
+
+    def test_get_unknown_export_job_returns_404(self):
+        """Test that a job that does not exist, or was started by another user, is not found."""
+        from handlers.search import search_api_handler
+
+        for job_id in ['00000000-0000-0000-0000-000000000000', '../../other-user-id']:
+            with self.subTest(job_id=job_id):
+                response = search_api_handler(self._create_get_export_job_event('aslp', job_id), self.mock_context)
+
+                self.assertEqual(404, response['statusCode'])
+                self.assertEqual({'message': 'Export job not found'}, json.loads(response['body']))
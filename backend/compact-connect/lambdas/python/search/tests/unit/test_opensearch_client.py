@@ -1,8 +1,13 @@
 # ruff: noqa ARG002 unused-argument
+import json
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from opensearchpy.exceptions import ConnectionTimeout, RequestError, TransportError
+from opensearchpy.exceptions import ConnectionTimeout, NotFoundError, RequestError, TransportError
+
+
+def _ndjson(*lines: dict) -> bytes:
+    return ''.join(f'{json.dumps(line, separators=(",", ":"))}\n' for line in lines).encode('utf-8')
 
 
 class TestOpenSearchClient(TestCase):
@@ -120,6 +125,102 @@ class TestOpenSearchClient(TestCase):
 
         mock_internal_client.indices.put_settings.assert_called_once_with(index=index_name, body=settings)
 
+    def test_get_alias_index_names_returns_indices_the_alias_points_to(self):
+        """Test that get_alias_index_names returns the index names from the internal client's indices.get_alias."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        mock_internal_client.indices.get_alias.return_value = {
+            'test_index_v1': {'aliases': {'test_alias': {}}},
+        }
+
+        result = client.get_alias_index_names(alias_name='test_alias')
+
+        mock_internal_client.indices.get_alias.assert_called_once_with(index='test_alias')
+        self.assertEqual(['test_index_v1'], result)
+
+    def test_get_alias_index_names_returns_empty_list_when_alias_does_not_exist(self):
+        """Test that get_alias_index_names does not retry when the alias does not exist."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        mock_internal_client.indices.get_alias.side_effect = NotFoundError(404, 'alias missing', {})
+
+        result = client.get_alias_index_names(alias_name='test_alias')
+
+        mock_internal_client.indices.get_alias.assert_called_once_with(index='test_alias')
+        self.assertEqual([], result)
+
+    def test_update_aliases_calls_internal_client_with_expected_arguments(self):
+        """Test that update_aliases sends every action in a single indices.update_aliases call."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        actions = [
+            {'remove': {'index': 'test_index_v1', 'alias': 'test_alias'}},
+            {'add': {'index': 'test_index_v2', 'alias': 'test_alias'}},
+        ]
+
+        client.update_aliases(actions=actions)
+
+        mock_internal_client.indices.update_aliases.assert_called_once_with(body={'actions': actions})
+
+    def test_refresh_index_calls_internal_client_with_expected_arguments(self):
+        """Test that refresh_index calls the internal client's indices.refresh method correctly."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        client.refresh_index(index_name='test_index')
+
+        mock_internal_client.indices.refresh.assert_called_once_with(index='test_index')
+
+    def test_force_merge_calls_internal_client_with_expected_arguments(self):
+        """Test that force_merge waits for the merge, with a longer request timeout."""
+        from opensearch_client import FORCE_MERGE_TIMEOUT
+
+        client, mock_internal_client = self._create_client_with_mock()
+
+        client.force_merge(index_name='test_index', max_num_segments=1)
+
+        mock_internal_client.indices.forcemerge.assert_called_once_with(
+            index='test_index', max_num_segments=1, request_timeout=FORCE_MERGE_TIMEOUT
+        )
+
+    def test_count_documents_returns_count(self):
+        """Test that count_documents returns the count from the internal client's count method."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        mock_internal_client.count.return_value = {'count': 42, '_shards': {}}
+
+        result = client.count_documents(index_name='test_index')
+
+        mock_internal_client.count.assert_called_once_with(index='test_index')
+        self.assertEqual(42, result)
+
+    def test_create_point_in_time_returns_pit_id(self):
+        """Test that create_point_in_time returns the PIT id from the internal client's create_pit method."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        mock_internal_client.create_pit.return_value = {'pit_id': 'test-pit-id', 'creation_time': 1}
+
+        result = client.create_point_in_time(index_name='test_index', keep_alive='2m')
+
+        mock_internal_client.create_pit.assert_called_once_with(index='test_index', params={'keep_alive': '2m'})
+        self.assertEqual('test-pit-id', result)
+
+    def test_delete_point_in_time_calls_internal_client_with_expected_arguments(self):
+        """Test that delete_point_in_time calls the internal client's delete_pit method correctly."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        client.delete_point_in_time(pit_id='test-pit-id')
+
+        mock_internal_client.delete_pit.assert_called_once_with(body={'pit_id': ['test-pit-id']})
+
+    def test_search_without_index_name_searches_point_in_time(self):
+        """Test that search without an index name leaves the point in time in the body to select the index."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        body = {'query': {'match_all': {}}, 'pit': {'id': 'test-pit-id', 'keep_alive': '2m'}}
+        client.search(index_name=None, body=body)
+
+        mock_internal_client.search.assert_called_once_with(index=None, body=body)
+
     def test_search_calls_internal_client_with_expected_arguments(self):
         """Test that search calls the internal client's search method correctly."""
         client, mock_internal_client = self._create_client_with_mock()
@@ -255,13 +356,13 @@ class TestOpenSearchClient(TestCase):
 
         result = client.bulk_index(index_name=index_name, documents=documents)
 
-        expected_actions = [
+        expected_body = _ndjson(
             {'index': {'_id': 'provider-1'}},
             {'providerId': 'provider-1', 'givenName': 'John', 'familyName': 'Doe'},
             {'index': {'_id': 'provider-2'}},
             {'providerId': 'provider-2', 'givenName': 'Jane', 'familyName': 'Smith'},
-        ]
-        mock_internal_client.bulk.assert_called_once_with(body=expected_actions, index=index_name)
+        )
+        mock_internal_client.bulk.assert_called_once_with(body=expected_body, index=index_name)
         self.assertEqual(expected_response, result)
 
     def test_bulk_index_uses_custom_id_field(self):
@@ -277,13 +378,59 @@ class TestOpenSearchClient(TestCase):
 
         client.bulk_index(index_name=index_name, documents=documents, id_field='customId')
 
-        expected_actions = [
+        expected_body = _ndjson(
             {'index': {'_id': 'custom-1'}},
             {'customId': 'custom-1', 'name': 'Document 1'},
             {'index': {'_id': 'custom-2'}},
             {'customId': 'custom-2', 'name': 'Document 2'},
-        ]
-        mock_internal_client.bulk.assert_called_once_with(body=expected_actions, index=index_name)
+        )
+        mock_internal_client.bulk.assert_called_once_with(body=expected_body, index=index_name)
+
+    def test_bulk_index_with_version_uses_external_gte_versioning(self):
+        """Test that bulk_index writes every document with the given external version."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        documents = [{'providerId': 'provider-1'}, {'providerId': 'provider-2'}]
+        mock_internal_client.bulk.return_value = {'errors': False, 'items': []}
+
+        client.bulk_index(index_name='test_index', documents=documents, version=1700000000000000)
+
+        expected_body = _ndjson(
+            {'index': {'_id': 'provider-1', 'version': 1700000000000000, 'version_type': 'external_gte'}},
+            {'providerId': 'provider-1'},
+            {'index': {'_id': 'provider-2', 'version': 1700000000000000, 'version_type': 'external_gte'}},
+            {'providerId': 'provider-2'},
+        )
+        mock_internal_client.bulk.assert_called_once_with(body=expected_body, index='test_index')
+
+    def test_bulk_delete_with_version_ignores_version_conflicts(self):
+        """Test that bulk_delete uses the given external version, and documents indexed since are not failures."""
+        client, mock_internal_client = self._create_client_with_mock()
+
+        mock_internal_client.bulk.return_value = {
+            'errors': True,
+            'items': [
+                {
+                    'delete': {
+                        '_id': 'provider-1',
+                        'status': 409,
+                        'error': {'type': 'version_conflict_engine_exception'},
+                    }
+                },
+                {'delete': {'_id': 'provider-2', 'status': 400, 'error': {'type': 'illegal_argument_exception'}}},
+            ],
+        }
+
+        result = client.bulk_delete(
+            index_name='test_index', document_ids=['provider-1', 'provider-2'], version=1700000000000000
+        )
+
+        self.assertEqual({'provider-2'}, result)
+        expected_body = _ndjson(
+            {'delete': {'_id': 'provider-1', 'version': 1700000000000000, 'version_type': 'external_gte'}},
+            {'delete': {'_id': 'provider-2', 'version': 1700000000000000, 'version_type': 'external_gte'}},
+        )
+        mock_internal_client.bulk.assert_called_once_with(body=expected_body, index='test_index')
 
     def test_bulk_index_returns_early_for_empty_documents(self):
         """Test that bulk_index returns early without calling the internal client for empty documents."""
@@ -396,6 +543,161 @@ class TestOpenSearchClient(TestCase):
             self.assertLessEqual(sleep_value, MAX_BACKOFF_SECONDS)
 
 
+class TestBulkWriter(TestCase):
+    """Test suite for BulkWriter"""
+
+    def setUp(self):
+        self.mock_internal_client = MagicMock()
+
+    def _create_writer(self, **kwargs):
+        from opensearch_client import BulkWriter
+
+        return BulkWriter(self.mock_internal_client, **kwargs)
+
+    @staticmethod
+    def _index_operations(count: int) -> list[tuple[dict, dict]]:
+        return [({'index': {'_id': f'provider-{i}'}}, {'providerId': f'provider-{i}'}) for i in range(count)]
+
+    @staticmethod
+    def _response_for(body: bytes, status: int = 201) -> dict:
+        """Build a bulk response with the given status for every action in a request body"""
+        actions = [json.loads(line) for line in body.decode('utf-8').splitlines()][::2]
+        items = [{'index': {'_id': action['index']['_id'], 'status': status}} for action in actions]
+        if status >= 300:
+            for item in items:
+                item['index']['error'] = {'type': 'mapper_parsing_exception'}
+        return {'errors': status >= 300, 'items': items}
+
+    def _sent_ids(self) -> list[list[str]]:
+        return [
+            [json.loads(line)['index']['_id'] for line in call.kwargs['body'].decode('utf-8').splitlines()[::2]]
+            for call in self.mock_internal_client.bulk.call_args_list
+        ]
+
+    def test_write_splits_requests_by_size(self):
+        operations = self._index_operations(5)
+        operation_bytes = len(_ndjson(*operations[0]))
+        self.mock_internal_client.bulk.side_effect = lambda body, index: self._response_for(body)
+        writer = self._create_writer(max_request_bytes=2 * operation_bytes)
+
+        result = writer.write(index_name='test_index', operations=operations, operation_type='index')
+
+        self.assertEqual(
+            [['provider-0', 'provider-1'], ['provider-2', 'provider-3'], ['provider-4']],
+            self._sent_ids(),
+        )
+        self.assertFalse(result['errors'])
+        self.assertEqual([f'provider-{i}' for i in range(5)], [item['index']['_id'] for item in result['items']])
+
+    @patch('opensearch_client.time.sleep')
+    def test_write_retries_only_rejected_items(self, mock_sleep):
+        from opensearch_client import INITIAL_BACKOFF_SECONDS
+
+        def bulk(body, index):  # noqa: ARG001 unused-argument
+            response = self._response_for(body)
+            # Reject the second item of the first request
+            if self.mock_internal_client.bulk.call_count == 1:
+                response['errors'] = True
+                response['items'][1]['index'].update(status=429, error={'type': 'es_rejected_execution_exception'})
+            return response
+
+        self.mock_internal_client.bulk.side_effect = bulk
+        writer = self._create_writer()
+
+        result = writer.write(index_name='test_index', operations=self._index_operations(3), operation_type='index')
+
+        self.assertEqual([['provider-0', 'provider-1', 'provider-2'], ['provider-1']], self._sent_ids())
+        mock_sleep.assert_called_once_with(INITIAL_BACKOFF_SECONDS)
+        self.assertFalse(result['errors'])
+        self.assertEqual(
+            [('provider-0', 201), ('provider-1', 201), ('provider-2', 201)],
+            [(item['index']['_id'], item['index']['status']) for item in result['items']],
+        )
+
+    @patch('opensearch_client.time.sleep')
+    def test_write_does_not_retry_item_errors(self, mock_sleep):
+        self.mock_internal_client.bulk.side_effect = lambda body, index: self._response_for(body, status=400)
+        writer = self._create_writer()
+
+        result = writer.write(index_name='test_index', operations=self._index_operations(2), operation_type='index')
+
+        self.assertEqual(1, self.mock_internal_client.bulk.call_count)
+        mock_sleep.assert_not_called()
+        self.assertTrue(result['errors'])
+
+    def test_write_splits_request_rejected_as_too_large(self):
+        def bulk(body, index):  # noqa: ARG001 unused-argument
+            if body.count(b'\n') > 2:
+                raise TransportError(413, 'Request Entity Too Large', {})
+            return self._response_for(body)
+
+        self.mock_internal_client.bulk.side_effect = bulk
+        writer = self._create_writer()
+
+        result = writer.write(index_name='test_index', operations=self._index_operations(3), operation_type='index')
+
+        self.assertEqual(
+            [
+                ['provider-0', 'provider-1', 'provider-2'],
+                ['provider-0'],
+                ['provider-1', 'provider-2'],
+                ['provider-1'],
+                ['provider-2'],
+            ],
+            self._sent_ids(),
+        )
+        self.assertFalse(result['errors'])
+        self.assertEqual(3, len(result['items']))
+
+    def test_write_fails_single_operation_rejected_as_too_large(self):
+        self.mock_internal_client.bulk.side_effect = TransportError(413, 'Request Entity Too Large', {})
+        writer = self._create_writer()
+
+        result = writer.write(index_name='test_index', operations=self._index_operations(1), operation_type='index')
+
+        self.assertEqual(1, self.mock_internal_client.bulk.call_count)
+        self.assertTrue(result['errors'])
+        self.assertEqual(413, result['items'][0]['index']['status'])
+        self.assertEqual('provider-0', result['items'][0]['index']['_id'])
+
+    @patch('opensearch_client.time.monotonic')
+    def test_batch_size_grows_while_the_cluster_is_fast(self, mock_monotonic):
+        # Each request takes 0.1 seconds
+        mock_monotonic.side_effect = [0.0, 0.1] * 3
+        self.mock_internal_client.bulk.side_effect = lambda body, index: self._response_for(body)
+        writer = self._create_writer(initial_batch_size=10, target_latency_seconds=2.0)
+
+        writer.write(index_name='test_index', operations=self._index_operations(32), operation_type='index')
+
+        # The last batch was not full, so it says nothing about whether the cluster could take a larger one
+        self.assertEqual([10, 11, 11], [len(ids) for ids in self._sent_ids()])
+        self.assertEqual(12, writer.batch_size)
+
+    @patch('opensearch_client.time.monotonic')
+    def test_batch_size_shrinks_when_the_cluster_is_slow(self, mock_monotonic):
+        # Each request takes 5 seconds
+        mock_monotonic.side_effect = [0.0, 5.0] * 3
+        self.mock_internal_client.bulk.side_effect = lambda body, index: self._response_for(body)
+        writer = self._create_writer(initial_batch_size=40, min_batch_size=10, target_latency_seconds=2.0)
+
+        writer.write(index_name='test_index', operations=self._index_operations(70), operation_type='index')
+
+        self.assertEqual([40, 20, 10], [len(ids) for ids in self._sent_ids()])
+        self.assertEqual(10, writer.batch_size)
+
+    @patch('opensearch_client.time.sleep')
+    def test_batch_size_shrinks_when_items_are_rejected(self, mock_sleep):  # noqa: ARG002 unused-argument
+        self.mock_internal_client.bulk.side_effect = [
+            {'errors': True, 'items': [{'index': {'_id': 'provider-0', 'status': 429}}]},
+            {'errors': False, 'items': [{'index': {'_id': 'provider-0', 'status': 201}}]},
+        ]
+        writer = self._create_writer(initial_batch_size=100)
+
+        writer.write(index_name='test_index', operations=self._index_operations(1), operation_type='index')
+
+        self.assertEqual(50, writer.batch_size)
+
+
 class TestOpenSearchClientIndexManagementRetry(TestCase):
     """Test suite for OpenSearchClient index management operations with retry logic."""
 
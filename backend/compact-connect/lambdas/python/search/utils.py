@@ -3,16 +3,51 @@ Utility functions for provider document processing and OpenSearch indexing.
 
 This module contains shared logic for processing provider records and preparing
 them for OpenSearch indexing. It is used by both the populate_provider_documents
-and provider_update_ingest handlers.
+and provider_update_ingest handlers, along with the naming of the indices they write to.
 """
 
 import json
+import time
 
 from cc_common.config import config
+from cc_common.data_model.provider_read_profile import ProviderReadProfile
+from cc_common.data_model.provider_record_util import ProviderUserRecords
 from cc_common.data_model.schema.provider.api import ProviderGeneralResponseSchema
 from cc_common.utils import ResponseEncoder
 
 
+def get_provider_reindex_alias_name(compact: str) -> str:
+    """
+    Get the name of the alias that points to the index a blue/green reindex of a compact is loading.
+
+    The alias only exists while a reindex is in progress, so it also tells writers that documents need to be written
+    to the new index, as well as the live one.
+
+    :param compact: The compact abbreviation
+    :return: The alias name (e.g., compact_aslp_providers_reindex)
+    """
+    return f'compact_{compact}_providers_reindex'
+
+
+def get_provider_document_version(read_at: float | None = None) -> int:
+    """
+    Get the external version to index provider documents with: when the records they were built from were read, in
+    epoch microseconds.
+
+    Every writer of provider documents indexes and deletes them with this version, and the external_gte version type,
+    so a document is only written if it was built from a read at least as recent as the one already indexed. A
+    document built from an older read, such as a reindex's, then never replaces one the provider update ingest built
+    after a later change, and never brings back a provider the ingest deleted, for as long as the index keeps the
+    delete's tombstone (see index.gc_deletes). For this to hold, the version must be taken no later than the read.
+
+    :param read_at: When the records were read, in epoch seconds, or None for now, if they are about to be read
+    :return: The document version
+    """
+    if read_at is None:
+        return time.time_ns() // 1_000
+    return int(read_at * 1_000_000)
+
+
 def generate_provider_opensearch_document(compact: str, provider_id: str) -> dict:
     """
     Process a single provider and return the sanitized document ready for indexing.
@@ -28,8 +63,21 @@ def generate_provider_opensearch_document(compact: str, provider_id: str) -> dic
         compact=compact,
         provider_id=provider_id,
         consistent_read=True,
+        read_profile=ProviderReadProfile.SEARCH_DOCUMENT,
     )
+    return generate_opensearch_document_from_provider_records(provider_user_records)
 
+
+def generate_opensearch_document_from_provider_records(provider_user_records: ProviderUserRecords) -> dict:
+    """
+    Build the sanitized document for a provider from records that were already read.
+
+    :param provider_user_records: The provider's main records, read with at least the attributes of the
+        SEARCH_DOCUMENT read profile
+    :return: Sanitized document ready for indexing
+    :raises CCInternalException: If there is not exactly one top-level provider record among the records
+    :raises ValidationError: If the provider data fails schema validation
+    """
     # Generate API response object with all nested records
     api_response = provider_user_records.generate_api_response_object()
 
@@ -34,6 +34,9 @@ class ProviderManagementLambdas:
             'EVENT_BUS_NAME': data_event_bus.event_bus_name,
             'PROV_FAM_GIV_MID_INDEX_NAME': persistent_stack.provider_table.provider_fam_giv_mid_index_name,
             'PROV_DATE_OF_UPDATE_INDEX_NAME': persistent_stack.provider_table.provider_date_of_update_index_name,
+            'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME': persistent_stack.provider_table.fam_giv_mid_sharded_index_name,
+            'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME': persistent_stack.provider_table.date_of_update_sharded_index_name,
+            'PROVIDER_GSI_SHARDED_READS': str(persistent_stack.provider_table.provider_gsi_sharded_reads).lower(),
             'SSN_TABLE_NAME': persistent_stack.ssn_table.table_name,
             'SSN_INDEX_NAME': persistent_stack.ssn_table.ssn_index_name,
             'RATE_LIMITING_TABLE_NAME': persistent_stack.rate_limiting_table.table_name,
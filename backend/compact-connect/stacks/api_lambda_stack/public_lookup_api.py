@@ -29,6 +29,9 @@ class PublicLookupApiLambdas:
             'PROVIDER_TABLE_NAME': persistent_stack.provider_table.table_name,
             'PROV_FAM_GIV_MID_INDEX_NAME': persistent_stack.provider_table.provider_fam_giv_mid_index_name,
             'PROV_DATE_OF_UPDATE_INDEX_NAME': persistent_stack.provider_table.provider_date_of_update_index_name,
+            'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME': persistent_stack.provider_table.fam_giv_mid_sharded_index_name,
+            'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME': persistent_stack.provider_table.date_of_update_sharded_index_name,
+            'PROVIDER_GSI_SHARDED_READS': str(persistent_stack.provider_table.provider_gsi_sharded_reads).lower(),
             'COMPACT_CONFIGURATION_TABLE_NAME': persistent_stack.compact_configuration_table.table_name,
             **stack.common_env_vars,
         }
@@ -85,7 +85,14 @@ class PurchasesLambdas:
             lambda_dir='purchases',
             index=os.path.join('handlers', 'privileges.py'),
             handler='post_purchase_privileges',
-            environment=lambda_environment,
+            environment={
+                **lambda_environment,
+                # Each container reserves this many privilege numbers from the compact's privilege counter at a time,
+                # so that concurrent purchases do not all contend for the counter's item. Numbers left unissued when a
+                # container is shut down are never issued, so privilege numbers can have gaps and are not issued in
+                # order across containers, which is acceptable, as with a purchase that fails after claiming a number.
+                'PRIVILEGE_NUMBER_BLOCK_SIZE': '20',
+            },
             alarm_topic=alarm_topic,
             # required as this lambda is bundled with the authorize.net SDK which is large
             memory_size=1024,
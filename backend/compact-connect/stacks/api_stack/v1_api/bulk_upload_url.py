@@ -49,9 +49,16 @@ class BulkUploadUrl:
                 handler,
                 timeout=Duration.seconds(29),
             ),
-            request_parameters={'method.request.header.Authorization': True}
-            if method_options.authorization_type != AuthorizationType.NONE
-            else {},
+            request_parameters={
+                # Optional Content-Encoding (i.e. gzip) the file will be uploaded with. Compressed files are not
+                # split into shards for processing, so are processed in a single invocation.
+                'method.request.querystring.contentEncoding': False,
+                **(
+                    {'method.request.header.Authorization': True}
+                    if method_options.authorization_type != AuthorizationType.NONE
+                    else {}
+                ),
+            },
             authorization_type=method_options.authorization_type,
             authorizer=method_options.authorizer,
             authorization_scopes=method_options.authorization_scopes,
@@ -47,7 +47,7 @@ class IngestStack(AppStack):
             description='Ingest license data handler',
             lambda_dir='provider-data-v1',
             index=os.path.join('handlers', 'ingest.py'),
-            handler='ingest_license_message',
+            handler='ingest_license_messages',
             timeout=Duration.minutes(5),
             environment={
                 'EVENT_BUS_NAME': data_event_bus.event_bus_name,
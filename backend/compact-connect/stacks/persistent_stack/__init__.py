@@ -21,6 +21,7 @@ from common_constructs.stack import AppStack
 from constructs import Construct
 
 from stacks.backup_infrastructure_stack import BackupInfrastructureStack
+from stacks.persistent_stack.bulk_upload_shard_table import BulkUploadShardTable
 from stacks.persistent_stack.bulk_uploads_bucket import BulkUploadsBucket
 from stacks.persistent_stack.compact_configuration_table import CompactConfigurationTable
 from stacks.persistent_stack.compact_configuration_upload import CompactConfigurationUpload
@@ -212,6 +213,13 @@ class PersistentStack(AppStack):
             environment_context=self.environment_context,
         )
 
+        self.bulk_upload_shard_table = BulkUploadShardTable(
+            self,
+            'BulkUploadShardTable',
+            encryption_key=self.ssn_table.key,
+            removal_policy=removal_policy,
+        )
+
         self.bulk_uploads_bucket = BulkUploadsBucket(
             self,
             'BulkUploadsBucket',
@@ -225,6 +233,8 @@ class PersistentStack(AppStack):
             event_bus=self._data_event_bus,
             license_preprocessing_queue=self.ssn_table.preprocessor_queue.queue,
             license_upload_role=self.ssn_table.license_upload_role,
+            bulk_upload_shard_table=self.bulk_upload_shard_table,
+            environment_context=self.environment_context,
         )
 
         self.transaction_reports_bucket = TransactionReportsBucket(
@@ -5,6 +5,7 @@ import os
 from aws_cdk import Duration
 from aws_cdk.aws_cloudwatch import Alarm, ComparisonOperator, Stats, TreatMissingData
 from aws_cdk.aws_cloudwatch_actions import SnsAction
+from aws_cdk.aws_dynamodb import ITable
 from aws_cdk.aws_events import EventBus
 from aws_cdk.aws_iam import IRole
 from aws_cdk.aws_kms import IKey
@@ -16,6 +17,7 @@ from cdk_nag import NagSuppressions
 from common_constructs.access_logs_bucket import AccessLogsBucket
 from common_constructs.bucket import Bucket
 from common_constructs.python_function import PythonFunction
+from common_constructs.queued_lambda_processor import QueuedLambdaProcessor
 from common_constructs.stack import Stack
 from constructs import Construct
 
@@ -33,6 +35,8 @@ class BulkUploadsBucket(Bucket):
         event_bus: EventBus,
         license_preprocessing_queue: IQueue,
         license_upload_role: IRole,
+        bulk_upload_shard_table: ITable,
+        environment_context: dict,
         **kwargs,
     ):
         super().__init__(
@@ -53,7 +57,15 @@ class BulkUploadsBucket(Bucket):
         )
         self.log_groups = []
 
-        self._add_v1_ingest_object_events(event_bus, license_preprocessing_queue, license_upload_role)
+        self._add_v1_ingest_object_events(
+            event_bus,
+            license_preprocessing_queue,
+            license_upload_role,
+            bulk_upload_shard_table,
+            bucket_encryption_key,
+            # The most shards of bulk upload files that may be processed at once, across all uploads
+            shard_max_concurrency=environment_context.get('bulk_upload_shard_max_concurrency', 4),
+        )
 
         QueryDefinition(
             self,
@@ -83,10 +95,25 @@ class BulkUploadsBucket(Bucket):
         )
 
     def _add_v1_ingest_object_events(
-        self, event_bus: EventBus, license_preprocessing_queue: IQueue, license_upload_role: IRole
+        self,
+        event_bus: EventBus,
+        license_preprocessing_queue: IQueue,
+        license_upload_role: IRole,
+        bulk_upload_shard_table: ITable,
+        bucket_encryption_key: IKey,
+        *,
+        shard_max_concurrency: int,
     ):
         """Read any objects that get uploaded and trigger ingest events"""
         stack: ps.PersistentStack = ps.PersistentStack.of(self)
+        shard_queue = self._add_v1_shard_processor(
+            event_bus,
+            license_preprocessing_queue,
+            license_upload_role,
+            bulk_upload_shard_table,
+            bucket_encryption_key,
+            shard_max_concurrency=shard_max_concurrency,
+        )
         parse_objects_handler = PythonFunction(
             self,
             'V1ParseObjectsHandler',
@@ -101,6 +128,13 @@ class BulkUploadsBucket(Bucket):
             environment={
                 'EVENT_BUS_NAME': event_bus.event_bus_name,
                 'LICENSE_PREPROCESSING_QUEUE_URL': license_preprocessing_queue.queue_url,
+                'LICENSE_PREPROCESSING_QUEUE_SEND_CONCURRENCY': '8',
+                # Files over ~5MB (~35k licenses) are split into shards that are processed concurrently
+                'BULK_UPLOAD_SHARD_SIZE_BYTES': '5000000',
+                'BULK_UPLOAD_SHARD_QUEUE_URL': shard_queue.queue_url,
+                'BULK_UPLOAD_SHARD_TABLE_NAME': bulk_upload_shard_table.table_name,
+                # Compressed files may decompress to no more than ~300MB (~2M licenses)
+                'BULK_UPLOAD_MAX_DECOMPRESSED_BYTES': '300000000',
                 **stack.common_env_vars,
             },
         )
@@ -110,6 +144,8 @@ class BulkUploadsBucket(Bucket):
         license_preprocessing_queue.grant_send_messages(parse_objects_handler)
         # We still need event bus permissions for failure events
         event_bus.grant_put_events_to(parse_objects_handler)
+        shard_queue.grant_send_messages(parse_objects_handler)
+        bulk_upload_shard_table.grant_read_write_data(parse_objects_handler)
         self.log_groups.append(parse_objects_handler.log_group)
 
         # We should specifically set an alarm for any failures of this handler, since it could otherwise go unnoticed.
@@ -158,3 +194,61 @@ class BulkUploadsBucket(Bucket):
                 },
             ],
         )
+
+    def _add_v1_shard_processor(
+        self,
+        event_bus: EventBus,
+        license_preprocessing_queue: IQueue,
+        license_upload_role: IRole,
+        bulk_upload_shard_table: ITable,
+        bucket_encryption_key: IKey,
+        *,
+        shard_max_concurrency: int,
+    ) -> IQueue:
+        """Process shards of large uploaded objects from a queue, returning the queue"""
+        stack: ps.PersistentStack = ps.PersistentStack.of(self)
+        process_shards_handler = PythonFunction(
+            self,
+            'V1ProcessObjectShardsHandler',
+            description='Process s3 object shards handler',
+            lambda_dir='provider-data-v1',
+            index=os.path.join('handlers', 'bulk_upload.py'),
+            handler='process_bulk_upload_shards',
+            role=license_upload_role,
+            timeout=Duration.minutes(15),
+            alarm_topic=stack.alarm_topic,
+            memory_size=1024,
+            environment={
+                'EVENT_BUS_NAME': event_bus.event_bus_name,
+                'LICENSE_PREPROCESSING_QUEUE_URL': license_preprocessing_queue.queue_url,
+                'LICENSE_PREPROCESSING_QUEUE_SEND_CONCURRENCY': '8',
+                'BULK_UPLOAD_SHARD_TABLE_NAME': bulk_upload_shard_table.table_name,
+                **stack.common_env_vars,
+            },
+        )
+        self.grant_delete(process_shards_handler)
+        self.grant_read(process_shards_handler)
+        license_preprocessing_queue.grant_send_messages(process_shards_handler)
+        event_bus.grant_put_events_to(process_shards_handler)
+        bulk_upload_shard_table.grant_read_write_data(process_shards_handler)
+        self.log_groups.append(process_shards_handler.log_group)
+
+        shard_processor = QueuedLambdaProcessor(
+            self,
+            'V1ObjectShardQueue',
+            process_function=process_shards_handler,
+            # A shard can take up to the full function timeout, so its message must stay invisible for longer than
+            # that, before it can be redelivered.
+            visibility_timeout=Duration.minutes(20),
+            retention_period=Duration.hours(12),
+            max_batching_window=Duration.seconds(0),
+            max_receive_count=3,
+            # Each shard is as much work as one invocation should take on
+            batch_size=1,
+            encryption_key=bucket_encryption_key,
+            alarm_topic=stack.alarm_topic,
+            # Any shard that can't be processed leaves part of an upload unprocessed, which needs attention
+            dlq_count_alarm_threshold=0,
+            max_concurrency=shard_max_concurrency,
+        )
+        return shard_processor.queue
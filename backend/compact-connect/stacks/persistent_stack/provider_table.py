@@ -48,22 +48,72 @@ class ProviderTable(Table):
         )
         self.provider_fam_giv_mid_index_name = 'providerFamGivMid'
         self.provider_date_of_update_index_name = 'providerDateOfUpdate'
+        self.fam_giv_mid_sharded_index_name = 'providerFamGivMidSharded'
+        self.date_of_update_sharded_index_name = 'providerDateOfUpdateSharded'
         self.license_gsi_name = 'licenseGSI'
         self.compact_transaction_gsi_name = 'compactTransactionIdGSI'
         self.license_upload_date_gsi_name = 'licenseUploadDateGSI'
 
-        self.add_global_secondary_index(
-            index_name=self.provider_fam_giv_mid_index_name,
-            partition_key=Attribute(name='sk', type=AttributeType.STRING),
-            sort_key=Attribute(name='providerFamGivMid', type=AttributeType.STRING),
-            projection_type=ProjectionType.ALL,
+        # The provider GSIs below put all of a compact's providers into a single partition, which limits the throughput
+        # of provider listings and of the writes that feed them. Their sharded equivalents spread each compact's
+        # providers over a fixed number of shards, which are queried in parallel and merged.
+        # Note that CloudFormation can only add or remove one GSI per table update and does not wait for GSIs to be
+        # backfilled, so on an existing table the migration is deployed in steps, each by setting a flag in the
+        # environment's context:
+        # 1. Deploy providerFamGivMidSharded, which needs no flag.
+        # 2. Once it is active, set provider_date_of_update_sharded_index to add providerDateOfUpdateSharded.
+        # 3. Once it is active, backfill existing provider records with bin/backfill_provider_gsi_shards.py, then set
+        #    provider_gsi_sharded_reads, so that provider listings read from the sharded GSIs.
+        # 4. Once that deploy has completed, so no lambda reads the unsharded GSIs, set
+        #    remove_provider_fam_giv_mid_index to remove providerFamGivMid.
+        # 5. Then set remove_provider_date_of_update_index to remove providerDateOfUpdate. Until both are removed,
+        #    every provider record write still feeds them, and their single partition per compact.
+        self.provider_date_of_update_sharded_index = environment_context.get(
+            'provider_date_of_update_sharded_index', False
         )
+        self.provider_gsi_sharded_reads = environment_context.get('provider_gsi_sharded_reads', False)
+        self.remove_provider_fam_giv_mid_index = environment_context.get('remove_provider_fam_giv_mid_index', False)
+        self.remove_provider_date_of_update_index = environment_context.get(
+            'remove_provider_date_of_update_index', False
+        )
+        if self.provider_gsi_sharded_reads and not self.provider_date_of_update_sharded_index:
+            raise ValueError(
+                'provider_gsi_sharded_reads requires provider_date_of_update_sharded_index to be enabled and backfilled'
+            )
+        if (self.remove_provider_fam_giv_mid_index or self.remove_provider_date_of_update_index) and (
+            not self.provider_gsi_sharded_reads
+        ):
+            raise ValueError(
+                'The unsharded provider GSIs can only be removed once provider_gsi_sharded_reads is enabled'
+            )
+
+        if not self.remove_provider_fam_giv_mid_index:
+            self.add_global_secondary_index(
+                index_name=self.provider_fam_giv_mid_index_name,
+                partition_key=Attribute(name='sk', type=AttributeType.STRING),
+                sort_key=Attribute(name='providerFamGivMid', type=AttributeType.STRING),
+                projection_type=ProjectionType.ALL,
+            )
+        if not self.remove_provider_date_of_update_index:
+            self.add_global_secondary_index(
+                index_name=self.provider_date_of_update_index_name,
+                partition_key=Attribute(name='sk', type=AttributeType.STRING),
+                sort_key=Attribute(name='providerDateOfUpdate', type=AttributeType.STRING),
+                projection_type=ProjectionType.ALL,
+            )
         self.add_global_secondary_index(
-            index_name=self.provider_date_of_update_index_name,
-            partition_key=Attribute(name='sk', type=AttributeType.STRING),
-            sort_key=Attribute(name='providerDateOfUpdate', type=AttributeType.STRING),
+            index_name=self.fam_giv_mid_sharded_index_name,
+            partition_key=Attribute(name='providerGSIPK', type=AttributeType.STRING),
+            sort_key=Attribute(name='providerFamGivMid', type=AttributeType.STRING),
             projection_type=ProjectionType.ALL,
         )
+        if self.provider_date_of_update_sharded_index:
+            self.add_global_secondary_index(
+                index_name=self.date_of_update_sharded_index_name,
+                partition_key=Attribute(name='providerGSIPK', type=AttributeType.STRING),
+                sort_key=Attribute(name='providerDateOfUpdate', type=AttributeType.STRING),
+                projection_type=ProjectionType.ALL,
+            )
         self.add_global_secondary_index(
             index_name=self.license_gsi_name,
             partition_key=Attribute(name='licenseGSIPK', type=AttributeType.STRING),
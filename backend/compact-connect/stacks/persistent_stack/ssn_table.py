@@ -455,7 +455,7 @@ class SSNTable(Table):
             description='Preprocess license data to create SSN Dynamo records before sending licenses to the event bus',
             lambda_dir='provider-data-v1',
             index=os.path.join('handlers', 'ingest.py'),
-            handler='preprocess_license_ingest',
+            handler='preprocess_license_ingest_messages',
             role=self.ingest_role,
             timeout=Duration.minutes(2),
             environment={
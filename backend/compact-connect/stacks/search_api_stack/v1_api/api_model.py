@@ -90,6 +90,11 @@ class ApiModel:
                     type=JsonSchemaType.OBJECT,
                     description='The OpenSearch query body',
                 ),
+                'async': JsonSchema(
+                    type=JsonSchemaType.BOOLEAN,
+                    description='Run the export as a background job, and return its jobId to fetch the file with '
+                    'once it completes. Exports too large to complete within the API timeout must be run this way.',
+                ),
             },
         )
 
@@ -155,20 +160,64 @@ class ApiModel:
             return self.api._v1_search_privileges_response_model
         self.api._v1_search_privileges_response_model = self.api.add_model(
             'V1ExportPrivilegesResponseModel',
-            description='Export privileges response model with presigned URL to CSV file',
+            description='Export privileges response model with presigned URL to CSV file, or an async export job',
             schema=JsonSchema(
                 type=JsonSchemaType.OBJECT,
-                required=['fileUrl'],
                 properties={
                     'fileUrl': JsonSchema(
                         type=JsonSchemaType.STRING,
                         description='Presigned URL to download the CSV file containing the export results',
                     ),
+                    **self._export_privileges_job_properties,
                 },
             ),
         )
         return self.api._v1_search_privileges_response_model
 
+    @property
+    def _export_privileges_job_properties(self) -> dict[str, JsonSchema]:
+        """Return the properties of an async privilege export job"""
+        return {
+            'jobId': JsonSchema(
+                type=JsonSchemaType.STRING,
+                description='The id of the export job, to fetch the job with',
+            ),
+            'status': JsonSchema(
+                type=JsonSchemaType.STRING,
+                enum=['inProgress', 'complete', 'failed'],
+            ),
+        }
+
+    @property
+    def export_privileges_job_response_model(self) -> Model:
+        """Return the export privileges job response model, which should only be created once per API"""
+        if hasattr(self.api, '_v1_export_privileges_job_response_model'):
+            return self.api._v1_export_privileges_job_response_model
+        self.api._v1_export_privileges_job_response_model = self.api.add_model(
+            'V1ExportPrivilegesJobResponseModel',
+            description='Export privileges job response model, with presigned URL to CSV file once complete',
+            schema=JsonSchema(
+                type=JsonSchemaType.OBJECT,
+                required=['jobId', 'status'],
+                properties={
+                    **self._export_privileges_job_properties,
+                    'fileUrl': JsonSchema(
+                        type=JsonSchemaType.STRING,
+                        description='Presigned URL to download the CSV file, once the job is complete',
+                    ),
+                    'privilegeCount': JsonSchema(
+                        type=JsonSchemaType.INTEGER,
+                        description='The number of privileges exported, once the job is complete',
+                    ),
+                    'message': JsonSchema(
+                        type=JsonSchemaType.STRING,
+                        description='Why the job failed, if it failed',
+                    ),
+                },
+            ),
+        )
+        return self.api._v1_export_privileges_job_response_model
+
     @property
     def _providers_response_schema(self):
         stack: AppStack = AppStack.of(self.api)
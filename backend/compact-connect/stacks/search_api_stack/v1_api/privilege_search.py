@@ -59,3 +59,20 @@ class PrivilegeSearch:
             authorizer=method_options.authorizer,
             authorization_scopes=method_options.authorization_scopes,
         )
+
+        # GET /v1/compacts/{compact}/privileges/export/{jobId}
+        self.privilege_search_export_job_endpoint = export_resource.add_resource('{jobId}').add_method(
+            'GET',
+            request_validator=self.api.parameter_body_validator,
+            method_responses=[
+                MethodResponse(
+                    status_code='200',
+                    response_models={'application/json': self.api_model.export_privileges_job_response_model},
+                ),
+            ],
+            integration=LambdaIntegration(handler, timeout=Duration.seconds(29)),
+            request_parameters={'method.request.header.Authorization': True},
+            authorization_type=method_options.authorization_type,
+            authorizer=method_options.authorizer,
+            authorization_scopes=method_options.authorization_scopes,
+        )
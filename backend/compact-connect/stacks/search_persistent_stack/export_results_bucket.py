@@ -47,6 +47,9 @@ class ExportResultsBucket(Bucket):
                     id='DeleteExportFilesAfterOneDay',
                     enabled=True,
                     expiration=Duration.days(1),
+                    # Exports are streamed in with multipart uploads, which are left incomplete if an export is cut
+                    # short without being able to abort its upload
+                    abort_incomplete_multipart_upload_after=Duration.days(1),
                 ),
             ],
             **kwargs,
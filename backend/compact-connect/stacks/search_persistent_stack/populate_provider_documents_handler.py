@@ -67,6 +67,9 @@ class PopulateProviderDocumentsHandler(Construct):
                 'OPENSEARCH_HOST_ENDPOINT': opensearch_domain.domain_endpoint,
                 'PROVIDER_TABLE_NAME': provider_table.table_name,
                 'PROV_DATE_OF_UPDATE_INDEX_NAME': provider_table.provider_date_of_update_index_name,
+                'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME': provider_table.fam_giv_mid_sharded_index_name,
+                'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME': provider_table.date_of_update_sharded_index_name,
+                'PROVIDER_GSI_SHARDED_READS': str(provider_table.provider_gsi_sharded_reads).lower(),
                 **stack.common_env_vars,
             },
             # Longer timeout for processing large datasets
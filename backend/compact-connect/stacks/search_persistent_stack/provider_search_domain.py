@@ -233,9 +233,9 @@ class ProviderSearchDomain(Construct):
         Configure access policies for the OpenSearch domain.
 
         Creates IAM-based access policies that restrict access to specific Lambda roles:
-        - Ingest role: POST/PUT access to compact indices
+        - Ingest role: GET/HEAD/POST/PUT access to compact indices, as the populate handler manages blue/green reindexes
         - Index manager role: GET/HEAD/POST/PUT access for index management
-        - Search API role: POST access restricted to _search endpoint only
+        - Search API role: POST access restricted to _search endpoint only, plus point in time searches for exports
 
         :param compact_abbreviations: List of compact abbreviations for index access policies
         """
@@ -243,6 +243,9 @@ class ProviderSearchDomain(Construct):
             effect=Effect.ALLOW,
             principals=[self._ingest_lambda_role],
             actions=[
+                # Required to look up the aliases and index settings of a blue/green reindex
+                'es:ESHttpGet',
+                'es:ESHttpHead',
                 'es:ESHttpPost',
                 'es:ESHttpPut',
             ],
@@ -265,6 +268,7 @@ class ProviderSearchDomain(Construct):
             ingest_access_policy,
             index_manager_access_policy,
             search_api_policy,
+            *self._get_point_in_time_search_policies(self._search_api_lambda_role),
         )
 
     def _get_capacity_config(self) -> CapacityConfig:
@@ -629,6 +633,43 @@ class ProviderSearchDomain(Construct):
             apply_to_children=True,
         )
 
+    def _get_point_in_time_search_policies(self, principal: IPrincipal) -> list[PolicyStatement]:
+        """
+        Generate access policies to search the compact indices through a point in time (PIT).
+
+        Privilege exports page through their results with search_after over a PIT. Creating a PIT is restricted to the
+        compact indices. Searching and deleting a PIT can not be restricted by index, since the PIT id takes the place
+        of the index name in those requests, but a PIT can only be created on, and so only searched over, the compact
+        indices.
+
+        See: https://docs.opensearch.org/latest/search-plugins/searching-data/point-in-time-api/
+        """
+        return [
+            PolicyStatement(
+                effect=Effect.ALLOW,
+                actions=[
+                    'es:ESHttpPost',
+                ],
+                resources=[
+                    Fn.join(
+                        delimiter='',
+                        list_of_values=[self.domain.domain_arn, f'/compact_{compact}_providers/_search/point_in_time'],
+                    )
+                    for compact in self._compact_abbreviations
+                ]
+                + [Fn.join(delimiter='', list_of_values=[self.domain.domain_arn, '/_search'])],
+                principals=[principal.grant_principal],
+            ),
+            PolicyStatement(
+                effect=Effect.ALLOW,
+                actions=[
+                    'es:ESHttpDelete',
+                ],
+                resources=[Fn.join(delimiter='', list_of_values=[self.domain.domain_arn, '/_search/point_in_time'])],
+                principals=[principal.grant_principal],
+            ),
+        ]
+
     def grant_search_providers(self, principal: IPrincipal):
         """
         Grant search access to the principal policy.
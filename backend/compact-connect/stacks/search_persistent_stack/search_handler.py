@@ -76,6 +76,39 @@ class SearchHandler(Construct):
             alarm_topic=alarm_topic,
         )
 
+        # Create Lambda function for running privilege exports that are too large to complete within the API's
+        # timeout, which the search handler starts asynchronously
+        self.privilege_export_job_handler = PythonFunction(
+            self,
+            'PrivilegeExportJobFunction',
+            description='Privilege export job handler for large privilege CSV exports',
+            index=os.path.join('handlers', 'search.py'),
+            lambda_dir='search',
+            handler='export_privileges_job_handler',
+            role=lambda_role,
+            log_retention=RetentionDays.ONE_MONTH,
+            environment={
+                'OPENSEARCH_HOST_ENDPOINT': opensearch_domain.domain_endpoint,
+                'EXPORT_RESULTS_BUCKET_NAME': export_results_bucket.bucket_name,
+                **stack.common_env_vars,
+            },
+            timeout=Duration.minutes(15),
+            # A failed job records its failure in its status, so it is not retried, which would overwrite that status
+            # and rerun an export that ran out of time
+            retry_attempts=0,
+            # Exports are streamed to S3 a page at a time, so memory use does not grow with the export size
+            memory_size=2048,
+            vpc=vpc_stack.vpc,
+            vpc_subnets=vpc_subnets,
+            security_groups=[vpc_stack.lambda_security_group],
+            alarm_topic=alarm_topic,
+        )
+        self.handler.add_environment(
+            'PRIVILEGE_EXPORT_JOB_LAMBDA_NAME', self.privilege_export_job_handler.function_name
+        )
+        self.privilege_export_job_handler.grant_invoke(self.handler)
+
+        # The job handler shares the handler's role, so these grants apply to both
         # Grant the handler read access to the OpenSearch domain
         opensearch_domain.grant_read(self.handler)
 
@@ -101,13 +134,37 @@ class SearchHandler(Construct):
             ],
         )
 
-        # Create a metric filter to capture ERROR level logs from the search handler Lambda
+        self._add_error_log_alarm(
+            construct_id_prefix='SearchHandler',
+            function=self.handler,
+            description='Search Handler',
+            alarm_topic=alarm_topic,
+        )
+        self._add_error_log_alarm(
+            construct_id_prefix='PrivilegeExportJob',
+            function=self.privilege_export_job_handler,
+            description='Privilege Export Job',
+            alarm_topic=alarm_topic,
+        )
+
+    def _add_error_log_alarm(
+        self, *, construct_id_prefix: str, function: PythonFunction, description: str, alarm_topic: ITopic
+    ):
+        """
+        Add an alarm that triggers when the function logs an ERROR level message.
+
+        :param construct_id_prefix: The prefix of the metric filter and alarm construct ids, and of the metric name
+        :param function: The function to alarm on
+        :param description: The name of the function to use in the alarm description
+        :param alarm_topic: The SNS topic for alarms
+        """
+        # Create a metric filter to capture ERROR level logs from the Lambda
         error_log_metric = MetricFilter(
             self,
-            'SearchHandlerErrorLogMetric',
-            log_group=self.handler.log_group,
+            f'{construct_id_prefix}ErrorLogMetric',
+            log_group=function.log_group,
             metric_namespace='CompactConnect/Search',
-            metric_name='SearchHandlerErrors',
+            metric_name=f'{construct_id_prefix}Errors',
             filter_pattern=FilterPattern.string_value(json_field='$.level', comparison='=', value='ERROR'),
             metric_value='1',
             default_value=0,
@@ -116,13 +173,13 @@ class SearchHandler(Construct):
         # Create an alarm that triggers when ERROR logs are detected
         error_log_alarm = Alarm(
             self,
-            'SearchHandlerErrorLogAlarm',
+            f'{construct_id_prefix}ErrorLogAlarm',
             metric=error_log_metric.metric(statistic='Sum'),
             evaluation_periods=1,
             threshold=1,
             actions_enabled=True,
-            alarm_description=f'The Search Handler Lambda logged an ERROR level message. Investigate '
-            f'the logs for the {self.handler.function_name} lambda to determine the cause.',
+            alarm_description=f'The {description} Lambda logged an ERROR level message. Investigate '
+            f'the logs for the {function.function_name} lambda to determine the cause.',
             comparison_operator=ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
             treat_missing_data=TreatMissingData.NOT_BREACHING,
         )
@@ -516,6 +516,9 @@ class TestStateApi(TestApi):
             'PROVIDER_TABLE_NAME',
             'PROV_FAM_GIV_MID_INDEX_NAME',
             'PROV_DATE_OF_UPDATE_INDEX_NAME',
+            'PROV_FAM_GIV_MID_SHARDED_INDEX_NAME',
+            'PROV_DATE_OF_UPDATE_SHARDED_INDEX_NAME',
+            'PROVIDER_GSI_SHARDED_READS',
             'API_BASE_URL',
         ]
 